@@ -33,6 +33,7 @@ class ACEConfig(BaseModel):
         prune_threshold: Semantic similarity threshold for de-duplication (0-1)
         semantic_similarity_threshold: Cosine similarity for merging entries (0-1)
 
+        reflection_sample_rate: Fraction of executions queued for reflection (0-1)
         max_reflection_iterations: How many rounds of reflection refinement
         reflector_model: LLM model for reflection (recommend Haiku for cost)
         reflector_temperature: Temperature for reflection LLM
@@ -79,6 +80,12 @@ class ACEConfig(BaseModel):
     )
 
     # Reflection settings
+    reflection_sample_rate: float = Field(
+        default=1.0,
+        ge=0.0,
+        le=1.0,
+        description="Fraction of executions reflected on (sampled before building the trace)"
+    )
     max_reflection_iterations: int = Field(
         default=5,
         ge=1,
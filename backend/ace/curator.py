@@ -14,7 +14,7 @@ The curator implements the "Curator" role from ACE framework:
 - Prevents duplication through semantic similarity
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 import logging
 
@@ -31,6 +31,13 @@ from ace.schemas import (
     PlaybookEntry,
 )
 from ace.osmosis_extractor import OsmosisExtractor
+from ace.embedding_index import (
+    ANN_MIN_ENTRIES,
+    EntryEmbeddingIndex,
+    attach_embedding,
+    normalize_rows,
+    stale_entries,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -43,7 +50,10 @@ class Curator:
     1. Pass 1: Claude reasons about de-duplication and updates
     2. Pass 2: Osmosis extracts structured PlaybookDelta
 
-    Includes semantic de-duplication to prevent redundant entries.
+    Includes semantic de-duplication to prevent redundant entries. Entry
+    embeddings are stored on the entries and the per-agent similarity index
+    is kept until the playbook's entries change, so each curation only
+    embeds its new insights.
     """
 
     def __init__(
@@ -53,6 +63,7 @@ class Curator:
         embeddings: Optional[Embeddings] = None,
         similarity_threshold: float = 0.85,
         temperature: float = 0.3,
+        ann_min_entries: int = ANN_MIN_ENTRIES,
     ):
         """
         Initialize Curator.
@@ -63,6 +74,8 @@ class Curator:
             embeddings: Embeddings model for semantic de-duplication (default: nomic-embed-text via Ollama)
             similarity_threshold: Similarity threshold for de-duplication (0.0-1.0)
             temperature: LLM temperature (0.3 for consistent curation decisions)
+            ann_min_entries: Playbook size from which an ANN index (hnswlib, if
+                             installed) replaces exact similarity search
         """
         self.llm = ChatGoogleGenerativeAI(
             model=model,
@@ -72,6 +85,13 @@ class Curator:
         # Use fast local embeddings via Ollama (nomic-embed-text: 274MB, very fast, 8K context)
         self.embeddings = embeddings or OllamaEmbeddings(model="nomic-embed-text")
         self.similarity_threshold = similarity_threshold
+        self.ann_min_entries = ann_min_entries
+
+        # Identifies stored entry embeddings (recomputed if the model changes)
+        self.embedding_model = getattr(self.embeddings, "model", None) or type(self.embeddings).__name__
+
+        # agent_type -> similarity index over that agent's current entries
+        self._indexes: Dict[str, EntryEmbeddingIndex] = {}
 
         logger.info(
             f"Initialized Curator with {model} and local Ollama embeddings "
@@ -105,7 +125,7 @@ class Curator:
         )
 
         # Semantic de-duplication
-        deduplicated_insights = await self._deduplicate_insights(
+        deduplicated_insights, insight_vectors = await self._deduplicate_insights(
             insights,
             current_playbook,
         )
@@ -149,6 +169,12 @@ class Curator:
         delta.execution_id = execution_id
         delta.created_at = datetime.now()
 
+        # Reuse insight embeddings for entries added verbatim
+        for entry in delta.add:
+            vector = insight_vectors.get(entry.content)
+            if vector is not None:
+                attach_embedding(entry, self.embedding_model, vector)
+
         return delta
 
     def _get_system_prompt(self) -> str:
@@ -169,56 +195,40 @@ Focus on making smart decisions. Structure will be extracted later."""
         self,
         insights: List[ReflectionInsight],
         current_playbook: PlaybookState,
-    ) -> List[ReflectionInsight]:
+    ) -> Tuple[List[ReflectionInsight], Dict[str, np.ndarray]]:
         """
         Remove insights that are too similar to existing playbook entries.
 
         Uses semantic similarity (embeddings) instead of exact matching.
+        Only the insights (and entries without a current embedding) are
+        embedded; similarity is one insights x entries matrix product.
 
         Args:
             insights: New insights to check
             current_playbook: Current playbook state
 
         Returns:
-            Deduplicated list of insights
+            (deduplicated insights, normalized insight embedding by content)
         """
-        if not current_playbook["entries"]:
+        entries = current_playbook["entries"]
+        if not entries or not insights:
             logger.debug("Playbook empty - no deduplication needed")
-            return insights
+            return insights, {}
 
         # Generate embeddings for new insights
         insight_texts = [i.content for i in insights]
         logger.debug(f"Generating embeddings for {len(insight_texts)} insights...")
-        insight_embeddings = await self.embeddings.aembed_documents(insight_texts)
+        insight_matrix = normalize_rows(await self.embeddings.aembed_documents(insight_texts))
 
-        # Generate embeddings for existing entries
-        entry_texts = [e.content for e in current_playbook["entries"]]
-        logger.debug(f"Generating embeddings for {len(entry_texts)} playbook entries...")
-        entry_embeddings = await self.embeddings.aembed_documents(entry_texts)
+        index = await self._get_entry_index(current_playbook["agent_type"], entries)
+        best, similarities = index.best_match(insight_matrix)
 
         # Filter out duplicates
         deduplicated = []
         duplicate_count = 0
 
         for i, insight in enumerate(insights):
-            insight_vec = np.array(insight_embeddings[i])
-
-            # Normalize vector
-            insight_vec = insight_vec / np.linalg.norm(insight_vec)
-
-            # Check similarity to all existing entries
-            max_similarity = 0.0
-            most_similar_entry = None
-
-            for j, entry_vec in enumerate(entry_embeddings):
-                # Normalize
-                entry_vec_norm = np.array(entry_vec) / np.linalg.norm(entry_vec)
-
-                # Cosine similarity
-                similarity = np.dot(insight_vec, entry_vec_norm)
-                if similarity > max_similarity:
-                    max_similarity = similarity
-                    most_similar_entry = current_playbook["entries"][j].content
+            max_similarity = float(similarities[i])
 
             # Keep if sufficiently different
             if max_similarity < self.similarity_threshold:
@@ -230,7 +240,7 @@ Focus on making smart decisions. Structure will be extracted later."""
                 duplicate_count += 1
                 logger.debug(
                     f"✗ Insight {i+1}: Duplicate (similarity={max_similarity:.3f} "
-                    f"to '{most_similar_entry[:50]}...')"
+                    f"to '{entries[best[i]].content[:50]}...')"
                 )
 
         logger.info(
@@ -238,7 +248,40 @@ Focus on making smart decisions. Structure will be extracted later."""
             f"(threshold={self.similarity_threshold})"
         )
 
-        return deduplicated
+        return deduplicated, dict(zip(insight_texts, insight_matrix))
+
+    async def _get_entry_index(
+        self,
+        agent_type: str,
+        entries: List[PlaybookEntry],
+    ) -> EntryEmbeddingIndex:
+        """
+        Similarity index over the playbook's entries.
+
+        Reused while the entries (IDs and embedded content) are unchanged;
+        otherwise entries lacking a current embedding are embedded once,
+        stored on the entry, and the index is rebuilt.
+        """
+        stale = stale_entries(entries, self.embedding_model)
+        index = self._indexes.get(agent_type)
+        if not stale and index is not None and index.matches(e.id for e in entries):
+            return index
+
+        if stale:
+            logger.debug(f"Generating embeddings for {len(stale)} playbook entries...")
+            vectors = normalize_rows(
+                await self.embeddings.aembed_documents([entries[i].content for i in stale])
+            )
+            for i, vector in zip(stale, vectors):
+                attach_embedding(entries[i], self.embedding_model, vector)
+
+        index = EntryEmbeddingIndex(
+            [e.id for e in entries],
+            [e.embedding for e in entries],
+            ann_min_entries=self.ann_min_entries,
+        )
+        self._indexes[agent_type] = index
+        return index
 
     def _build_curation_prompt(
         self,
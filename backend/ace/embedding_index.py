@@ -0,0 +1,125 @@
+"""
+Embedding index for Curator semantic de-duplication.
+
+Playbook entries carry their normalized embedding (PlaybookEntry.embedding),
+so a curation only embeds its new insights. Similarity against the whole
+playbook is one matrix product (insights x entries) with a row-wise argmax.
+
+For large playbooks an approximate nearest-neighbour index (hnswlib, optional)
+replaces the exact product once the entry count reaches ann_min_entries.
+"""
+
+import hashlib
+import logging
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Check if hnswlib is available (optional ANN backend)
+try:
+    import hnswlib
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    HNSWLIB_AVAILABLE = False
+
+# Entry count from which the ANN index is used (exact search below this)
+ANN_MIN_ENTRIES = 5000
+
+
+def embedding_key(model_name: str, content: str) -> str:
+    """Identify the (model, text) an embedding was computed from."""
+    return hashlib.sha1(f"{model_name}\0{content}".encode("utf-8")).hexdigest()
+
+
+def normalize_rows(vectors: Sequence[Sequence[float]]) -> np.ndarray:
+    """
+    L2-normalize each row into a float32 matrix.
+
+    Zero vectors stay zero (similarity 0 to everything) instead of NaN.
+    """
+    matrix = np.array(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+class EntryEmbeddingIndex:
+    """
+    Nearest-entry lookup over normalized playbook entry embeddings.
+
+    Attributes:
+        entry_ids: Entry IDs in row order (used to detect a changed playbook)
+        matrix: (n_entries, dim) normalized float32 matrix
+    """
+
+    def __init__(
+        self,
+        entry_ids: Sequence[str],
+        vectors: Sequence[Sequence[float]],
+        ann_min_entries: int = ANN_MIN_ENTRIES,
+    ):
+        """
+        Build the index.
+
+        Args:
+            entry_ids: Playbook entry IDs, one per vector
+            vectors: Normalized entry embeddings
+            ann_min_entries: Use hnswlib from this many entries (if installed)
+        """
+        self.entry_ids: Tuple[str, ...] = tuple(entry_ids)
+        self.matrix = normalize_rows(vectors) if len(vectors) else np.zeros((0, 0), dtype=np.float32)
+        self._ann = None
+
+        if HNSWLIB_AVAILABLE and len(self.entry_ids) >= ann_min_entries:
+            self._ann = hnswlib.Index(space="ip", dim=self.matrix.shape[1])
+            self._ann.init_index(max_elements=len(self.entry_ids), ef_construction=200, M=16)
+            self._ann.add_items(self.matrix, np.arange(len(self.entry_ids)))
+            self._ann.set_ef(64)
+            logger.debug(f"Built ANN index over {len(self.entry_ids)} playbook entries")
+
+    def matches(self, entry_ids: Sequence[str]) -> bool:
+        """True if the index was built from exactly these entries (same order)."""
+        return self.entry_ids == tuple(entry_ids)
+
+    def best_match(self, queries: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Most similar entry for each normalized query row.
+
+        Args:
+            queries: (n_queries, dim) normalized matrix
+
+        Returns:
+            (row indices, cosine similarities), one per query
+        """
+        if not self.entry_ids:
+            empty = np.zeros(len(queries))
+            return empty.astype(np.int64), empty
+
+        if self._ann is not None:
+            labels, distances = self._ann.knn_query(queries, k=1)
+            # hnswlib "ip" distance is 1 - inner product
+            return labels[:, 0].astype(np.int64), 1.0 - distances[:, 0]
+
+        similarities = queries @ self.matrix.T
+        best = similarities.argmax(axis=1)
+        return best, similarities[np.arange(len(best)), best]
+
+
+def stale_entries(entries: Sequence, model_name: str) -> List[int]:
+    """Indexes of entries with no embedding for their current content and model."""
+    return [
+        i for i, entry in enumerate(entries)
+        if entry.embedding is None
+        or entry.embedding_key != embedding_key(model_name, entry.content)
+    ]
+
+
+def attach_embedding(entry, model_name: str, vector: np.ndarray) -> None:
+    """Store a normalized embedding on a PlaybookEntry."""
+    entry.embedding = vector.tolist()
+    entry.embedding_key = embedding_key(model_name, entry.content)
+
@@ -8,7 +8,8 @@ Implements the ACE (Agentic Context Engineering) framework:
 
 Key Features:
 - Middleware pattern: Wraps existing nodes without modifying core logic
-- Async reflection: Doesn't block user responses
+- Async reflection: Doesn't block user responses (bounded worker pool,
+  per-agent serialization, batched traces, sampling)
 - Per-agent configuration: Enable/disable ACE for specific agents
 - Osmosis two-pass workflow: +284% accuracy improvement
 
@@ -22,10 +23,11 @@ Usage:
     wrapped_researcher = middleware.wrap_node(researcher_node, "researcher")
 """
 
-from typing import Callable, Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional
 from datetime import datetime
 import logging
 import asyncio
+import random
 import traceback
 
 from langgraph.store.base import BaseStore
@@ -36,6 +38,14 @@ from ace.playbook_store import PlaybookStore
 from ace.reflector import Reflector
 from ace.curator import Curator
 from ace.osmosis_extractor import OsmosisExtractor
+from ace.reflection_queue import (
+    DEFAULT_DRAIN_TIMEOUT,
+    DEFAULT_MAX_BATCH,
+    DEFAULT_MAX_PENDING,
+    DEFAULT_WORKERS,
+    ReflectionJob,
+    ReflectionQueue,
+)
 from ace.schemas import (
     PlaybookState,
     PlaybookEntry,
@@ -45,6 +55,9 @@ from ace.schemas import (
 
 logger = logging.getLogger(__name__)
 
+# Seconds background extractions wait to share one Osmosis request
+OSMOSIS_BATCH_WINDOW = 0.25
+
 
 def _get_message_role(msg: Any) -> str:
     """
@@ -127,6 +140,9 @@ class ACEMiddleware:
         store: Optional[BaseStore] = None,
         configs: Optional[Dict[str, ACEConfig]] = None,
         osmosis_mode: str = "ollama",
+        reflection_workers: int = DEFAULT_WORKERS,
+        max_pending_reflections: int = DEFAULT_MAX_PENDING,
+        reflection_batch_size: int = DEFAULT_MAX_BATCH,
     ):
         """
         Initialize ACEMiddleware.
@@ -135,12 +151,19 @@ class ACEMiddleware:
             store: LangGraph Store for playbook persistence
             configs: Per-agent ACE configurations
             osmosis_mode: "ollama" (local, free) or "api" (hosted)
+            reflection_workers: Concurrent background reflection batches
+            max_pending_reflections: Queued execution traces before shedding
+            reflection_batch_size: Execution traces per reflection call
         """
         # Initialize store
         self.store = store or InMemoryStore()
 
-        # Initialize Osmosis (shared across all components)
-        self.osmosis = OsmosisExtractor(mode=osmosis_mode)
+        # Initialize Osmosis (shared across all components). Reflection workers
+        # extract concurrently, so their requests are micro-batched.
+        self.osmosis = OsmosisExtractor(
+            mode=osmosis_mode,
+            batch_window=OSMOSIS_BATCH_WINDOW,
+        )
 
         # Initialize PlaybookStore
         self.playbook_store = PlaybookStore(self.store)
@@ -155,6 +178,14 @@ class ACEMiddleware:
         # Execution tracking
         self.execution_count = 0
 
+        # Background reflection (bounded, serialized per agent)
+        self.reflection_queue = ReflectionQueue(
+            self._reflect_and_update,
+            workers=reflection_workers,
+            max_pending=max_pending_reflections,
+            max_batch=reflection_batch_size,
+        )
+
         logger.info(
             f"Initialized ACEMiddleware with {len(self.configs)} agent configs "
             f"(osmosis_mode={osmosis_mode})"
@@ -253,29 +284,32 @@ class ACEMiddleware:
 
                 # === POST-EXECUTION: Async Reflection + Curation ===
                 if config.reflection_mode in ["automatic", "observe"]:
-                    # Build execution trace
-                    execution_trace = self._build_execution_trace(
-                        enhanced_state,
-                        result_state,
-                        execution_success,
-                        execution_error,
-                        duration,
-                    )
+                    if random.random() >= config.reflection_sample_rate:
+                        self.reflection_queue.record_sampled_out()
+                    else:
+                        # Build execution trace
+                        execution_trace = self._build_execution_trace(
+                            enhanced_state,
+                            result_state,
+                            execution_success,
+                            execution_error,
+                            duration,
+                        )
 
-                    # Trigger async reflection (non-blocking)
-                    asyncio.create_task(
-                        self._reflect_and_update(
-                            execution_trace,
-                            execution_id,
-                            agent_type,
-                            config,
+                        # Queue for background reflection (non-blocking)
+                        queued = self.reflection_queue.submit(
+                            ReflectionJob(
+                                agent_type=agent_type,
+                                execution_id=execution_id,
+                                execution_trace=execution_trace,
+                                config=config,
+                            )
                         )
-                    )
 
-                    logger.debug(
-                        f"[{execution_id}] Triggered async reflection "
-                        f"(mode={config.reflection_mode})"
-                    )
+                        logger.debug(
+                            f"[{execution_id}] Queued async reflection "
+                            f"(mode={config.reflection_mode}, queued={queued})"
+                        )
 
             return result_state
 
@@ -292,6 +326,8 @@ class ACEMiddleware:
         Inject playbook into state's system prompt.
 
         Modifies the system message to include formatted playbook entries.
+        If the node builds its own system message (the first message is not a
+        SystemMessage), the section is passed as state["ace_playbook"] instead.
         Does NOT modify the state directly - returns enhanced copy.
 
         Args:
@@ -317,31 +353,18 @@ class ACEMiddleware:
 
         # Find system message
         messages = enhanced_state.get("messages", [])
-        if not messages:
-            logger.debug(f"No messages in state for {agent_type} - skipping injection")
-            return state
 
         # Get first message - check if it's a SystemMessage
-        first_message = messages[0]
+        first_message = messages[0] if messages else None
 
         # Check if first message is a SystemMessage
         from langchain_core.messages import SystemMessage
         is_system_message = isinstance(first_message, SystemMessage)
 
-        if not is_system_message:
-            # First message is not a SystemMessage (e.g., it's a HumanMessage)
-            # This happens on first execution before the node creates the SystemMessage
-            # Skip injection - the node will create its own SystemMessage
-            logger.debug(
-                f"First message is not SystemMessage for {agent_type} "
-                f"(type: {type(first_message).__name__}) - skipping injection. "
-                f"ACE will activate on subsequent executions."
-            )
+        if not formatted_playbook:
             return state
 
-        # Inject playbook section
-        if formatted_playbook:
-            playbook_section = f"""
+        playbook_section = f"""
 ═══════════════════════════════════════════════════════════════════════════
 ACE PLAYBOOK (Learnings from Previous Executions)
 ═══════════════════════════════════════════════════════════════════════════
@@ -351,25 +374,38 @@ ACE PLAYBOOK (Learnings from Previous Executions)
 Use these learnings to inform your approach on this task.
 ═══════════════════════════════════════════════════════════════════════════
 """
-            # Append to system message content
-            if hasattr(first_message, 'content'):
-                # LangChain Message object
-                original_content = first_message.content
-                enhanced_content = original_content + "\n" + playbook_section
 
-                # Create new message with enhanced content
-                enhanced_message = SystemMessage(content=enhanced_content)
+        if not is_system_message:
+            # First message is not a SystemMessage (e.g., it's a HumanMessage,
+            # or a fresh subagent branch with no messages yet):
+            # the node builds its own SystemMessage (prompts.assembly) and puts
+            # the playbook in the prompt's dynamic tail, after the cached prefix
+            enhanced_state["ace_playbook"] = playbook_section
+            logger.debug(
+                f"First message is not SystemMessage for {agent_type} "
+                f"(type: {type(first_message).__name__}) - passing playbook as ace_playbook"
+            )
+            return enhanced_state
+
+        # Append to system message content
+        if hasattr(first_message, 'content'):
+            # LangChain Message object
+            original_content = first_message.content
+            if isinstance(original_content, list):
+                # Content blocks (cached prefix): append as a separate block
+                enhanced_content = original_content + [{"type": "text", "text": playbook_section}]
+            else:
+                enhanced_content = original_content + "\n" + playbook_section
 
-                # Replace first message
-                enhanced_state["messages"] = [enhanced_message] + messages[1:]
-                logger.debug(
-                    f"Injected {len(playbook['entries'])} playbook entries "
-                    f"into SystemMessage for {agent_type}"
-                )
+            # Create new message with enhanced content
+            enhanced_message = SystemMessage(content=enhanced_content)
 
-            elif isinstance(first_message, dict):
-                # Dict message
-                first_message["content"] += "\n" + playbook_section
+            # Replace first message
+            enhanced_state["messages"] = [enhanced_message] + messages[1:]
+            logger.debug(
+                f"Injected {len(playbook['entries'])} playbook entries "
+                f"into SystemMessage for {agent_type}"
+            )
 
         return enhanced_state
 
@@ -447,32 +483,32 @@ Use these learnings to inform your approach on this task.
 
     async def _reflect_and_update(
         self,
-        execution_trace: Dict[str, Any],
-        execution_id: str,
         agent_type: str,
-        config: ACEConfig,
+        jobs: List[ReflectionJob],
     ):
         """
-        Background reflection and playbook update.
+        Background reflection and playbook update for a batch of executions.
 
-        Runs asynchronously without blocking user responses.
+        Called by the reflection queue; batches for the same agent never run
+        concurrently, so the playbook read-modify-save below cannot race.
 
         Args:
-            execution_trace: Execution data
-            execution_id: Unique execution ID
             agent_type: Agent type
-            config: ACE configuration
+            jobs: Queued executions of that agent (oldest first)
         """
+        # Latest config wins (modes can change at runtime)
+        config = jobs[-1].config
+        execution_id = jobs[-1].execution_id
+
         try:
-            logger.info(f"[{execution_id}] Starting async reflection...")
+            logger.info(f"[{execution_id}] Starting async reflection ({len(jobs)} execution(s))...")
 
             # Get current playbook
             playbook = await self.playbook_store.get_playbook(agent_type)
 
-            # STEP 1: Reflection (two-pass: Claude → Osmosis)
-            insights = await self.reflector.analyze(
-                execution_trace=execution_trace,
-                execution_id=execution_id,
+            # STEP 1: Reflection (two-pass: Claude → Osmosis), one call per batch
+            insights = await self.reflector.analyze_batch(
+                executions=[(job.execution_id, job.execution_trace) for job in jobs],
                 agent_type=agent_type,
                 current_playbook=playbook["entries"],
             )
@@ -511,8 +547,8 @@ Use these learnings to inform your approach on this task.
                     # Reload pruned playbook
                     updated_playbook = await self.playbook_store.get_playbook(agent_type)
 
-                # STEP 5: Save updated playbook
-                updated_playbook["total_executions"] += 1
+                # STEP 5: Save updated playbook (every execution in the batch counts)
+                updated_playbook["total_executions"] += len(jobs)
                 await self.playbook_store.save_playbook(updated_playbook)
 
                 logger.info(
@@ -533,6 +569,21 @@ Use these learnings to inform your approach on this task.
                 f"[{execution_id}] Async reflection failed: {e}\n"
                 f"{traceback.format_exc()}"
             )
+            # Counted as failed by the reflection queue
+            raise
+
+    async def shutdown(self, timeout: float = DEFAULT_DRAIN_TIMEOUT) -> bool:
+        """
+        Finish queued reflections and stop the worker pool.
+
+        Returns:
+            True if the queue drained within timeout
+        """
+        return await self.reflection_queue.drain(timeout=timeout)
+
+    def get_reflection_stats(self) -> dict:
+        """Return reflection queue counters (submitted, sampled_out, dropped, shed, ...)."""
+        return self.reflection_queue.get_stats()
 
     def _apply_delta(
         self,
@@ -559,8 +610,11 @@ Use these learnings to inform your approach on this task.
 
         # UPDATE operations
         for update_op in delta.update:
-            for entry in entries:
+            for index, entry in enumerate(entries):
                 if entry.id == update_op.entry_id:
+                    # Copy first: entries are shared with PlaybookStore's cache
+                    entry = entries[index] = entry.model_copy(deep=True)
+
                     # Apply updates
                     for key, value in update_op.updates.items():
                         if key == "helpful_count" and value.startswith("+"):
@@ -633,8 +687,8 @@ async def example():
     print(f"\n✓ Execution complete")
     print(f"Messages: {len(result['messages'])}")
 
-    # Wait for async reflection
-    await asyncio.sleep(3)
+    # Wait for queued reflection
+    await middleware.shutdown()
 
     # Check playbook
     playbook = await middleware.playbook_store.get_playbook("researcher")
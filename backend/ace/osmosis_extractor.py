@@ -7,11 +7,16 @@ Enables two-pass workflow:
 
 Proven: +284% accuracy improvement on complex reasoning tasks (AIME benchmark).
 
-Supports both local (Ollama) and API (Inference.net) deployments.
+Supports both local (Ollama) and API (Inference.net) deployments. All backends
+are awaited on the event loop (ollama.AsyncClient / httpx.AsyncClient), JSON
+schemas are computed once per model class, and an optional micro-batching mode
+combines concurrent extractions of the same schema into one request.
 """
 
-from typing import Type, TypeVar, Optional, Dict, Any
-from pydantic import BaseModel
+from typing import Type, TypeVar, Optional, Dict, Any, List, Set, Tuple
+from functools import lru_cache
+from pydantic import BaseModel, create_model
+import asyncio
 import httpx
 import json
 from datetime import datetime
@@ -24,12 +29,32 @@ T = TypeVar('T', bound=BaseModel)
 
 # Check if ollama library is available
 try:
-    from ollama import chat as ollama_chat
+    from ollama import AsyncClient as OllamaAsyncClient
     OLLAMA_AVAILABLE = True
 except ImportError:
     OLLAMA_AVAILABLE = False
     logger.warning("ollama library not installed. Install with: pip install ollama")
 
+# Micro-batching defaults (off unless batch_window is set)
+DEFAULT_MAX_BATCH_SIZE = 4
+
+
+@lru_cache(maxsize=None)
+def get_schema_info(schema: Type[BaseModel]) -> dict:
+    """
+    JSON schema of a model class, computed once per class.
+
+    Returns:
+        JSON schema dict. Treat as read-only.
+    """
+    return schema.model_json_schema()
+
+
+@lru_cache(maxsize=None)
+def get_batch_schema(schema: Type[BaseModel]) -> Type[BaseModel]:
+    """Wrapper model holding one schema instance per batched text, in order."""
+    return create_model(f"{schema.__name__}Batch", items=(List[schema], ...))
+
 
 class OsmosisExtractor:
     """
@@ -56,6 +81,8 @@ class OsmosisExtractor:
         model_name: str = "Osmosis/Osmosis-Structure-0.6B",
         timeout: int = 30,
         enable_fallback: bool = True,
+        batch_window: Optional[float] = None,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
     ):
         """
         Initialize Osmosis extractor.
@@ -67,6 +94,9 @@ class OsmosisExtractor:
             model_name: Osmosis model name
             timeout: Request timeout in seconds
             enable_fallback: Enable fallback to direct Pydantic parsing if Osmosis fails
+            batch_window: Seconds to collect concurrent extractions of the same
+                          schema into one request (None disables batching)
+            max_batch_size: Texts per batched request (flushes early when reached)
         """
         self.mode = mode
         self.api_key = api_key or os.getenv("OSMOSIS_API_KEY")
@@ -85,6 +115,17 @@ class OsmosisExtractor:
         )
 
         self.client = httpx.AsyncClient(timeout=timeout)
+        self._ollama_client = OllamaAsyncClient(timeout=timeout) if OLLAMA_AVAILABLE else None
+
+        # Micro-batching state: schema -> [(text, future)]
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self._batches: Dict[type, List[Tuple[str, asyncio.Future]]] = {}
+        self._batch_timers: Dict[type, asyncio.TimerHandle] = {}
+        self._batch_tasks: Set[asyncio.Task] = set()
+
+        # Default prompts per schema class (built from the cached JSON schema)
+        self._default_prompts: Dict[type, str] = {}
 
         logger.info(
             f"Initialized OsmosisExtractor in {mode} mode "
@@ -104,6 +145,9 @@ class OsmosisExtractor:
         1. LLM generated 'text' (free reasoning, no constraints)
         2. Osmosis extracts valid Pydantic model from text
 
+        With batch_window set (and no custom extraction_prompt), the call may
+        share one request with concurrent extractions of the same schema.
+
         Args:
             text: Free-form text from LLM (Claude analysis)
             schema: Target Pydantic model class
@@ -115,14 +159,27 @@ class OsmosisExtractor:
         Raises:
             ValueError: If extraction fails and fallback disabled
         """
-        logger.debug(f"Extracting {schema.__name__} from {len(text)} chars of text")
+        if self.batch_window and extraction_prompt is None:
+            return await self._extract_batched(text, schema)
+        return await self._extract_single(text, schema, extraction_prompt)
 
-        # Convert Pydantic model to JSON schema
-        json_schema = schema.model_json_schema()
+    async def _extract_single(
+        self,
+        text: str,
+        schema: Type[T],
+        extraction_prompt: Optional[str] = None,
+        allow_fallback: bool = True,
+    ) -> T:
+        """Extract one schema instance with one backend request."""
+        logger.debug(f"Extracting {schema.__name__} from {len(text)} chars of text")
 
         # Build extraction prompt
         if extraction_prompt is None:
-            extraction_prompt = self._build_default_prompt(json_schema, schema.__name__)
+            extraction_prompt = self._default_prompts.get(schema)
+            if extraction_prompt is None:
+                json_schema = get_schema_info(schema)
+                extraction_prompt = self._build_default_prompt(json_schema, schema.__name__)
+                self._default_prompts[schema] = extraction_prompt
 
         # Route to appropriate backend
         try:
@@ -141,15 +198,93 @@ class OsmosisExtractor:
         except Exception as e:
             logger.warning(f"Osmosis extraction failed: {e}")
 
-            if self.enable_fallback:
+            if self.enable_fallback and allow_fallback:
                 logger.info("Attempting fallback to direct Pydantic parsing")
                 return await self._fallback_parse(text, schema)
             else:
                 raise ValueError(f"Osmosis extraction failed: {e}")
 
+    async def _extract_batched(self, text: str, schema: Type[T]) -> T:
+        """
+        Queue text for a combined request with other pending texts of the same schema.
+
+        The batch is sent after batch_window seconds, or as soon as
+        max_batch_size texts are pending.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        pending = self._batches.setdefault(schema, [])
+        pending.append((text, future))
+        if len(pending) >= self.max_batch_size:
+            self._flush_batch(schema)
+        elif len(pending) == 1:
+            self._batch_timers[schema] = loop.call_later(
+                self.batch_window, self._flush_batch, schema
+            )
+
+        return await future
+
+    def _flush_batch(self, schema: type) -> None:
+        """Send the pending batch for schema (timer callback or size trigger)."""
+        timer = self._batch_timers.pop(schema, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._batches.pop(schema, None)
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._run_batch(schema, batch))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, schema: Type[T], batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Extract a batch in one request; fall back to one request per text."""
+        if len(batch) > 1:
+            try:
+                combined = await self._extract_single(
+                    self._build_batch_text([text for text, _ in batch], schema.__name__),
+                    get_batch_schema(schema),
+                    allow_fallback=False,
+                )
+                if len(combined.items) != len(batch):
+                    raise ValueError(
+                        f"expected {len(batch)} items, got {len(combined.items)}"
+                    )
+                logger.info(f"✓ Batched extraction of {len(batch)} {schema.__name__} objects")
+                for (_, future), item in zip(batch, combined.items):
+                    if not future.done():
+                        future.set_result(item)
+                return
+            except Exception as e:
+                logger.warning(f"Batched extraction failed ({e}) - extracting individually")
+
+        results = await asyncio.gather(
+            *(self._extract_single(text, schema) for text, _ in batch),
+            return_exceptions=True,
+        )
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    @staticmethod
+    def _build_batch_text(texts: List[str], schema_name: str) -> str:
+        """Combine texts into one input, asking for one item per text in order."""
+        sections = "\n\n".join(
+            f"### TEXT {i}\n{text}" for i, text in enumerate(texts, 1)
+        )
+        return (
+            f"The following {len(texts)} texts are independent inputs. "
+            f"Extract exactly one {schema_name} per text, in the same order, "
+            f"into the \"items\" list.\n\n{sections}"
+        )
+
     def _build_default_prompt(self, json_schema: dict, schema_name: str) -> str:
         """Build default extraction prompt from JSON schema."""
-        schema_str = json.dumps(json_schema, indent=2)
+        schema_str = json.dumps(json_schema, indent=2)  # Prompt is cached per schema class
 
         return f"""Extract structured information from the text and format it according to this JSON schema for {schema_name}:
 
@@ -165,21 +300,22 @@ Instructions:
 Output ONLY valid JSON matching the schema. No additional text or explanation."""
 
     async def _extract_ollama(self, text: str, extraction_prompt: str, schema: Type[T]) -> dict:
-        """Extract using local Ollama deployment with ollama library."""
+        """Extract using local Ollama deployment (awaited - never blocks the event loop)."""
         if not OLLAMA_AVAILABLE:
             raise ValueError(
                 "ollama library not installed. Install with: pip install ollama"
             )
 
+        content = ""
         try:
             logger.debug(f"Calling Ollama with model {self.model_name}")
 
-            # Get JSON schema for the format parameter
-            json_schema = schema.model_json_schema()
+            # Cached JSON schema for the format parameter
+            json_schema = get_schema_info(schema)
 
-            # Use ollama.chat() with proper format parameter
+            # Use AsyncClient.chat() with proper format parameter
             # This ensures Osmosis returns valid JSON matching the schema
-            response = ollama_chat(
+            response = await self._ollama_client.chat(
                 messages=[
                     {
                         "role": "system",
@@ -318,7 +454,7 @@ Text to extract from:
 
 Extract all relevant information accurately."""
 
-            result = structured_llm.invoke(extraction_prompt)
+            result = await structured_llm.ainvoke(extraction_prompt)
             logger.info(f"✓ Claude fallback succeeded for {schema.__name__}")
             return result
 
@@ -326,8 +462,14 @@ Extract all relevant information accurately."""
             raise ValueError(f"Fallback extraction failed: {e}")
 
     async def close(self):
-        """Close HTTP client."""
+        """Send pending batches, then close HTTP clients."""
+        for schema in list(self._batches):
+            self._flush_batch(schema)
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
         await self.client.aclose()
+        if self._ollama_client is not None:
+            await self._ollama_client.close()
 
 
 # Example usage
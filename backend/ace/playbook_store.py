@@ -5,10 +5,13 @@ Handles CRUD operations for agent playbooks with namespace management.
 Integrates with Osmosis for schema validation and integrity.
 
 Each agent (supervisor, researcher, data_scientist, expert_analyst, writer, reviewer)
-has its own playbook namespace with versioned entries.
+has its own playbook namespace holding a single "latest" key, plus a separate
+history namespace with one key per version. Reads go through an in-process
+cache, so playbook injection costs one dict copy regardless of history length.
 """
 
-from typing import Optional, List, Dict, Any
+import time
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 from langgraph.store.base import BaseStore
 from langgraph.store.memory import InMemoryStore
@@ -27,21 +30,40 @@ class PlaybookStore:
     Manages playbooks for all 6 agents with versioning and namespace isolation.
 
     Namespace structure:
-        ("ace", "playbooks", "{agent_type}")
+        ("ace", "playbooks", "{agent_type}")         # key "latest": current version
+        ("ace", "playbook_history", "{agent_type}")  # keys "v{n}": every saved version
 
     Example:
         ("ace", "playbooks", "researcher")  # Researcher's playbook
         ("ace", "playbooks", "supervisor")  # Supervisor's playbook
+
+    get_playbook() is served from an in-process cache. save_playbook() writes
+    through and replaces the cached copy only with a newer version; set
+    revalidate_seconds when other processes write to the same store to
+    re-read the "latest" key (one get) after that interval.
     """
 
-    def __init__(self, store: Optional[BaseStore] = None):
+    LATEST_KEY = "latest"
+    HISTORY_PAGE_SIZE = 100
+
+    def __init__(
+        self,
+        store: Optional[BaseStore] = None,
+        revalidate_seconds: Optional[float] = None,
+    ):
         """
         Initialize PlaybookStore.
 
         Args:
             store: LangGraph Store instance (defaults to InMemoryStore for testing)
+            revalidate_seconds: Re-read the latest key after this many seconds
+                                (None: trust the cache until this process saves)
         """
         self.store = store or InMemoryStore()
+        self.revalidate_seconds = revalidate_seconds
+
+        # agent_type -> (loaded_at monotonic, playbook snapshot)
+        self._cache: Dict[str, Tuple[float, PlaybookState]] = {}
 
         # Agent types (6 agents)
         self.agent_types = [
@@ -74,6 +96,63 @@ class PlaybookStore:
 
         return ("ace", "playbooks", agent_type)
 
+    def _get_history_namespace(self, agent_type: str) -> tuple:
+        """Namespace holding every saved version (read only by history queries)."""
+        self._get_namespace(agent_type)
+        return ("ace", "playbook_history", agent_type)
+
+    @staticmethod
+    def _snapshot(playbook: PlaybookState) -> PlaybookState:
+        """Copy with its own entries list, so callers can mutate the result freely."""
+        return PlaybookState(**{**playbook, "entries": list(playbook["entries"])})
+
+    async def _search_all(self, namespace: tuple) -> list:
+        """Page through every item in a namespace (asearch is limited per call)."""
+        items = []
+        while True:
+            page = await self.store.asearch(
+                namespace, limit=self.HISTORY_PAGE_SIZE, offset=len(items)
+            )
+            items.extend(page)
+            if len(page) < self.HISTORY_PAGE_SIZE:
+                return items
+
+    def _cache_put(self, agent_type: str, playbook: PlaybookState) -> None:
+        """Cache a snapshot unless a newer version is already cached."""
+        cached = self._cache.get(agent_type)
+        if cached is None or playbook["version"] >= cached[1]["version"]:
+            self._cache[agent_type] = (time.monotonic(), self._snapshot(playbook))
+
+    def invalidate(self, agent_type: Optional[str] = None) -> None:
+        """Drop cached playbooks (one agent, or all)."""
+        if agent_type is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(agent_type, None)
+
+    async def _load_latest(self, agent_type: str) -> Optional[PlaybookState]:
+        """Read the latest key, migrating the old one-key-per-version layout once."""
+        namespace = self._get_namespace(agent_type)
+
+        item = await self.store.aget(namespace, self.LATEST_KEY)
+        if item is not None:
+            return PlaybookState(**item.value)
+
+        # Legacy layout: v{n} keys directly in the playbook namespace
+        legacy = [i for i in await self._search_all(namespace) if i.key != self.LATEST_KEY]
+        if not legacy:
+            return None
+
+        history_namespace = self._get_history_namespace(agent_type)
+        for legacy_item in legacy:
+            await self.store.aput(history_namespace, legacy_item.key, legacy_item.value)
+        latest_item = max(legacy, key=lambda x: x.value.get("version", 0))
+        await self.store.aput(namespace, self.LATEST_KEY, latest_item.value)
+        for legacy_item in legacy:
+            await self.store.adelete(namespace, legacy_item.key)
+
+        return PlaybookState(**latest_item.value)
+
     async def get_playbook(self, agent_type: str) -> PlaybookState:
         """
         Retrieve playbook for agent.
@@ -84,23 +163,31 @@ class PlaybookStore:
             agent_type: Agent type (supervisor, researcher, etc.)
 
         Returns:
-            PlaybookState for the agent
+            PlaybookState for the agent (a copy - safe to modify and save)
         """
-        namespace = self._get_namespace(agent_type)
+        self._get_namespace(agent_type)
 
-        # Search for playbook versions
-        items = await self.store.asearch(namespace)
+        cached = self._cache.get(agent_type)
+        if cached is not None:
+            loaded_at, playbook = cached
+            if (
+                self.revalidate_seconds is None
+                or time.monotonic() - loaded_at < self.revalidate_seconds
+            ):
+                return self._snapshot(playbook)
 
-        if not items:
-            # No playbook exists - create initial
-            return create_initial_playbook(agent_type)
+        playbook = await self._load_latest(agent_type)
 
-        # Get latest version
-        latest_item = max(items, key=lambda x: x.value.get("version", 0))
-        playbook_data = latest_item.value
+        if playbook is None:
+            # No playbook exists - create initial (not cached, nothing to invalidate)
+            return create_initial_playbook(agent_type)
 
-        # Validate and return as PlaybookState
-        return PlaybookState(**playbook_data)
+        if cached is not None and cached[1]["version"] == playbook["version"]:
+            # Revalidated: unchanged
+            self._cache[agent_type] = (time.monotonic(), cached[1])
+        else:
+            self._cache[agent_type] = (time.monotonic(), self._snapshot(playbook))
+        return self._snapshot(playbook)
 
     async def save_playbook(self, playbook: PlaybookState) -> None:
         """
@@ -120,14 +207,22 @@ class PlaybookStore:
 
         # Generate version key
         version_key = f"v{playbook['version']}"
+        snapshot = self._snapshot(playbook)
 
-        # Save to store
+        # Append to history, then move the latest pointer
         await self.store.aput(
-            namespace=namespace,
+            namespace=self._get_history_namespace(agent_type),
             key=version_key,
-            value=dict(playbook),
+            value=dict(snapshot),
+        )
+        await self.store.aput(
+            namespace=namespace,
+            key=self.LATEST_KEY,
+            value=dict(snapshot),
         )
 
+        self._cache_put(agent_type, snapshot)
+
     async def get_playbook_history(
         self,
         agent_type: str,
@@ -143,10 +238,11 @@ class PlaybookStore:
         Returns:
             List of PlaybookState versions (newest first)
         """
-        namespace = self._get_namespace(agent_type)
+        # Migrate a legacy layout before reading history
+        await self._load_latest(agent_type)
 
         # Get all versions
-        items = await self.store.asearch(namespace)
+        items = await self._search_all(self._get_history_namespace(agent_type))
 
         if not items:
             return []
@@ -174,13 +270,14 @@ class PlaybookStore:
             agent_type: Agent type
         """
         namespace = self._get_namespace(agent_type)
+        history_namespace = self._get_history_namespace(agent_type)
 
-        # Get all versions
-        items = await self.store.asearch(namespace)
+        # Delete the latest pointer, any legacy keys, and each history version
+        for ns in (namespace, history_namespace):
+            for item in await self._search_all(ns):
+                await self.store.adelete(ns, item.key)
 
-        # Delete each version
-        for item in items:
-            await self.store.adelete(namespace, item.key)
+        self.invalidate(agent_type)
 
     async def initialize_all_playbooks(self) -> Dict[str, PlaybookState]:
         """
@@ -0,0 +1,232 @@
+"""
+ReflectionQueue: Bounded background worker pool for ACE reflection.
+
+Replaces one untracked asyncio task per node execution:
+- Fixed number of workers, so reflection LLM calls never exceed that
+  concurrency no matter how many requests are in flight
+- Per-agent serialization: at most one batch per agent runs at a time, so
+  playbook read-modify-save cycles for the same agent never interleave
+- Batching: up to max_batch pending traces of an agent go into one
+  reflection call
+- Bounded backlog: when full, the agent's oldest pending trace is shed (or
+  the new one dropped if that agent has nothing queued)
+- drain() on shutdown finishes queued work within a timeout
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_WORKERS = 2           # Concurrent reflection batches (across all agents)
+DEFAULT_MAX_PENDING = 256     # Queued traces across all agents
+DEFAULT_MAX_BATCH = 4         # Traces per reflection call
+DEFAULT_BATCH_WINDOW = 1.0    # Seconds a worker waits for a batch to fill
+DEFAULT_DRAIN_TIMEOUT = 30.0  # Seconds drain() waits for queued work
+
+
+@dataclass
+class ReflectionJob:
+    """
+    One execution trace waiting for reflection.
+
+    Attributes:
+        agent_type: Agent that executed
+        execution_id: Unique execution identifier
+        execution_trace: Trace built by ACEMiddleware
+        config: ACEConfig in effect when the node ran
+        enqueued_at: time.monotonic() at submission
+    """
+
+    agent_type: str
+    execution_id: str
+    execution_trace: Dict[str, Any]
+    config: Any
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+BatchHandler = Callable[[str, List[ReflectionJob]], Awaitable[None]]
+
+
+class ReflectionQueue:
+    """
+    Per-agent batching queue served by a fixed worker pool.
+
+    Workers are started lazily on the first submit() (the middleware is
+    created at import time, before any event loop runs). All methods must
+    be called on that loop.
+
+    Attributes:
+        workers: Worker count
+        max_pending: Bound on queued traces
+        max_batch: Traces per handler call
+        batch_window: Seconds to wait for a partial batch to fill
+    """
+
+    def __init__(
+        self,
+        handler: BatchHandler,
+        workers: int = DEFAULT_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        batch_window: float = DEFAULT_BATCH_WINDOW,
+    ):
+        """
+        Initialize an empty queue.
+
+        Args:
+            handler: Coroutine called with (agent_type, jobs) for each batch
+            workers: Worker count
+            max_pending: Bound on queued traces
+            max_batch: Traces per handler call
+            batch_window: Seconds to wait for a partial batch to fill
+        """
+        self.handler = handler
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+
+        self._pending: Dict[str, Deque[ReflectionJob]] = {}
+        self._scheduled: Set[str] = set()  # Agents queued in _ready or running
+        self._ready: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._size = 0
+        self._running = 0
+        self._accepting = True
+        self._idle: Optional[asyncio.Event] = None
+
+        self._stats = {
+            "submitted": 0,
+            "sampled_out": 0,
+            "dropped": 0,
+            "shed": 0,
+            "processed": 0,
+            "failed": 0,
+            "batches": 0,
+        }
+
+    def start(self) -> None:
+        """Start the worker pool on the running loop (idempotent)."""
+        if self._tasks:
+            return
+        loop = asyncio.get_running_loop()
+        self._ready = asyncio.Queue()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._accepting = True
+        self._tasks = [
+            loop.create_task(self._worker(i)) for i in range(self.workers)
+        ]
+        logger.info(f"[ACE] Reflection queue started ({self.workers} workers)")
+
+    def record_sampled_out(self) -> None:
+        """Count an execution skipped by the agent's sampling rate."""
+        self._stats["sampled_out"] += 1
+
+    def submit(self, job: ReflectionJob) -> bool:
+        """
+        Queue a trace for reflection (never blocks).
+
+        Returns:
+            False if the job was dropped (queue full or shutting down)
+        """
+        if not self._accepting:
+            self._stats["dropped"] += 1
+            return False
+        self.start()
+
+        backlog = self._pending.setdefault(job.agent_type, deque())
+        if self._size >= self.max_pending:
+            if not backlog:
+                self._stats["dropped"] += 1
+                logger.warning(f"[ACE] Reflection queue full - dropped {job.execution_id}")
+                return False
+            # Newer traces are more relevant: shed this agent's oldest
+            shed = backlog.popleft()
+            self._size -= 1
+            self._stats["shed"] += 1
+            logger.warning(f"[ACE] Reflection queue full - shed {shed.execution_id}")
+
+        backlog.append(job)
+        self._size += 1
+        self._stats["submitted"] += 1
+        self._idle.clear()
+
+        if job.agent_type not in self._scheduled:
+            self._scheduled.add(job.agent_type)
+            self._ready.put_nowait(job.agent_type)
+        return True
+
+    async def drain(self, timeout: float = DEFAULT_DRAIN_TIMEOUT) -> bool:
+        """
+        Stop accepting work, finish what is queued, then stop the workers.
+
+        Returns:
+            True if everything queued was processed within timeout
+        """
+        self._accepting = False
+        if not self._tasks:
+            return True
+
+        drained = True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            drained = False
+            self._stats["dropped"] += self._size
+            logger.warning(f"[ACE] Reflection drain timed out with {self._size} traces queued")
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._pending.clear()
+        self._scheduled.clear()
+        self._size = 0
+        return drained
+
+    async def _worker(self, worker_id: int) -> None:
+        while True:
+            agent_type = await self._ready.get()
+            backlog = self._pending[agent_type]
+
+            # Let a partial batch fill up (skipped while draining)
+            if self._accepting and self.batch_window and len(backlog) < self.max_batch:
+                await asyncio.sleep(self.batch_window)
+
+            batch = [backlog.popleft() for _ in range(min(self.max_batch, len(backlog)))]
+            self._size -= len(batch)
+            self._running += 1
+            try:
+                if batch:
+                    await self.handler(agent_type, batch)
+                    self._stats["processed"] += len(batch)
+                    self._stats["batches"] += 1
+            except Exception as e:
+                self._stats["failed"] += len(batch)
+                logger.error(f"[ACE] Reflection batch for {agent_type} failed: {e}")
+            finally:
+                self._running -= 1
+                if backlog:
+                    # More arrived meanwhile: requeue behind other agents
+                    self._ready.put_nowait(agent_type)
+                else:
+                    self._scheduled.discard(agent_type)
+                    self._pending.pop(agent_type, None)
+                if self._size == 0 and self._running == 0:
+                    self._idle.set()
+
+    def get_stats(self) -> dict:
+        """Return counters and current backlog."""
+        return {
+            **self._stats,
+            "pending": self._size,
+            "running": self._running,
+            "agents_waiting": len(self._scheduled),
+        }
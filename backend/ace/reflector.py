@@ -14,7 +14,7 @@ The reflector implements the "Reflector" role from ACE framework:
 - Iterates to refine insights (up to max_iterations)
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import logging
 
@@ -26,6 +26,48 @@ from ace.osmosis_extractor import OsmosisExtractor
 
 logger = logging.getLogger(__name__)
 
+# Task section shared by single and batched analysis prompts
+ANALYSIS_TASK = """═══════════════════════════════════════════════════════════════════════════
+ANALYSIS TASK
+═══════════════════════════════════════════════════════════════════════════
+
+Analyze this execution deeply and identify:
+
+1. **HELPFUL patterns**: What worked well? What should be repeated?
+   Examples:
+   - Effective tool usage patterns (e.g., "Using tavily_search before read_file")
+   - Good delegation strategies (e.g., "Delegating research before analysis")
+   - Successful verification approaches
+   - Clever workarounds or optimizations
+   - Proper error handling
+
+2. **HARMFUL patterns**: What went wrong? What should be avoided?
+   Examples:
+   - Tool misuse or failures
+   - Poor delegation choices (e.g., "Delegating prematurely without context")
+   - Verification gaps
+   - Wasted effort or redundancy
+   - Errors that could have been prevented
+
+3. **NEUTRAL observations**: Interesting patterns that aren't clearly good or bad
+   Examples:
+   - Timeout values that might need tuning
+   - File paths that could be standardized
+   - Patterns worth experimenting with
+
+For each insight:
+- Explain WHAT happened (specific, concrete example from this execution)
+- Explain WHY it was helpful/harmful/neutral (reasoning)
+- Suggest HOW to leverage or avoid in future (actionable recommendation)
+
+Think step by step. Be specific with examples from this execution trace.
+Focus on NON-OBVIOUS insights that would actually help improve future executions.
+Avoid generic advice like "be careful" or "do better" - be concrete and actionable.
+
+IMPORTANT: Write your analysis in natural language. Do NOT try to format as JSON.
+Focus on reasoning quality. Structure will be extracted later by a specialized model.
+"""
+
 
 def _get_message_role(msg: Any) -> str:
     """
@@ -162,6 +204,53 @@ class Reflector:
             HumanMessage(content=analysis_prompt),
         ]
 
+        return await self._analyze_prompt(messages, execution_id, agent_type)
+
+    async def analyze_batch(
+        self,
+        executions: List[Tuple[str, Dict[str, Any]]],
+        agent_type: str,
+        current_playbook: Optional[List[Any]] = None,
+    ) -> List[ReflectionInsight]:
+        """
+        Analyze several executions of one agent with a single two-pass call.
+
+        Args:
+            executions: (execution_id, execution_trace) pairs, oldest first
+            agent_type: Agent that executed
+            current_playbook: Optional current playbook entries for context
+
+        Returns:
+            List of structured reflection insights (execution_id lists every
+            execution in the batch, comma-separated)
+        """
+        if len(executions) == 1:
+            execution_id, execution_trace = executions[0]
+            return await self.analyze(execution_trace, execution_id, agent_type, current_playbook)
+
+        execution_ids = [execution_id for execution_id, _ in executions]
+        logger.info(f"Analyzing {len(executions)} executions for {agent_type} in one batch")
+
+        analysis_prompt = self._build_batch_analysis_prompt(
+            [trace for _, trace in executions],
+            agent_type,
+            current_playbook,
+        )
+
+        messages = [
+            SystemMessage(content=self._get_system_prompt()),
+            HumanMessage(content=analysis_prompt),
+        ]
+
+        return await self._analyze_prompt(messages, ",".join(execution_ids), agent_type)
+
+    async def _analyze_prompt(
+        self,
+        messages: List[Any],
+        execution_id: str,
+        agent_type: str,
+    ) -> List[ReflectionInsight]:
+        """Run Pass 1 (Claude) and Pass 2 (Osmosis) for a built analysis prompt."""
         logger.debug("Pass 1: Claude analyzing execution...")
         response = await self.llm.ainvoke(messages)
         analysis_text = response.content
@@ -210,83 +299,69 @@ Focus purely on reasoning quality. Structure will be extracted later."""
         current_playbook: Optional[List[Any]] = None,
     ) -> str:
         """Build prompt for Claude's free-form analysis (Pass 1)."""
-
-        # Extract key execution elements
-        messages = execution_trace.get("messages", [])
-        tool_calls = execution_trace.get("tool_calls", [])
-        errors = execution_trace.get("errors", [])
-        final_result = execution_trace.get("final_result", "")
-        duration_seconds = execution_trace.get("duration_seconds", 0)
-
-        # Build playbook context (if available)
-        playbook_context = ""
-        if current_playbook:
-            playbook_context = "\nCURRENT PLAYBOOK (existing learnings):\n"
-            for i, entry in enumerate(current_playbook[:10], 1):
-                content = entry.get("content", entry) if isinstance(entry, dict) else str(entry)
-                playbook_context += f"{i}. {content[:150]}\n"
-            playbook_context += "\nAvoid generating insights that duplicate existing playbook entries.\n"
-
         prompt = f"""You are analyzing an execution by the {agent_type} agent to extract insights about what worked well and what didn't.
 
 EXECUTION TRACE:
-{playbook_context}
+{self._format_playbook_context(current_playbook)}
 Agent Type: {agent_type}
-Duration: {duration_seconds:.2f}s
+{self._format_execution(execution_trace)}
 
-Messages exchanged:
-{self._format_messages(messages)}
+{ANALYSIS_TASK}"""
+        return prompt
 
-Tool calls made:
-{self._format_tool_calls(tool_calls)}
+    def _build_batch_analysis_prompt(
+        self,
+        execution_traces: List[Dict[str, Any]],
+        agent_type: str,
+        current_playbook: Optional[List[Any]] = None,
+    ) -> str:
+        """Build one Pass 1 prompt covering several executions of the same agent."""
+        sections = "\n\n".join(
+            f"--- EXECUTION {i} of {len(execution_traces)} ---\n{self._format_execution(trace)}"
+            for i, trace in enumerate(execution_traces, 1)
+        )
 
-Errors encountered:
-{self._format_errors(errors)}
+        return f"""You are analyzing {len(execution_traces)} recent executions by the {agent_type} agent to extract insights about what worked well and what didn't.
+Prefer patterns that recur across executions; cite which execution each example comes from.
 
-Final result:
-{final_result[:500] if final_result else "None"}
+EXECUTION TRACES:
+{self._format_playbook_context(current_playbook)}
+Agent Type: {agent_type}
 
-═══════════════════════════════════════════════════════════════════════════
-ANALYSIS TASK
-═══════════════════════════════════════════════════════════════════════════
+{sections}
 
-Analyze this execution deeply and identify:
+{ANALYSIS_TASK}"""
 
-1. **HELPFUL patterns**: What worked well? What should be repeated?
-   Examples:
-   - Effective tool usage patterns (e.g., "Using tavily_search before read_file")
-   - Good delegation strategies (e.g., "Delegating research before analysis")
-   - Successful verification approaches
-   - Clever workarounds or optimizations
-   - Proper error handling
+    def _format_playbook_context(self, current_playbook: Optional[List[Any]]) -> str:
+        """Existing entries shown so the analysis avoids duplicates."""
+        if not current_playbook:
+            return ""
 
-2. **HARMFUL patterns**: What went wrong? What should be avoided?
-   Examples:
-   - Tool misuse or failures
-   - Poor delegation choices (e.g., "Delegating prematurely without context")
-   - Verification gaps
-   - Wasted effort or redundancy
-   - Errors that could have been prevented
+        playbook_context = "\nCURRENT PLAYBOOK (existing learnings):\n"
+        for i, entry in enumerate(current_playbook[:10], 1):
+            content = entry.get("content", entry) if isinstance(entry, dict) else str(entry)
+            playbook_context += f"{i}. {content[:150]}\n"
+        playbook_context += "\nAvoid generating insights that duplicate existing playbook entries.\n"
+        return playbook_context
 
-3. **NEUTRAL observations**: Interesting patterns that aren't clearly good or bad
-   Examples:
-   - Timeout values that might need tuning
-   - File paths that could be standardized
-   - Patterns worth experimenting with
+    def _format_execution(self, execution_trace: Dict[str, Any]) -> str:
+        """Format one execution trace (duration, messages, tools, errors, result)."""
+        final_result = execution_trace.get("final_result", "")
+        duration_seconds = execution_trace.get("duration_seconds", 0)
 
-For each insight:
-- Explain WHAT happened (specific, concrete example from this execution)
-- Explain WHY it was helpful/harmful/neutral (reasoning)
-- Suggest HOW to leverage or avoid in future (actionable recommendation)
+        return f"""Duration: {duration_seconds:.2f}s
 
-Think step by step. Be specific with examples from this execution trace.
-Focus on NON-OBVIOUS insights that would actually help improve future executions.
-Avoid generic advice like "be careful" or "do better" - be concrete and actionable.
+Messages exchanged:
+{self._format_messages(execution_trace.get("messages", []))}
 
-IMPORTANT: Write your analysis in natural language. Do NOT try to format as JSON.
-Focus on reasoning quality. Structure will be extracted later by a specialized model.
-"""
-        return prompt
+Tool calls made:
+{self._format_tool_calls(execution_trace.get("tool_calls", []))}
+
+Errors encountered:
+{self._format_errors(execution_trace.get("errors", []))}
+
+Final result:
+{final_result[:500] if final_result else "None"}"""
 
     def _format_messages(self, messages: List[Any]) -> str:
         """Format messages for analysis prompt."""
@@ -11,6 +11,7 @@ Defines the data structures for Agentic Context Engineering (ACE):
 from typing import Literal, Optional, List, Dict, Any
 from datetime import datetime
 from pydantic import BaseModel, Field
+from pydantic.json_schema import SkipJsonSchema
 from typing_extensions import TypedDict
 
 
@@ -37,6 +38,8 @@ class PlaybookEntry(BaseModel):
         source_executions: Execution IDs that contributed to this insight
         tags: Categorization tags for filtering
         metadata: Additional context
+        embedding: Normalized content embedding (set by Curator, hidden from extraction schemas)
+        embedding_key: Hash of (embedding model, content) the embedding was computed from
     """
     id: str = Field(..., description="Unique identifier (UUID)")
     content: str = Field(..., min_length=10, description="The insight/strategy text")
@@ -55,6 +58,8 @@ class PlaybookEntry(BaseModel):
     )
     tags: List[str] = Field(default_factory=list, description="Categorization tags")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Extra context")
+    embedding: SkipJsonSchema[Optional[List[float]]] = Field(default=None, repr=False)
+    embedding_key: SkipJsonSchema[Optional[str]] = Field(default=None, repr=False)
 
     def update_success(self):
         """Record a successful application of this insight."""
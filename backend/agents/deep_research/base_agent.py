@@ -4,6 +4,8 @@ Orchestrates multi-agent research workflow with configurable effort levels,
 search tracking, and HITL capabilities. Adapted from LangChain DeepAgents patterns.
 """
 
+import asyncio
+import logging
 from datetime import datetime
 from typing import Literal
 from langgraph.graph import StateGraph, END
@@ -11,22 +13,39 @@ from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 from langchain_anthropic import ChatAnthropic
 from langchain_community.tools.tavily_search import TavilySearchResults
 
-from .state import ResearchState, create_initial_state, trim_action_history, ActionRecord
+from .state import ResearchState, ActionRecord, SearchResult, search_result_key
 from .effort_config import get_effort_config, should_continue_searching
+from .search_fanout import (
+    RESULTS_PER_SEARCH,
+    merge_results,
+    parse_subqueries,
+    run_searches,
+    select_subqueries,
+    subquery_count,
+)
+from .vector_store import format_chunks, get_vector_store
+
+logger = logging.getLogger(__name__)
+
+# Vector RAG retrieval budgets (chunks per sub-question, chunks per prompt)
+ANALYSIS_TOP_K = 4
+ANALYSIS_MAX_CHUNKS = 12
+WRITING_TOP_K = 3
+WRITING_MAX_CHUNKS = 24
 
 
 # Initialize LLM (using Claude Haiku 4.5 for research tasks)
 llm = ChatAnthropic(model="claude-haiku-4-5-20251001", temperature=0.7)
 
 
-def planning_node(state: ResearchState) -> ResearchState:
+def planning_node(state: ResearchState) -> dict:
     """Planning phase - create research plan and clarify query
 
     Args:
         state: Current research state
 
     Returns:
-        Updated state with plan and clarified query
+        State update with plan and clarified query
     """
     query = state["query"]
     effort_level = state["effort_level"]
@@ -68,11 +87,6 @@ Provide:
                 clarified_query = line.split(":", 1)[1].strip()
                 break
 
-    # Update state
-    state["clarified_query"] = clarified_query
-    state["phase"] = "researching"
-    state["iteration"] = 1
-
     # Record action
     action = ActionRecord(
         action_type="analyze",
@@ -82,116 +96,241 @@ Provide:
         timestamp=datetime.now(),
         metadata={"effort_level": effort_level}
     )
-    state["action_history"].append(action)
-    state["updated_at"] = datetime.now()
+
+    update = {
+        "clarified_query": clarified_query,
+        "phase": "researching",
+        "iteration": 1,
+        "action_history": [action],
+        "updated_at": datetime.now(),
+    }
 
     # If HITL enabled and not yet approved, require approval
     if state["hitl_enabled"] and not state["planning_approved"]:
-        state["approval_required"] = True
-        state["next_action"] = "Wait for user approval of research plan"
+        update["approval_required"] = True
+        update["next_action"] = "Wait for user approval of research plan"
+
+    return update
+
+
+async def expand_queries(query: str, count: int, history: list[str]) -> list[str]:
+    """Generate up to count distinct sub-queries that have not been searched yet
+
+    Args:
+        query: Research question
+        count: Number of sub-queries wanted
+        history: Queries searched in earlier iterations
+
+    Returns:
+        Queries for this iteration (falls back to the original query)
+    """
+    if count <= 1:
+        return select_subqueries(query, [], history, 1)
+
+    recent = "\n".join(f"- {q}" for q in history[-20:]) or "- (none)"
+    expansion_prompt = f"""Generate {count} distinct web search queries that together cover different aspects of this research question:
+
+Question: {query}
+
+Already searched (do not repeat):
+{recent}
+
+Return one query per line, with no numbering or commentary.
+"""
+
+    try:
+        response = await llm.ainvoke(expansion_prompt)
+        candidates = parse_subqueries(response.content)
+    except Exception:
+        # Expansion is an optimization: fall back to the original query
+        candidates = []
+
+    return select_subqueries(query, candidates, history, count)
+
+
+async def index_results(
+    session_id: str,
+    results: dict,
+    current_count: int,
+    indexed_results: dict | None = None,
+) -> int:
+    """Chunk, embed and persist new search results in the session's vector store
+
+    Args:
+        session_id: Research session identifier
+        results: New search-result store entries
+        current_count: vector_docs_count before this call
+        indexed_results: Results indexed by earlier calls, re-added when the
+            store comes back empty (stored index dropped, e.g. built with
+            another embedding model)
 
-    return state
+    Returns:
+        Chunks in the store (current_count if indexing failed)
+    """
+    try:
+        store = get_vector_store(session_id)
+        if current_count and store.size == 0 and indexed_results:
+            logger.info(f"Rebuilding vector index for session {session_id} from {len(indexed_results)} results")
+            results = {**indexed_results, **results}
+        if await store.add_results(results):
+            await asyncio.to_thread(store.save)
+        return store.size
+    except Exception as e:
+        # RAG is an enhancement: research continues without it
+        logger.warning(f"Vector indexing failed for session {session_id}: {e}")
+        return current_count
 
 
-def research_node(state: ResearchState) -> ResearchState:
+async def retrieve_evidence(state: ResearchState, questions: list[str], top_k: int, max_chunks: int) -> str | None:
+    """Retrieve and format the chunks most relevant to the given sub-questions
+
+    Args:
+        state: Current research state
+        questions: Sub-questions to retrieve for
+        top_k: Chunks per sub-question
+        max_chunks: Chunks in the prompt overall
+
+    Returns:
+        Formatted evidence, or None when vector RAG is off, empty or failing
+    """
+    if not get_effort_config(state["effort_level"]).use_vector_rag or not state["vector_docs_count"]:
+        return None
+    try:
+        chunks = await get_vector_store(state["session_id"]).search(questions, top_k, max_chunks)
+    except Exception as e:
+        logger.warning(f"Vector retrieval failed for session {state['session_id']}: {e}")
+        return None
+    return format_chunks(chunks) if chunks else None
+
+
+async def research_node(state: ResearchState) -> dict:
     """Research phase - perform searches
 
+    Expands the query into distinct sub-queries and runs them concurrently
+    (at most config.parallel_searches at a time), merging results by URL.
+
     Args:
         state: Current research state
 
     Returns:
-        Updated state with search results
+        State update with only the new search results
     """
     query = state["clarified_query"] or state["query"]
     config = get_effort_config(state["effort_level"])
 
     # Initialize Tavily search tool
     search = TavilySearchResults(
-        max_results=5,
+        max_results=RESULTS_PER_SEARCH,
         search_depth="advanced" if config.depth in ["deep", "extended", "definitive"] else "basic",
         include_answer=True,
         include_raw_content=False,
     )
 
-    # Perform search
-    try:
-        results = search.invoke({"query": query})
-
-        # Process results
-        for result in results:
-            from .state import SearchResult
-            search_result = SearchResult(
-                query=query,
-                content=result.get("content", ""),
-                url=result.get("url", ""),
-                title=result.get("title", ""),
-                score=result.get("score"),
-                timestamp=datetime.now()
-            )
-            state["search_results"].append(search_result)
-
-        # Update search count
-        state["search_count"] = len(state["search_results"])
-
-        # Track query for loop detection
-        state["query_history"].append(query)
-
-        # Record action
-        action = ActionRecord(
-            action_type="search",
-            agent_name="researcher",
-            input=query,
-            output=f"Found {len(results)} results",
-            timestamp=datetime.now(),
-            metadata={
-                "search_count": state["search_count"],
-                "min_required": config.min_searches
-            }
-        )
-        state["action_history"].append(action)
+    count = subquery_count(config, state["search_count"], state["iteration"])
+    sub_queries = await expand_queries(query, count, state["query_history"])
 
-    except Exception as e:
-        # Handle search errors gracefully
-        action = ActionRecord(
-            action_type="search",
-            agent_name="researcher",
-            input=query,
-            output=f"Search failed: {str(e)}",
-            timestamp=datetime.now(),
-            metadata={"error": True}
+    # Perform searches concurrently
+    outcomes = await run_searches(
+        sub_queries,
+        lambda q: search.ainvoke({"query": q}),
+        config.parallel_searches,
+    )
+    failures = {q: str(r) for q, r in outcomes if isinstance(r, Exception)}
+
+    # Process results (deduplicated by URL across sub-queries and iterations)
+    seen_urls = {r.url for r in state["search_results"].values()}
+    merged, duplicates = merge_results(outcomes, seen_urls)
+    new_results = {}
+    for sub_query, result in merged:
+        search_result = SearchResult(
+            query=sub_query,
+            content=result.get("content", ""),
+            url=result.get("url", ""),
+            title=result.get("title", ""),
+            score=result.get("score"),
+            timestamp=datetime.now()
+        )
+        key = search_result_key(search_result.url, search_result.content)
+        if key not in state["search_results"]:
+            new_results[key] = search_result
+    search_count = len(state["search_results"]) + len(new_results)
+
+    # Embed new results as they arrive (vector RAG levels only); earlier
+    # results are re-embedded if the session's stored index was dropped
+    vector_docs_count = state["vector_docs_count"]
+    if config.use_vector_rag and (new_results or vector_docs_count):
+        vector_docs_count = await index_results(
+            state["session_id"], new_results, vector_docs_count, state["search_results"]
         )
-        state["action_history"].append(action)
-
-    state["updated_at"] = datetime.now()
-    state["iteration"] += 1
 
-    # Trim action history to keep context manageable
-    state = trim_action_history(state, keep_recent=5)
+    # Record action
+    if len(failures) == len(sub_queries):
+        output = f"Search failed: {next(iter(failures.values()))}"
+    else:
+        output = f"Found {len(merged)} new results from {len(sub_queries) - len(failures)} searches"
+    action = ActionRecord(
+        action_type="search",
+        agent_name="researcher",
+        input=query,
+        output=output,
+        timestamp=datetime.now(),
+        metadata={
+            "search_count": search_count,
+            "min_required": config.min_searches,
+            "sub_queries": sub_queries,
+            "duplicates_dropped": duplicates,
+            "failed_queries": failures,
+            "error": len(failures) == len(sub_queries),
+        }
+    )
 
-    return state
+    # Return deltas only: the reducers merge them into the accumulated state
+    return {
+        "search_results": new_results,
+        "search_count": search_count,
+        "query_history": sub_queries,
+        "sub_queries": sub_queries,
+        "vector_docs_count": vector_docs_count,
+        "action_history": [action],
+        "iteration": state["iteration"] + 1,
+        "updated_at": datetime.now(),
+    }
 
 
-def analysis_node(state: ResearchState) -> ResearchState:
+async def analysis_node(state: ResearchState) -> dict:
     """Analysis phase - synthesize findings
 
+    With vector RAG, analyzes the chunks most relevant to the query and the
+    latest sub-queries (drawn from all results so far); otherwise the last
+    10 results.
+
     Args:
         state: Current research state
 
     Returns:
-        Updated state with analysis
+        State update with analysis
     """
-    # Get recent search results
-    recent_results = state["search_results"][-10:]  # Last 10 results
+    query = state["clarified_query"] or state["query"]
+    results_text = await retrieve_evidence(
+        state, [query, *state["sub_queries"]], ANALYSIS_TOP_K, ANALYSIS_MAX_CHUNKS
+    )
 
-    # Create analysis prompt
-    results_text = "\n\n".join([
-        f"Source: {r.title}\nURL: {r.url}\nContent: {r.content}"
-        for r in recent_results
-    ])
+    if results_text:
+        analyzed = "retrieved evidence"
+    else:
+        # Get recent search results
+        recent_results = list(state["search_results"].values())[-10:]  # Last 10 results
+        analyzed = f"{len(recent_results)} results"
+
+        # Create analysis prompt
+        results_text = "\n\n".join([
+            f"Source: {r.title}\nURL: {r.url}\nContent: {r.content}"
+            for r in recent_results
+        ])
 
     analysis_prompt = f"""Analyze the following search results and extract key findings:
 
-Query: {state['clarified_query'] or state['query']}
+Query: {query}
 
 Search Results:
 {results_text}
@@ -204,29 +343,31 @@ Provide:
 """
 
     # Get analysis
-    response = llm.invoke(analysis_prompt)
+    response = await llm.ainvoke(analysis_prompt)
     analysis = response.content
 
     # Extract essential findings (simplified)
+    essential_findings = state["essential_findings"]
     if "Key findings:" in analysis or "Key Findings:" in analysis:
         findings_section = analysis.split("Key findings:")[-1].split("\n\n")[0]
         findings = [line.strip("- ").strip() for line in findings_section.split("\n") if line.strip().startswith("-")]
-        state["essential_findings"].extend(findings[:5])  # Keep top 5
+        essential_findings = essential_findings + findings[:5]  # Keep top 5
 
     # Record action
     action = ActionRecord(
         action_type="analyze",
         agent_name="analyst",
-        input=f"Analyzed {len(recent_results)} results",
+        input=f"Analyzed {analyzed}",
         output=analysis,
         timestamp=datetime.now()
     )
-    state["action_history"].append(action)
 
-    state["phase"] = "analyzing"
-    state["updated_at"] = datetime.now()
-
-    return state
+    return {
+        "essential_findings": essential_findings,
+        "action_history": [action],
+        "phase": "analyzing",
+        "updated_at": datetime.now(),
+    }
 
 
 def should_continue_node(state: ResearchState) -> Literal["continue", "write", "end"]:
@@ -263,28 +404,36 @@ def should_continue_node(state: ResearchState) -> Literal["continue", "write", "
     return "write"
 
 
-def writing_node(state: ResearchState) -> ResearchState:
+async def writing_node(state: ResearchState) -> dict:
     """Writing phase - generate final report
 
+    With vector RAG, sources are the chunks most relevant to the query and
+    every sub-query searched; otherwise the last 20 results.
+
     Args:
         state: Current research state
 
     Returns:
-        Updated state with final report
+        State update with final report
     """
     # Gather all findings
-    all_results = state["search_results"]
+    all_results = list(state["search_results"].values())
     findings = state["essential_findings"]
+    query = state["clarified_query"] or state["query"]
 
     # Create writing prompt
-    sources_text = "\n\n".join([
-        f"[{i+1}] {r.title} ({r.url})\n{r.content}"
-        for i, r in enumerate(all_results[-20:])  # Last 20 results
-    ])
+    sources_text = await retrieve_evidence(
+        state, [query, *state["query_history"]], WRITING_TOP_K, WRITING_MAX_CHUNKS
+    )
+    if not sources_text:
+        sources_text = "\n\n".join([
+            f"[{i+1}] {r.title} ({r.url})\n{r.content}"
+            for i, r in enumerate(all_results[-20:])  # Last 20 results
+        ])
 
     writing_prompt = f"""Write a comprehensive research report based on the following findings:
 
-Query: {state['clarified_query'] or state['query']}
+Query: {query}
 
 Key Findings:
 {chr(10).join([f'- {f}' for f in findings])}
@@ -303,13 +452,9 @@ Write the final research report:
 """
 
     # Generate report
-    response = llm.invoke(writing_prompt)
+    response = await llm.ainvoke(writing_prompt)
     report = response.content
 
-    state["final_report"] = report
-    state["phase"] = "done"
-    state["should_continue"] = False
-
     # Record action
     action = ActionRecord(
         action_type="write",
@@ -318,11 +463,14 @@ Write the final research report:
         output=f"Generated report ({len(report)} chars)",
         timestamp=datetime.now()
     )
-    state["action_history"].append(action)
-
-    state["updated_at"] = datetime.now()
 
-    return state
+    return {
+        "final_report": report,
+        "phase": "done",
+        "should_continue": False,
+        "action_history": [action],
+        "updated_at": datetime.now(),
+    }
 
 
 def create_deep_research_agent(checkpointer: AsyncPostgresSaver | None = None):
@@ -0,0 +1,159 @@
+"""Concurrent Search Fan-Out for Deep Research
+
+Turns one research question into several distinct sub-queries per iteration and
+runs them concurrently, bounded by EffortConfig.parallel_searches:
+- Sub-queries already searched (after normalization) are skipped
+- Searches run under an asyncio.Semaphore; one failing search does not
+  cancel the others
+- Results are merged in sub-query order and deduplicated by URL
+"""
+
+import asyncio
+import math
+import re
+from typing import Any, Awaitable, Callable, Iterable
+
+from .effort_config import EffortConfig
+
+
+# Results requested per Tavily search
+RESULTS_PER_SEARCH = 5
+
+# Upper bound on sub-queries per iteration, as a multiple of parallel_searches
+MAX_FANOUT_FACTOR = 2
+
+_LIST_MARKER = re.compile(r"^\s*(?:[-*•]|\d+[.)]|Q\d+[:.)])\s*", re.IGNORECASE)
+
+SearchFn = Callable[[str], Awaitable[list[dict]]]
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query for duplicate detection (case, punctuation, spacing)."""
+    return " ".join(re.sub(r"[^\w\s]", " ", query.lower()).split())
+
+
+def subquery_count(config: EffortConfig, search_count: int, iteration: int) -> int:
+    """Number of sub-queries to run this iteration
+
+    Spreads the remaining min_searches results over the remaining iterations,
+    clamped to [parallel_searches, MAX_FANOUT_FACTOR * parallel_searches].
+
+    Args:
+        config: Effort configuration
+        search_count: Results collected so far
+        iteration: Current iteration (1-based)
+
+    Returns:
+        Sub-query count for this iteration
+    """
+    remaining = max(0, config.min_searches - search_count)
+    iterations_left = max(1, config.max_iterations - iteration + 1)
+    needed = math.ceil(remaining / (RESULTS_PER_SEARCH * iterations_left))
+    return max(config.parallel_searches, min(needed, config.parallel_searches * MAX_FANOUT_FACTOR))
+
+
+def parse_subqueries(text: str) -> list[str]:
+    """Extract one query per line from an LLM list (bullets/numbering stripped)
+
+    Args:
+        text: LLM response
+
+    Returns:
+        Candidate sub-queries in order
+    """
+    queries = []
+    for line in text.splitlines():
+        line = _LIST_MARKER.sub("", line).strip().strip('"').strip()
+        if not line or line.endswith(":"):
+            continue
+        queries.append(line)
+    return queries
+
+
+def select_subqueries(
+    query: str,
+    candidates: Iterable[str],
+    history: Iterable[str],
+    count: int,
+) -> list[str]:
+    """Pick up to count distinct, not-yet-searched queries
+
+    The original query comes first if it has not been searched yet. When every
+    candidate was already searched, the original query is returned alone so
+    the iteration still makes progress.
+
+    Args:
+        query: Research question
+        candidates: Expanded sub-queries
+        history: Queries searched in earlier iterations
+        count: Maximum number of queries
+
+    Returns:
+        Queries to search this iteration
+    """
+    seen = {normalize_query(q) for q in history}
+    selected = []
+    for candidate in [query, *candidates]:
+        key = normalize_query(candidate)
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        selected.append(candidate)
+        if len(selected) >= count:
+            break
+    return selected or [query]
+
+
+async def run_searches(
+    queries: list[str],
+    search: SearchFn,
+    concurrency: int,
+) -> list[tuple[str, list[dict] | Exception]]:
+    """Run searches concurrently, at most concurrency at a time
+
+    Args:
+        queries: Queries to run
+        search: Async search function returning result dicts
+        concurrency: Semaphore size (EffortConfig.parallel_searches)
+
+    Returns:
+        (query, results or exception) in query order
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_one(query: str) -> list[dict]:
+        async with semaphore:
+            results = await search(query)
+            return results if isinstance(results, list) else []
+
+    outcomes = await asyncio.gather(*(run_one(q) for q in queries), return_exceptions=True)
+    return list(zip(queries, outcomes))
+
+
+def merge_results(
+    outcomes: list[tuple[str, list[dict] | Exception]],
+    seen_urls: set[str],
+) -> tuple[list[tuple[str, dict]], int]:
+    """Merge search outcomes, dropping results whose URL was already collected
+
+    Args:
+        outcomes: Output of run_searches
+        seen_urls: URLs already in the research state (updated in place)
+
+    Returns:
+        ((query, result) pairs in order, number of duplicates dropped)
+    """
+    merged: list[tuple[str, dict[str, Any]]] = []
+    duplicates = 0
+    for query, results in outcomes:
+        if isinstance(results, Exception):
+            continue
+        for result in results:
+            url = result.get("url", "")
+            if url and url in seen_urls:
+                duplicates += 1
+                continue
+            if url:
+                seen_urls.add(url)
+            merged.append((query, result))
+    return merged, duplicates
@@ -4,12 +4,17 @@ Defines the state structure for the multi-agent research system with
 search tracking, context management, and quality metrics.
 """
 
+import hashlib
 from typing import Annotated, TypedDict, Literal
 from operator import add
 from datetime import datetime
 from pydantic import BaseModel, Field
 
 
+# Actions kept in state (older ones are dropped by the reducer)
+ACTION_HISTORY_LIMIT = 5
+
+
 class SearchResult(BaseModel):
     """Individual search result"""
     query: str
@@ -47,10 +52,35 @@ class QualityMetrics(BaseModel):
     overall_score: float  # 0-1
 
 
+def search_result_key(url: str, content: str = "") -> str:
+    """Store key for a search result: hash of its URL (content if no URL)"""
+    return hashlib.sha1((url or content).encode("utf-8")).hexdigest()[:16]
+
+
+def merge_search_results(
+    left: dict[str, SearchResult],
+    right: dict[str, SearchResult],
+) -> dict[str, SearchResult]:
+    """Reducer for the search-result store: add new keys, keep the first copy"""
+    merged = dict(left)
+    for key, result in right.items():
+        merged.setdefault(key, result)
+    return merged
+
+
+def keep_recent_actions(left: list[ActionRecord], right: list[ActionRecord]) -> list[ActionRecord]:
+    """Reducer for action history: append, then keep the last ACTION_HISTORY_LIMIT"""
+    return (left + right)[-ACTION_HISTORY_LIMIT:]
+
+
 class ResearchState(TypedDict):
     """State for deep research workflow
 
-    Uses Annotated with operator.add for accumulator fields that append to lists.
+    Accumulator fields use reducers, so nodes must return only their new items
+    (deltas), never the whole list or store:
+    - search_results: merged by URL hash (duplicates dropped)
+    - action_history: appended and trimmed to the last ACTION_HISTORY_LIMIT
+    - citations, query_history: appended (operator.add)
     """
 
     # Core research data
@@ -58,15 +88,15 @@ class ResearchState(TypedDict):
     clarified_query: str | None  # Clarified/refined query
     final_report: str | None  # Final research report
 
-    # Search tracking (accumulator - appends to list)
-    search_results: Annotated[list[SearchResult], add]
-    search_count: int  # Total searches performed
+    # Search tracking (store keyed by search_result_key - deduplicated by URL)
+    search_results: Annotated[dict[str, SearchResult], merge_search_results]
+    search_count: int  # Total search results collected
 
     # Citations tracking (accumulator)
     citations: Annotated[list[Citation], add]
 
-    # Action history (accumulator - keep last 5 + essential)
-    action_history: Annotated[list[ActionRecord], add]
+    # Action history (accumulator - keeps the last ACTION_HISTORY_LIMIT)
+    action_history: Annotated[list[ActionRecord], keep_recent_actions]
 
     # Context management
     context_summary: str | None  # Compressed context
@@ -87,6 +117,7 @@ class ResearchState(TypedDict):
 
     # Loop detection
     query_history: Annotated[list[str], add]  # Track all queries for duplicate detection
+    sub_queries: list[str]  # Sub-queries searched in the latest research iteration
     novelty_scores: list[float]  # Track novelty of each search
     stuck_count: int  # Number of times stuck in loop
 
@@ -142,7 +173,7 @@ def create_initial_state(
         final_report=None,
 
         # Search tracking
-        search_results=[],
+        search_results={},
         search_count=0,
 
         # Citations
@@ -170,6 +201,7 @@ def create_initial_state(
 
         # Loop detection
         query_history=[],
+        sub_queries=[],
         novelty_scores=[],
         stuck_count=0,
 
@@ -197,36 +229,14 @@ def create_initial_state(
     )
 
 
-def trim_action_history(state: ResearchState, keep_recent: int = 5) -> ResearchState:
-    """Trim action history to keep last N actions + essential context
-
-    Args:
-        state: Current state
-        keep_recent: Number of recent actions to keep (default 5)
-
-    Returns:
-        State with trimmed action history
-    """
-    if len(state["action_history"]) <= keep_recent:
-        return state
-
-    # Keep last N actions
-    trimmed_history = state["action_history"][-keep_recent:]
-
-    state["action_history"] = trimmed_history
-    state["updated_at"] = datetime.now()
-
-    return state
-
-
 def update_quality_metrics(
     state: ResearchState,
     completeness: float,
     accuracy: float,
     relevance: float,
     citation_quality: float,
-) -> ResearchState:
-    """Update quality metrics and check if threshold met
+) -> dict:
+    """Compute quality metrics and check if threshold met
 
     Args:
         state: Current state
@@ -236,22 +246,22 @@ def update_quality_metrics(
         citation_quality: Citation quality score (0-1)
 
     Returns:
-        Updated state with quality metrics
+        State update (quality_metrics, quality_threshold_met, updated_at)
     """
     from .effort_config import get_effort_config
 
     overall_score = (completeness + accuracy + relevance + citation_quality) / 4
 
-    state["quality_metrics"] = QualityMetrics(
-        completeness=completeness,
-        accuracy=accuracy,
-        relevance=relevance,
-        citation_quality=citation_quality,
-        overall_score=overall_score,
-    )
-
     config = get_effort_config(state["effort_level"])
-    state["quality_threshold_met"] = overall_score >= config.quality_threshold
-    state["updated_at"] = datetime.now()
 
-    return state
+    return {
+        "quality_metrics": QualityMetrics(
+            completeness=completeness,
+            accuracy=accuracy,
+            relevance=relevance,
+            citation_quality=citation_quality,
+            overall_score=overall_score,
+        ),
+        "quality_threshold_met": overall_score >= config.quality_threshold,
+        "updated_at": datetime.now(),
+    }
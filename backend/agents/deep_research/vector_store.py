@@ -0,0 +1,297 @@
+"""Vector RAG Store for Deep Research
+
+In-process vector index over search results, used when
+EffortConfig.use_vector_rag is enabled:
+- Search results are chunked and embedded as they arrive (once per URL)
+- Exact (flat) cosine search over a normalized NumPy matrix
+- Retrieval for several sub-questions at once, merged by best score and
+  capped, so prompt size stays bounded at high effort levels
+- Persisted per session to DEEP_RESEARCH_VECTOR_DIR, so a resumed session
+  (another process, same checkpoint) keeps its index
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_community.embeddings import OllamaEmbeddings
+
+from .state import SearchResult
+
+logger = logging.getLogger(__name__)
+
+# Storage location (one sub-directory per session)
+VECTOR_DIR = Path(os.getenv(
+    "DEEP_RESEARCH_VECTOR_DIR",
+    str(Path(tempfile.gettempdir()) / "deep_research_vectors"),
+))
+
+# Chunking (characters)
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 150
+
+# Open stores kept in memory
+MAX_OPEN_STORES = 8
+
+VECTORS_FILE = "vectors.npy"
+CHUNKS_FILE = "chunks.json"
+
+
+@dataclass
+class RetrievedChunk:
+    """A chunk returned by ResearchVectorStore.search"""
+    url: str
+    title: str
+    text: str
+    score: float
+
+
+def chunk_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> list[str]:
+    """Split text into overlapping chunks, breaking on whitespace where possible
+
+    Args:
+        text: Text to split
+        chunk_size: Maximum characters per chunk
+        overlap: Characters repeated at the start of the next chunk
+
+    Returns:
+        Non-empty chunks in order
+    """
+    text = " ".join(text.split())
+    if len(text) <= chunk_size:
+        return [text] if text else []
+
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_size, len(text))
+        if end < len(text):
+            space = text.rfind(" ", start + overlap + 1, end)
+            if space > start:
+                end = space
+        chunks.append(text[start:end].strip())
+        if end >= len(text):
+            break
+        # Next chunk starts at the first word boundary inside the overlap
+        boundary = text.find(" ", end - overlap, end)
+        start = boundary + 1 if boundary > start else end
+    return [c for c in chunks if c]
+
+
+def format_chunks(chunks: list[RetrievedChunk]) -> str:
+    """Format retrieved chunks for a prompt, grouped and numbered by source
+
+    Args:
+        chunks: Retrieved chunks (best first)
+
+    Returns:
+        "[n] Title (URL)" blocks with the source's chunks underneath
+    """
+    sources: OrderedDict[str, list[RetrievedChunk]] = OrderedDict()
+    for chunk in chunks:
+        sources.setdefault(chunk.url, []).append(chunk)
+
+    return "\n\n".join(
+        f"[{i + 1}] {group[0].title} ({url})\n" + "\n...\n".join(c.text for c in group)
+        for i, (url, group) in enumerate(sources.items())
+    )
+
+
+class ResearchVectorStore:
+    """Flat cosine-similarity index over chunked search results
+
+    Not safe for concurrent writers; one research session writes its store
+    from one graph run at a time.
+
+    Attributes:
+        path: Directory the store persists to (None for memory only)
+        embeddings: Embedding model for chunks and queries
+    """
+
+    def __init__(self, embeddings: Embeddings, path: Path | None = None):
+        """Create an empty store, loading path if it holds a compatible index"""
+        self.embeddings = embeddings
+        self.path = path
+        self.model = getattr(embeddings, "model", None) or type(embeddings).__name__
+
+        self._matrix = np.zeros((0, 0), dtype=np.float32)  # Capacity-doubling buffer
+        self._size = 0
+        self._chunks: list[dict] = []   # {"key", "url", "title", "text"} per row
+        self._keys: set[str] = set()    # Search results already indexed
+
+        if path is not None and (path / CHUNKS_FILE).exists():
+            self._load()
+
+    @property
+    def size(self) -> int:
+        """Number of indexed chunks"""
+        return self._size
+
+    async def add_results(self, results: dict[str, SearchResult]) -> int:
+        """Chunk and embed search results not indexed yet
+
+        Args:
+            results: Search-result store entries (key -> SearchResult)
+
+        Returns:
+            Number of chunks added
+        """
+        rows = []
+        for key, result in results.items():
+            if key in self._keys:
+                continue
+            for text in chunk_text(result.content):
+                rows.append({"key": key, "url": result.url, "title": result.title, "text": text})
+        if not rows:
+            return 0
+
+        vectors = await self.embeddings.aembed_documents([row["text"] for row in rows])
+        self._append(_normalize(vectors), rows)
+        self._keys.update(row["key"] for row in rows)
+        return len(rows)
+
+    async def search(
+        self,
+        queries: list[str],
+        k_per_query: int,
+        max_chunks: int,
+    ) -> list[RetrievedChunk]:
+        """Retrieve the chunks most relevant to any of the queries
+
+        Args:
+            queries: Sub-questions (duplicates ignored)
+            k_per_query: Top chunks taken per query
+            max_chunks: Cap on chunks returned overall
+
+        Returns:
+            Chunks ordered by best similarity to any query
+        """
+        queries = list(dict.fromkeys(q for q in queries if q))
+        if not queries or self._size == 0:
+            return []
+
+        # Query embeddings: asymmetric models embed questions differently from passages
+        vectors = await asyncio.gather(*(self.embeddings.aembed_query(q) for q in queries))
+        query_vectors = _normalize(list(vectors))
+        similarities = query_vectors @ self._matrix[:self._size].T  # (queries, chunks)
+
+        k = min(k_per_query, self._size)
+        best: dict[int, float] = {}
+        for row in similarities:
+            top = np.argpartition(-row, k - 1)[:k]
+            for index in top.tolist():
+                best[index] = max(best.get(index, -1.0), float(row[index]))
+
+        ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)[:max_chunks]
+        return [
+            RetrievedChunk(
+                url=self._chunks[i]["url"],
+                title=self._chunks[i]["title"],
+                text=self._chunks[i]["text"],
+                score=score,
+            )
+            for i, score in ranked
+        ]
+
+    def save(self) -> None:
+        """Persist the index atomically (no-op for memory-only stores)"""
+        if self.path is None:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        vectors_tmp = self.path / f"{VECTORS_FILE}.tmp"
+        with open(vectors_tmp, "wb") as f:
+            np.save(f, self._matrix[:self._size])
+        chunks_tmp = self.path / f"{CHUNKS_FILE}.tmp"
+        chunks_tmp.write_text(
+            json.dumps({"model": self.model, "chunks": self._chunks}),
+            encoding="utf-8",
+        )
+
+        # Vectors first: a crash in between leaves extra rows, never missing ones
+        os.replace(vectors_tmp, self.path / VECTORS_FILE)
+        os.replace(chunks_tmp, self.path / CHUNKS_FILE)
+
+    def _load(self) -> None:
+        data = json.loads((self.path / CHUNKS_FILE).read_text(encoding="utf-8"))
+        if data.get("model") != self.model:
+            # Dropped: the caller re-adds the session's results (see index_results)
+            logger.info(f"Vector store at {self.path} built with {data.get('model')}; starting empty")
+            return
+
+        matrix = np.load(self.path / VECTORS_FILE)
+        chunks = data["chunks"][:len(matrix)]
+        self._matrix = matrix[:len(chunks)].astype(np.float32, copy=False)
+        self._size = len(chunks)
+        self._chunks = chunks
+        self._keys = {chunk["key"] for chunk in chunks}
+
+    def _append(self, vectors: np.ndarray, rows: list[dict]) -> None:
+        needed = self._size + len(rows)
+        if self._matrix.shape[1] != vectors.shape[1] and self._size == 0:
+            self._matrix = np.zeros((0, vectors.shape[1]), dtype=np.float32)
+        if needed > len(self._matrix):
+            grown = np.zeros((max(needed, 2 * len(self._matrix)), vectors.shape[1]), dtype=np.float32)
+            grown[:self._size] = self._matrix[:self._size]
+            self._matrix = grown
+        self._matrix[self._size:needed] = vectors
+        self._chunks.extend(rows)
+        self._size = needed
+
+
+def _normalize(vectors: list[list[float]]) -> np.ndarray:
+    """L2-normalize rows into a float32 matrix (zero rows stay zero)"""
+    matrix = np.array(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def _session_path(session_id: str) -> Path:
+    """Directory for a session's index, named by a hash so any id stays under VECTOR_DIR"""
+    return VECTOR_DIR.resolve() / hashlib.sha256(session_id.encode("utf-8")).hexdigest()[:32]
+
+
+# Open stores by session (least recently used are closed first)
+_stores: OrderedDict[str, ResearchVectorStore] = OrderedDict()
+_stores_lock = threading.Lock()
+_default_embeddings: Embeddings | None = None
+
+
+def get_vector_store(session_id: str, embeddings: Embeddings | None = None) -> ResearchVectorStore:
+    """Return the vector store for a research session, opening it if needed
+
+    Args:
+        session_id: Research session identifier
+        embeddings: Embedding model (default: nomic-embed-text via Ollama)
+
+    Returns:
+        The session's store (persisted under VECTOR_DIR)
+    """
+    global _default_embeddings
+
+    with _stores_lock:
+        store = _stores.get(session_id)
+        if store is not None:
+            _stores.move_to_end(session_id)
+            return store
+
+        if embeddings is None:
+            if _default_embeddings is None:
+                _default_embeddings = OllamaEmbeddings(model="nomic-embed-text")
+            embeddings = _default_embeddings
+
+        store = ResearchVectorStore(embeddings, path=_session_path(session_id))
+        _stores[session_id] = store
+        while len(_stores) > MAX_OPEN_STORES:
+            _stores.popitem(last=False)
+        return store
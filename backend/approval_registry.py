@@ -0,0 +1,289 @@
+"""
+Per-Session Human-in-the-Loop Approval State.
+
+Replaces the process-wide approval globals that lived in module_2_2_simple.py:
+- Auto-approve mode is a ContextVar, so each chat request (its own task on the
+  shared event-loop thread) carries its own setting instead of a
+  threading.local() that every concurrent chat shared
+- Pending approvals are registered per thread_id; decisions resolve the waiting
+  future on the loop that created it (call_soon_threadsafe)
+- Entries older than the TTL are swept, so abandoned requests never leak
+
+Waiting is always an await on the owning loop - no executor thread is parked
+on future.result() while the user decides.
+"""
+
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_APPROVAL_TIMEOUT = 300.0  # Seconds a tool waits for a decision
+DEFAULT_TTL = 600.0               # Registry entries older than this are swept
+SWEEP_INTERVAL = 60.0             # Seconds between background sweeps
+
+TIMEOUT_DECISION = {"approved": False, "feedback": "Approval timeout - operation cancelled"}
+EXPIRED_DECISION = {"approved": False, "feedback": "Approval request expired"}
+
+# Auto-approve mode of the chat executing in this context. Set by the SSE
+# stream before the agent runs; LangGraph tasks and executor threads started
+# from that stream inherit a copy of the context.
+_auto_approve: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "auto_approve", default=True
+)
+
+
+def set_auto_approve(enabled: bool) -> contextvars.Token:
+    """Set auto-approve mode for the current chat context."""
+    return _auto_approve.set(enabled)
+
+
+def reset_auto_approve(token: contextvars.Token) -> None:
+    """Restore the mode that was active before set_auto_approve()."""
+    _auto_approve.reset(token)
+
+
+def get_auto_approve() -> bool:
+    """Return auto-approve mode for the current chat context (default True)."""
+    return _auto_approve.get()
+
+
+@dataclass
+class PendingApproval:
+    """
+    A tool call waiting for a user decision.
+
+    Attributes:
+        request_id: Identifier sent to the frontend
+        thread_id: Session that owns the request
+        tool_name: Tool awaiting approval
+        tool_args: Arguments shown to the user
+        future: Resolved with the decision dict
+        loop: Loop that owns the future
+        created_at: time.monotonic() at registration
+    """
+
+    request_id: str
+    thread_id: str
+    tool_name: str
+    tool_args: dict
+    future: asyncio.Future
+    loop: asyncio.AbstractEventLoop
+    created_at: float = field(default_factory=time.monotonic)
+
+
+class ApprovalRegistry:
+    """
+    Pending approvals grouped by thread_id.
+
+    The registry is shared by the server loop and any private loop a
+    synchronous tool runs in, so the maps are guarded by a threading.Lock
+    and futures are only ever resolved on their own loop.
+
+    Attributes:
+        ttl: Seconds after which an unresolved entry is expired and removed
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL):
+        """Initialize an empty registry."""
+        self.ttl = ttl
+        self._sessions: Dict[str, Dict[str, PendingApproval]] = {}
+        self._by_request: Dict[str, PendingApproval] = {}
+        self._lock = threading.Lock()
+        self._sweep_task: Optional[asyncio.Task] = None
+
+        self._stats = {
+            "requested": 0,
+            "approved": 0,
+            "rejected": 0,
+            "timed_out": 0,
+            "expired": 0,
+            "unknown_decisions": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Waiting side (tools)
+    # ------------------------------------------------------------------
+
+    def register(
+        self,
+        thread_id: str,
+        request_id: str,
+        tool_name: str,
+        tool_args: dict
+    ) -> PendingApproval:
+        """
+        Register a pending approval bound to the running loop.
+
+        Raises:
+            ValueError: If request_id is already pending
+        """
+        loop = asyncio.get_running_loop()
+        pending = PendingApproval(
+            request_id=request_id,
+            thread_id=thread_id,
+            tool_name=tool_name,
+            tool_args=tool_args,
+            future=loop.create_future(),
+            loop=loop,
+        )
+        with self._lock:
+            if request_id in self._by_request:
+                raise ValueError(f"Approval request {request_id} is already pending")
+            self._by_request[request_id] = pending
+            self._sessions.setdefault(thread_id, {})[request_id] = pending
+            self._stats["requested"] += 1
+        return pending
+
+    async def wait(self, pending: PendingApproval, timeout: float = DEFAULT_APPROVAL_TIMEOUT) -> dict:
+        """
+        Await the decision for a registered approval.
+
+        Returns:
+            The decision dict, or a rejection if timeout elapses first
+        """
+        try:
+            return await asyncio.wait_for(pending.future, timeout=timeout)
+        except asyncio.TimeoutError:
+            self._stats["timed_out"] += 1
+            logger.info(f"[Approvals] Timed out waiting on {pending.tool_name} ({pending.request_id})")
+            return dict(TIMEOUT_DECISION)
+        finally:
+            self._discard(pending)
+
+    # ------------------------------------------------------------------
+    # Deciding side (HTTP endpoint)
+    # ------------------------------------------------------------------
+
+    def resolve(
+        self,
+        request_id: str,
+        approved: bool,
+        feedback: Optional[str] = None,
+        thread_id: Optional[str] = None
+    ) -> bool:
+        """
+        Deliver a decision to the waiting tool.
+
+        Args:
+            request_id: Pending request to resolve
+            approved: Whether the tool call may proceed
+            feedback: Optional message returned to the agent on rejection
+            thread_id: If given, the request must belong to this session
+
+        Returns:
+            True if a pending request was resolved
+        """
+        with self._lock:
+            pending = self._by_request.get(request_id)
+            if pending is None or (thread_id is not None and pending.thread_id != thread_id):
+                self._stats["unknown_decisions"] += 1
+                return False
+            self._remove_locked(pending)
+            self._stats["approved" if approved else "rejected"] += 1
+
+        self._set_result(pending, {"approved": approved, "feedback": feedback})
+        return True
+
+    # ------------------------------------------------------------------
+    # Cleanup
+    # ------------------------------------------------------------------
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """
+        Expire entries older than the TTL.
+
+        Waiters (if still alive) receive a rejection; entries whose loop has
+        closed are simply dropped.
+
+        Returns:
+            Number of entries removed
+        """
+        cutoff = (time.monotonic() if now is None else now) - self.ttl
+        with self._lock:
+            expired = [p for p in self._by_request.values() if p.created_at <= cutoff]
+            for pending in expired:
+                self._remove_locked(pending)
+            self._stats["expired"] += len(expired)
+
+        for pending in expired:
+            self._set_result(pending, dict(EXPIRED_DECISION))
+        if expired:
+            logger.info(f"[Approvals] Expired {len(expired)} stale approval request(s)")
+        return len(expired)
+
+    def start(self, interval: float = SWEEP_INTERVAL) -> None:
+        """Start the periodic TTL sweep on the running loop."""
+        if self._sweep_task is None or self._sweep_task.done():
+            self._sweep_task = asyncio.get_running_loop().create_task(self._sweep_loop(interval))
+
+    async def stop(self) -> None:
+        """Stop the sweep and reject everything still pending."""
+        if self._sweep_task is not None:
+            self._sweep_task.cancel()
+            try:
+                await self._sweep_task
+            except asyncio.CancelledError:
+                pass
+            self._sweep_task = None
+        self.sweep(now=float("inf"))
+
+    async def _sweep_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.warning(f"[Approvals] Sweep failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _discard(self, pending: PendingApproval) -> None:
+        with self._lock:
+            if self._by_request.get(pending.request_id) is pending:
+                self._remove_locked(pending)
+
+    def _remove_locked(self, pending: PendingApproval) -> None:
+        """Drop an entry from both maps (caller holds the lock)."""
+        self._by_request.pop(pending.request_id, None)
+        session = self._sessions.get(pending.thread_id)
+        if session is not None:
+            session.pop(pending.request_id, None)
+            if not session:
+                del self._sessions[pending.thread_id]
+
+    @staticmethod
+    def _set_result(pending: PendingApproval, decision: dict) -> None:
+        """Resolve the future on its own loop."""
+        def _apply():
+            if not pending.future.done():
+                pending.future.set_result(decision)
+
+        if pending.loop.is_closed():
+            return
+        try:
+            pending.loop.call_soon_threadsafe(_apply)
+        except RuntimeError:
+            # Loop closed between the check and the call
+            pass
+
+    def get_stats(self) -> dict:
+        """Return counters and current pending totals."""
+        with self._lock:
+            return {
+                **self._stats,
+                "pending": len(self._by_request),
+                "sessions": len(self._sessions),
+            }
+
+
+# Singleton instance
+approval_registry = ApprovalRegistry()
@@ -4,7 +4,7 @@ Adds support for progress logs and better streaming
 """
 
 from fastapi import FastAPI, Request, HTTPException, Query, WebSocket, WebSocketDisconnect, Header
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional, Literal
@@ -14,14 +14,28 @@ import sys
 import os
 import json
 import asyncio
+import base64
 import uuid
 import logging
 import time
-import psycopg
+import mimetypes
+from stat import S_ISREG
+from psycopg.rows import tuple_row
 from datetime import datetime
 from auth import verify_token, create_access_token
 from websocket_manager import manager
 from file_watcher import FileWatcher
+from workspace_index import WorkspaceTreeIndex, TreePathError
+from file_responses import (
+    RangeNotSatisfiable,
+    file_etag,
+    is_not_modified,
+    iter_file_range,
+    last_modified,
+    parse_range,
+)
+from db_pool import open_connection_pool, get_pool, get_pool_stats
+from sse_encoder import SSEEncoder, tool_result_store
 from observability.tracing import get_user_metadata, get_user_tags
 from planning_agent import initialize_planning_agent
 
@@ -40,8 +54,14 @@ sys.path.insert(0, parent_dir)
 from module_2_2_simple import submit_approval_decision, get_approval_for_tool, setup_checkpointer
 import module_2_2_simple
 
+# Session binding and approval mode for chat streams (same module objects
+# module_2_2_simple uses, so the contextvars set here are the ones its tools read)
+from backend.session_events import set_current_session
+from backend.approval_registry import set_auto_approve
+
 # Import unified graph with all subagent nodes for Command.goto routing
-from langgraph_studio_graphs import create_unified_graph
+from langgraph_studio_graphs import create_unified_graph, ace_middleware
+from delegation_fanout import JOIN_NODE, subagent_type_from_namespace
 
 # Import planning agent and middleware
 from planning_agent import start_research_with_plan, get_plan_state, create_plan_only
@@ -52,6 +72,9 @@ file_watcher = None
 WORKSPACE_ROOT = Path(__file__).parent / "workspace"
 WORKSPACE_ROOT.mkdir(exist_ok=True)
 
+# Cached workspace tree for /api/workspace/tree (updated by the file watcher)
+workspace_index = WorkspaceTreeIndex(WORKSPACE_ROOT)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -59,16 +82,17 @@ async def lifespan(app: FastAPI):
 
     Replaces deprecated @app.on_event() decorators with modern async context manager.
     Handles:
-    - PostgreSQL checkpointer initialization
+    - Shared PostgreSQL connection pool
+    - PostgreSQL checkpointer initialization (on the shared pool)
     - Agent creation with persistence
     - File watcher startup/shutdown
     """
     global file_watcher
 
-    logger.info("🚀 [Startup] Initializing PostgreSQL checkpointer...")
+    logger.info("🚀 [Startup] Opening PostgreSQL connection pool...")
 
-    # Initialize PostgreSQL checkpointer and create agent
-    async with setup_checkpointer() as checkpointer:
+    # One pool for the checkpointer and the thread-management endpoints
+    async with open_connection_pool() as pool, setup_checkpointer(pool) as checkpointer:
         # Create unified graph with all subagent nodes (for Command.goto routing)
         module_2_2_simple.agent = create_unified_graph(custom_checkpointer=checkpointer)
         logger.info("✅ [Startup] Unified graph initialized with PostgreSQL persistence")
@@ -77,9 +101,19 @@ async def lifespan(app: FastAPI):
         initialize_planning_agent(checkpointer)
         logger.info("✅ [Startup] Planning agent initialized with shared checkpointer")
 
+        # Fan out per-session events (approval requests) to WebSocket clients
+        module_2_2_simple.event_bus.attach_websocket_manager(manager)
+
+        # Deliver broadcasts from synchronous tools on this loop
+        module_2_2_simple.broadcast_dispatcher.start(manager)
+
+        # Expire abandoned approval requests
+        module_2_2_simple.approval_registry.start()
+
         # Start file watcher
         logger.info("🚀 [Startup] Initializing file watcher...")
         file_watcher = FileWatcher(WORKSPACE_ROOT, manager)
+        file_watcher.add_listener(workspace_index.apply_event)
         file_watcher.start()
         logger.info("✅ [Startup] File watcher started successfully")
 
@@ -90,7 +124,11 @@ async def lifespan(app: FastAPI):
         if file_watcher:
             file_watcher.stop()
         logger.info("✅ [Shutdown] File watcher stopped")
-        logger.info("✅ [Shutdown] PostgreSQL checkpointer connection closed")
+        await module_2_2_simple.broadcast_dispatcher.stop()
+        await module_2_2_simple.approval_registry.stop()
+        await ace_middleware.shutdown()
+        logger.info("✅ [Shutdown] ACE reflection queue drained")
+        logger.info("✅ [Shutdown] PostgreSQL checkpointer and connection pool closed")
 
 app = FastAPI(
     title="DeepAgent Research API v2.5",
@@ -201,6 +239,17 @@ def validate_workspace_path(relative_path: str) -> Path:
     return full_path
 
 
+def workspace_relative_path(full_path: Path) -> str:
+    """
+    Convert a path from validate_workspace_path() to the index key form.
+
+    Returns:
+        POSIX path relative to the workspace root ("" for the root itself)
+    """
+    relative = full_path.relative_to(WORKSPACE_ROOT.resolve()).as_posix()
+    return "" if relative == "." else relative
+
+
 # ============================================================================
 # Existing Helper Functions
 # ============================================================================
@@ -267,7 +316,7 @@ def get_agent_display_name(state: dict, node_name: str) -> str:
     return 'Supervisor'
 
 
-async def stream_agent_response(
+async def agent_event_stream(
     query: str,
     auto_approve: bool = True,
     plan_mode: bool = False,
@@ -275,7 +324,7 @@ async def stream_agent_response(
     session_id: Optional[str] = None
 ):
     """
-    Stream agent execution with plan tracking, approval flow, and LangSmith tracing.
+    Run the agent and yield its events (dicts) with plan tracking, approval flow, and LangSmith tracing.
 
     Args:
         query: User query to process
@@ -284,12 +333,13 @@ async def stream_agent_response(
         user_id: Unique user identifier from JWT token (optional)
         session_id: Unique session identifier for this conversation (optional)
     """
-    # Import the module-level auto_approve functions and sse_event_queue from module_2_2_simple
+    # Import the agent and event bus from module_2_2_simple
     import module_2_2_simple
     from middleware.plan_websocket_bridge import stream_agent_with_websocket_updates
     from planning_agent import start_research_with_plan
 
-    module_2_2_simple.set_auto_approve(auto_approve)
+    # Contextvar: scoped to this request, not shared with concurrent chats
+    set_auto_approve(auto_approve)
 
     # Prepare LangSmith metadata and tags
     metadata = get_user_metadata(user_id, session_id)
@@ -298,6 +348,9 @@ async def stream_agent_response(
     # Generate thread_id from session or user, fallback to "web-session"
     thread_id = session_id or user_id or "web-session"
 
+    # Bind this session so tools publish approval events to this stream only
+    set_current_session(thread_id)
+
     # Choose agent based on plan_mode toggle
     if plan_mode:
         # Plan Mode: Create plan ONLY, then pass to main agent for execution
@@ -338,163 +391,173 @@ Begin executing the plan now. Remember: YOU MUST follow the plan step-by-step an
 
         # Step 3: Execute main agent with plan context
         # Main agent stream uses "updates" mode → SSE events → Progress Logs populated
+        # (subgraphs=True: subagent branches run as nested graphs)
         agent_stream = module_2_2_simple.agent.astream(
             {"messages": [{"role": "user", "content": plan_context}]},
             config={"configurable": {"thread_id": thread_id}},
-            stream_mode="updates"
+            stream_mode="updates",
+            subgraphs=True,
         )
     else:
         # Normal agent flow: DeepAgent with full toolset (default)
         # Emits standard SSE events for ProgressLogs sidebar
+        # subgraphs=True: subagent branches run as nested graphs, stream their steps too
         agent_stream = module_2_2_simple.agent.astream(
             {"messages": [{"role": "user", "content": query}]},
             config={"configurable": {"thread_id": thread_id}},
-            stream_mode="updates"
+            stream_mode="updates",
+            subgraphs=True,
         )
 
     # Use astream for async iteration (PostgreSQL checkpointer requires async)
-    async for chunk in agent_stream:
-        # Check for pending approval requests in the queue (non-blocking)
-        try:
-            while True:
-                approval_event = module_2_2_simple.sse_event_queue.get_nowait()
-                yield f"data: {json.dumps(approval_event)}\n\n"
-                await asyncio.sleep(0)  # Force flush
-        except asyncio.QueueEmpty:
-            pass  # No approval events pending
-
-        # Debug logging for chunk type
-        logger.debug(f"[SSE Stream] Chunk type: {type(chunk).__name__}")
-
-        # Handle custom events (tuples) - skip them, WebSocket already broadcasts
-        if isinstance(chunk, tuple):
-            logger.debug(f"[SSE Stream] Skipping custom event tuple: {chunk[0] if chunk else 'empty'}")
-            continue
-
-        # Only process dict chunks (node updates)
-        if not isinstance(chunk, dict):
-            logger.warning(f"[SSE Stream] Unexpected chunk type: {type(chunk)}, value: {chunk}")
-            continue
-
-        # Add error handling for chunk processing
-        try:
-            for node_name, node_update in chunk.items():
-                if node_name in ["__start__", "__end__"]:
-                    continue
-
-                # Skip if update is None or empty
-                if not node_update:
-                    continue
-
-                # Extract agent type from state for identification
-                agent_name = get_agent_display_name(node_update, node_name)
-
-                # Emit enhanced event types
-                event_data = {"type": "node_update", "node": node_name, "data": {}}
-
-                # Handle messages
-                if "messages" in node_update:
-                    messages = node_update["messages"]
-
-                    # Ensure messages is iterable
-                    # LangGraph can return Overwrite objects in stream_mode="updates"
-                    if not isinstance(messages, (list, tuple)):
-                        # If it's a single message or Overwrite object, wrap in list
-                        messages = [messages]
-
-                    for msg in messages:
-                        # LLM thinking/reasoning (AIMessage with content)
-                        if hasattr(msg, "content") and msg.content and hasattr(msg, "tool_calls"):
-                            # If there's content AND tool_calls, emit thinking before tools
-                            if msg.content and msg.tool_calls:
-                                yield f"data: {
-                                    json.dumps(
-                                        {
-                                            'type': 'llm_thinking',
-                                            'content': extract_text_from_content(msg.content),
-                                            'agent': agent_name,
-                                        }
-                                    )
-                                }\n\n"
-                                await asyncio.sleep(0)  # Force flush
-                            # If there's content but NO tool_calls, it's the final response
-                            elif msg.content and not msg.tool_calls:
-                                yield f"data: {
-                                    json.dumps(
-                                        {
-                                            'type': 'llm_final_response',
-                                            'content': extract_text_from_content(msg.content),
-                                            'agent': agent_name,
-                                        }
-                                    )
-                                }\n\n"
-                                await asyncio.sleep(0)  # Force flush
-
-                        # Tool calls with full arguments
-                        if hasattr(msg, "tool_calls") and msg.tool_calls:
-                            for tool_call in msg.tool_calls:
-                                tool_name = tool_call['name']
-                                tool_args = tool_call.get('args', {})
-
-                                # Yield the tool_call event
-                                yield f"data: {
-                                    json.dumps(
-                                        {
-                                            'type': 'tool_call',
-                                            'tool': tool_name,
-                                            'args': tool_args,
-                                            'agent': agent_name,
-                                        }
-                                    )
-                                }\n\n"
-                                await asyncio.sleep(0)  # Force flush
-
-                        # Tool results (full content, no truncation)
-                        elif hasattr(msg, "tool_call_id"):
-                            yield f"data: {
-                                json.dumps(
-                                    {
-                                        'type': 'tool_result',
+    # Session events (approval requests) are interleaved as soon as they are
+    # published, including while the agent is blocked waiting on an approval.
+    async with module_2_2_simple.event_bus.subscribe(thread_id) as subscription:
+        async for source, chunk in subscription.interleave(agent_stream):
+            if source == "event":
+                yield chunk
+                continue
+
+            # subgraphs=True: (namespace, update); namespace is () for supervisor
+            # nodes and ("<type>_agent:<task_id>", ...) inside a subagent branch
+            if not (isinstance(chunk, tuple) and len(chunk) == 2):
+                logger.warning(f"[SSE Stream] Unexpected chunk type: {type(chunk)}, value: {chunk}")
+                continue
+            namespace, chunk = chunk
+            branch_type = subagent_type_from_namespace(namespace)
+
+            # Debug logging for chunk type
+            logger.debug(f"[SSE Stream] Chunk type: {type(chunk).__name__} (namespace: {namespace})")
+
+            # Only process dict chunks (node updates)
+            if not isinstance(chunk, dict):
+                logger.warning(f"[SSE Stream] Unexpected chunk type: {type(chunk)}, value: {chunk}")
+                continue
+
+            # Add error handling for chunk processing
+            try:
+                for node_name, node_update in chunk.items():
+                    if node_name in ["__start__", "__end__"]:
+                        continue
+
+                    # Skip if update is None or empty
+                    if not node_update:
+                        continue
+
+                    # Extract agent type for identification (branch updates: from the namespace)
+                    agent_name = get_agent_display_name(
+                        {"subagent_type": branch_type} if branch_type else node_update, node_name
+                    )
+
+                    # Emit enhanced event types
+                    event_data = {"type": "node_update", "node": node_name, "data": {}}
+
+                    # Handle messages
+                    if "messages" in node_update:
+                        messages = node_update["messages"]
+
+                        # Ensure messages is iterable
+                        # LangGraph can return Overwrite objects in stream_mode="updates"
+                        if not isinstance(messages, (list, tuple)):
+                            # If it's a single message or Overwrite object, wrap in list
+                            messages = [messages]
+
+                        for msg in messages:
+                            # Joined subagent results, reported to the supervisor like a tool result
+                            if node_name == JOIN_NODE:
+                                yield {
+                                    'type': 'tool_result',
+                                    'content': extract_text_from_content(msg.content),
+                                    'agent': agent_name,
+                                }
+                                continue
+
+                            # LLM thinking/reasoning (AIMessage with content)
+                            if hasattr(msg, "content") and msg.content and hasattr(msg, "tool_calls"):
+                                # If there's content AND tool_calls, emit thinking before tools
+                                if msg.content and msg.tool_calls:
+                                    yield {
+                                        'type': 'llm_thinking',
                                         'content': extract_text_from_content(msg.content),
                                         'agent': agent_name,
                                     }
-                                )
-                            }\n\n"
-                            await asyncio.sleep(0)  # Force flush
-
-                # Handle progress logs (NEW!)
-                if "logs" in node_update:
-                    for log in node_update["logs"]:
-                        yield f"data: {
-                            json.dumps(
-                                {
-                                    'type': 'progress_log',
-                                    'message': log['message'],
-                                    'done': log['done'],
+                                # If there's content but NO tool_calls, it's the final response
+                                elif msg.content and not msg.tool_calls:
+                                    yield {
+                                        'type': 'llm_final_response',
+                                        'content': extract_text_from_content(msg.content),
+                                        'agent': agent_name,
+                                    }
+
+                            # Tool calls with full arguments
+                            if hasattr(msg, "tool_calls") and msg.tool_calls:
+                                for tool_call in msg.tool_calls:
+                                    tool_name = tool_call['name']
+                                    tool_args = tool_call.get('args', {})
+
+                                    # Yield the tool_call event
+                                    yield {
+                                        'type': 'tool_call',
+                                        'tool': tool_name,
+                                        'args': tool_args,
+                                        'agent': agent_name,
+                                    }
+
+                            # Tool results (full content; compact streams send large ones by reference)
+                            elif hasattr(msg, "tool_call_id"):
+                                yield {
+                                    'type': 'tool_result',
+                                    'content': extract_text_from_content(msg.content),
+                                    'agent': agent_name,
                                 }
-                            )
-                        }\n\n"
-                        await asyncio.sleep(0)  # Force flush
-        except AttributeError as e:
-            logger.error(f"[SSE Stream] AttributeError processing chunk: {type(chunk)} - {e}")
-            logger.error(f"[SSE Stream] Chunk value: {chunk}")
-            continue
-        except Exception as e:
-            logger.error(f"[SSE Stream] Error processing chunk: {e}")
-            continue
 
-    # Final queue flush - send any remaining approval events after stream completes
-    try:
-        while True:
-            approval_event = module_2_2_simple.sse_event_queue.get_nowait()
-            yield f"data: {json.dumps(approval_event)}\n\n"
-            await asyncio.sleep(0)  # Force flush
-    except asyncio.QueueEmpty:
-        pass  # No more approval events
+                    # Handle progress logs (NEW!)
+                    if "logs" in node_update:
+                        for log in node_update["logs"]:
+                            yield {
+                                'type': 'progress_log',
+                                'message': log['message'],
+                                'done': log['done'],
+                            }
+            except AttributeError as e:
+                logger.error(f"[SSE Stream] AttributeError processing chunk: {type(chunk)} - {e}")
+                logger.error(f"[SSE Stream] Chunk value: {chunk}")
+                continue
+            except Exception as e:
+                logger.error(f"[SSE Stream] Error processing chunk: {e}")
+                continue
 
     # Signal stream completion to frontend
     logger.info(f"[SSE Stream] Completed for thread {thread_id}")
-    yield f"data: {json.dumps({'type': 'stream_complete', 'thread_id': thread_id})}\n\n"
+    yield {'type': 'stream_complete', 'thread_id': thread_id}
+
+
+async def stream_agent_response(
+    query: str,
+    auto_approve: bool = True,
+    plan_mode: bool = False,
+    user_id: Optional[str] = None,
+    session_id: Optional[str] = None,
+    compact_tool_results: bool = False
+):
+    """
+    Stream agent events as SSE, coalescing events produced close together into one write.
+
+    Args:
+        query, auto_approve, plan_mode, user_id, session_id: See agent_event_stream
+        compact_tool_results: Send large tool results as a preview plus a result_id
+            (full content from /api/threads/{thread_id}/tool-results/{result_id})
+    """
+    # Same thread_id fallback as agent_event_stream (scopes referenced results)
+    thread_id = session_id or user_id or "web-session"
+    encoder = SSEEncoder(thread_id, compact=compact_tool_results)
+
+    async for data in encoder.stream(
+        agent_event_stream(query, auto_approve, plan_mode, user_id, session_id)
+    ):
+        yield data
+
+    logger.info(f"[SSE Stream] Encoder stats for thread {thread_id}: {encoder.get_stats()}")
 
 
 class ChatRequest(BaseModel):
@@ -503,6 +566,7 @@ class ChatRequest(BaseModel):
     auto_approve: bool = Field(True, description="Whether to auto-approve tool calls")
     plan_mode: bool = Field(False, description="Enable planning workflow (default: direct execution)")
     session_id: Optional[str] = Field(None, description="Session ID for conversation persistence")
+    compact_tool_results: bool = Field(False, description="Send large tool results by reference (fetch via tool-results endpoint)")
 
 
 @app.post("/api/chat")
@@ -538,7 +602,8 @@ async def chat(
             auto_approve=request.auto_approve,
             plan_mode=request.plan_mode,
             user_id=user_id,
-            session_id=session_id
+            session_id=session_id,
+            compact_tool_results=request.compact_tool_results
         ),
         media_type="text/event-stream"
     )
@@ -549,15 +614,29 @@ async def chat(
 # ============================================================================
 
 @app.get("/api/workspace/tree", response_model=List[FileNode])
-async def get_workspace_tree() -> List[FileNode]:
+async def get_workspace_tree(
+    path: str = Query(default="", description="Relative directory to list (default: workspace root)"),
+    depth: Optional[int] = Query(default=None, ge=1, description="Directory levels to include (default: all)"),
+    if_none_match: Optional[str] = Header(default=None)
+):
     """
     Return hierarchical file/folder tree structure for workspace.
 
+    Served from the in-memory WorkspaceTreeIndex (kept current by the file
+    watcher), so requests never walk the workspace on the event loop. The
+    ETag changes whenever the index does; a matching If-None-Match yields
+    304 Not Modified. Directories beyond depth have children = null and
+    can be loaded with ?path=<dir>.
+
+    Args:
+        path: Relative directory path (default: workspace root)
+        depth: Levels of directories to expand (default: full subtree)
+
     Returns:
-        List of root FileNode objects with nested children
+        List of FileNode objects (children of path) with nested children
 
     Raises:
-        HTTPException: 500 if workspace directory doesn't exist
+        HTTPException: 404 if path is not a directory, 500 if workspace directory doesn't exist
     """
     try:
         if not WORKSPACE_ROOT.exists():
@@ -566,82 +645,111 @@ async def get_workspace_tree() -> List[FileNode]:
                 detail=f"Workspace directory not found: {WORKSPACE_ROOT}"
             )
 
-        def build_tree(directory: Path, base_path: Path) -> List[FileNode]:
-            """Recursively build file tree structure."""
-            nodes = []
+        # Normalize and confine the subtree path to the workspace
+        relative_dir = workspace_relative_path(validate_workspace_path(path)) if path.strip("/") else ""
 
-            try:
-                items = sorted(directory.iterdir(), key=lambda x: (not x.is_dir(), x.name))
-            except PermissionError:
-                return nodes
-
-            for item in items:
-                # Skip hidden files
-                if item.name.startswith('.'):
-                    continue
-
-                relative_path = str(item.relative_to(base_path))
-                node_id = relative_path.replace('/', '_').replace('\\', '_')
-
-                if item.is_dir():
-                    node = FileNode(
-                        id=node_id,
-                        name=item.name,
-                        path=relative_path,
-                        type="directory",
-                        children=build_tree(item, base_path),
-                        lastModified=item.stat().st_mtime
-                    )
-                else:
-                    stat = item.stat()
-                    node = FileNode(
-                        id=node_id,
-                        name=item.name,
-                        path=relative_path,
-                        type="file",
-                        size=stat.st_size,
-                        extension=item.suffix,
-                        lastModified=stat.st_mtime
-                    )
+        await workspace_index.ensure_built()
 
-                nodes.append(node)
+        etag = workspace_index.etag_for(relative_dir, depth)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
 
-            return nodes
+        try:
+            etag, body = await asyncio.to_thread(workspace_index.render, relative_dir, depth)
+        except TreePathError:
+            raise HTTPException(status_code=404, detail=f"Directory not found: {path}")
 
-        return build_tree(WORKSPACE_ROOT, WORKSPACE_ROOT)
+        headers["ETag"] = etag
+        return Response(content=body, media_type="application/json", headers=headers)
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/workspace/file", response_model=FileContent)
 async def get_file_content(
-    path: str = Query(..., description="Relative path from workspace root")
+    request: Request,
+    path: str = Query(..., description="Relative path from workspace root"),
+    stream: bool = Query(False, description="Stream raw file bytes instead of a JSON body")
 ) -> FileContent:
     """
     Return content of specific file.
 
+    By default responds with FileContent JSON. With ?stream=true or a Range
+    header, the raw bytes are streamed from disk in chunks (206 Partial
+    Content for a satisfiable single range). All reads run in a worker
+    thread. Responses carry ETag (mtime + size) and Last-Modified, and a
+    matching If-None-Match / If-Modified-Since returns 304.
+
     Args:
         path: Relative file path from workspace root
+        stream: Stream the raw file (default: False)
 
     Returns:
         FileContent with content string and metadata
 
     Raises:
-        HTTPException: 400 for invalid path, 404 if file not found, 403 for access denied
+        HTTPException: 400 for invalid path, 404 if file not found, 403 for access denied,
+                       416 for an unsatisfiable range
     """
     try:
         full_path = validate_workspace_path(path)
 
-        if not full_path.exists():
+        try:
+            stat = await asyncio.to_thread(full_path.stat)
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail=f"File not found: {path}")
 
-        if not full_path.is_file():
+        if not S_ISREG(stat.st_mode):
             raise HTTPException(status_code=400, detail=f"Path is not a file: {path}")
 
+        headers = {
+            "ETag": file_etag(stat),
+            "Last-Modified": last_modified(stat),
+            "Accept-Ranges": "bytes",
+            "Cache-Control": "no-cache"
+        }
+
+        if is_not_modified(
+            stat,
+            request.headers.get("if-none-match"),
+            request.headers.get("if-modified-since")
+        ):
+            return Response(status_code=304, headers=headers)
+
+        range_header = request.headers.get("range")
+        if stream or range_header:
+            try:
+                byte_range = parse_range(range_header, stat.st_size)
+            except RangeNotSatisfiable:
+                raise HTTPException(
+                    status_code=416,
+                    detail=f"Range not satisfiable: {range_header}",
+                    headers={"Content-Range": f"bytes */{stat.st_size}"}
+                )
+
+            start, end = byte_range if byte_range else (0, stat.st_size - 1)
+            headers["Content-Length"] = str(max(end - start + 1, 0))
+            if byte_range:
+                headers["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+
+            media_type = mimetypes.guess_type(full_path.name)[0] or "text/plain"
+            if media_type.startswith("text/"):
+                media_type += "; charset=utf-8"
+
+            return StreamingResponse(
+                iter_file_range(full_path, start, end),
+                status_code=206 if byte_range else 200,
+                media_type=media_type,
+                headers=headers
+            )
+
         # Read file content
         try:
-            content = full_path.read_text(encoding='utf-8')
+            content = await asyncio.to_thread(full_path.read_text, encoding='utf-8')
         except UnicodeDecodeError:
             # Handle binary files
             raise HTTPException(
@@ -650,14 +758,16 @@ async def get_file_content(
             )
 
         # Get file metadata
-        stat = full_path.stat()
         metadata = FileMetadata(
             size=stat.st_size,
             lastModified=stat.st_mtime,
             extension=full_path.suffix
         )
 
-        return FileContent(content=content, metadata=metadata)
+        return JSONResponse(
+            content=FileContent(content=content, metadata=metadata).model_dump(),
+            headers=headers
+        )
 
     except HTTPException:
         raise
@@ -687,6 +797,7 @@ async def save_file_content(request: SaveFileRequest) -> SaveFileResponse:
 
         # Write file content
         full_path.write_text(request.content, encoding='utf-8')
+        await workspace_index.refresh_path(workspace_relative_path(full_path))
 
         # Get updated metadata
         stat = full_path.stat()
@@ -754,6 +865,7 @@ async def create_new_file(request: CreateFileRequest) -> SaveFileResponse:
 
         # Write initial content
         full_path.write_text(request.content, encoding='utf-8')
+        await workspace_index.refresh_path(workspace_relative_path(full_path))
 
         # Get metadata
         stat = full_path.stat()
@@ -804,6 +916,7 @@ async def create_new_folder(request: CreateFolderRequest):
 
         # Create folder
         full_path.mkdir(parents=True, exist_ok=False)
+        await workspace_index.refresh_path(workspace_relative_path(full_path))
 
         return {
             "success": True,
@@ -836,6 +949,7 @@ class ApprovalDecisionRequest(BaseModel):
     request_id: str = Field(..., description="Unique request identifier")
     approved: bool = Field(..., description="Whether to approve the tool call")
     feedback: Optional[str] = Field(None, description="Optional feedback message")
+    thread_id: Optional[str] = Field(None, description="Session that owns the request (checked when given)")
 
 
 @app.post("/api/approval/decision")
@@ -844,7 +958,7 @@ async def approval_decision(request: ApprovalDecisionRequest):
     Receive approval decision from frontend.
 
     Args:
-        request: ApprovalDecisionRequest with request_id, approved, and optional feedback
+        request: ApprovalDecisionRequest with request_id, approved, and optional feedback/thread_id
 
     Returns:
         {"status": "ok"} if successful, or error details
@@ -853,7 +967,8 @@ async def approval_decision(request: ApprovalDecisionRequest):
         result = await submit_approval_decision(
             request_id=request.request_id,
             approved=request.approved,
-            feedback=request.feedback
+            feedback=request.feedback,
+            thread_id=request.thread_id
         )
         return result
     except Exception as e:
@@ -861,27 +976,61 @@ async def approval_decision(request: ApprovalDecisionRequest):
         return {"status": "error", "message": str(e)}
 
 
+async def _user_owns_thread(user_id: str, thread_id: str) -> bool:
+    """True if thread_id is the user's own session or one of their user_threads."""
+    if thread_id == user_id:
+        return True
+    try:
+        async with get_pool().connection() as conn:
+            async with conn.cursor(row_factory=tuple_row) as cur:
+                await cur.execute(
+                    "SELECT 1 FROM user_threads WHERE user_id = %s AND thread_id = %s",
+                    (user_id, thread_id)
+                )
+                return await cur.fetchone() is not None
+    except Exception as e:
+        logger.error(f"❌ [Plan WebSocket] Thread ownership check failed: {e}")
+        return False
+
+
 @app.websocket("/ws/plan")
-async def plan_websocket_endpoint(websocket: WebSocket, token: str = Query("dummy")):
+async def plan_websocket_endpoint(
+    websocket: WebSocket,
+    token: Optional[str] = Query(None),
+    thread_id: Optional[str] = Query(None)
+):
     """
     WebSocket endpoint for real-time plan event broadcasting.
 
     This endpoint broadcasts plan events (plan_created, step_started, step_completed)
-    to all connected clients for real-time UI updates.
+    to all connected clients for real-time UI updates. Session-private events
+    (tool approval requests) are sent only to sockets that name their thread_id;
+    naming one requires a valid token whose user owns that thread, otherwise
+    the connection is refused.
 
     Args:
         websocket: WebSocket connection
-        token: JWT authentication token (optional, defaults to "dummy" for development)
+        token: JWT authentication token (required only with thread_id)
+        thread_id: Chat session whose private events this socket receives (optional)
     """
     logger.info("🔌 [Plan WebSocket] New connection request")
 
-    # Accept connection (token validation is optional for plan events)
+    if thread_id:
+        owner_id = verify_token(token) if token else None
+        if not owner_id or not await _user_owns_thread(owner_id, thread_id):
+            logger.warning(f"🚫 [Plan WebSocket] Unauthorized subscription to thread: {thread_id}")
+            await websocket.close(code=1008, reason="Not authorized for this thread")
+            return
+
+    # Accept connection (plan events need no token; session events were checked above)
     await websocket.accept()
     logger.info("🤝 [Plan WebSocket] Connection accepted")
 
     # Register with connection manager using special "_plan_events" room
     user_id = "plan_subscriber"
     await manager.connect(websocket, "_plan_events", user_id)
+    if thread_id:
+        await manager.connect_session(websocket, thread_id)
 
     try:
         # Keep connection alive and listen for client messages (if any)
@@ -897,18 +1046,49 @@ async def plan_websocket_endpoint(websocket: WebSocket, token: str = Query("dumm
     finally:
         # Cleanup connection
         await manager.disconnect(websocket, "_plan_events", user_id)
+        if thread_id:
+            await manager.disconnect_session(websocket, thread_id)
         logger.info("✅ [Plan WebSocket] Cleanup complete")
 
 
+async def _send_file_snapshot(websocket: WebSocket, file_path: str, binary: bool = False) -> bool:
+    """
+    Stream the current file content from disk with its version.
+
+    Returns:
+        False if the file does not exist
+    """
+    full_path = validate_workspace_path(file_path)
+    if not (full_path.exists() and full_path.is_file()):
+        return False
+
+    await manager.send_initial_content(websocket, file_path, full_path, binary=binary)
+    return True
+
+
 @app.websocket("/ws/workspace/{file_path:path}")
-async def websocket_endpoint(websocket: WebSocket, file_path: str, token: str = Query(...)):
+async def websocket_endpoint(
+    websocket: WebSocket,
+    file_path: str,
+    token: str = Query(...),
+    delta: bool = Query(False, description="Receive file_patch messages instead of full snapshots"),
+    binary: bool = Query(False, description="Receive large-file chunks as binary frames")
+):
     """
     WebSocket endpoint for real-time file synchronization.
 
+    Clients connecting with ?delta=true receive file_patch messages (see
+    ConnectionManager._broadcast_patch). If a patch does not apply, the
+    client sends {"type": "resync_request"} and gets a fresh initial_content.
+    With ?binary=true, chunks of files over 100KB arrive as binary frames
+    (4-byte header length, JSON header, UTF-8 payload).
+
     Args:
         websocket: WebSocket connection
         file_path: Relative path from workspace root
         token: JWT authentication token
+        delta: Opt into delta mode (default: False)
+        binary: Opt into binary chunk frames (default: False)
     """
     logger.info(f"🔌 [WebSocket] New connection request for file: {file_path}")
 
@@ -928,18 +1108,13 @@ async def websocket_endpoint(websocket: WebSocket, file_path: str, token: str =
     try:
         # Send initial content BEFORE registering with manager
         # This ensures we only track connections that are fully functional
-        full_path = validate_workspace_path(file_path)
-        if full_path.exists() and full_path.is_file():
-            initial_content = full_path.read_text(encoding='utf-8')
-            await websocket.send_json({"type": "initial_content", "new_content": initial_content})
-            logger.info(f"📤 [WebSocket] Sent initial_content for {file_path} ({len(initial_content)} chars)")
-        else:
+        if not await _send_file_snapshot(websocket, file_path, binary=binary):
             logger.warning(f"⚠️  [WebSocket] File not found: {file_path}")
 
         # Register connection with manager ONLY after initial send succeeds
         # This prevents zombie connections where manager tracks broken sockets
-        await manager.connect(websocket, file_path, user_id)
-        logger.info(f"📝 [WebSocket] Registered with manager: {file_path}, user: {user_id}")
+        await manager.connect(websocket, file_path, user_id, delta=delta, binary=binary)
+        logger.info(f"📝 [WebSocket] Registered with manager: {file_path}, user: {user_id}, delta: {delta}, binary: {binary}")
 
         # Keep alive with ping/pong
         logger.info(f"💓 [WebSocket] Entering ping/pong keep-alive loop for {file_path}")
@@ -950,6 +1125,15 @@ async def websocket_endpoint(websocket: WebSocket, file_path: str, token: str =
                 if data == "ping":
                     await websocket.send_text("pong")
                     logger.debug(f"🏓 [WebSocket] Sent pong to {user_id}")
+                elif data.startswith("{"):
+                    try:
+                        message = json.loads(data)
+                    except json.JSONDecodeError:
+                        continue
+                    if message.get("type") == "resync_request":
+                        # Client's version diverged - resend full snapshot
+                        logger.info(f"🔄 [WebSocket] Resync requested by {user_id} for {file_path}")
+                        await _send_file_snapshot(websocket, file_path, binary=binary)
             except WebSocketDisconnect as e:
                 logger.info(f"🔌 [WebSocket] Client disconnected: {file_path}, user: {user_id}, code: {e.code}")
                 break
@@ -1261,13 +1445,16 @@ class Thread(BaseModel):
     created_at: str = Field(..., description="ISO timestamp of creation")
     updated_at: str = Field(..., description="ISO timestamp of last update")
     message_count: int = Field(default=0, description="Number of messages in thread")
+    last_checkpoint_at: Optional[str] = Field(None, description="ISO timestamp of the latest checkpoint")
     is_archived: bool = Field(default=False, description="Archived status")
 
 
 class ThreadListResponse(BaseModel):
     """Response model for thread listing."""
     threads: List[Thread] = Field(default_factory=list, description="List of conversation threads")
-    total_count: int = Field(0, description="Total number of threads")
+    total_count: int = Field(0, description="Number of threads in this page")
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page (None on last page)")
+    has_more: bool = Field(default=False, description="Whether more threads follow this page")
 
 
 class CreateThreadRequest(BaseModel):
@@ -1358,12 +1545,9 @@ async def create_thread(request: CreateThreadRequest):
         thread_title = request.thread_title or "New Conversation"
         created_at = datetime.now().isoformat()
 
-        # Get database URI from environment
-        db_uri = os.getenv("POSTGRES_URI", "postgresql://localhost:5432/langgraph_checkpoints")
-
         # Insert into user_threads table
-        async with await psycopg.AsyncConnection.connect(db_uri) as conn:
-            async with conn.cursor() as cur:
+        async with get_pool().connection() as conn:
+            async with conn.cursor(row_factory=tuple_row) as cur:
                 await cur.execute("""
                     INSERT INTO user_threads (user_id, thread_id, thread_title, created_at, updated_at)
                     VALUES (%s, %s, %s, NOW(), NOW())
@@ -1371,7 +1555,6 @@ async def create_thread(request: CreateThreadRequest):
                 """, (request.user_id, thread_id, thread_title))
 
                 result = await cur.fetchone()
-                await conn.commit()
 
         logger.info(f"✅ [Threads] Created new thread: {thread_id} for user: {request.user_id}")
 
@@ -1389,32 +1572,69 @@ async def create_thread(request: CreateThreadRequest):
         )
 
 
+def _encode_thread_cursor(updated_at: datetime, thread_id: str) -> str:
+    """Encode the keyset position (updated_at, thread_id) as an opaque cursor."""
+    payload = json.dumps([updated_at.isoformat(), thread_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def _decode_thread_cursor(cursor: str) -> tuple:
+    """
+    Decode a cursor produced by _encode_thread_cursor.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        updated_at, thread_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(updated_at), str(thread_id)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {str(e)}")
+
+
 @app.get("/api/threads/list", response_model=ThreadListResponse)
 async def list_threads(
     user_id: str = Query(default="anonymous", description="User identifier"),
-    include_archived: bool = Query(default=False, description="Include archived threads")
+    include_archived: bool = Query(default=False, description="Include archived threads"),
+    cursor: Optional[str] = Query(default=None, description="Cursor from a previous page's next_cursor"),
+    limit: int = Query(default=50, ge=1, le=200, description="Maximum threads per page")
 ):
     """
-    List all conversation threads for a user.
+    List conversation threads for a user, one page at a time.
 
-    Returns threads sorted by most recently updated first.
-    Includes message count from checkpoints table.
+    Returns threads sorted by most recently updated first. Message counts are
+    read from the materialized user_threads.message_count column (maintained
+    by a trigger on checkpoints, see migrations/004_thread_message_counts.sql),
+    so the cost of a page does not depend on checkpoint volume.
+
+    Pagination is keyset-based on (updated_at, thread_id): pass the returned
+    next_cursor back as cursor to fetch the following page.
 
     Args:
         user_id: User identifier (default: "anonymous")
         include_archived: Include archived threads (default: False)
+        cursor: Opaque cursor from the previous response (default: first page)
+        limit: Page size, 1-200 (default: 50)
 
     Returns:
-        ThreadListResponse with list of threads and total count
+        ThreadListResponse with the page of threads and the next cursor
 
     Example:
-        GET /api/threads/list?user_id=user123&include_archived=false
+        GET /api/threads/list?user_id=user123&include_archived=false&limit=20
     """
     try:
-        db_uri = os.getenv("POSTGRES_URI", "postgresql://localhost:5432/langgraph_checkpoints")
-
-        # Build query based on include_archived flag
+        # Build query based on include_archived flag and cursor position
         archive_filter = "" if include_archived else "AND t.is_archived = false"
+        params = [user_id]
+
+        cursor_filter = ""
+        if cursor:
+            cursor_updated_at, cursor_thread_id = _decode_thread_cursor(cursor)
+            cursor_filter = "AND (t.updated_at, t.thread_id) < (%s, %s)"
+            params.extend([cursor_updated_at, cursor_thread_id])
+
+        # Fetch one extra row to detect whether another page exists
+        params.append(limit + 1)
 
         query = f"""
             SELECT
@@ -1424,19 +1644,22 @@ async def list_threads(
                 t.created_at,
                 t.updated_at,
                 t.is_archived,
-                COUNT(DISTINCT c.checkpoint_id) as message_count
+                t.message_count,
+                t.last_checkpoint_at
             FROM user_threads t
-            LEFT JOIN checkpoints c ON c.thread_id = t.thread_id::text
-            WHERE t.user_id = %s {archive_filter}
-            GROUP BY t.thread_id, t.thread_title, t.user_id, t.created_at, t.updated_at, t.is_archived
-            ORDER BY t.updated_at DESC
+            WHERE t.user_id = %s {archive_filter} {cursor_filter}
+            ORDER BY t.updated_at DESC, t.thread_id DESC
+            LIMIT %s
         """
 
-        async with await psycopg.AsyncConnection.connect(db_uri) as conn:
-            async with conn.cursor() as cur:
-                await cur.execute(query, (user_id,))
+        async with get_pool().connection() as conn:
+            async with conn.cursor(row_factory=tuple_row) as cur:
+                await cur.execute(query, params)
                 rows = await cur.fetchall()
 
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
         # Convert to Thread models
         threads = []
         for row in rows:
@@ -1447,16 +1670,26 @@ async def list_threads(
                 created_at=row[3].isoformat() if row[3] else datetime.now().isoformat(),
                 updated_at=row[4].isoformat() if row[4] else datetime.now().isoformat(),
                 message_count=row[6] or 0,
+                last_checkpoint_at=row[7].isoformat() if row[7] else None,
                 is_archived=row[5] or False
             ))
 
-        logger.info(f"📊 [Threads] Retrieved {len(threads)} threads for user: {user_id}")
+        next_cursor = None
+        if has_more and rows:
+            last_row = rows[-1]
+            next_cursor = _encode_thread_cursor(last_row[4], last_row[0])
+
+        logger.info(f"📊 [Threads] Retrieved {len(threads)} threads for user: {user_id} (has_more={has_more})")
 
         return ThreadListResponse(
             threads=threads,
-            total_count=len(threads)
+            total_count=len(threads),
+            next_cursor=next_cursor,
+            has_more=has_more
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ [Threads] Failed to list threads: {e}")
         raise HTTPException(
@@ -1485,10 +1718,8 @@ async def update_thread_title(
         {"thread_title": "Updated Title"}
     """
     try:
-        db_uri = os.getenv("POSTGRES_URI", "postgresql://localhost:5432/langgraph_checkpoints")
-
-        async with await psycopg.AsyncConnection.connect(db_uri) as conn:
-            async with conn.cursor() as cur:
+        async with get_pool().connection() as conn:
+            async with conn.cursor(row_factory=tuple_row) as cur:
                 # Update title and updated_at timestamp
                 await cur.execute("""
                     UPDATE user_threads
@@ -1498,7 +1729,6 @@ async def update_thread_title(
                 """, (request.thread_title, thread_id))
 
                 result = await cur.fetchone()
-                await conn.commit()
 
                 if not result:
                     raise HTTPException(
@@ -1545,10 +1775,8 @@ async def delete_thread(
         DELETE /api/threads/550e8400-e29b-41d4-a716-446655440000?permanent=false
     """
     try:
-        db_uri = os.getenv("POSTGRES_URI", "postgresql://localhost:5432/langgraph_checkpoints")
-
-        async with await psycopg.AsyncConnection.connect(db_uri) as conn:
-            async with conn.cursor() as cur:
+        async with get_pool().connection() as conn:
+            async with conn.cursor(row_factory=tuple_row) as cur:
                 if permanent:
                     # Permanent delete from database
                     await cur.execute("""
@@ -1565,7 +1793,6 @@ async def delete_thread(
                     """, (thread_id,))
 
                 result = await cur.fetchone()
-                await conn.commit()
 
                 if not result:
                     raise HTTPException(
@@ -1592,6 +1819,31 @@ async def delete_thread(
         )
 
 
+@app.get("/api/threads/{thread_id}/tool-results/{result_id}")
+async def get_tool_result(thread_id: str, result_id: str):
+    """
+    Fetch a tool result that a compact chat stream sent by reference.
+
+    Args:
+        thread_id: Thread the result was streamed to
+        result_id: result_id from the truncated tool_result event
+
+    Returns:
+        Full tool result content
+
+    Example:
+        GET /api/threads/550e8400-e29b-41d4-a716-446655440000/tool-results/9f1c...
+    """
+    content = tool_result_store.get(thread_id, result_id)
+    if content is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Tool result not found (or expired): {result_id}"
+        )
+
+    return {"thread_id": thread_id, "result_id": result_id, "content": content}
+
+
 @app.get("/health")
 async def health():
     """Health check endpoint with WebSocket status."""
@@ -1600,7 +1852,13 @@ async def health():
         "version": "2.5",
         "websocket_enabled": True,
         "file_watcher_enabled": file_watcher is not None,
+        "file_watcher": file_watcher.get_stats() if file_watcher else None,
         "active_connections": sum(len(conns) for conns in manager.active_connections.values()),
+        "event_bus": module_2_2_simple.event_bus.get_stats(),
+        "broadcast_dispatcher": module_2_2_simple.broadcast_dispatcher.get_stats(),
+        "approvals": module_2_2_simple.approval_registry.get_stats(),
+        "ace_reflection": ace_middleware.get_reflection_stats(),
+        "db_pool": get_pool_stats(),
         "features": {
             "plan_tracking": True,
             "sqlite_persistence": True,
@@ -0,0 +1,99 @@
+"""
+Thread Message Count Backfill Script
+Populates user_threads.message_count / last_checkpoint_at from existing checkpoints
+
+Run once after migrations/004_thread_message_counts.sql:
+    python run_migration.py migrations/004_thread_message_counts.sql
+    python backfill_thread_counts.py [batch_size]
+
+Threads are processed in keyset-ordered batches so each UPDATE touches a
+bounded number of rows. Each batch locks its user_threads rows before
+counting, so a trigger increment from migration 004 either commits before
+the count (and is included in it) or waits for the batch to commit (and is
+added on top); the backfill can run while the server writes checkpoints,
+and re-running is safe.
+"""
+import asyncio
+import os
+import psycopg
+
+
+DEFAULT_BATCH_SIZE = 500
+
+# Separate statement: the count below must read a snapshot taken after the locks
+LOCK_BATCH_SQL = """
+    SELECT thread_id
+    FROM user_threads
+    WHERE thread_id > %s
+    ORDER BY thread_id
+    LIMIT %s
+    FOR UPDATE
+"""
+
+BACKFILL_BATCH_SQL = """
+    WITH counts AS (
+        SELECT
+            t.thread_id,
+            COUNT(c.checkpoint_id) AS message_count,
+            MAX((c.checkpoint->>'ts')::timestamptz) AS last_checkpoint_at
+        FROM user_threads t
+        LEFT JOIN checkpoints c ON c.thread_id = t.thread_id
+        WHERE t.thread_id = ANY(%s)
+        GROUP BY t.thread_id
+    )
+    UPDATE user_threads t
+    SET message_count = counts.message_count,
+        last_checkpoint_at = counts.last_checkpoint_at
+    FROM counts
+    WHERE t.thread_id = counts.thread_id
+    RETURNING t.thread_id
+"""
+
+
+async def backfill_thread_counts(batch_size: int = DEFAULT_BATCH_SIZE):
+    """Recompute materialized counts for every thread, one batch per transaction"""
+    db_uri = os.getenv("POSTGRES_URI", "postgresql://localhost:5432/langgraph_checkpoints")
+
+    print(f"🔄 Backfilling thread message counts (batch size: {batch_size})")
+    print(f"🗄️  Database: {db_uri}")
+    print("-" * 60)
+
+    last_thread_id = ""
+    total = 0
+
+    try:
+        async with await psycopg.AsyncConnection.connect(db_uri) as conn:
+            while True:
+                # Lock, count and update in one transaction
+                async with conn.cursor() as cur:
+                    await cur.execute(LOCK_BATCH_SQL, (last_thread_id, batch_size))
+                    thread_ids = [row[0] for row in await cur.fetchall()]
+                    rows = []
+                    if thread_ids:
+                        await cur.execute(BACKFILL_BATCH_SQL, (thread_ids,))
+                        rows = await cur.fetchall()
+                await conn.commit()
+
+                if not rows:
+                    break
+
+                total += len(rows)
+                last_thread_id = max(row[0] for row in rows)
+                print(f"   ✅ {total} thread(s) updated (last: {last_thread_id})")
+
+                if len(rows) < batch_size:
+                    break
+
+        print(f"✅ Backfill complete: {total} thread(s)")
+
+    except Exception as e:
+        print(f"❌ Backfill failed: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    import sys
+
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BATCH_SIZE
+
+    asyncio.run(backfill_thread_counts(batch_size))
@@ -0,0 +1,263 @@
+"""
+Main-Loop WebSocket Broadcast Dispatcher.
+
+Synchronous tools (write_file, edit_file, plan tools) run in worker threads
+but need to notify WebSocket clients whose sockets belong to the server's
+event loop. This module provides a single dispatcher bound to that loop:
+
+- Thread-safe submission from any thread (no per-event threads or loops)
+- Pending events drained in batches by one task on the main loop
+- Coalescing: a newer file change / plan update replaces a pending one for
+  the same file or plan (keeping the original old_content for file diffs)
+- Bounded backlog: when full, the oldest pending event is dropped
+- Counters exposed for /health
+
+Usage:
+    # FastAPI lifespan
+    broadcast_dispatcher.start(manager)
+    ...
+    await broadcast_dispatcher.stop()
+
+    # From any thread
+    broadcast_dispatcher.submit({"type": "agent_event", ...})
+    broadcast_dispatcher.submit_file_change(file_path, old, new, "ai_agent", metadata)
+"""
+
+import asyncio
+import itertools
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Maximum events waiting for delivery before the oldest is dropped
+DEFAULT_MAX_PENDING = 1024
+
+# Maximum events delivered per drain iteration (yields to the loop in between)
+DEFAULT_BATCH_SIZE = 64
+
+# Event types where only the latest state per plan matters
+COALESCED_EVENT_TYPES = frozenset({"plan_updated"})
+
+
+class BroadcastDispatcher:
+    """
+    Collects broadcasts from worker threads and delivers them on the main loop.
+
+    Pending events live in an OrderedDict keyed by a coalescing key so that
+    repeated updates to the same file or plan collapse into one delivery.
+    Non-coalescable events get a unique key and keep their submission order.
+    """
+
+    def __init__(
+        self,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ):
+        self._max_pending = max_pending
+        self._batch_size = batch_size
+        self._lock = threading.Lock()
+        self._pending: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._seq = itertools.count()
+
+        self._manager = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+        self._stats = {
+            "submitted": 0,
+            "coalesced": 0,
+            "dropped": 0,
+            "delivered": 0,
+            "batches": 0,
+            "errors": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle (main loop only)
+    # ------------------------------------------------------------------
+
+    def start(self, manager) -> None:
+        """
+        Bind to the running event loop and start the delivery task.
+
+        Args:
+            manager: ConnectionManager whose sockets live on this loop
+        """
+        if self._task is not None and not self._task.done():
+            return
+
+        self._manager = manager
+        self._stopping = False
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = self._loop.create_task(self._run(), name="broadcast-dispatcher")
+
+        # Deliver anything submitted before startup
+        with self._lock:
+            if self._pending:
+                self._wakeup.set()
+
+        logger.info("✅ [Broadcast] Dispatcher started on main event loop")
+
+    async def stop(self) -> None:
+        """Deliver remaining events and stop the delivery task."""
+        task, self._task = self._task, None
+        if task is None:
+            return
+
+        # Let the task finish the batch it is delivering instead of cancelling it
+        self._stopping = True
+        self._wakeup.set()
+        await task
+
+        # Events submitted while the task was finishing
+        await self._drain()
+        self._loop = None
+        logger.info(f"🛑 [Broadcast] Dispatcher stopped (stats: {self._stats})")
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ------------------------------------------------------------------
+    # Submission (any thread)
+    # ------------------------------------------------------------------
+
+    def submit(self, message: dict, key: Optional[Hashable] = None) -> bool:
+        """
+        Queue a message for manager.broadcast().
+
+        Args:
+            message: JSON-serializable message sent to all connections
+            key: Optional coalescing key; defaults to (event_type, plan_id)
+                 for plan_updated events and a unique key otherwise
+
+        Returns:
+            True if queued (or coalesced), False if the dispatcher is not running
+        """
+        if key is None:
+            event_type = message.get("event_type")
+            plan_id = (message.get("data") or {}).get("plan_id")
+            if event_type in COALESCED_EVENT_TYPES and plan_id:
+                key = ("plan", event_type, plan_id)
+
+        return self._enqueue(key, ("broadcast", message))
+
+    def submit_file_change(
+        self,
+        file_path: str,
+        old_content: str,
+        new_content: str,
+        editor_user_id: str,
+        change_metadata: Optional[dict] = None
+    ) -> bool:
+        """
+        Queue a manager.broadcast_file_change() call.
+
+        A pending change for the same file is replaced, keeping its
+        old_content so the delivered diff spans both edits.
+
+        Returns:
+            True if queued (or coalesced), False if the dispatcher is not running
+        """
+        payload = {
+            "file_path": file_path,
+            "old_content": old_content,
+            "new_content": new_content,
+            "editor_user_id": editor_user_id,
+            "change_metadata": change_metadata,
+        }
+        return self._enqueue(("file", file_path), ("file_change", payload))
+
+    def _enqueue(self, key: Optional[Hashable], item: tuple) -> bool:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            with self._lock:
+                self._stats["dropped"] += 1
+            logger.debug("[Broadcast] Dispatcher not running - event dropped")
+            return False
+
+        with self._lock:
+            self._stats["submitted"] += 1
+            was_empty = not self._pending
+
+            if key is not None and key in self._pending:
+                kind, payload = item
+                if kind == "file_change":
+                    # Diff against the content clients last saw
+                    payload["old_content"] = self._pending[key][1]["old_content"]
+                self._pending[key] = item
+                self._pending.move_to_end(key)
+                self._stats["coalesced"] += 1
+                return True
+
+            if len(self._pending) >= self._max_pending:
+                self._pending.popitem(last=False)
+                self._stats["dropped"] += 1
+
+            self._pending[key if key is not None else ("event", next(self._seq))] = item
+
+        if was_empty:
+            try:
+                loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                # Loop closed between the check above and now
+                return False
+        return True
+
+    # ------------------------------------------------------------------
+    # Delivery (main loop only)
+    # ------------------------------------------------------------------
+
+    def _take_batch(self) -> list:
+        with self._lock:
+            batch = []
+            while self._pending and len(batch) < self._batch_size:
+                batch.append(self._pending.popitem(last=False)[1])
+            return batch
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            await self._drain()
+
+    async def _drain(self) -> None:
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return
+            self._stats["batches"] += 1
+            for kind, payload in batch:
+                await self._deliver(kind, payload)
+
+    async def _deliver(self, kind: str, payload: Any) -> None:
+        if self._manager is None:
+            return
+        try:
+            if kind == "file_change":
+                await self._manager.broadcast_file_change(**payload)
+            else:
+                await self._manager.broadcast(payload)
+            self._stats["delivered"] += 1
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"⚠️  [Broadcast] Delivery failed ({kind}): {e}")
+
+    def get_stats(self) -> dict:
+        """Return dispatcher counters for /health."""
+        with self._lock:
+            return {
+                **self._stats,
+                "pending": len(self._pending),
+                "running": self.running,
+            }
+
+
+# Global dispatcher instance (started in FastAPI lifespan)
+broadcast_dispatcher = BroadcastDispatcher()
@@ -0,0 +1,135 @@
+"""
+Shared Async PostgreSQL Connection Pool.
+
+This module owns the single psycopg_pool.AsyncConnectionPool used by the
+backend process:
+- Created once in the FastAPI lifespan (see open_connection_pool)
+- Shared by the LangGraph AsyncPostgresSaver and the thread-management endpoints
+- Configurable min/max size, idle/lifetime limits and checkout health checks
+- Pool metrics exposed for the /health endpoint
+
+Configuration (environment variables):
+    POSTGRES_URI                 Connection string
+    POSTGRES_POOL_MIN_SIZE       Connections kept open (default: 2)
+    POSTGRES_POOL_MAX_SIZE       Upper bound on open connections (default: 10)
+    POSTGRES_POOL_TIMEOUT        Seconds to wait for a free connection (default: 30)
+    POSTGRES_POOL_MAX_IDLE       Seconds before an idle connection is closed (default: 300)
+    POSTGRES_POOL_MAX_LIFETIME   Seconds before a connection is recycled (default: 3600)
+"""
+
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+
+logger = logging.getLogger(__name__)
+
+# Connection string (same default as module_2_2_simple.DB_URI)
+DB_URI = os.getenv("POSTGRES_URI", "postgresql://localhost:5432/langgraph_checkpoints")
+
+# Pool sizing and lifecycle configuration
+POOL_MIN_SIZE = int(os.getenv("POSTGRES_POOL_MIN_SIZE", "2"))
+POOL_MAX_SIZE = int(os.getenv("POSTGRES_POOL_MAX_SIZE", "10"))
+POOL_TIMEOUT = float(os.getenv("POSTGRES_POOL_TIMEOUT", "30"))
+POOL_MAX_IDLE = float(os.getenv("POSTGRES_POOL_MAX_IDLE", "300"))
+POOL_MAX_LIFETIME = float(os.getenv("POSTGRES_POOL_MAX_LIFETIME", "3600"))
+
+# Connection settings required by AsyncPostgresSaver:
+# - autocommit: setup() runs CREATE INDEX CONCURRENTLY
+# - prepare_threshold=0: avoid prepared-statement clashes behind PgBouncer
+# - dict_row: the saver reads rows by column name
+# Endpoints that index rows by position pass row_factory=tuple_row per cursor.
+CONNECTION_KWARGS = {
+    "autocommit": True,
+    "prepare_threshold": 0,
+    "row_factory": dict_row,
+}
+
+# Global pool instance (initialized in FastAPI lifespan)
+_pool: Optional[AsyncConnectionPool] = None
+
+
+@asynccontextmanager
+async def open_connection_pool(
+    conninfo: str = DB_URI,
+    min_size: int = POOL_MIN_SIZE,
+    max_size: int = POOL_MAX_SIZE
+) -> AsyncIterator[AsyncConnectionPool]:
+    """
+    Open the process-wide connection pool for the duration of the context.
+
+    Waits until min_size connections are established so that startup fails
+    fast when PostgreSQL is unreachable.
+
+    Usage in FastAPI lifespan:
+        async with open_connection_pool() as pool:
+            async with setup_checkpointer(pool) as saver:
+                ...
+    """
+    global _pool
+
+    pool = AsyncConnectionPool(
+        conninfo=conninfo,
+        min_size=min_size,
+        max_size=max_size,
+        timeout=POOL_TIMEOUT,
+        max_idle=POOL_MAX_IDLE,
+        max_lifetime=POOL_MAX_LIFETIME,
+        kwargs=CONNECTION_KWARGS,
+        check=AsyncConnectionPool.check_connection,  # Health check on checkout
+        name="tandem-backend",
+        open=False,
+    )
+
+    await pool.open(wait=True, timeout=POOL_TIMEOUT)
+    _pool = pool
+    logger.info(f"✅ [DB Pool] Opened PostgreSQL pool (min={min_size}, max={max_size})")
+
+    try:
+        yield pool
+    finally:
+        _pool = None
+        await pool.close()
+        logger.info("🛑 [DB Pool] PostgreSQL pool closed")
+
+
+def get_pool() -> AsyncConnectionPool:
+    """
+    Return the shared pool.
+
+    Raises:
+        RuntimeError: If called before the lifespan opened the pool
+    """
+    if _pool is None:
+        raise RuntimeError("PostgreSQL connection pool not initialized - server startup may have failed")
+    return _pool
+
+
+def get_pool_stats() -> dict:
+    """
+    Return pool metrics for /health.
+
+    Returns:
+        Dict with sizing config and psycopg_pool counters, or
+        {"initialized": False} before startup.
+    """
+    if _pool is None:
+        return {"initialized": False}
+
+    stats = _pool.get_stats()
+    return {
+        "initialized": True,
+        "min_size": _pool.min_size,
+        "max_size": _pool.max_size,
+        "pool_size": stats.get("pool_size", 0),
+        "pool_available": stats.get("pool_available", 0),
+        "requests_waiting": stats.get("requests_waiting", 0),
+        "requests_num": stats.get("requests_num", 0),
+        "requests_wait_ms": stats.get("requests_wait_ms", 0),
+        "requests_errors": stats.get("requests_errors", 0),
+        "connections_num": stats.get("connections_num", 0),
+        "connections_lost": stats.get("connections_lost", 0),
+    }
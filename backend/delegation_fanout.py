@@ -0,0 +1,289 @@
+"""
+Parallel Subagent Fan-Out for the Unified Graph.
+
+Runs every delegate_to_* call of a supervisor turn concurrently, using
+LangGraph Send:
+- Each delegation runs as its own branch with a private message channel
+  (SubagentBranchState), so branches never see or overwrite each other's
+  tool calls, tool results or thread metadata
+- Branches write one entry each into the supervisor's subagent_results
+  channel (merge_subagent_results reducer), keyed by delegation tool_call_id
+- A join node turns the results of the turn into a message for the supervisor
+  and clears the channel, so results are not kept in every later checkpoint
+- At most MAX_PARALLEL_SUBAGENTS branches of a run execute at once (the
+  run's max_concurrency, see fanout_run_config); the rest wait
+- A failing branch is reported as an error result and does not cancel the others
+- Branch progress reaches the chat stream when it is streamed with
+  subgraphs=True (subagent_type_from_namespace labels each update)
+
+Previously only the first delegate_to_* call of a turn was routed, so
+independent delegations were serialized across supervisor turns.
+"""
+
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langgraph.graph import END, MessagesState, StateGraph
+from langgraph.types import Command, Send
+
+logger = logging.getLogger(__name__)
+
+# Constants
+MAX_PARALLEL_SUBAGENTS = int(os.getenv("MAX_PARALLEL_SUBAGENTS", "3"))
+JOIN_NODE = "join_subagents"
+
+# Delegation tool name -> subagent type (branch node is "{type}_agent")
+DELEGATION_TARGETS = {
+    "delegate_to_researcher": "researcher",
+    "delegate_to_data_scientist": "data_scientist",
+    "delegate_to_expert_analyst": "expert_analyst",
+    "delegate_to_writer": "writer",
+    "delegate_to_reviewer": "reviewer",
+}
+
+NodeFn = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+def merge_subagent_results(
+    left: Optional[Dict[str, Dict[str, Any]]],
+    right: Optional[Dict[str, Dict[str, Any]]],
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Reducer for subagent_results: merge branch results by delegation id.
+
+    A None update clears the channel (written by the join once the results
+    are reported).
+    """
+    if right is None:
+        return {}
+    return {**(left or {}), **right}
+
+
+def fanout_run_config(max_parallel_subagents: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Run config bounding how many delegation branches run at once.
+
+    LangGraph applies max_concurrency per run (per superstep of that run), so
+    the limit covers one supervisor turn's fan-out and never makes unrelated
+    threads or runs wait on each other.
+
+    Args:
+        max_parallel_subagents: Branch limit (default: MAX_PARALLEL_SUBAGENTS)
+
+    Returns:
+        Config for compiled_graph.with_config(...)
+    """
+    return {"max_concurrency": max(1, max_parallel_subagents or MAX_PARALLEL_SUBAGENTS)}
+
+
+class SubagentBranchState(MessagesState):
+    """Private state of one delegation branch (own message channel)"""
+
+    task: str
+    delegation_id: str  # tool_call_id of the delegate_to_* call
+    subagent_type: str
+    parent_thread_id: Optional[str]
+    subagent_thread_id: Optional[str]
+
+
+def branch_node_name(subagent_type: str) -> str:
+    """Name of the unified-graph node that runs a subagent branch."""
+    return f"{subagent_type}_agent"
+
+
+# Branch node name -> subagent type
+BRANCH_NODES = {branch_node_name(t): t for t in DELEGATION_TARGETS.values()}
+
+
+def subagent_type_from_namespace(namespace: Tuple[str, ...]) -> Optional[str]:
+    """
+    Subagent type of an update streamed with subgraphs=True.
+
+    Updates from inside a branch carry the namespace of the branch node
+    ("researcher_agent:<task_id>", ...); supervisor-level updates carry ().
+
+    Returns:
+        Subagent type, or None for updates outside a branch
+    """
+    if not namespace:
+        return None
+    return BRANCH_NODES.get(namespace[0].split(":", 1)[0])
+
+
+def split_delegation_output(output: Any) -> Tuple[List[BaseMessage], Dict[str, Dict[str, Any]]]:
+    """
+    Split ToolNode output for delegation tools into messages and branch metadata.
+
+    Delegation tools return Command(goto=..., update=...); the goto is dropped
+    (branches are started with Send instead) and the thread metadata in the
+    update is kept per tool_call_id.
+
+    Args:
+        output: Result of ToolNode.ainvoke (dict or list of Command/dict)
+
+    Returns:
+        (ToolMessages for the supervisor, {tool_call_id: update without messages})
+    """
+    items = output if isinstance(output, list) else [output]
+
+    messages: List[BaseMessage] = []
+    metadata: Dict[str, Dict[str, Any]] = {}
+    for item in items:
+        update = item.update if isinstance(item, Command) else item
+        if not isinstance(update, dict):
+            continue
+        item_messages = list(update.get("messages", []))
+        messages.extend(item_messages)
+        extra = {k: v for k, v in update.items() if k != "messages"}
+        for message in item_messages:
+            if isinstance(message, ToolMessage):
+                metadata[message.tool_call_id] = extra
+    return messages, metadata
+
+
+def delegation_sends(
+    ai_message: AIMessage,
+    tool_messages: List[BaseMessage],
+    metadata: Dict[str, Dict[str, Any]],
+) -> List[Send]:
+    """
+    Build one Send per successful delegate_to_* call, in call order.
+
+    Args:
+        ai_message: Supervisor message holding the delegation tool calls
+        tool_messages: ToolMessages returned for those calls
+        metadata: Per-call thread metadata from split_delegation_output
+
+    Returns:
+        Sends targeting the "{type}_agent" branch nodes
+    """
+    failed = {
+        m.tool_call_id for m in tool_messages
+        if isinstance(m, ToolMessage) and getattr(m, "status", "success") == "error"
+    }
+
+    sends = []
+    for tool_call in ai_message.tool_calls:
+        subagent_type = DELEGATION_TARGETS.get(tool_call.get("name", ""))
+        call_id = tool_call.get("id")
+        if subagent_type is None or call_id in failed:
+            continue
+        extra = metadata.get(call_id, {})
+        sends.append(Send(branch_node_name(subagent_type), {
+            "messages": [],
+            "task": tool_call.get("args", {}).get("task", ""),
+            "delegation_id": call_id,
+            "subagent_type": subagent_type,
+            "parent_thread_id": extra.get("parent_thread_id"),
+            "subagent_thread_id": extra.get("subagent_thread_id"),
+        }))
+    return sends
+
+
+def _route_branch(state: SubagentBranchState) -> str:
+    last_message = state["messages"][-1] if state["messages"] else None
+    if getattr(last_message, "tool_calls", None):
+        return "tools"
+    return END
+
+
+def build_subagent_branch(agent_node: NodeFn, tools_node: NodeFn):
+    """
+    Compile a subagent's reasoning loop (agent ⇄ tools) over a private state.
+
+    Args:
+        agent_node: Subagent reasoning node (reads task and messages)
+        tools_node: Subagent tool execution node
+
+    Returns:
+        Compiled graph; finishes when the agent responds without tool calls
+    """
+    workflow = StateGraph(SubagentBranchState)
+    workflow.add_node("agent", agent_node)
+    workflow.add_node("tools", tools_node)
+    workflow.set_entry_point("agent")
+    workflow.add_conditional_edges("agent", _route_branch, {"tools": "tools", END: END})
+    workflow.add_edge("tools", "agent")
+    return workflow.compile()
+
+
+def _message_text(message: BaseMessage) -> str:
+    content = message.content
+    if isinstance(content, list):
+        return "\n".join(
+            block.get("text", "") if isinstance(block, dict) else str(block)
+            for block in content
+        ).strip()
+    return str(content).strip()
+
+
+def make_branch_runner(branch_graph) -> NodeFn:
+    """
+    Wrap a compiled subagent branch as a unified-graph node.
+
+    Args:
+        branch_graph: Result of build_subagent_branch
+
+    Returns:
+        Async node writing {"subagent_results": {delegation_id: result}}
+    """
+    async def run_branch(branch: SubagentBranchState) -> Dict[str, Any]:
+        subagent_type = branch["subagent_type"]
+        try:
+            final_state = await branch_graph.ainvoke(branch)
+            replies = [m for m in final_state["messages"] if isinstance(m, AIMessage)]
+            result = {
+                "status": "completed",
+                "output": _message_text(replies[-1]) if replies else "",
+            }
+        except Exception as e:
+            logger.error(f"[Fan-out] {subagent_type} branch {branch['delegation_id']} failed: {e}")
+            result = {"status": "error", "output": str(e)}
+
+        result.update(subagent_type=subagent_type, task=branch["task"])
+        return {"subagent_results": {branch["delegation_id"]: result}}
+
+    return run_branch
+
+
+def join_subagent_results(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Report the results of the latest delegation turn to the supervisor.
+
+    Results are listed in the order the supervisor issued the delegations.
+    The subagent_results channel is cleared: the message now carries them.
+
+    Returns:
+        {"messages": [HumanMessage], "subagent_results": None} with one
+        section per delegation
+    """
+    messages = state.get("messages", [])
+    results = state.get("subagent_results") or {}
+
+    delegating = next(
+        (m for m in reversed(messages)
+         if isinstance(m, AIMessage) and any(tc.get("name") in DELEGATION_TARGETS for tc in m.tool_calls)),
+        None,
+    )
+    if delegating is None:
+        return {"messages": [], "subagent_results": None}
+
+    sections = []
+    for tool_call in delegating.tool_calls:
+        result = results.get(tool_call.get("id"))
+        if result is None:
+            continue
+        sections.append(
+            f"## {result['subagent_type']} ({result['status']})\n"
+            f"Task: {result['task'][:200]}\n\n"
+            f"{result['output']}"
+        )
+    if not sections:
+        return {"messages": [], "subagent_results": None}
+
+    return {
+        "messages": [HumanMessage(content="Subagent results:\n\n" + "\n\n".join(sections))],
+        "subagent_results": None,
+    }
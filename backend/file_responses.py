@@ -0,0 +1,130 @@
+"""
+HTTP helpers for serving workspace files.
+
+Used by GET /api/workspace/file:
+- Validators derived from stat (ETag from mtime_ns + size, Last-Modified)
+- Conditional request evaluation (If-None-Match / If-Modified-Since -> 304)
+- Single byte-range parsing (Range: bytes=...)
+- Chunked async reads in a worker thread for StreamingResponse
+"""
+
+import asyncio
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import AsyncIterator, Optional, Tuple
+
+# Bytes read per worker-thread call while streaming
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class RangeNotSatisfiable(Exception):
+    """Range header cannot be satisfied for the file size (HTTP 416)."""
+
+
+def file_etag(stat: os.stat_result) -> str:
+    """Strong ETag from modification time and size."""
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def last_modified(stat: os.stat_result) -> str:
+    """HTTP-date for the Last-Modified header."""
+    return formatdate(stat.st_mtime, usegmt=True)
+
+
+def is_not_modified(
+    stat: os.stat_result,
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str]
+) -> bool:
+    """
+    Evaluate conditional request headers (RFC 9110 section 13.2.2).
+
+    If-None-Match takes precedence; If-Modified-Since is only consulted
+    when it is absent. Unparseable dates are ignored.
+    """
+    if if_none_match is not None:
+        etag = file_etag(stat)
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        # Weak comparison: W/"x" matches "x"
+        return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have one-second resolution
+        return int(stat.st_mtime) <= int(since)
+
+    return False
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single byte range.
+
+    Args:
+        range_header: Value of the Range header (e.g. "bytes=0-1023")
+        size: File size in bytes
+
+    Returns:
+        Inclusive (start, end) offsets, or None to serve the whole file
+        (no header, other units, or multiple ranges)
+
+    Raises:
+        RangeNotSatisfiable: If the range lies outside the file
+    """
+    if not range_header or not range_header.startswith("bytes="):
+        return None
+
+    spec = range_header[len("bytes="):].strip()
+    if "," in spec:
+        # Multipart ranges not supported - a full response is allowed
+        return None
+
+    start_text, sep, end_text = spec.partition("-")
+    if not sep:
+        return None
+
+    try:
+        if start_text == "":
+            # Suffix range: last N bytes
+            length = int(end_text)
+            if length <= 0 or size == 0:
+                # An empty file has no last N bytes
+                raise RangeNotSatisfiable(range_header)
+            return max(size - length, 0), size - 1
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError:
+        return None
+
+    if start >= size or start > end:
+        raise RangeNotSatisfiable(range_header)
+    return start, min(end, size - 1)
+
+
+async def iter_file_range(
+    path: Path,
+    start: int,
+    end: int,
+    chunk_size: int = STREAM_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """
+    Yield bytes start..end (inclusive) of a file, reading in a worker thread.
+
+    Only one chunk is held in memory at a time.
+    """
+    f = await asyncio.to_thread(open, path, 'rb')
+    try:
+        await asyncio.to_thread(f.seek, start)
+        remaining = end - start + 1
+        while remaining > 0:
+            data = await asyncio.to_thread(f.read, min(chunk_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+    finally:
+        await asyncio.to_thread(f.close)
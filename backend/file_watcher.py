@@ -6,48 +6,111 @@ them to connected WebSocket clients. It uses the watchdog library for
 efficient file system monitoring.
 
 Features:
-- Monitors workspace directory for file modifications
+- Monitors workspace directory for file creation, modification, deletion and moves
 - Filters out temporary files and directories
-- Broadcasts changes via WebSocket manager
-- Debounces rapid changes to avoid broadcast spam
-- Thread-safe operations with proper cleanup
+- Hands events from the watchdog thread to the main event loop via a bounded queue
+- Trailing-edge debounce: a burst of events for one path yields one broadcast
+  after the path has been quiet for debounce_seconds
+- Bounded LRU state for (mtime, size) so unchanged files are not re-read
+- Broadcasts content changes and workspace tree events via WebSocket manager
 """
 
 import asyncio
 import logging
 import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Set
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler, FileModifiedEvent
+from watchdog.events import FileSystemEventHandler, FileSystemEvent
 
 logger = logging.getLogger(__name__)
 
+# Events waiting for the main loop before new ones are dropped
+DEFAULT_QUEUE_SIZE = 4096
+
+# Paths with a pending (debounced) change; beyond this the oldest is flushed early
+MAX_PENDING_PATHS = 1024
+
+# Files whose last seen (mtime_ns, size) is remembered (LRU)
+MAX_TRACKED_FILES = 4096
+
+# Event types emitted to clients ("workspace_event" messages)
+EVENT_CREATED = "created"
+EVENT_MODIFIED = "modified"
+EVENT_DELETED = "deleted"
+EVENT_MOVED = "moved"
+
+
+@dataclass
+class WorkspaceEvent:
+    """A filtered file system event with paths relative to the workspace root."""
+    event_type: str
+    path: str
+    is_directory: bool = False
+    dest_path: Optional[str] = None
+
+
+# Temporary, cache and editor backup names never reported (suffix match)
+IGNORE_PATTERNS = frozenset({
+    '.tmp', '.swp', '.pyc', '.pyo', '~', '.bak',
+    '__pycache__', '.DS_Store'
+})
+
+
+def is_ignored_name(name: str) -> bool:
+    """
+    Whether a file or directory name is filtered out of workspace events.
+
+    Shared with WorkspaceTreeIndex so its cold build skips the same entries
+    the watcher never reports (which would otherwise never be removed).
+    """
+    if name.startswith('.') or name in IGNORE_PATTERNS:
+        return True
+    return any(name.endswith(pattern) for pattern in IGNORE_PATTERNS)
+
+
+def _coalesce(previous: str, latest: str) -> Optional[str]:
+    """
+    Combine two event types seen for one path within a debounce window.
+
+    Returns:
+        Resulting event type, or None if the events cancel out
+        (created then deleted)
+    """
+    if previous == EVENT_CREATED:
+        if latest == EVENT_DELETED:
+            return None
+        return EVENT_CREATED
+    if previous == EVENT_DELETED and latest == EVENT_CREATED:
+        # Replaced in place (e.g. atomic save) - clients see new content
+        return EVENT_MODIFIED
+    return latest
+
 
 class WorkspaceFileHandler(FileSystemEventHandler):
     """
     Handles file system events for workspace files.
 
-    Monitors file modifications and broadcasts changes to WebSocket clients.
-    Implements debouncing to avoid duplicate broadcasts for rapid changes.
+    Runs in the watchdog observer thread: it only filters events and hands
+    them to the main loop; all I/O and broadcasting happens in FileWatcher.
     """
 
-    def __init__(self, workspace_root: Path, ws_manager, debounce_seconds: float = 0.5):
+    def __init__(self, workspace_root: Path, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue):
         """
         Initialize file handler.
 
         Args:
             workspace_root: Path to workspace directory being monitored
-            ws_manager: WebSocket connection manager for broadcasting
-            debounce_seconds: Minimum time between broadcasts for same file
+            loop: Main event loop that owns the queue
+            queue: Queue consumed by FileWatcher on the main loop
         """
         super().__init__()
         self.workspace_root = workspace_root
-        self.ws_manager = ws_manager
-        self.debounce_seconds = debounce_seconds
-
-        # Track recently modified files with timestamps to debounce
-        self._recent_changes: dict[str, float] = {}
+        self._loop = loop
+        self._queue = queue
+        self.dropped = 0
 
         logger.info(f"📁 [FileWatcher] Initialized for {workspace_root}")
 
@@ -73,150 +136,142 @@ class WorkspaceFileHandler(FileSystemEventHandler):
         if any(part.startswith('.') for part in path_obj.parts):
             return True
 
-        # Ignore temporary and cache files
-        ignore_patterns = {
-            '.tmp', '.swp', '.pyc', '.pyo', '~', '.bak',
-            '__pycache__', '.DS_Store'
-        }
-
-        if path_obj.name in ignore_patterns:
-            return True
-
-        if any(path_obj.name.endswith(pattern) for pattern in ignore_patterns):
-            return True
-
-        return False
-
-    def _should_broadcast(self, file_path: str) -> bool:
-        """
-        Determine if change should be broadcast based on debounce logic.
+        return is_ignored_name(path_obj.name)
 
-        Args:
-            file_path: Path to file that changed
+    def _relative(self, path: str) -> Optional[str]:
+        """Path relative to the workspace root, or None if filtered/outside."""
+        try:
+            relative_path = Path(path).relative_to(self.workspace_root)
+        except ValueError:
+            # Path is outside workspace (shouldn't happen but be safe)
+            logger.warning(f"⚠️  [FileWatcher] Path outside workspace: {path}")
+            return None
 
-        Returns:
-            True if change should be broadcast, False if debounced
-        """
-        now = time.time()
-        last_change = self._recent_changes.get(file_path, 0)
+        if self._should_ignore_path(str(relative_path)):
+            return None
+        return str(relative_path)
 
-        # If file was modified recently (within debounce window), skip
-        if now - last_change < self.debounce_seconds:
-            logger.debug(f"⏭️  [FileWatcher] Debounced: {file_path} (last change {now - last_change:.2f}s ago)")
-            return False
+    def _put(self, event: WorkspaceEvent) -> None:
+        """Enqueue on the main loop (called from the observer thread)."""
+        try:
+            self._loop.call_soon_threadsafe(self._put_nowait, event)
+        except RuntimeError:
+            # Loop closed during shutdown
+            pass
 
-        # Update timestamp and allow broadcast
-        self._recent_changes[file_path] = now
-        return True
+    def _put_nowait(self, event: WorkspaceEvent) -> None:
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning(f"⚠️  [FileWatcher] Event queue full, dropped {event.event_type}: {event.path}")
 
-    def on_modified(self, event):
+    def on_any_event(self, event: FileSystemEvent):
         """
-        Handle file modification events.
+        Translate watchdog events into WorkspaceEvents.
 
         Args:
             event: FileSystemEvent from watchdog
         """
-        # Only handle file modifications (not directory)
-        if event.is_directory:
+        event_type = event.event_type
+
+        if event_type == EVENT_MOVED:
+            src = self._relative(event.src_path)
+            dest = self._relative(event.dest_path)
+            if src is None and dest is None:
+                return
+            if src is None:
+                # Moved in from an ignored name (e.g. temp file renamed on save)
+                self._put(WorkspaceEvent(EVENT_CREATED, dest, event.is_directory))
+            elif dest is None:
+                self._put(WorkspaceEvent(EVENT_DELETED, src, event.is_directory))
+            else:
+                self._put(WorkspaceEvent(EVENT_MOVED, src, event.is_directory, dest_path=dest))
             return
 
-        # Only handle FileModifiedEvent
-        if not isinstance(event, FileModifiedEvent):
+        if event_type not in (EVENT_CREATED, EVENT_MODIFIED, EVENT_DELETED):
+            # opened / closed / closed_no_write
             return
 
-        file_path = event.src_path
-
-        # Ignore filtered paths
-        if self._should_ignore_path(file_path):
+        # Directory modifications are just child-list changes (reported separately)
+        if event.is_directory and event_type == EVENT_MODIFIED:
             return
 
-        # Get relative path from workspace root
-        try:
-            relative_path = Path(file_path).relative_to(self.workspace_root)
-            relative_path_str = str(relative_path)
-        except ValueError:
-            # Path is outside workspace (shouldn't happen but be safe)
-            logger.warning(f"⚠️  [FileWatcher] Path outside workspace: {file_path}")
-            return
-
-        # Check debounce
-        if not self._should_broadcast(file_path):
-            return
-
-        # Read file content
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                new_content = f.read()
-        except UnicodeDecodeError:
-            # Skip binary files
-            logger.debug(f"⏭️  [FileWatcher] Skipped binary file: {relative_path_str}")
-            return
-        except Exception as e:
-            logger.error(f"❌ [FileWatcher] Error reading {relative_path_str}: {e}")
-            return
-
-        logger.info(
-            f"📝 [FileWatcher] File modified: {relative_path_str} "
-            f"({len(new_content)} chars)"
-        )
-
-        # Broadcast change asynchronously
-        # We don't have old_content, so pass empty string
-        # This will cause conflict detection on client side if needed
-        asyncio.run(
-            self.ws_manager.broadcast_file_change(
-                file_path=relative_path_str,
-                old_content="",  # Unknown - let client detect conflicts
-                new_content=new_content,
-                editor_user_id="file_system",  # Mark as external change
-                change_metadata={
-                    "timestamp": time.time(),
-                    "change_type": "external",
-                    "file_size": len(new_content),
-                    "editor": "file_system"
-                }
-            )
-        )
+        relative_path = self._relative(event.src_path)
+        if relative_path is not None:
+            self._put(WorkspaceEvent(event_type, relative_path, event.is_directory))
 
 
 class FileWatcher:
     """
     File system watcher service for workspace monitoring.
 
-    Manages watchdog Observer lifecycle and handles graceful shutdown.
+    Manages watchdog Observer lifecycle, debounces events on the main loop
+    and handles graceful shutdown.
     """
 
-    def __init__(self, workspace_root: Path, ws_manager):
+    def __init__(
+        self,
+        workspace_root: Path,
+        ws_manager,
+        debounce_seconds: float = 0.5,
+        max_pending: int = MAX_PENDING_PATHS,
+        max_tracked: int = MAX_TRACKED_FILES
+    ):
         """
         Initialize file watcher.
 
         Args:
             workspace_root: Path to workspace directory to monitor
             ws_manager: WebSocket connection manager for broadcasting
+            debounce_seconds: Quiet period before a path's changes are broadcast
+            max_pending: Bound on paths waiting in the debounce window
+            max_tracked: Bound on remembered (mtime, size) entries
         """
         self.workspace_root = workspace_root
         self.ws_manager = ws_manager
+        self.debounce_seconds = debounce_seconds
+        self.max_pending = max_pending
+        self.max_tracked = max_tracked
+
         self.observer: Observer | None = None
         self.event_handler: WorkspaceFileHandler | None = None
 
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._consumer: Optional[asyncio.Task] = None
+
+        # Debounce state: path -> (event, timer); insertion order = oldest first
+        self._pending: "OrderedDict[str, Tuple[WorkspaceEvent, asyncio.TimerHandle]]" = OrderedDict()
+        self._flush_tasks: set = set()
+
+        # LRU of last broadcast file stats: path -> (mtime_ns, size)
+        self._file_stats: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+
+        self._stats: Dict[str, int] = {"events": 0, "coalesced": 0, "broadcasts": 0, "unchanged": 0}
+
+        # Async callbacks notified of every debounced event (e.g. tree index)
+        self._listeners: List[Callable[[WorkspaceEvent], Awaitable[None]]] = []
+
         logger.info(f"🔍 [FileWatcher] Created for {workspace_root}")
 
     def start(self):
         """
         Start file system monitoring.
 
-        Creates workspace directory if it doesn't exist and starts
+        Must be called from the main event loop. Creates workspace directory
+        if it doesn't exist, starts the queue consumer on this loop and
         the watchdog Observer in a background thread.
         """
         # Ensure workspace directory exists
         self.workspace_root.mkdir(parents=True, exist_ok=True)
 
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=DEFAULT_QUEUE_SIZE)
+        self._consumer = self._loop.create_task(self._consume(), name="file-watcher")
+
         # Create event handler
-        self.event_handler = WorkspaceFileHandler(
-            self.workspace_root,
-            self.ws_manager,
-            debounce_seconds=0.5  # Wait 500ms between broadcasts for same file
-        )
+        self.event_handler = WorkspaceFileHandler(self.workspace_root, self._loop, self._queue)
 
         # Create and start observer
         self.observer = Observer()
@@ -229,15 +284,15 @@ class FileWatcher:
 
         logger.info(
             f"✅ [FileWatcher] Started monitoring {self.workspace_root} "
-            f"(recursive: True)"
+            f"(recursive: True, debounce: {self.debounce_seconds}s)"
         )
 
     def stop(self):
         """
         Stop file system monitoring.
 
-        Gracefully shuts down the watchdog Observer and waits for
-        background thread to complete.
+        Gracefully shuts down the watchdog Observer, waits for the background
+        thread to complete, and cancels pending debounce timers.
         """
         if self.observer:
             logger.info("🛑 [FileWatcher] Stopping observer...")
@@ -247,3 +302,175 @@ class FileWatcher:
             logger.info("✅ [FileWatcher] Stopped")
         else:
             logger.debug("ℹ️  [FileWatcher] Observer not running")
+
+        for _, timer in self._pending.values():
+            timer.cancel()
+        self._pending.clear()
+
+        if self._consumer:
+            self._consumer.cancel()
+            self._consumer = None
+
+    def add_listener(self, callback: Callable[[WorkspaceEvent], Awaitable[None]]) -> None:
+        """
+        Register an async callback for debounced events.
+
+        Listeners run on the main loop before the WebSocket broadcast.
+        """
+        self._listeners.append(callback)
+
+    def get_stats(self) -> dict:
+        """Return watcher counters for /health."""
+        return {
+            **self._stats,
+            "pending": len(self._pending),
+            "tracked_files": len(self._file_stats),
+            "queued": self._queue.qsize() if self._queue else 0,
+            "dropped": self.event_handler.dropped if self.event_handler else 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Main-loop processing
+    # ------------------------------------------------------------------
+
+    async def _consume(self) -> None:
+        while True:
+            event = await self._queue.get()
+            self._stats["events"] += 1
+            try:
+                self._on_event(event)
+            except Exception as e:
+                logger.error(f"❌ [FileWatcher] Error handling {event}: {e}")
+
+    def _on_event(self, event: WorkspaceEvent) -> None:
+        """Apply trailing-edge debounce per path."""
+        if event.event_type == EVENT_MOVED:
+            # Flush anything pending for either side first, then emit the move
+            # immediately so clients can re-key open editors
+            for path in (event.path, event.dest_path):
+                self._flush_now(path)
+            self._file_stats.pop(event.path, None)
+            self._schedule(self._dispatch(event))
+            return
+
+        key = event.path
+        if key in self._pending:
+            previous, timer = self._pending.pop(key)
+            timer.cancel()
+            self._stats["coalesced"] += 1
+            event_type = _coalesce(previous.event_type, event.event_type)
+            if event_type is None:
+                return
+            event = WorkspaceEvent(event_type, key, event.is_directory or previous.is_directory)
+
+        timer = self._loop.call_later(self.debounce_seconds, self._flush_now, key)
+        self._pending[key] = (event, timer)
+
+        # Bound debounce state: flush the oldest path early
+        while len(self._pending) > self.max_pending:
+            oldest = next(iter(self._pending))
+            self._flush_now(oldest)
+
+    def _flush_now(self, path: Optional[str]) -> None:
+        entry = self._pending.pop(path, None) if path is not None else None
+        if entry is None:
+            return
+        event, timer = entry
+        timer.cancel()
+        self._schedule(self._dispatch(event))
+
+    def _schedule(self, coro) -> None:
+        task = self._loop.create_task(coro)
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _dispatch(self, event: WorkspaceEvent) -> None:
+        """Notify listeners and broadcast one debounced event."""
+        for listener in self._listeners:
+            try:
+                await listener(event)
+            except Exception as e:
+                logger.error(f"❌ [FileWatcher] Listener failed for {event.path}: {e}")
+
+        try:
+            if event.event_type == EVENT_DELETED:
+                self._file_stats.pop(event.path, None)
+
+            if event.event_type != EVENT_MODIFIED:
+                await self.ws_manager.broadcast({
+                    "type": "workspace_event",
+                    "event": event.event_type,
+                    "path": event.path,
+                    "dest_path": event.dest_path,
+                    "is_directory": event.is_directory,
+                    "timestamp": time.time()
+                })
+
+            if event.event_type in (EVENT_CREATED, EVENT_MODIFIED) and not event.is_directory:
+                await self._broadcast_content(event.path)
+        except Exception as e:
+            logger.error(f"❌ [FileWatcher] Broadcast failed for {event.path}: {e}")
+
+    def _remember_stat(self, path: str, stat_key: Tuple[int, int]) -> bool:
+        """
+        Record (mtime_ns, size) for path in the LRU.
+
+        Returns:
+            False if the file is unchanged since the last broadcast
+        """
+        if self._file_stats.get(path) == stat_key:
+            self._file_stats.move_to_end(path)
+            return False
+        self._file_stats[path] = stat_key
+        self._file_stats.move_to_end(path)
+        while len(self._file_stats) > self.max_tracked:
+            self._file_stats.popitem(last=False)
+        return True
+
+    async def _broadcast_content(self, relative_path_str: str) -> None:
+        # Nobody has the file open - nothing to read
+        if relative_path_str not in self.ws_manager.active_connections:
+            return
+
+        full_path = self.workspace_root / relative_path_str
+        try:
+            stat = await asyncio.to_thread(full_path.stat)
+        except FileNotFoundError:
+            return
+
+        if not self._remember_stat(relative_path_str, (stat.st_mtime_ns, stat.st_size)):
+            self._stats["unchanged"] += 1
+            logger.debug(f"⏭️  [FileWatcher] Unchanged (mtime/size): {relative_path_str}")
+            return
+
+        # Read file content
+        try:
+            new_content = await asyncio.to_thread(full_path.read_text, encoding='utf-8')
+        except UnicodeDecodeError:
+            # Skip binary files
+            logger.debug(f"⏭️  [FileWatcher] Skipped binary file: {relative_path_str}")
+            return
+        except Exception as e:
+            logger.error(f"❌ [FileWatcher] Error reading {relative_path_str}: {e}")
+            return
+
+        logger.info(
+            f"📝 [FileWatcher] File modified: {relative_path_str} "
+            f"({len(new_content)} chars)"
+        )
+
+        # We don't have old_content, so pass empty string
+        # This will cause conflict detection on client side if needed
+        self._stats["broadcasts"] += 1
+        await self.ws_manager.broadcast_file_change(
+            file_path=relative_path_str,
+            old_content="",  # Unknown - let client detect conflicts
+            new_content=new_content,
+            editor_user_id="file_system",  # Mark as external change
+            change_metadata={
+                "timestamp": time.time(),
+                "change_type": "external",
+                "file_size": len(new_content),
+                "editor": "file_system"
+            }
+        )
@@ -15,9 +15,8 @@ from langgraph.graph import StateGraph, END, add_messages, MessagesState
 from langgraph.prebuilt import ToolNode
 from langgraph.types import Command
 import typing
-from typing import Literal, Optional, Any
-from langchain_core.messages import ToolMessage, SystemMessage, AIMessage, HumanMessage
-from datetime import datetime
+from typing import Annotated, Literal, Optional, Any
+from langchain_core.messages import ToolMessage, AIMessage, HumanMessage
 
 # Import from existing system (will use these for actual execution)
 from module_2_2_simple import (
@@ -40,6 +39,20 @@ from module_2_2_simple import (
     edit_plan_tool,
 )
 
+# Parallel delegation fan-out (Send branches joined via subagent_results)
+from delegation_fanout import (
+    JOIN_NODE,
+    SubagentBranchState,
+    branch_node_name,
+    build_subagent_branch,
+    delegation_sends,
+    fanout_run_config,
+    join_subagent_results,
+    make_branch_runner,
+    merge_subagent_results,
+    split_delegation_output,
+)
+
 # Import V3 Citation Verification Tools
 from tools.citation_verification import (
     tavily_search_cached,
@@ -63,15 +76,11 @@ except ImportError:
 from ace import ACEMiddleware, ACE_CONFIGS
 from ace.schemas import format_playbook_for_prompt
 
-# Optimized Prompts imports (research-backed system prompts)
-from prompts import (
-    get_supervisor_prompt,
-    get_researcher_prompt,
-    get_data_scientist_prompt,
-    get_expert_analyst_prompt,
-    get_writer_prompt,
-    get_reviewer_prompt,
-)
+# Cached tool bindings per agent
+from tool_binding import ToolBindingRegistry
+
+# Optimized Prompts imports (research-backed system prompts, cached static prefix)
+from prompts.assembly import build_system_message
 
 # ============================================================================
 # ACE MIDDLEWARE INITIALIZATION
@@ -90,6 +99,9 @@ import logging
 logger = logging.getLogger(__name__)
 logger.info(f"ACE Middleware initialized with {len(ACE_CONFIGS)} agent configs (osmosis_mode=ollama)")
 
+# Tool-bound models, built once per (agent, tool set) instead of bind_tools per turn
+bound_models = ToolBindingRegistry(model)
+
 # ============================================================================
 # STATE DEFINITIONS
 # ============================================================================
@@ -107,6 +119,8 @@ class SupervisorAgentState(MessagesState):
     tools: list[Any] = []  # Frontend tools from CopilotKit
     active_agent: str = "supervisor"  # For routing visualization
     routing_reason: str = ""  # Why this agent was selected
+    # Results of parallel subagent branches, keyed by delegation tool_call_id
+    subagent_results: Annotated[dict[str, dict], merge_subagent_results] = {}
     # Note: messages field automatically inherited from MessagesState with proper add_messages reducer
 
 
@@ -132,12 +146,11 @@ def agent_node(state: SupervisorAgentState):
     messages = state["messages"]
 
     # Use optimized supervisor prompt (450 lines, research-backed AgentOrchestra pattern)
-    current_date = datetime.now().strftime("%Y-%m-%d")
-    system_prompt = get_supervisor_prompt(current_date=current_date)
+    system_message = build_system_message("supervisor", playbook=state.get("ace_playbook"))
 
-    messages_with_system = [SystemMessage(content=system_prompt)] + list(messages)
-    # Bind all production tools to the model for this invocation
-    model_with_tools = model.bind_tools(production_tools)
+    messages_with_system = [system_message] + list(messages)
+    # Production tools (executed by delegation_tools / supervisor_production_tools)
+    model_with_tools = bound_models.get("supervisor", production_tools)
     response = model_with_tools.invoke(messages_with_system)
     return {"messages": [response]}
 
@@ -511,12 +524,11 @@ def create_researcher_graph():
         messages = state["messages"]
 
         # V3: Use citation-aware researcher prompt with tool bindings for citation verification
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        system_prompt = get_researcher_prompt(current_date=current_date)
+        system_message = build_system_message("researcher", playbook=state.get("ace_playbook"))
 
-        messages_with_system = [SystemMessage(content=system_prompt)] + list(messages)
+        messages_with_system = [system_message] + list(messages)
         # V3: Bind researcher-specific tools (includes citation verification)
-        model_with_tools = model.bind_tools(researcher_tools_list)
+        model_with_tools = bound_models.get("researcher", researcher_tools_list)
         response = model_with_tools.invoke(messages_with_system)
         return {"messages": [response]}
 
@@ -605,11 +617,10 @@ def create_data_scientist_graph():
         messages = state["messages"]
 
         # Use optimized data scientist prompt (250 lines, hypothesis-driven analysis)
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        system_prompt = get_data_scientist_prompt(current_date=current_date)
+        system_message = build_system_message("data_scientist", playbook=state.get("ace_playbook"))
 
-        messages_with_system = [SystemMessage(content=system_prompt)] + list(messages)
-        model_with_tools = model.bind_tools(production_tools)
+        messages_with_system = [system_message] + list(messages)
+        model_with_tools = bound_models.get("data_scientist", data_scientist_tools_list)
         response = model_with_tools.invoke(messages_with_system)
         return {"messages": [response]}
 
@@ -709,11 +720,10 @@ def create_expert_analyst_graph():
         messages = state["messages"]
 
         # Use optimized expert analyst prompt (250 lines, Decision→Plan→Execute→Judge workflow)
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        system_prompt = get_expert_analyst_prompt(current_date=current_date)
+        system_message = build_system_message("expert_analyst", playbook=state.get("ace_playbook"))
 
-        messages_with_system = [SystemMessage(content=system_prompt)] + list(messages)
-        model_with_tools = model.bind_tools(production_tools)
+        messages_with_system = [system_message] + list(messages)
+        model_with_tools = bound_models.get("expert_analyst", expert_analyst_tools_list)
         response = model_with_tools.invoke(messages_with_system)
         return {"messages": [response]}
 
@@ -827,11 +837,10 @@ def create_writer_graph():
         messages = state["messages"]
 
         # Use optimized writer prompt (300 lines, multi-stage writing workflow)
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        system_prompt = get_writer_prompt(current_date=current_date)
+        system_message = build_system_message("writer", playbook=state.get("ace_playbook"))
 
-        messages_with_system = [SystemMessage(content=system_prompt)] + list(messages)
-        model_with_tools = model.bind_tools(production_tools)
+        messages_with_system = [system_message] + list(messages)
+        model_with_tools = bound_models.get("writer", writer_tools_list)
         response = model_with_tools.invoke(messages_with_system)
         return {"messages": [response]}
 
@@ -945,11 +954,10 @@ def create_reviewer_graph():
         messages = state["messages"]
 
         # Use optimized reviewer prompt (300 lines, quality criteria & gap identification)
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        system_prompt = get_reviewer_prompt(current_date=current_date)
+        system_message = build_system_message("reviewer", playbook=state.get("ace_playbook"))
 
-        messages_with_system = [SystemMessage(content=system_prompt)] + list(messages)
-        model_with_tools = model.bind_tools(production_tools)
+        messages_with_system = [system_message] + list(messages)
+        model_with_tools = bound_models.get("reviewer", reviewer_tools_list)
         response = model_with_tools.invoke(messages_with_system)
         return {"messages": [response]}
 
@@ -1043,23 +1051,24 @@ reviewer_graph = create_reviewer_graph()
 # ============================================================================
 
 
-def create_unified_graph(custom_checkpointer=None):
+def create_unified_graph(custom_checkpointer=None, max_parallel_subagents: Optional[int] = None):
     """
     Build unified graph showing all subagents as individual nodes
 
     Structure:
     __start__ → agent → routing →
-      ├─ tools (regular tool execution)
-      ├─ subagents_router → [researcher_agent, data_scientist_agent, expert_analyst_agent, writer_agent, reviewer_agent]
+      ├─ supervisor_production_tools (regular tool execution) → agent
+      ├─ delegation_tools ─Send per delegate_to_* call→ [researcher_agent, data_scientist_agent,
+      │    expert_analyst_agent, writer_agent, reviewer_agent] (concurrent) → join_subagents → agent
       └─ end
 
-    Each subagent has:
-      subagent_agent → subagent_tools → agent (back to main)
-
-    This provides a single-page view of the entire system with all 13+ nodes visible.
+    Each subagent node runs its own loop in a private message channel:
+      agent → tools → agent ... → result (written to subagent_results)
 
     Args:
         custom_checkpointer: Optional PostgreSQL checkpointer to use instead of module-level one
+        max_parallel_subagents: Max concurrently running subagent branches per run
+            (default: MAX_PARALLEL_SUBAGENTS env var, 3)
     """
     # Use custom checkpointer if provided, otherwise fall back to module-level
     active_checkpointer = custom_checkpointer if custom_checkpointer is not None else checkpointer
@@ -1068,7 +1077,7 @@ def create_unified_graph(custom_checkpointer=None):
     # SUBAGENT NODES: RESEARCHER
     # ========================================================================
 
-    async def researcher_agent_node(state: SupervisorAgentState):
+    async def researcher_agent_node(state: SubagentBranchState):
         """Researcher subagent reasoning node with optimized prompt and real-time event emission"""
         messages = state["messages"]
 
@@ -1077,22 +1086,13 @@ def create_unified_graph(custom_checkpointer=None):
         subagent_thread_id = state.get("subagent_thread_id")
         subagent_type = state.get("subagent_type", "researcher")
 
-        # Extract task from delegation tool call
-        task_content = None
-        for msg in reversed(messages):
-            if hasattr(msg, "tool_calls") and msg.tool_calls:
-                for tc in msg.tool_calls:
-                    if tc.get("name") == "delegate_to_researcher":
-                        task_content = tc.get("args", {}).get("task")
-                        break
-            if task_content:
-                break
+        # Task of the delegation that started this branch
+        task_content = state.get("task")
 
         # Use optimized researcher prompt (350 lines with extensive citation requirements)
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        system_prompt = get_researcher_prompt(current_date=current_date)
+        system_message = build_system_message("researcher", playbook=state.get("ace_playbook"))
 
-        context_messages = [SystemMessage(content=system_prompt)]
+        context_messages = [system_message]
 
         # Add task as HumanMessage with explicit completion instructions
         if task_content:
@@ -1112,8 +1112,8 @@ IMPORTANT COMPLETION INSTRUCTIONS:
 
         # Use ainvoke to get complete response with valid tool_call_ids
         # Streaming was causing incomplete tool_call objects without proper 'id' fields
-        model_with_tools = model.bind_tools(production_tools)
-        response = await model_with_tools.ainvoke(context_messages)
+        model_with_tools = bound_models.get("researcher", researcher_tools_list)
+        response = await model_with_tools.ainvoke(context_messages + list(messages))
 
         # Emit response event for frontend visibility
         if parent_thread_id and subagent_thread_id and response.content:
@@ -1179,26 +1179,17 @@ IMPORTANT COMPLETION INSTRUCTIONS:
     # SUBAGENT NODES: DATA SCIENTIST
     # ========================================================================
 
-    async def data_scientist_agent_node(state: SupervisorAgentState):
+    async def data_scientist_agent_node(state: SubagentBranchState):
         """Data scientist subagent reasoning node with optimized prompt"""
         messages = state["messages"]
 
-        # Extract task from delegation tool call
-        task_content = None
-        for msg in reversed(messages):
-            if hasattr(msg, "tool_calls") and msg.tool_calls:
-                for tc in msg.tool_calls:
-                    if tc.get("name") == "delegate_to_data_scientist":
-                        task_content = tc.get("args", {}).get("task")
-                        break
-            if task_content:
-                break
+        # Task of the delegation that started this branch
+        task_content = state.get("task")
 
         # Use optimized data scientist prompt (250 lines, hypothesis-driven analysis)
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        system_prompt = get_data_scientist_prompt(current_date=current_date)
+        system_message = build_system_message("data_scientist", playbook=state.get("ace_playbook"))
 
-        context_messages = [SystemMessage(content=system_prompt)]
+        context_messages = [system_message]
 
         # Add task as HumanMessage with completion instructions
         if task_content:
@@ -1213,8 +1204,8 @@ IMPORTANT COMPLETION INSTRUCTIONS:
             context_messages.append(HumanMessage(content="Please proceed with the data analysis task."))
 
         # Use ainvoke to get complete response with valid tool_call_ids
-        model_with_tools = model.bind_tools(production_tools)
-        response = await model_with_tools.ainvoke(context_messages)
+        model_with_tools = bound_models.get("data_scientist", data_scientist_tools_list)
+        response = await model_with_tools.ainvoke(context_messages + list(messages))
         return {"messages": [response]}
 
     def data_scientist_tools_node(state: SupervisorAgentState):
@@ -1261,26 +1252,17 @@ IMPORTANT COMPLETION INSTRUCTIONS:
     # SUBAGENT NODES: EXPERT ANALYST
     # ========================================================================
 
-    async def expert_analyst_agent_node(state: SupervisorAgentState):
+    async def expert_analyst_agent_node(state: SubagentBranchState):
         """Expert analyst subagent reasoning node with optimized prompt"""
         messages = state["messages"]
 
-        # Extract task from delegation tool call
-        task_content = None
-        for msg in reversed(messages):
-            if hasattr(msg, "tool_calls") and msg.tool_calls:
-                for tc in msg.tool_calls:
-                    if tc.get("name") == "delegate_to_expert_analyst":
-                        task_content = tc.get("args", {}).get("task")
-                        break
-            if task_content:
-                break
+        # Task of the delegation that started this branch
+        task_content = state.get("task")
 
         # Use optimized expert analyst prompt (250 lines, Decision→Plan→Execute→Judge workflow)
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        system_prompt = get_expert_analyst_prompt(current_date=current_date)
+        system_message = build_system_message("expert_analyst", playbook=state.get("ace_playbook"))
 
-        context_messages = [SystemMessage(content=system_prompt)]
+        context_messages = [system_message]
 
         # Add task as HumanMessage with completion instructions
         if task_content:
@@ -1295,8 +1277,8 @@ IMPORTANT COMPLETION INSTRUCTIONS:
             context_messages.append(HumanMessage(content="Please proceed with the analysis task."))
 
         # Use ainvoke to get complete response with valid tool_call_ids
-        model_with_tools = model.bind_tools(production_tools)
-        response = await model_with_tools.ainvoke(context_messages)
+        model_with_tools = bound_models.get("expert_analyst", expert_analyst_tools_list)
+        response = await model_with_tools.ainvoke(context_messages + list(messages))
         return {"messages": [response]}
 
     def expert_analyst_tools_node(state: SupervisorAgentState):
@@ -1343,26 +1325,17 @@ IMPORTANT COMPLETION INSTRUCTIONS:
     # SUBAGENT NODES: WRITER
     # ========================================================================
 
-    async def writer_agent_node(state: SupervisorAgentState):
+    async def writer_agent_node(state: SubagentBranchState):
         """Writer subagent reasoning node with optimized prompt"""
         messages = state["messages"]
 
-        # Extract task from delegation tool call
-        task_content = None
-        for msg in reversed(messages):
-            if hasattr(msg, "tool_calls") and msg.tool_calls:
-                for tc in msg.tool_calls:
-                    if tc.get("name") == "delegate_to_writer":
-                        task_content = tc.get("args", {}).get("task")
-                        break
-            if task_content:
-                break
+        # Task of the delegation that started this branch
+        task_content = state.get("task")
 
         # Use optimized writer prompt (300 lines, multi-stage writing workflow)
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        system_prompt = get_writer_prompt(current_date=current_date)
+        system_message = build_system_message("writer", playbook=state.get("ace_playbook"))
 
-        context_messages = [SystemMessage(content=system_prompt)]
+        context_messages = [system_message]
 
         # Add task as HumanMessage with completion instructions
         if task_content:
@@ -1377,8 +1350,8 @@ IMPORTANT COMPLETION INSTRUCTIONS:
             context_messages.append(HumanMessage(content="Please proceed with the writing task."))
 
         # Use ainvoke to get complete response with valid tool_call_ids
-        model_with_tools = model.bind_tools(production_tools)
-        response = await model_with_tools.ainvoke(context_messages)
+        model_with_tools = bound_models.get("writer", writer_tools_list)
+        response = await model_with_tools.ainvoke(context_messages + list(messages))
         return {"messages": [response]}
 
     def writer_tools_node(state: SupervisorAgentState):
@@ -1425,26 +1398,17 @@ IMPORTANT COMPLETION INSTRUCTIONS:
     # SUBAGENT NODES: REVIEWER
     # ========================================================================
 
-    async def reviewer_agent_node(state: SupervisorAgentState):
+    async def reviewer_agent_node(state: SubagentBranchState):
         """Reviewer subagent reasoning node with optimized prompt"""
         messages = state["messages"]
 
-        # Extract task from delegation tool call
-        task_content = None
-        for msg in reversed(messages):
-            if hasattr(msg, "tool_calls") and msg.tool_calls:
-                for tc in msg.tool_calls:
-                    if tc.get("name") == "delegate_to_reviewer":
-                        task_content = tc.get("args", {}).get("task")
-                        break
-            if task_content:
-                break
+        # Task of the delegation that started this branch
+        task_content = state.get("task")
 
         # Use optimized reviewer prompt (300 lines, quality criteria & gap identification)
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        system_prompt = get_reviewer_prompt(current_date=current_date)
+        system_message = build_system_message("reviewer", playbook=state.get("ace_playbook"))
 
-        context_messages = [SystemMessage(content=system_prompt)]
+        context_messages = [system_message]
 
         # Add task as HumanMessage with completion instructions
         if task_content:
@@ -1459,8 +1423,8 @@ IMPORTANT COMPLETION INSTRUCTIONS:
             context_messages.append(HumanMessage(content="Please proceed with the review task."))
 
         # Use ainvoke to get complete response with valid tool_call_ids
-        model_with_tools = model.bind_tools(production_tools)
-        response = await model_with_tools.ainvoke(context_messages)
+        model_with_tools = bound_models.get("reviewer", reviewer_tools_list)
+        response = await model_with_tools.ainvoke(context_messages + list(messages))
         return {"messages": [response]}
 
     def reviewer_tools_node(state: SupervisorAgentState):
@@ -1507,145 +1471,26 @@ IMPORTANT COMPLETION INSTRUCTIONS:
     # ROUTING FUNCTIONS
     # ========================================================================
 
-    def should_continue_researcher(state: SupervisorAgentState) -> Literal["researcher_tools", "end"]:
-        """
-        Route Researcher agent to tools or end.
-
-        - researcher_tools: Researcher made tool calls (execute tools, loop back)
-        - end: No tool calls, research complete
-        """
-        messages = state.get("messages", [])
-        if not messages:
-            return "end"
-
-        last_message = messages[-1]
-
-        # Check if last message has tool calls
-        if hasattr(last_message, "tool_calls") and last_message.tool_calls:
-            return "researcher_tools"
-
-        return "end"
-
-
-    def should_continue_data_scientist(state: SupervisorAgentState) -> Literal["data_scientist_tools", "end"]:
-        """
-        Route Data Scientist agent to tools or end.
-
-        - data_scientist_tools: Data Scientist made tool calls (execute tools, loop back)
-        - end: No tool calls, analysis complete
-        """
-        messages = state.get("messages", [])
-        if not messages:
-            return "end"
-
-        last_message = messages[-1]
-
-        # Check if last message has tool calls
-        if hasattr(last_message, "tool_calls") and last_message.tool_calls:
-            return "data_scientist_tools"
-
-        return "end"
-
-
-    def should_continue_expert_analyst(state: SupervisorAgentState) -> Literal["expert_analyst_tools", "end"]:
-        """
-        Route Expert Analyst agent to tools or end.
-
-        - expert_analyst_tools: Expert Analyst made tool calls (execute tools, loop back)
-        - end: No tool calls, analysis complete
-        """
-        messages = state.get("messages", [])
-        if not messages:
-            return "end"
-
-        last_message = messages[-1]
-
-        # Check if last message has tool calls
-        if hasattr(last_message, "tool_calls") and last_message.tool_calls:
-            return "expert_analyst_tools"
-
-        return "end"
-
-
-    def should_continue_writer(state: SupervisorAgentState) -> Literal["writer_tools", "end"]:
-        """
-        Route Writer agent to tools or end.
-
-        - writer_tools: Writer made tool calls (execute tools, loop back)
-        - end: No tool calls, writing complete
-        """
-        messages = state.get("messages", [])
-        if not messages:
-            return "end"
-
-        last_message = messages[-1]
-
-        # Check if last message has tool calls
-        if hasattr(last_message, "tool_calls") and last_message.tool_calls:
-            return "writer_tools"
-
-        return "end"
-
-
-    def should_continue_reviewer(state: SupervisorAgentState) -> Literal["reviewer_tools", "end"]:
-        """
-        Route Reviewer agent to tools or end.
-
-        - reviewer_tools: Reviewer made tool calls (execute tools, loop back)
-        - end: No tool calls, review complete
-        """
-        messages = state.get("messages", [])
-        if not messages:
-            return "end"
-
-        last_message = messages[-1]
-
-        # Check if last message has tool calls
-        if hasattr(last_message, "tool_calls") and last_message.tool_calls:
-            return "reviewer_tools"
-
-        return "end"
-
+    # ========================================================================
+    # PARALLEL DELEGATION FAN-OUT
+    # ========================================================================
 
-    def should_continue_after_delegation(state: SupervisorAgentState) -> Literal[
-        "researcher_agent",
-        "data_scientist_agent",
-        "expert_analyst_agent",
-        "writer_agent",
-        "reviewer_agent",
-        "end"
-    ]:
+    async def fanout_delegations_node(state: SupervisorAgentState):
         """
-        Route to appropriate subagent based on which delegation tool was called.
-
-        Checks the second-to-last message for the delegation tool call name,
-        then routes to the corresponding subagent node.
+        Execute delegation tools and start one branch per delegation (Send).
 
-        This function provides explicit routing for delegation tools, enabling
-        reliable multi-agent delegation without relying on Command.goto pattern.
+        Every delegate_to_* call of the supervisor turn gets its own branch with
+        a private message channel; branches run concurrently (bounded by
+        max_parallel_subagents) and are joined back in join_subagents.
         """
-        messages = state.get("messages", [])
-        if len(messages) < 2:
-            return "end"
+        output = await delegation_tool_node.ainvoke(state)
+        tool_messages, metadata = split_delegation_output(output)
 
-        # Check second-to-last message (before ToolMessage) for tool call
-        prev_msg = messages[-2]
-        if hasattr(prev_msg, "tool_calls") and prev_msg.tool_calls:
-            tool_name = prev_msg.tool_calls[0].get("name", "")
-
-            # Route based on delegation tool called
-            if tool_name == "delegate_to_researcher":
-                return "researcher_agent"
-            elif tool_name == "delegate_to_data_scientist":
-                return "data_scientist_agent"
-            elif tool_name == "delegate_to_expert_analyst":
-                return "expert_analyst_agent"
-            elif tool_name == "delegate_to_writer":
-                return "writer_agent"
-            elif tool_name == "delegate_to_reviewer":
-                return "reviewer_agent"
+        sends = delegation_sends(state["messages"][-1], tool_messages, metadata)
+        logger.debug(f"🔀 Fanning out {len(sends)} delegation(s): {[send.node for send in sends]}")
 
-        return "end"
+        # No branch to run (e.g. all delegations failed): report back to supervisor
+        return Command(update={"messages": tool_messages}, goto=sends or "agent")
 
     # ========================================================================
     # BUILD UNIFIED WORKFLOW
@@ -1664,35 +1509,32 @@ IMPORTANT COMPLETION INSTRUCTIONS:
     # Add main agent nodes (use ACE-wrapped versions)
     workflow.add_node("agent", wrapped_supervisor)
     # Phase 1.1: Separate tools nodes for Supervisor
-    workflow.add_node("delegation_tools", delegation_tools_node)
     workflow.add_node("supervisor_production_tools", supervisor_production_tools_node)
 
-    # Add all subagent nodes (use ACE-wrapped versions)
-    workflow.add_node("researcher_agent", wrapped_researcher_unified)
-    # Phase 1.2: Use dedicated tools node for researcher
-    workflow.add_node("researcher_tools", researcher_tools_node_unified)
-
-    workflow.add_node("data_scientist_agent", wrapped_data_scientist_unified)
-    # Phase 1.2: Use dedicated tools node for data scientist
-    workflow.add_node("data_scientist_tools", data_scientist_tools_node_unified)
-
-    workflow.add_node("expert_analyst_agent", wrapped_expert_analyst_unified)
-    # Phase 1.2: Use dedicated tools node for expert analyst
-    workflow.add_node("expert_analyst_tools", expert_analyst_tools_node_unified)
+    # Subagent branches: each runs its own agent ⇄ tools loop over a private
+    # message channel and writes its result to subagent_results
+    subagent_branches = {
+        "researcher": (wrapped_researcher_unified, researcher_tools_node_unified),
+        "data_scientist": (wrapped_data_scientist_unified, data_scientist_tools_node_unified),
+        "expert_analyst": (wrapped_expert_analyst_unified, expert_analyst_tools_node_unified),
+        "writer": (wrapped_writer_unified, writer_tools_node_unified),
+        "reviewer": (wrapped_reviewer_unified, reviewer_tools_node_unified),
+    }
+    branch_nodes = tuple(branch_node_name(subagent_type) for subagent_type in subagent_branches)
 
-    workflow.add_node("writer_agent", wrapped_writer_unified)
-    # Phase 1.2: Use dedicated tools node for writer
-    workflow.add_node("writer_tools", writer_tools_node_unified)
+    workflow.add_node("delegation_tools", fanout_delegations_node, destinations=branch_nodes + ("agent",))
+    for subagent_type, (subagent_agent_node, subagent_tools_node) in subagent_branches.items():
+        branch_graph = build_subagent_branch(subagent_agent_node, subagent_tools_node)
+        workflow.add_node(branch_node_name(subagent_type), make_branch_runner(branch_graph))
+        # All branches of a turn finish before the join runs (same superstep)
+        workflow.add_edge(branch_node_name(subagent_type), JOIN_NODE)
 
-    workflow.add_node("reviewer_agent", wrapped_reviewer_unified)
-    # Phase 1.2: Use dedicated tools node for reviewer
-    workflow.add_node("reviewer_tools", reviewer_tools_node_unified)
+    workflow.add_node(JOIN_NODE, join_subagent_results)
 
     # Set entry point
     workflow.set_entry_point("agent")
 
-    # Main agent routing - simplified for Command.goto pattern
-    # Command.goto from delegation tools handles routing to subagent nodes dynamically
+    # Main agent routing
     # Phase 1.3: Route to separate tools nodes based on tool type
     workflow.add_conditional_edges(
         "agent",
@@ -1708,83 +1550,13 @@ IMPORTANT COMPLETION INSTRUCTIONS:
     # Production tools loop back to agent for continued reasoning
     workflow.add_edge("supervisor_production_tools", "agent")
 
-    # Phase 1.2: Delegation tools routing - conditional edges route to appropriate subagent
-    workflow.add_conditional_edges(
-        "delegation_tools",
-        should_continue_after_delegation,
-        {
-            "researcher_agent": "researcher_agent",
-            "data_scientist_agent": "data_scientist_agent",
-            "expert_analyst_agent": "expert_analyst_agent",
-            "writer_agent": "writer_agent",
-            "reviewer_agent": "reviewer_agent",
-            "end": END,
-        }
-    )
-
-    # Phase 1.4: Individual routing for each subagent (independent reasoning loops)
+    # Joined subagent results go back to the supervisor
+    workflow.add_edge(JOIN_NODE, "agent")
 
-    # Researcher routing
-    workflow.add_conditional_edges(
-        "researcher_agent",
-        should_continue_researcher,
-        {
-            "researcher_tools": "researcher_tools",
-            "end": END,
-        },
+    # Branch limit applies per run (max_concurrency), not across threads
+    return workflow.compile(checkpointer=active_checkpointer).with_config(
+        fanout_run_config(max_parallel_subagents)
     )
-    # Researcher tools → back to researcher agent (for continued reasoning)
-    workflow.add_edge("researcher_tools", "researcher_agent")
-
-    # Data Scientist routing
-    workflow.add_conditional_edges(
-        "data_scientist_agent",
-        should_continue_data_scientist,
-        {
-            "data_scientist_tools": "data_scientist_tools",
-            "end": END,
-        },
-    )
-    # Data Scientist tools → back to data scientist agent (for continued reasoning)
-    workflow.add_edge("data_scientist_tools", "data_scientist_agent")
-
-    # Expert Analyst routing
-    workflow.add_conditional_edges(
-        "expert_analyst_agent",
-        should_continue_expert_analyst,
-        {
-            "expert_analyst_tools": "expert_analyst_tools",
-            "end": END,
-        },
-    )
-    # Expert Analyst tools → back to expert analyst agent (for continued reasoning)
-    workflow.add_edge("expert_analyst_tools", "expert_analyst_agent")
-
-    # Writer routing
-    workflow.add_conditional_edges(
-        "writer_agent",
-        should_continue_writer,
-        {
-            "writer_tools": "writer_tools",
-            "end": END,
-        },
-    )
-    # Writer tools → back to writer agent (for continued reasoning)
-    workflow.add_edge("writer_tools", "writer_agent")
-
-    # Reviewer routing
-    workflow.add_conditional_edges(
-        "reviewer_agent",
-        should_continue_reviewer,
-        {
-            "reviewer_tools": "reviewer_tools",
-            "end": END,
-        },
-    )
-    # Reviewer tools → back to reviewer agent (for continued reasoning)
-    workflow.add_edge("reviewer_tools", "reviewer_agent")
-
-    return workflow.compile(checkpointer=active_checkpointer)
 
 
 # Compile unified graph (will be re-compiled with PostgreSQL checkpointer in main.py)
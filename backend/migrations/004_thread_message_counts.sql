@@ -0,0 +1,59 @@
+-- Migration 004: Materialized Thread Message Counts
+-- Purpose: Keep per-thread checkpoint counts on user_threads so /api/threads/list
+--          no longer joins and aggregates the whole checkpoints table
+-- Created: 2025-11-18
+-- Dependencies: 003_user_threads.sql, LangGraph checkpointer tables (from AsyncPostgresSaver)
+-- Follow-up: run backfill_thread_counts.py once to populate existing threads
+
+-- Materialized counters (maintained by trigger below)
+ALTER TABLE user_threads
+ADD COLUMN IF NOT EXISTS message_count INTEGER NOT NULL DEFAULT 0;
+
+ALTER TABLE user_threads
+ADD COLUMN IF NOT EXISTS last_checkpoint_at TIMESTAMPTZ;
+
+-- Index for keyset pagination: WHERE user_id = ? AND (updated_at, thread_id) < (?, ?)
+CREATE INDEX IF NOT EXISTS idx_user_threads_user_keyset
+ON user_threads(user_id, updated_at DESC, thread_id DESC);
+
+-- Increment the owning thread's counter for every checkpoint the saver inserts.
+-- INSERT ... ON CONFLICT DO UPDATE only fires this for genuinely new checkpoints.
+CREATE OR REPLACE FUNCTION increment_user_thread_message_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE user_threads
+    SET message_count = message_count + 1,
+        last_checkpoint_at = NOW()
+    WHERE thread_id = NEW.thread_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS checkpoints_message_count_trigger ON checkpoints;
+CREATE TRIGGER checkpoints_message_count_trigger
+AFTER INSERT ON checkpoints
+FOR EACH ROW
+EXECUTE FUNCTION increment_user_thread_message_count();
+
+-- Counter-only updates move updated_at to the latest checkpoint instead of NOW(),
+-- so the backfill does not reorder the thread list; live checkpoints still bump it.
+CREATE OR REPLACE FUNCTION update_user_threads_timestamp()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.message_count IS DISTINCT FROM OLD.message_count
+       AND NEW.thread_title IS NOT DISTINCT FROM OLD.thread_title
+       AND NEW.is_archived IS NOT DISTINCT FROM OLD.is_archived
+       AND NEW.metadata IS NOT DISTINCT FROM OLD.metadata THEN
+        NEW.updated_at = GREATEST(OLD.updated_at, COALESCE(NEW.last_checkpoint_at, OLD.updated_at));
+    ELSE
+        NEW.updated_at = NOW();
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Verification query (run after backfill to confirm)
+-- SELECT thread_id, message_count, last_checkpoint_at
+-- FROM user_threads
+-- ORDER BY updated_at DESC
+-- LIMIT 10;
@@ -0,0 +1,59 @@
+-- Migration 005: Cross-Session Tavily Query Cache
+-- Purpose: Answer repeated Tavily queries from any session without an API call,
+--          and store each page body once instead of once per session
+-- Created: 2025-11-19
+-- Dependencies: tavily_search_cache (citation verification tools)
+-- Used by: tools/citation_verification.py, tools/tavily_cache.py
+
+-- Session-scoped results (created here if the citation tools never ran)
+CREATE TABLE IF NOT EXISTS tavily_search_cache (
+    id SERIAL PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    query TEXT,
+    search_depth TEXT,
+    url TEXT NOT NULL,
+    title TEXT,
+    content TEXT,
+    raw_content TEXT,
+    score DOUBLE PRECISION,
+    published_date TEXT,
+    search_timestamp TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    UNIQUE (session_id, url)
+);
+
+-- Page bodies shared by every session and query that returned them
+-- content_hash = sha256(url || '\0' || raw_content)
+CREATE TABLE IF NOT EXISTS tavily_content (
+    content_hash TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT,
+    raw_content TEXT,
+    published_date TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- One row per (normalized query, search depth, max results)
+-- results: ordered [{content_hash, content (query-specific snippet), score}]
+CREATE TABLE IF NOT EXISTS tavily_query_cache (
+    query_key TEXT PRIMARY KEY,
+    normalized_query TEXT NOT NULL,
+    search_depth TEXT NOT NULL,
+    max_results INTEGER NOT NULL,
+    results JSONB NOT NULL,
+    fetched_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Expiry sweeps: DELETE FROM tavily_query_cache WHERE fetched_at < NOW() - INTERVAL '8 days'
+CREATE INDEX IF NOT EXISTS idx_tavily_query_cache_fetched_at
+ON tavily_query_cache(fetched_at);
+
+-- Session rows point at shared content; raw_content is only kept for rows
+-- written before this migration (readers COALESCE the two)
+ALTER TABLE tavily_search_cache
+ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+ALTER TABLE tavily_search_cache
+ALTER COLUMN raw_content DROP NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_tavily_search_cache_content_hash
+ON tavily_search_cache(content_hash);
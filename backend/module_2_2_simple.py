@@ -23,7 +23,6 @@ from typing import Optional
 from typing_extensions import TypedDict
 import asyncio
 import time
-import threading
 import functools
 import uuid
 
@@ -37,7 +36,7 @@ from deepagents.backends import (
 
 # LangChain imports
 from langchain_anthropic import ChatAnthropic
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool, tool
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver  # PostgreSQL checkpointer for persistence
 from pydantic import BaseModel, Field
@@ -63,6 +62,26 @@ except ImportError:
     manager = None
     print("⚠️  Warning: websocket_manager.py not found - WebSocket broadcasting disabled")
 
+# Main-loop broadcast dispatcher (sync tools submit, server loop delivers)
+from backend.broadcast_dispatcher import broadcast_dispatcher
+
+# Per-session event bus (routes approval requests to the owning chat stream)
+from backend.session_events import (
+    event_bus,
+    get_current_session,
+    DEFAULT_SESSION_ID,
+)
+
+# Per-thread research plans (cached, locked, written behind to workspace/.plans)
+from backend.plan_store import PlanStore, plan_delta, register_atexit
+
+# Per-session approval mode and pending approval registry
+from backend.approval_registry import (
+    approval_registry,
+    get_auto_approve,
+    DEFAULT_APPROVAL_TIMEOUT,
+)
+
 load_dotenv()
 
 # ============================================================================
@@ -79,34 +98,50 @@ checkpointer = None
 agent = None
 
 @asynccontextmanager
-async def setup_checkpointer():
+async def _open_saver(pool=None):
+    """Yield an AsyncPostgresSaver on the shared pool, or on a dedicated connection."""
+    if pool is not None:
+        # Pool lifetime is owned by the caller (backend_main lifespan)
+        yield AsyncPostgresSaver(pool)
+    else:
+        async with AsyncPostgresSaver.from_conn_string(DB_URI) as saver:
+            yield saver
+
+
+@asynccontextmanager
+async def setup_checkpointer(pool=None):
     """
     Initialize PostgreSQL checkpointer with proper connection management.
 
     This context manager:
-    1. Creates database connection
+    1. Uses the shared connection pool if given, else opens a dedicated connection
     2. Sets up required tables for checkpointing
     3. Yields the checkpointer for agent creation
     4. Ensures proper cleanup on shutdown
 
+    Args:
+        pool: Optional psycopg_pool.AsyncConnectionPool from db_pool.open_connection_pool()
+
     Raises:
         Exception: If PostgreSQL connection fails, preventing silent failures
 
     Usage in FastAPI lifespan:
-        async with setup_checkpointer() as saver:
-            global agent
-            agent = create_deep_agent(..., checkpointer=saver)
+        async with open_connection_pool() as pool:
+            async with setup_checkpointer(pool) as saver:
+                global agent
+                agent = create_deep_agent(..., checkpointer=saver)
     """
     global checkpointer
 
     try:
-        async with AsyncPostgresSaver.from_conn_string(DB_URI) as saver:
+        async with _open_saver(pool) as saver:
             # Create database tables if they don't exist
             print(f"📊 Connecting to PostgreSQL: {DB_URI}")
             await saver.setup()
             checkpointer = saver
             print(f"✅ PostgreSQL checkpointer initialized successfully")
             print(f"   Database: {DB_URI}")
+            print(f"   Connection: {'shared pool' if pool is not None else 'dedicated'}")
             print(f"   Tables created/verified")
             yield saver
 
@@ -364,32 +399,6 @@ class EditPlanInput(BaseModel):
     )
 
 
-# ============================================================================
-# WebSocket Broadcasting Helper
-# ============================================================================
-
-def _run_broadcast_in_thread(coro):
-    """
-    Run async broadcast in separate thread with own event loop.
-
-    This helper allows synchronous tools like write_file to trigger async
-    WebSocket broadcasts without blocking or requiring an async context.
-
-    Args:
-        coro: Async coroutine to run (e.g., manager.broadcast_file_change(...))
-    """
-    def run():
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            loop.run_until_complete(coro)
-        finally:
-            loop.close()
-
-    thread = threading.Thread(target=run, daemon=True)
-    thread.start()
-
-
 def _write_file_impl(file_path: str, content: str) -> str:
     """
     Internal implementation of write_file without approval check.
@@ -425,20 +434,18 @@ def _write_file_impl(file_path: str, content: str) -> str:
     # Broadcast file change via WebSocket (if manager is available)
     if manager is not None:
         try:
-            # Run broadcast in background thread (non-blocking)
-            _run_broadcast_in_thread(
-                manager.broadcast_file_change(
-                    file_path=relative_path,
-                    old_content=old_content,
-                    new_content=content,
-                    editor_user_id="ai_agent",
-                    change_metadata={
-                        "timestamp": time.time(),
-                        "change_type": "ai_edit",
-                        "file_size": len(content),
-                        "editor": "ai_agent"
-                    }
-                )
+            # Hand off to the main-loop dispatcher (non-blocking)
+            broadcast_dispatcher.submit_file_change(
+                file_path=relative_path,
+                old_content=old_content,
+                new_content=content,
+                editor_user_id="ai_agent",
+                change_metadata={
+                    "timestamp": time.time(),
+                    "change_type": "ai_edit",
+                    "file_size": len(content),
+                    "editor": "ai_agent"
+                }
             )
             print(f"📡 [WebSocket] Broadcast initiated for {file_path} ({len(content)} characters)")
         except Exception as e:
@@ -491,20 +498,18 @@ def _edit_file_impl(file_path: str, old_string: str, new_string: str) -> str:
     # WebSocket broadcasting
     if manager is not None:
         try:
-            _run_broadcast_in_thread(
-                manager.broadcast_file_change(
-                    file_path=relative_path,
-                    old_content=old_content,
-                    new_content=new_content,
-                    editor_user_id="ai_agent",
-                    change_metadata={
-                        "timestamp": time.time(),
-                        "change_type": "ai_edit",
-                        "file_size": len(new_content),
-                        "editor": "ai_agent",
-                        "edit_type": "replace"
-                    }
-                )
+            broadcast_dispatcher.submit_file_change(
+                file_path=relative_path,
+                old_content=old_content,
+                new_content=new_content,
+                editor_user_id="ai_agent",
+                change_metadata={
+                    "timestamp": time.time(),
+                    "change_type": "ai_edit",
+                    "file_size": len(new_content),
+                    "editor": "ai_agent",
+                    "edit_type": "replace"
+                }
             )
         except Exception as e:
             print(f"⚠️  Warning: WebSocket broadcast failed: {e}")
@@ -513,8 +518,7 @@ def _edit_file_impl(file_path: str, old_string: str, new_string: str) -> str:
     return f"✅ File edited successfully: {file_path} ({len(new_content)} characters){warning}"
 
 
-@tool("write_file", args_schema=WriteFileInput)
-def write_file_tool(file_path: str, content: str) -> str:
+def _write_file_with_approval(file_path: str, content: str) -> str:
     """
     Write content to a file in the workspace.
 
@@ -583,119 +587,103 @@ def write_file_tool(file_path: str, content: str) -> str:
             new_string="<last sentence from step 1>\\n<Next 1000 sentences>"
         )
     """
-    # Check if approval is required
-    if not get_auto_approve():
-        # Generate request ID
-        request_id = str(uuid.uuid4())
-
-        # Create approval request synchronously
-        try:
-            # We need to run async code from sync context
-            loop = None
-            try:
-                loop = asyncio.get_running_loop()
-            except RuntimeError:
-                # No running loop, create a new one
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                approval_result = loop.run_until_complete(
-                    get_approval_for_tool(
-                        tool_name="write_file",
-                        tool_args={"file_path": file_path, "content": content[:100] + "..."},
-                        request_id=request_id
-                    )
-                )
-                loop.close()
-            else:
-                # Running in async context, schedule coroutine in the event loop
-                future = asyncio.run_coroutine_threadsafe(
-                    get_approval_for_tool(
-                        tool_name="write_file",
-                        tool_args={"file_path": file_path, "content": content[:100] + "..."},
-                        request_id=request_id
-                    ),
-                    loop
-                )
-                approval_result = future.result()  # This blocks until complete
-
-            # Check approval
-            if not approval_result.get("approved", False):
-                feedback = approval_result.get("feedback", "Operation rejected by user")
-                return f"❌ Operation rejected: {feedback}"
-
-        except Exception as e:
-            print(f"⚠️ [Approval] Error during approval check: {e}")
-            return f"❌ Approval system error: {str(e)}"
+    rejection = _run_approval_sync(
+        "write_file",
+        {"file_path": file_path, "content": content[:100] + "..."}
+    )
+    if rejection:
+        return rejection
 
     # Execute the actual file write
     return _write_file_impl(file_path, content)
 
 
-@tool("edit_file", args_schema=EditFileInput)
-def edit_file_with_approval(file_path: str, old_string: str, new_string: str) -> str:
+async def _awrite_file_with_approval(file_path: str, content: str) -> str:
+    """Async write_file: awaits the approval on the calling loop, writes in a worker thread."""
+    rejection = await _request_approval(
+        "write_file",
+        {"file_path": file_path, "content": content[:100] + "..."}
+    )
+    if rejection:
+        return rejection
+    return await asyncio.to_thread(_write_file_impl, file_path, content)
+
+
+def _edit_file_with_approval(file_path: str, old_string: str, new_string: str) -> str:
     """
     Edit a file by replacing old_string with new_string.
     Requires user approval when auto_approve is disabled.
     Replaces the built-in edit_file tool from FilesystemBackend.
     """
-    # Check if approval is required
-    if not get_auto_approve():
-        request_id = str(uuid.uuid4())
+    rejection = _run_approval_sync("edit_file", _edit_approval_args(file_path, old_string, new_string))
+    if rejection:
+        return rejection
 
-        # Truncate strings for display
-        old_display = old_string[:100] + "..." if len(old_string) > 100 else old_string
-        new_display = new_string[:100] + "..." if len(new_string) > 100 else new_string
+    # Execute the actual file edit
+    return _edit_file_impl(file_path, old_string, new_string)
 
-        try:
-            # Run async code from sync context (EXACT pattern from write_file_tool)
-            loop = None
-            try:
-                loop = asyncio.get_running_loop()
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                approval_result = loop.run_until_complete(
-                    get_approval_for_tool(
-                        tool_name="edit_file",
-                        tool_args={
-                            "file_path": file_path,
-                            "old_string": old_display,
-                            "new_string": new_display
-                        },
-                        request_id=request_id
-                    )
-                )
-                loop.close()
-            else:
-                future = asyncio.run_coroutine_threadsafe(
-                    get_approval_for_tool(
-                        tool_name="edit_file",
-                        tool_args={
-                            "file_path": file_path,
-                            "old_string": old_display,
-                            "new_string": new_display
-                        },
-                        request_id=request_id
-                    ),
-                    loop
-                )
-                approval_result = future.result()  # Blocks until approval
-
-            if not approval_result.get("approved", False):
-                feedback = approval_result.get("feedback", "Operation rejected by user")
-                return f"❌ Operation rejected: {feedback}"
 
-        except Exception as e:
-            return f"❌ Approval system error: {str(e)}"
+async def _aedit_file_with_approval(file_path: str, old_string: str, new_string: str) -> str:
+    """Async edit_file: awaits the approval on the calling loop, edits in a worker thread."""
+    rejection = await _request_approval("edit_file", _edit_approval_args(file_path, old_string, new_string))
+    if rejection:
+        return rejection
+    return await asyncio.to_thread(_edit_file_impl, file_path, old_string, new_string)
 
-    # Execute the actual file edit
-    return _edit_file_impl(file_path, old_string, new_string)
+
+def _edit_approval_args(file_path: str, old_string: str, new_string: str) -> dict:
+    """Truncate strings for display in the approval dialog."""
+    return {
+        "file_path": file_path,
+        "old_string": old_string[:100] + "..." if len(old_string) > 100 else old_string,
+        "new_string": new_string[:100] + "..." if len(new_string) > 100 else new_string,
+    }
+
+
+# Both variants are registered: LangGraph's async execution (astream) calls the
+# coroutine, so approval waits never park an executor thread; sync callers
+# (run_agent_task) get the blocking variant.
+write_file_tool = StructuredTool.from_function(
+    func=_write_file_with_approval,
+    coroutine=_awrite_file_with_approval,
+    name="write_file",
+    args_schema=WriteFileInput,
+)
+
+edit_file_with_approval = StructuredTool.from_function(
+    func=_edit_file_with_approval,
+    coroutine=_aedit_file_with_approval,
+    name="edit_file",
+    args_schema=EditFileInput,
+)
 
 
 # ============================================================================
 # RESEARCH PLANNING TOOLS
 # ============================================================================
 
+def _plan_thread_id() -> str:
+    """Thread whose plan the current tool call reads and edits."""
+    return get_current_session() or DEFAULT_SESSION_ID
+
+
+def _submit_plan_event(event_type: str, thread_id: str, data: dict) -> None:
+    """Queue a plan event for WebSocket broadcast (no-op without a manager)."""
+    if manager is None:
+        return
+    try:
+        broadcast_dispatcher.submit({
+            "type": "agent_event",
+            "event_type": event_type,
+            "thread_id": thread_id,
+            "data": {"type": event_type, **data},
+            "timestamp": time.time()
+        })
+    except Exception as e:
+        import logging
+        logging.getLogger(__name__).warning(f"⚠️ WebSocket broadcast failed: {e}")
+
+
 @tool("create_research_plan", args_schema=CreatePlanInput)
 def create_research_plan_tool(query: str, num_steps: int = 5) -> str:
     """
@@ -723,66 +711,28 @@ def create_research_plan_tool(query: str, num_steps: int = 5) -> str:
     The plan is automatically tracked in the UI with progress indicators.
     """
     import json
-    import time
     import logging
     from planning_agent import create_plan_logic
 
     logger = logging.getLogger(__name__)
+    thread_id = _plan_thread_id()
 
     try:
         # Generate plan using extracted logic from planning_agent.py
         plan_response = create_plan_logic(query, num_steps)
 
-        # Generate unique plan ID
-        plan_id = str(uuid.uuid4())
-        created_at = time.time()
+        # Store plan as this thread's current plan (/workspace/.plans/)
+        plan_dict = plan_store.create(thread_id, query, plan_response.steps)
+        plan_id = plan_dict["plan_id"]
 
-        # Create plan structure
-        plan_dict = {
+        logger.info(f"✅ Created research plan: {plan_id} ({len(plan_response.steps)} steps) for {thread_id}")
+
+        _submit_plan_event("plan_created", thread_id, {
             "plan_id": plan_id,
-            "query": query,
             "steps": plan_response.steps,
-            "current_step": 0,
             "progress": 0.0,
-            "past_steps": [],
-            "created_at": created_at,
-            "status": "active"
-        }
-
-        # Store plan in filesystem (/workspace/.plans/)
-        plan_dir = workspace_dir / ".plans"
-        plan_dir.mkdir(parents=True, exist_ok=True)
-
-        # Save plan with unique ID
-        plan_file = plan_dir / f"{plan_id}.json"
-        plan_file.write_text(json.dumps(plan_dict, indent=2), encoding='utf-8')
-
-        # Also save as "current" for easy access
-        current_plan_file = plan_dir / "current_plan.json"
-        current_plan_file.write_text(json.dumps(plan_dict, indent=2), encoding='utf-8')
-
-        logger.info(f"✅ Created research plan: {plan_id} ({len(plan_response.steps)} steps)")
-
-        # Broadcast plan creation via WebSocket
-        if manager is not None:
-            try:
-                _run_broadcast_in_thread(
-                    manager.broadcast({
-                        "type": "agent_event",
-                        "event_type": "plan_created",
-                        "thread_id": "unknown",  # Will be filled by middleware
-                        "data": {
-                            "type": "plan_created",
-                            "plan_id": plan_id,
-                            "steps": plan_response.steps,
-                            "progress": 0.0,
-                        },
-                        "timestamp": created_at
-                    })
-                )
-                logger.info(f"📡 Broadcast plan_created event for {plan_id}")
-            except Exception as e:
-                logger.warning(f"⚠️ WebSocket broadcast failed: {e}")
+            "version": plan_dict["version"],
+        })
 
         # Return plan as JSON
         return json.dumps({
@@ -797,22 +747,7 @@ def create_research_plan_tool(query: str, num_steps: int = 5) -> str:
         error_msg = f"❌ Failed to create research plan: {str(e)}"
         logger.error(error_msg, exc_info=True)
 
-        # Broadcast error
-        if manager is not None:
-            try:
-                _run_broadcast_in_thread(
-                    manager.broadcast({
-                        "type": "agent_event",
-                        "event_type": "plan_error",
-                        "data": {
-                            "type": "plan_error",
-                            "error": str(e)
-                        },
-                        "timestamp": time.time()
-                    })
-                )
-            except:
-                pass
+        _submit_plan_event("plan_error", thread_id, {"error": str(e)})
 
         return json.dumps({"status": "error", "message": error_msg})
 
@@ -842,118 +777,74 @@ def update_plan_progress_tool(step_index: int, result: str) -> str:
         Returns: "✅ Step 1/5 completed (20%). Next: Analyze key themes..."
     """
     import json
-    import time
     import logging
 
     logger = logging.getLogger(__name__)
+    thread_id = _plan_thread_id()
 
     try:
-        # Load current plan from filesystem
-        plan_file = workspace_dir / ".plans" / "current_plan.json"
-
-        if not plan_file.exists():
-            return json.dumps({
-                "status": "error",
-                "message": "❌ No active plan found. Create one with create_research_plan() first."
-            })
-
-        # Read plan
-        plan_data = json.loads(plan_file.read_text(encoding='utf-8'))
-
-        # Validate step_index
-        num_steps = len(plan_data["steps"])
-        if step_index < 0 or step_index >= num_steps:
-            return json.dumps({
-                "status": "error",
-                "message": f"❌ Invalid step_index {step_index}. Plan has {num_steps} steps (0-{num_steps-1})."
-            })
+        with plan_store.edit(thread_id) as plan_data:
+            if plan_data is None:
+                return json.dumps({
+                    "status": "error",
+                    "message": "❌ No active plan found. Create one with create_research_plan() first."
+                })
 
-        # Update plan
-        step_text = plan_data["steps"][step_index]
-        plan_data["past_steps"].append([step_text, result])
-        plan_data["current_step"] = step_index + 1
-        plan_data["progress"] = plan_data["current_step"] / num_steps
-        plan_data["last_updated"] = time.time()
+            # Validate step_index
+            num_steps = len(plan_data["steps"])
+            if step_index < 0 or step_index >= num_steps:
+                return json.dumps({
+                    "status": "error",
+                    "message": f"❌ Invalid step_index {step_index}. Plan has {num_steps} steps (0-{num_steps-1})."
+                })
 
-        # Save updated plan
-        plan_file.write_text(json.dumps(plan_data, indent=2), encoding='utf-8')
+            # Update plan
+            step_text = plan_data["steps"][step_index]
+            plan_data["past_steps"].append([step_text, result])
+            plan_data["current_step"] = step_index + 1
+            plan_data["progress"] = plan_data["current_step"] / num_steps
+
+            logger.info(
+                f"✅ Updated plan {plan_data['plan_id']}: "
+                f"Step {step_index + 1}/{num_steps} completed ({plan_data['progress']:.0%})"
+            )
 
-        # Also update plan_id-specific file
-        plan_id_file = workspace_dir / ".plans" / f"{plan_data['plan_id']}.json"
-        if plan_id_file.exists():
-            plan_id_file.write_text(json.dumps(plan_data, indent=2), encoding='utf-8')
+            _submit_plan_event("step_completed", thread_id, plan_delta(
+                plan_data, "step_completed",
+                step_index=step_index,
+                step_text=step_text,
+                result=result[:200],  # Truncate for WebSocket
+            ))
+
+            # Check if plan is complete
+            if plan_data["current_step"] >= num_steps:
+                plan_data["status"] = "completed"
+
+                _submit_plan_event("plan_complete", thread_id, {
+                    "plan_id": plan_data["plan_id"],
+                    "progress": 1.0,
+                    "version": plan_data["version"],
+                })
 
-        logger.info(
-            f"✅ Updated plan {plan_data['plan_id']}: "
-            f"Step {step_index + 1}/{num_steps} completed ({plan_data['progress']:.0%})"
-        )
+                return json.dumps({
+                    "status": "complete",
+                    "message": f"✅ ALL STEPS COMPLETE ({num_steps}/{num_steps})",
+                    "progress": 1.0,
+                    "completed_steps": num_steps
+                })
 
-        # Broadcast update via WebSocket
-        if manager is not None:
-            try:
-                _run_broadcast_in_thread(
-                    manager.broadcast({
-                        "type": "agent_event",
-                        "event_type": "step_completed",
-                        "thread_id": "unknown",
-                        "data": {
-                            "type": "step_completed",
-                            "plan_id": plan_data["plan_id"],
-                            "step_index": step_index,
-                            "step_text": step_text,
-                            "result": result[:200],  # Truncate for WebSocket
-                            "progress": plan_data["progress"]
-                        },
-                        "timestamp": time.time()
-                    })
-                )
-                logger.info(f"📡 Broadcast step_completed event")
-            except Exception as e:
-                logger.warning(f"⚠️ WebSocket broadcast failed: {e}")
-
-        # Check if plan is complete
-        if plan_data["current_step"] >= num_steps:
-            plan_data["status"] = "completed"
-            plan_file.write_text(json.dumps(plan_data, indent=2), encoding='utf-8')
-
-            # Broadcast completion
-            if manager is not None:
-                try:
-                    _run_broadcast_in_thread(
-                        manager.broadcast({
-                            "type": "agent_event",
-                            "event_type": "plan_complete",
-                            "thread_id": "unknown",
-                            "data": {
-                                "type": "plan_complete",
-                                "plan_id": plan_data["plan_id"],
-                                "progress": 1.0
-                            },
-                            "timestamp": time.time()
-                        })
-                    )
-                except:
-                    pass
+            # Return progress message
+            next_step_index = plan_data["current_step"]
+            next_step = plan_data["steps"][next_step_index]
 
             return json.dumps({
-                "status": "complete",
-                "message": f"✅ ALL STEPS COMPLETE ({num_steps}/{num_steps})",
-                "progress": 1.0,
-                "completed_steps": num_steps
+                "status": "success",
+                "message": f"✓ Step {step_index} complete. Progress: {plan_data['current_step']}/{num_steps} steps.",
+                "next_step": next_step,
+                "progress": plan_data["progress"],
+                "completed_steps": plan_data["current_step"]
             })
 
-        # Return progress message
-        next_step_index = plan_data["current_step"]
-        next_step = plan_data["steps"][next_step_index]
-
-        return json.dumps({
-            "status": "success",
-            "message": f"✓ Step {step_index} complete. Progress: {plan_data['current_step']}/{num_steps} steps.",
-            "next_step": next_step,
-            "progress": plan_data["progress"],
-            "completed_steps": plan_data["current_step"]
-        })
-
     except Exception as e:
         error_msg = f"❌ Failed to update plan progress: {str(e)}"
         logger.error(error_msg, exc_info=True)
@@ -995,24 +886,20 @@ def read_current_plan_tool() -> str:
         }
     """
     import json
-    from pathlib import Path
     import logging
 
     logger = logging.getLogger(__name__)
 
     try:
-        # Load current plan
-        plan_file = workspace_dir / ".plans" / "current_plan.json"
+        # Load this thread's current plan (a copy; served from the cache)
+        plan_data = plan_store.current(_plan_thread_id())
 
-        if not plan_file.exists():
+        if plan_data is None:
             return json.dumps({
                 "status": "no_plan",
                 "message": "No active plan found. Create one with create_research_plan()."
             })
 
-        # Read and return plan
-        plan_data = json.loads(plan_file.read_text(encoding='utf-8'))
-
         # Add next_step field for convenience
         if plan_data["current_step"] < len(plan_data["steps"]):
             plan_data["next_step"] = plan_data["steps"][plan_data["current_step"]]
@@ -1092,224 +979,139 @@ def edit_plan_tool(
         )
     """
     import json
-    import time
     import logging
 
     logger = logging.getLogger(__name__)
+    thread_id = _plan_thread_id()
 
     try:
-        # Load current plan
-        plan_file = workspace_dir / ".plans" / "current_plan.json"
-
-        if not plan_file.exists():
-            return json.dumps({
-                "status": "error",
-                "message": "❌ No active plan found. Create one with create_research_plan() first."
-            })
-
-        # Read plan
-        plan_data = json.loads(plan_file.read_text(encoding='utf-8'))
-        num_steps = len(plan_data["steps"])
-
-        # Validate and execute action
-        if action == "mark_completed":
-            # Mark step as completed
-            if step_index is None or result is None:
+        with plan_store.edit(thread_id) as plan_data:
+            if plan_data is None:
                 return json.dumps({
                     "status": "error",
-                    "message": "❌ mark_completed requires step_index and result"
+                    "message": "❌ No active plan found. Create one with create_research_plan() first."
                 })
 
-            if step_index < 0 or step_index >= num_steps:
-                return json.dumps({
-                    "status": "error",
-                    "message": f"❌ Invalid step_index {step_index}. Plan has {num_steps} steps (0-{num_steps-1})."
-                })
+            num_steps = len(plan_data["steps"])
 
-            # Update plan
-            step_text_completed = plan_data["steps"][step_index]
-            plan_data["past_steps"].append([step_text_completed, result])
-            plan_data["current_step"] = max(plan_data["current_step"], step_index + 1)
-            plan_data["progress"] = plan_data["current_step"] / len(plan_data["steps"])
-            plan_data["last_updated"] = time.time()
-
-            # Broadcast step_completed event
-            if manager is not None:
-                try:
-                    _run_broadcast_in_thread(
-                        manager.broadcast({
-                            "type": "agent_event",
-                            "event_type": "step_completed",
-                            "thread_id": "unknown",
-                            "data": {
-                                "type": "step_completed",
-                                "plan_id": plan_data["plan_id"],
-                                "step_index": step_index,
-                                "step_text": step_text_completed,
-                                "result": result[:200],
-                                "progress": plan_data["progress"]
-                            },
-                            "timestamp": time.time()
-                        })
-                    )
-                    logger.info(f"📡 Broadcast step_completed event for step {step_index}")
-                except Exception as e:
-                    logger.warning(f"⚠️ WebSocket broadcast failed: {e}")
-
-            message = f"✅ Step {step_index + 1}/{len(plan_data['steps'])} marked complete ({plan_data['progress']:.0%})"
-
-        elif action == "add_step":
-            # Add new step
-            if step_text is None:
-                return json.dumps({
-                    "status": "error",
-                    "message": "❌ add_step requires step_text"
-                })
+            # Validate and execute action
+            if action == "mark_completed":
+                # Mark step as completed
+                if step_index is None or result is None:
+                    return json.dumps({
+                        "status": "error",
+                        "message": "❌ mark_completed requires step_index and result"
+                    })
 
-            # Insert at position or append
-            if insert_position is not None:
-                insert_position = max(0, min(insert_position, len(plan_data["steps"])))
-                plan_data["steps"].insert(insert_position, step_text)
-                message = f"➕ Added step at position {insert_position}: \"{step_text}\""
-            else:
-                plan_data["steps"].append(step_text)
-                message = f"➕ Added new step at end: \"{step_text}\""
-
-            plan_data["last_updated"] = time.time()
-            plan_data["progress"] = plan_data["current_step"] / len(plan_data["steps"])
-
-            # Broadcast plan_updated event
-            if manager is not None:
-                try:
-                    _run_broadcast_in_thread(
-                        manager.broadcast({
-                            "type": "agent_event",
-                            "event_type": "plan_updated",
-                            "thread_id": "unknown",
-                            "data": {
-                                "type": "plan_updated",
-                                "plan_id": plan_data["plan_id"],
-                                "steps": plan_data["steps"],
-                                "current_step": plan_data["current_step"],
-                                "progress": plan_data["progress"]
-                            },
-                            "timestamp": time.time()
-                        })
-                    )
-                    logger.info(f"📡 Broadcast plan_updated event (added step)")
-                except Exception as e:
-                    logger.warning(f"⚠️ WebSocket broadcast failed: {e}")
-
-        elif action == "remove_step":
-            # Remove step
-            if step_index is None:
-                return json.dumps({
-                    "status": "error",
-                    "message": "❌ remove_step requires step_index"
-                })
+                if step_index < 0 or step_index >= num_steps:
+                    return json.dumps({
+                        "status": "error",
+                        "message": f"❌ Invalid step_index {step_index}. Plan has {num_steps} steps (0-{num_steps-1})."
+                    })
 
-            if step_index < 0 or step_index >= num_steps:
-                return json.dumps({
-                    "status": "error",
-                    "message": f"❌ Invalid step_index {step_index}. Plan has {num_steps} steps (0-{num_steps-1})."
-                })
+                # Update plan
+                step_text_completed = plan_data["steps"][step_index]
+                plan_data["past_steps"].append([step_text_completed, result])
+                plan_data["current_step"] = max(plan_data["current_step"], step_index + 1)
+                plan_data["progress"] = plan_data["current_step"] / len(plan_data["steps"])
+
+                _submit_plan_event("step_completed", thread_id, plan_delta(
+                    plan_data, "step_completed",
+                    step_index=step_index,
+                    step_text=step_text_completed,
+                    result=result[:200],
+                ))
+
+                message = f"✅ Step {step_index + 1}/{len(plan_data['steps'])} marked complete ({plan_data['progress']:.0%})"
+
+            elif action == "add_step":
+                # Add new step
+                if step_text is None:
+                    return json.dumps({
+                        "status": "error",
+                        "message": "❌ add_step requires step_text"
+                    })
 
-            removed_step = plan_data["steps"].pop(step_index)
-            plan_data["last_updated"] = time.time()
-            plan_data["progress"] = plan_data["current_step"] / max(len(plan_data["steps"]), 1)
-
-            message = f"➖ Removed step {step_index}: \"{removed_step}\""
-
-            # Broadcast plan_updated event
-            if manager is not None:
-                try:
-                    _run_broadcast_in_thread(
-                        manager.broadcast({
-                            "type": "agent_event",
-                            "event_type": "plan_updated",
-                            "thread_id": "unknown",
-                            "data": {
-                                "type": "plan_updated",
-                                "plan_id": plan_data["plan_id"],
-                                "steps": plan_data["steps"],
-                                "current_step": plan_data["current_step"],
-                                "progress": plan_data["progress"]
-                            },
-                            "timestamp": time.time()
-                        })
-                    )
-                    logger.info(f"📡 Broadcast plan_updated event (removed step)")
-                except Exception as e:
-                    logger.warning(f"⚠️ WebSocket broadcast failed: {e}")
-
-        elif action == "update_step":
-            # Update step text
-            if step_index is None or step_text is None:
-                return json.dumps({
-                    "status": "error",
-                    "message": "❌ update_step requires step_index and step_text"
-                })
+                # Insert at position or append
+                if insert_position is not None:
+                    insert_position = max(0, min(insert_position, len(plan_data["steps"])))
+                    plan_data["steps"].insert(insert_position, step_text)
+                    message = f"➕ Added step at position {insert_position}: \"{step_text}\""
+                else:
+                    insert_position = len(plan_data["steps"])
+                    plan_data["steps"].append(step_text)
+                    message = f"➕ Added new step at end: \"{step_text}\""
+
+                plan_data["progress"] = plan_data["current_step"] / len(plan_data["steps"])
+
+                _submit_plan_event("plan_delta", thread_id, plan_delta(
+                    plan_data, "add_step", step_index=insert_position, step_text=step_text
+                ))
+
+            elif action == "remove_step":
+                # Remove step
+                if step_index is None:
+                    return json.dumps({
+                        "status": "error",
+                        "message": "❌ remove_step requires step_index"
+                    })
 
-            if step_index < 0 or step_index >= num_steps:
+                if step_index < 0 or step_index >= num_steps:
+                    return json.dumps({
+                        "status": "error",
+                        "message": f"❌ Invalid step_index {step_index}. Plan has {num_steps} steps (0-{num_steps-1})."
+                    })
+
+                removed_step = plan_data["steps"].pop(step_index)
+                plan_data["progress"] = plan_data["current_step"] / max(len(plan_data["steps"]), 1)
+
+                message = f"➖ Removed step {step_index}: \"{removed_step}\""
+
+                _submit_plan_event("plan_delta", thread_id, plan_delta(
+                    plan_data, "remove_step", step_index=step_index
+                ))
+
+            elif action == "update_step":
+                # Update step text
+                if step_index is None or step_text is None:
+                    return json.dumps({
+                        "status": "error",
+                        "message": "❌ update_step requires step_index and step_text"
+                    })
+
+                if step_index < 0 or step_index >= num_steps:
+                    return json.dumps({
+                        "status": "error",
+                        "message": f"❌ Invalid step_index {step_index}. Plan has {num_steps} steps (0-{num_steps-1})."
+                    })
+
+                old_text = plan_data["steps"][step_index]
+                plan_data["steps"][step_index] = step_text
+
+                message = f"✏️  Updated step {step_index}: \"{old_text}\" → \"{step_text}\""
+
+                _submit_plan_event("plan_delta", thread_id, plan_delta(
+                    plan_data, "update_step", step_index=step_index, step_text=step_text
+                ))
+
+            else:
                 return json.dumps({
                     "status": "error",
-                    "message": f"❌ Invalid step_index {step_index}. Plan has {num_steps} steps (0-{num_steps-1})."
+                    "message": f"❌ Invalid action '{action}'. Must be: mark_completed, add_step, remove_step, or update_step"
                 })
 
-            old_text = plan_data["steps"][step_index]
-            plan_data["steps"][step_index] = step_text
-            plan_data["last_updated"] = time.time()
-
-            message = f"✏️  Updated step {step_index}: \"{old_text}\" → \"{step_text}\""
-
-            # Broadcast plan_updated event
-            if manager is not None:
-                try:
-                    _run_broadcast_in_thread(
-                        manager.broadcast({
-                            "type": "agent_event",
-                            "event_type": "plan_updated",
-                            "thread_id": "unknown",
-                            "data": {
-                                "type": "plan_updated",
-                                "plan_id": plan_data["plan_id"],
-                                "steps": plan_data["steps"],
-                                "current_step": plan_data["current_step"],
-                                "progress": plan_data["progress"]
-                            },
-                            "timestamp": time.time()
-                        })
-                    )
-                    logger.info(f"📡 Broadcast plan_updated event (updated step)")
-                except Exception as e:
-                    logger.warning(f"⚠️ WebSocket broadcast failed: {e}")
+            logger.info(f"✅ Plan edited: {message}")
 
-        else:
+            # Return success
             return json.dumps({
-                "status": "error",
-                "message": f"❌ Invalid action '{action}'. Must be: mark_completed, add_step, remove_step, or update_step"
+                "status": "success",
+                "message": message,
+                "plan_id": plan_data["plan_id"],
+                "total_steps": len(plan_data["steps"]),
+                "current_step": plan_data["current_step"],
+                "progress": plan_data["progress"]
             })
 
-        # Save updated plan
-        plan_file.write_text(json.dumps(plan_data, indent=2), encoding='utf-8')
-
-        # Also update plan_id-specific file
-        plan_id_file = workspace_dir / ".plans" / f"{plan_data['plan_id']}.json"
-        if plan_id_file.exists():
-            plan_id_file.write_text(json.dumps(plan_data, indent=2), encoding='utf-8')
-
-        logger.info(f"✅ Plan edited: {message}")
-
-        # Return success
-        return json.dumps({
-            "status": "success",
-            "message": message,
-            "plan_id": plan_data["plan_id"],
-            "total_steps": len(plan_data["steps"]),
-            "current_step": plan_data["current_step"],
-            "progress": plan_data["progress"]
-        })
-
     except Exception as e:
         error_msg = f"❌ Failed to edit plan: {str(e)}"
         logger.error(error_msg, exc_info=True)
@@ -1331,6 +1133,9 @@ print("\n📋 Note: Firecrawl, GitHub, and e2b will be added as subagents in fut
 workspace_dir = Path(__file__).parent / "workspace"
 os.makedirs(workspace_dir, exist_ok=True)
 
+plan_store = register_atexit(PlanStore(workspace_dir / ".plans"))
+
+
 def create_hybrid_backend(rt):
     """Hybrid storage: ephemeral + filesystem."""
     return CompositeBackend(
@@ -2156,21 +1961,10 @@ print("✅ DeepAgent Ready with Tavily + built-in filesystem tools\n")
 # HUMAN-IN-THE-LOOP APPROVAL SYSTEM
 # ============================================================================
 
-# Global state for approval tracking
-pending_approvals = {}  # {request_id: {tool_name, tool_args, event, future}}
-approval_decisions = {}  # {request_id: {approved, feedback}}
-approval_lock = asyncio.Lock()
-
-# Thread-local storage for auto-approve mode (controlled by frontend via chat request)
-_auto_approve_state = threading.local()
-
-def set_auto_approve(enabled: bool):
-    """Set auto-approve mode for current thread/coroutine."""
-    _auto_approve_state.enabled = enabled
-
-def get_auto_approve() -> bool:
-    """Get auto-approve mode for current thread/coroutine."""
-    return getattr(_auto_approve_state, 'enabled', True)  # Default True
+# Auto-approve mode and pending approvals are per session (contextvar +
+# per-thread_id registry), so concurrent chats never see each other's mode
+# or decisions. The mode is set per request through
+# backend.approval_registry.set_auto_approve.
 
 # Workspace directory configuration (can be overridden for testing)
 _workspace_dir = None
@@ -2186,65 +1980,98 @@ def get_workspace_dir() -> Path:
         return Path(_workspace_dir)
     return Path(__file__).parent / "workspace"
 
-# SSE event queue for approval requests
-# Tools push approval events here, SSE stream yields them
-sse_event_queue = asyncio.Queue()
-
-async def get_approval_for_tool(tool_name: str, tool_args: dict, request_id: str) -> dict:
+async def get_approval_for_tool(
+    tool_name: str,
+    tool_args: dict,
+    request_id: str,
+    thread_id: Optional[str] = None,
+    timeout: float = DEFAULT_APPROVAL_TIMEOUT
+) -> dict:
     """
     Request approval for a tool call.
 
+    The approval request is published on the per-session event bus, so only
+    the SSE stream (and WebSocket clients) of the owning thread receive it.
+    The caller awaits the decision on its own loop; no thread is blocked.
+
     Args:
         tool_name: Name of the tool being called
         tool_args: Arguments for the tool call
         request_id: Unique identifier for this approval request
+        thread_id: Session to notify (defaults to the session bound to this context)
+        timeout: Seconds to wait before treating the request as rejected
 
     Returns:
         {"approved": True} to proceed
         {"approved": False, "feedback": "..."} to reject with feedback
     """
-    # Create an event to wait for decision
-    approval_event = asyncio.Event()
-    future = asyncio.Future()
+    session_id = thread_id or get_current_session() or DEFAULT_SESSION_ID
+    pending = approval_registry.register(session_id, request_id, tool_name, tool_args)
 
-    async with approval_lock:
-        pending_approvals[request_id] = {
-            "tool_name": tool_name,
-            "tool_args": tool_args,
-            "event": approval_event,
-            "future": future
-        }
-
-    # Push approval request to SSE event queue
+    # Push approval request to the owning session's event stream
     try:
-        await sse_event_queue.put({
+        await event_bus.publish(session_id, {
             "type": "tool_approval_request",
             "request_id": request_id,
             "tool_name": tool_name,
             "tool_args": tool_args
         })
-        print(f"📡 [Approval] Queued SSE event for {tool_name} (request_id: {request_id})")
+        print(f"📡 [Approval] Published event for {tool_name} to session {session_id} (request_id: {request_id})")
     except Exception as e:
         print(f"⚠️ [Approval] Failed to queue SSE event: {e}")
 
-    # Wait for decision (with timeout)
+    return await approval_registry.wait(pending, timeout=timeout)
+
+
+async def _request_approval(tool_name: str, tool_args: dict) -> Optional[str]:
+    """
+    Ask for approval unless auto-approve is on for this session.
+
+    Returns:
+        None to proceed, or the rejection message to return from the tool
+    """
+    if get_auto_approve():
+        return None
+
     try:
-        decision = await asyncio.wait_for(future, timeout=300.0)  # 5 minute timeout
-        return decision
-    except asyncio.TimeoutError:
-        print(f"⏱️ [Approval] Timeout waiting for decision on {tool_name}")
-        # Cleanup
-        async with approval_lock:
-            pending_approvals.pop(request_id, None)
-            approval_decisions.pop(request_id, None)
-        return {"approved": False, "feedback": "Approval timeout - operation cancelled"}
-    finally:
-        # Cleanup
-        async with approval_lock:
-            pending_approvals.pop(request_id, None)
-
-
-async def submit_approval_decision(request_id: str, approved: bool, feedback: str = None):
+        approval_result = await get_approval_for_tool(
+            tool_name=tool_name,
+            tool_args=tool_args,
+            request_id=str(uuid.uuid4())
+        )
+    except Exception as e:
+        print(f"⚠️ [Approval] Error during approval check: {e}")
+        return f"❌ Approval system error: {str(e)}"
+
+    if not approval_result.get("approved", False):
+        feedback = approval_result.get("feedback") or "Operation rejected by user"
+        return f"❌ Operation rejected: {feedback}"
+    return None
+
+
+def _run_approval_sync(tool_name: str, tool_args: dict) -> Optional[str]:
+    """
+    Blocking variant of _request_approval for synchronous tool invocation.
+
+    Only valid on a thread without a running loop (e.g. agent.stream());
+    async execution uses the tools' coroutine variants instead.
+    """
+    if get_auto_approve():
+        return None
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # asyncio.run copies this context, so the session binding carries over
+        return asyncio.run(_request_approval(tool_name, tool_args))
+    return "❌ Approval system error: synchronous tool call on a running event loop"
+
+
+async def submit_approval_decision(
+    request_id: str,
+    approved: bool,
+    feedback: str = None,
+    thread_id: Optional[str] = None
+):
     """
     Submit an approval decision for a pending request.
 
@@ -2252,32 +2079,16 @@ async def submit_approval_decision(request_id: str, approved: bool, feedback: st
         request_id: Unique identifier for the approval request
         approved: Whether to approve the tool call
         feedback: Optional feedback message (used when rejecting)
+        thread_id: If given, the request must belong to this session
 
     Returns:
         {"status": "ok"} if successful, {"status": "error", "message": "..."} otherwise
     """
-    async with approval_lock:
-        if request_id not in pending_approvals:
-            return {"status": "error", "message": "Request ID not found"}
-
-        # Store decision
-        decision = {
-            "approved": approved,
-            "feedback": feedback
-        }
-        approval_decisions[request_id] = decision
-
-        # Resolve the future
-        pending_approval = pending_approvals[request_id]
-        if not pending_approval["future"].done():
-            pending_approval["future"].set_result(decision)
-
-        # Signal the event
-        pending_approval["event"].set()
-
-        print(f"✅ [Approval] Decision recorded for {request_id}: approved={approved}")
+    if not approval_registry.resolve(request_id, approved, feedback, thread_id=thread_id):
+        return {"status": "error", "message": "Request ID not found"}
 
-        return {"status": "ok"}
+    print(f"✅ [Approval] Decision recorded for {request_id}: approved={approved}")
+    return {"status": "ok"}
 
 
 # ============================================================================
@@ -0,0 +1,343 @@
+"""
+Per-Thread Research Plan Store.
+
+Replaces the single workspace/.plans/current_plan.json that every session
+read, modified and rewrote (so concurrent chats overwrote each other's plans):
+- Plans keyed by plan_id, with one current plan per thread_id
+- In-memory cache; disk is read only on a cache miss (e.g. after a restart)
+- Per-plan locks around read-modify-write, so concurrent tool calls on one
+  plan serialize while different plans proceed in parallel
+- Write-behind persistence: mutations mark the plan dirty and a timer flushes
+  dirty plans shortly after, each as compact JSON written to a temp file and
+  renamed over the old one (readers never see a partial file)
+- A version counter per plan, included in broadcast deltas so clients can
+  detect a missed event and re-read the plan
+
+Layout under the store root (workspace/.plans):
+    {plan_id}.json              Plan (includes thread_id and version)
+    threads/{thread_id}.json    {"plan_id": ...} of the thread's current plan
+"""
+
+import atexit
+import copy
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Seconds between a mutation and its write-behind flush
+DEFAULT_FLUSH_DELAY = float(os.getenv("PLAN_STORE_FLUSH_DELAY", "0.5"))
+
+THREADS_DIR = "threads"
+
+
+def _safe_name(key: str) -> str:
+    """File-system safe name for a plan or thread id."""
+    return re.sub(r"[^\w.-]", "_", key)
+
+
+def _write_atomic(path: Path, data: Dict[str, Any]) -> None:
+    """Write JSON to a temp file in the same directory and rename it over path."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _content(plan: Dict[str, Any]) -> Dict[str, Any]:
+    """Plan fields without the bookkeeping edit() sets itself."""
+    return {k: v for k, v in plan.items() if k not in ("version", "last_updated")}
+
+
+def _restore(plan: Dict[str, Any], snapshot: Dict[str, Any]) -> None:
+    """Reset a cached plan in place to an earlier snapshot."""
+    plan.clear()
+    plan.update(snapshot)
+
+
+class PlanStore:
+    """
+    Cached, lock-per-plan store of research plans with write-behind persistence.
+
+    Plans are plain dicts (plan_id, thread_id, query, steps, current_step,
+    progress, past_steps, status, created_at, last_updated, version). Callers
+    get copies from get()/current(); mutations go through edit().
+    """
+
+    def __init__(self, root: Path, flush_delay: float = DEFAULT_FLUSH_DELAY):
+        """
+        Create a store persisting under root.
+
+        Args:
+            root: Directory for plan files (created on first flush)
+            flush_delay: Seconds to batch mutations before writing them
+        """
+        self.root = Path(root)
+        self.flush_delay = flush_delay
+
+        self._plans: Dict[str, Dict[str, Any]] = {}   # plan_id -> plan
+        self._current: Dict[str, str] = {}            # thread_id -> plan_id
+        self._dirty: Set[str] = set()                 # plan_ids awaiting flush
+        self._plan_locks: Dict[str, threading.Lock] = {}
+
+        self._lock = threading.Lock()                 # Guards the dicts above
+        self._flush_lock = threading.Lock()           # One flush at a time
+        self._timer: Optional[threading.Timer] = None
+
+        self._stats = {"created": 0, "edits": 0, "flushes": 0, "plans_written": 0, "disk_reads": 0}
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get(self, plan_id: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of a plan, or None if it does not exist."""
+        with self._plan_lock(plan_id):
+            plan = self._load(plan_id)
+            return copy.deepcopy(plan) if plan is not None else None
+
+    def current_plan_id(self, thread_id: str) -> Optional[str]:
+        """Return the id of the thread's current plan, or None."""
+        with self._lock:
+            plan_id = self._current.get(thread_id)
+        if plan_id is not None:
+            return plan_id
+
+        pointer = self.root / THREADS_DIR / f"{_safe_name(thread_id)}.json"
+        try:
+            plan_id = json.loads(pointer.read_text(encoding="utf-8"))["plan_id"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+        with self._lock:
+            self._stats["disk_reads"] += 1
+            return self._current.setdefault(thread_id, plan_id)
+
+    def current(self, thread_id: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the thread's current plan, or None."""
+        plan_id = self.current_plan_id(thread_id)
+        return self.get(plan_id) if plan_id is not None else None
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def create(self, thread_id: str, query: str, steps: List[str]) -> Dict[str, Any]:
+        """
+        Create a plan and make it the thread's current plan.
+
+        The plan and the thread pointer are written immediately (a new plan
+        should survive a crash); later edits are written behind.
+
+        Returns:
+            Copy of the new plan
+        """
+        now = time.time()
+        plan = {
+            "plan_id": str(uuid.uuid4()),
+            "thread_id": thread_id,
+            "query": query,
+            "steps": list(steps),
+            "current_step": 0,
+            "progress": 0.0,
+            "past_steps": [],
+            "created_at": now,
+            "last_updated": now,
+            "status": "active",
+            "version": 1,
+        }
+        plan_id = plan["plan_id"]
+
+        with self._plan_lock(plan_id):
+            with self._lock:
+                self._plans[plan_id] = plan
+                self._current[thread_id] = plan_id
+                self._stats["created"] += 1
+            _write_atomic(self.root / f"{_safe_name(plan_id)}.json", plan)
+            _write_atomic(self.root / THREADS_DIR / f"{_safe_name(thread_id)}.json", {"plan_id": plan_id})
+            return copy.deepcopy(plan)
+
+    @contextmanager
+    def edit(self, thread_id: str) -> Iterator[Optional[Dict[str, Any]]]:
+        """
+        Lock and yield the thread's current plan for in-place modification.
+
+        Yields None if the thread has no plan. The yielded plan already
+        carries the next version and last_updated, so events built inside the
+        block (and submitted there, in version order) match what is stored.
+        If the block changed the plan a flush is scheduled on exit; if it
+        changed nothing or raised, the plan is restored to its entry state.
+
+        Usage:
+            with plan_store.edit(thread_id) as plan:
+                plan["steps"].append("New step")
+        """
+        plan_id = self.current_plan_id(thread_id)
+        if plan_id is None:
+            yield None
+            return
+
+        with self._plan_lock(plan_id):
+            plan = self._load(plan_id)
+            if plan is None:
+                yield None
+                return
+
+            snapshot = copy.deepcopy(plan)
+            plan["version"] = snapshot.get("version", 0) + 1
+            plan["last_updated"] = time.time()
+            try:
+                yield plan
+            except BaseException:
+                _restore(plan, snapshot)
+                raise
+
+            if _content(plan) == _content(snapshot):
+                _restore(plan, snapshot)
+                return
+            with self._lock:
+                self._dirty.add(plan_id)
+                self._stats["edits"] += 1
+        self._schedule_flush()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def flush(self) -> int:
+        """
+        Write every dirty plan to disk now.
+
+        Returns:
+            Number of plans written
+        """
+        with self._flush_lock:
+            with self._lock:
+                self._timer = None
+                dirty, self._dirty = self._dirty, set()
+
+            written = 0
+            for plan_id in dirty:
+                with self._plan_lock(plan_id):
+                    plan = self._plans.get(plan_id)
+                    if plan is None:
+                        continue
+                    try:
+                        _write_atomic(self.root / f"{_safe_name(plan_id)}.json", plan)
+                        written += 1
+                    except OSError as e:
+                        logger.error(f"[PlanStore] Failed to persist plan {plan_id}: {e}")
+                        with self._lock:
+                            self._dirty.add(plan_id)
+
+            with self._lock:
+                self._stats["flushes"] += 1
+                self._stats["plans_written"] += written
+            return written
+
+    def close(self) -> None:
+        """Cancel the pending timer and flush (registered with atexit)."""
+        with self._lock:
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters plus cache and backlog sizes."""
+        with self._lock:
+            return {
+                **self._stats,
+                "cached_plans": len(self._plans),
+                "dirty_plans": len(self._dirty),
+            }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _plan_lock(self, plan_id: str) -> threading.Lock:
+        with self._lock:
+            lock = self._plan_locks.get(plan_id)
+            if lock is None:
+                lock = self._plan_locks[plan_id] = threading.Lock()
+            return lock
+
+    def _load(self, plan_id: str) -> Optional[Dict[str, Any]]:
+        """Cached plan, reading it from disk on a miss (caller holds the plan lock)."""
+        with self._lock:
+            plan = self._plans.get(plan_id)
+        if plan is not None:
+            return plan
+
+        try:
+            plan = json.loads((self.root / f"{_safe_name(plan_id)}.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+        plan.setdefault("version", 1)
+        with self._lock:
+            self._stats["disk_reads"] += 1
+            return self._plans.setdefault(plan_id, plan)
+
+    def _schedule_flush(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                return
+            if self.flush_delay <= 0:
+                timer = None
+            else:
+                timer = self._timer = threading.Timer(self.flush_delay, self.flush)
+                timer.daemon = True
+        if timer is None:
+            self.flush()
+        else:
+            timer.start()
+
+
+def plan_delta(plan: Dict[str, Any], op: str, **fields: Any) -> Dict[str, Any]:
+    """
+    Build the WebSocket event data for one plan change.
+
+    Carries only the change and the plan's position, never the full step list.
+
+    Args:
+        plan: Plan after the change
+        op: step_completed, add_step, remove_step or update_step
+        **fields: Change details (e.g. step_index, step_text)
+
+    Returns:
+        {"plan_id", "version", "op", ..., "current_step", "total_steps", "progress"}
+    """
+    return {
+        "plan_id": plan["plan_id"],
+        "version": plan["version"],
+        "op": op,
+        **fields,
+        "current_step": plan["current_step"],
+        "total_steps": len(plan["steps"]),
+        "progress": plan["progress"],
+    }
+
+
+def register_atexit(store: PlanStore) -> PlanStore:
+    """Flush store at interpreter exit; returns store for chaining."""
+    atexit.register(store.close)
+    return store
@@ -480,7 +480,7 @@ async def start_research_with_plan(query: str, thread_id: str = None):
 
     Args:
         query: User research query
-        thread_id: Optional thread ID for session persistence
+        thread_id: Thread the plan belongs to (defaults to the current session)
 
     Returns:
         Generator yielding plan events and results
@@ -581,14 +581,18 @@ async def create_plan_only(query: str, thread_id: str = None, num_steps: int = 5
         manager = None
         logger.warning("WebSocket manager not available - plan broadcasting disabled")
 
+    # Plans live in the main agent's store, where edit_plan looks them up
+    from module_2_2_simple import plan_store, _plan_thread_id
+
     # Generate plan using existing logic
     plan_response = create_plan_logic(query, num_steps)
 
-    # Generate unique plan ID
-    plan_id = str(uuid.uuid4())
+    # Store as the thread's current plan (edit_plan resolves it by thread)
+    thread_id = thread_id or _plan_thread_id()
+    plan_id = plan_store.create(thread_id, query, plan_response.steps)["plan_id"]
 
     # Broadcast plan_created event via WebSocket
-    if manager and thread_id:
+    if manager:
         try:
             await manager.broadcast({
                 "type": "agent_event",
@@ -19,6 +19,9 @@ Usage:
 
     current_date = datetime.now().strftime("%Y-%m-%d")
     researcher_prompt = get_researcher_prompt(current_date)
+
+Graph nodes use prompts.assembly.build_system_message, which sends the same
+instructions as a cacheable static prefix plus a dynamic tail (date, ACE playbook).
 """
 
 from .supervisor import get_supervisor_prompt, SUPERVISOR_SYSTEM_PROMPT
@@ -0,0 +1,146 @@
+"""
+Prompt Assembly with Prefix Caching
+
+Splits each agent's system prompt into:
+- A static prefix (instructions), identical on every turn and every day, marked
+  with an Anthropic cache_control breakpoint. Tools are sent before the system
+  prompt, so the cached prefix also covers the bound tool schemas.
+- A dynamic tail (current date, ACE playbook) after the breakpoint.
+
+The static prefix is rendered once per (agent, prompt version); the version is
+a hash of the template, so editing a prompt invalidates its cached render.
+
+Usage:
+    from prompts.assembly import build_system_message
+
+    system_message = build_system_message("researcher", playbook=state.get("ace_playbook"))
+    response = model_with_tools.invoke([system_message] + list(messages))
+"""
+
+import hashlib
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+from langchain_core.messages import SystemMessage
+
+from .data_scientist import DATA_SCIENTIST_SYSTEM_PROMPT
+from .expert_analyst import EXPERT_ANALYST_SYSTEM_PROMPT
+from .reviewer import REVIEWER_SYSTEM_PROMPT
+from .supervisor import SUPERVISOR_SYSTEM_PROMPT
+from .writer import WRITER_SYSTEM_PROMPT
+
+# Stands in for the date inside the static prefix (e.g. "Accessed: YYYY-MM-DD")
+DATE_PLACEHOLDER = "YYYY-MM-DD"
+
+# "Current date: {current_date}" header line, moved to the dynamic tail
+_DATE_HEADER = re.compile(r"^Current date: \{current_date\}\n\n?", re.MULTILINE)
+
+
+def _researcher_template() -> str:
+    # Same template get_researcher_prompt() renders (V3 citation-aware prompt)
+    from .prompts.researcher.challenger_prompt_3 import RESEARCHER_SYSTEM_PROMPT
+    return RESEARCHER_SYSTEM_PROMPT
+
+
+# Agent name -> template getter (templates use str.format with current_date)
+PROMPT_TEMPLATES: Dict[str, Callable[[], str]] = {
+    "supervisor": lambda: SUPERVISOR_SYSTEM_PROMPT,
+    "researcher": _researcher_template,
+    "data_scientist": lambda: DATA_SCIENTIST_SYSTEM_PROMPT,
+    "expert_analyst": lambda: EXPERT_ANALYST_SYSTEM_PROMPT,
+    "writer": lambda: WRITER_SYSTEM_PROMPT,
+    "reviewer": lambda: REVIEWER_SYSTEM_PROMPT,
+}
+
+
+def prompt_version(agent: str) -> str:
+    """
+    Get the version of an agent's prompt template (content hash).
+
+    Args:
+        agent: Agent name (key of PROMPT_TEMPLATES)
+
+    Returns:
+        First 12 hex characters of the template's SHA-256
+    """
+    return _template_version(PROMPT_TEMPLATES[agent]())
+
+
+@lru_cache(maxsize=32)
+def _template_version(template: str) -> str:
+    return hashlib.sha256(template.encode("utf-8")).hexdigest()[:12]
+
+
+@lru_cache(maxsize=32)
+def _render_prefix(agent: str, version: str) -> str:
+    template = _DATE_HEADER.sub("", PROMPT_TEMPLATES[agent](), count=1)
+    return template.format(current_date=DATE_PLACEHOLDER).strip()
+
+
+def get_static_prefix(agent: str) -> str:
+    """
+    Get the byte-stable, date-free part of an agent's system prompt.
+
+    Args:
+        agent: Agent name (key of PROMPT_TEMPLATES)
+
+    Returns:
+        Rendered prefix (memoized per agent and prompt version)
+    """
+    return _render_prefix(agent, prompt_version(agent))
+
+
+def get_dynamic_tail(current_date: str, playbook: Optional[str] = None) -> str:
+    """
+    Get the per-turn part of a system prompt.
+
+    Args:
+        current_date: Current date in YYYY-MM-DD format
+        playbook: Formatted ACE playbook section, if any
+
+    Returns:
+        Date context followed by the playbook
+    """
+    tail = (
+        f"Current date: {current_date}\n"
+        f"Wherever these instructions show {DATE_PLACEHOLDER} "
+        f"(e.g. \"Accessed: {DATE_PLACEHOLDER}\"), use the current date."
+    )
+    if playbook:
+        tail += "\n" + playbook
+    return tail
+
+
+def build_system_message(
+    agent: str,
+    current_date: Optional[str] = None,
+    playbook: Optional[str] = None,
+) -> SystemMessage:
+    """
+    Build an agent's system message with a cacheable prefix.
+
+    Args:
+        agent: Agent name (key of PROMPT_TEMPLATES)
+        current_date: Current date in YYYY-MM-DD format (default: today)
+        playbook: Formatted ACE playbook section, if any
+
+    Returns:
+        SystemMessage with two text blocks: the static prefix (cache breakpoint)
+        and the dynamic tail
+    """
+    if current_date is None:
+        current_date = datetime.now().strftime("%Y-%m-%d")
+
+    return SystemMessage(content=[
+        {
+            "type": "text",
+            "text": get_static_prefix(agent),
+            "cache_control": {"type": "ephemeral"},
+        },
+        {
+            "type": "text",
+            "text": get_dynamic_tail(current_date, playbook),
+        },
+    ])
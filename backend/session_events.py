@@ -0,0 +1,307 @@
+"""
+Per-Session Event Bus for SSE and WebSocket Delivery.
+
+This module routes out-of-band agent events (tool approval requests, etc.)
+to the chat stream that owns them, keyed by thread_id:
+- Bounded per-subscriber queues with backpressure
+- Fan-out to every SSE subscriber of a session and to WebSocket clients
+- Small replay backlog for events published before a stream subscribes
+- Interleaving of agent chunks and session events without polling
+
+Replaces the process-wide sse_event_queue that previously lived in
+module_2_2_simple.py, where concurrent chats could receive each other's
+approval requests.
+"""
+
+import asyncio
+import contextvars
+import logging
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_QUEUE_SIZE = 256      # Max undelivered events per subscriber
+DEFAULT_BACKLOG_SIZE = 32     # Events kept for sessions with no subscriber yet
+DEFAULT_PUT_TIMEOUT = 5.0     # Seconds a publisher waits on a full queue
+MAX_BACKLOG_SESSIONS = 1024   # Oldest session backlogs are evicted beyond this
+DEFAULT_SESSION_ID = "web-session"  # Matches backend_main thread_id fallback
+
+# Session (thread_id) of the chat currently executing in this context.
+# Set by the SSE stream before the agent runs; LangGraph tasks and executor
+# threads started from that stream inherit a copy of the context.
+_current_session_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "current_session_id", default=None
+)
+
+
+def set_current_session(thread_id: str) -> contextvars.Token:
+    """Bind thread_id as the current session for this context."""
+    return _current_session_id.set(thread_id)
+
+
+def reset_current_session(token: contextvars.Token) -> None:
+    """Restore the session binding that was active before set_current_session()."""
+    _current_session_id.reset(token)
+
+
+def get_current_session() -> Optional[str]:
+    """Return the thread_id bound to this context, or None outside a chat."""
+    return _current_session_id.get()
+
+
+class SessionSubscription:
+    """
+    A single consumer (usually one SSE stream) of a session's events.
+
+    Attributes:
+        thread_id: Session this subscription receives events for
+        queue: Bounded queue of undelivered events
+    """
+
+    def __init__(self, thread_id: str, maxsize: int = DEFAULT_QUEUE_SIZE):
+        self.thread_id = thread_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    def drain(self) -> List[dict]:
+        """Return all queued events without waiting."""
+        events = []
+        while True:
+            try:
+                events.append(self.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                return events
+
+    async def interleave(
+        self,
+        agent_stream: AsyncIterator[Any]
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Merge an agent stream with this subscription's events.
+
+        Waits on the next agent chunk and the next session event together,
+        so an approval request is delivered immediately even while the agent
+        is blocked waiting for that approval.
+
+        Args:
+            agent_stream: Async iterator from agent.astream()
+
+        Yields:
+            ("chunk", chunk) for agent output, ("event", event) for session events.
+            Events still queued when the agent stream finishes are yielded last.
+        """
+        iterator = agent_stream.__aiter__()
+        chunk_task = asyncio.ensure_future(iterator.__anext__())
+        event_task = asyncio.ensure_future(self.queue.get())
+
+        try:
+            while True:
+                done, _ = await asyncio.wait(
+                    {chunk_task, event_task},
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                # Events first: they are usually what the agent is waiting on
+                if event_task in done:
+                    yield "event", event_task.result()
+                    event_task = asyncio.ensure_future(self.queue.get())
+
+                if chunk_task in done:
+                    try:
+                        chunk = chunk_task.result()
+                    except StopAsyncIteration:
+                        break
+                    yield "chunk", chunk
+                    chunk_task = asyncio.ensure_future(iterator.__anext__())
+        finally:
+            # Cancelled queue.get() leaves its item in the queue for drain()
+            for task in (event_task, chunk_task):
+                if not task.done():
+                    task.cancel()
+
+        for event in self.drain():
+            yield "event", event
+
+
+class SessionEventBus:
+    """
+    Routes events to subscribers by thread_id.
+
+    All queue operations happen on the loop that owns the subscriptions.
+    Publishers running on another loop (e.g. a tool that created its own
+    loop inside an executor thread) are hopped onto the owning loop.
+
+    Attributes:
+        queue_size: Per-subscriber queue bound
+        backlog_size: Per-session replay buffer bound when nobody is subscribed
+        put_timeout: Seconds to wait on a full subscriber queue before dropping
+    """
+
+    def __init__(
+        self,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        backlog_size: int = DEFAULT_BACKLOG_SIZE,
+        put_timeout: float = DEFAULT_PUT_TIMEOUT
+    ):
+        """Initialize bus with no sessions and no WebSocket manager."""
+        self.queue_size = queue_size
+        self.backlog_size = backlog_size
+        self.put_timeout = put_timeout
+
+        self._subscribers: Dict[str, Set[SessionSubscription]] = {}
+        self._backlog: "OrderedDict[str, Deque[dict]]" = OrderedDict()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ws_manager = None
+
+        self._stats = {
+            "published": 0,
+            "delivered": 0,
+            "backlogged": 0,
+            "dropped": 0,
+        }
+
+    def attach_websocket_manager(self, ws_manager) -> None:
+        """
+        Fan out published events to WebSocket clients of the same session.
+
+        Events go only to sockets subscribed to their thread_id; sessions
+        without such a socket get them through the SSE subscription alone.
+
+        Args:
+            ws_manager: ConnectionManager exposing async send_to_session(thread_id, message)
+        """
+        self._ws_manager = ws_manager
+
+    @asynccontextmanager
+    async def subscribe(self, thread_id: str) -> AsyncIterator[SessionSubscription]:
+        """
+        Subscribe to a session for the duration of the context.
+
+        Any backlog accumulated for the session is replayed first.
+
+        Usage:
+            async with event_bus.subscribe(thread_id) as subscription:
+                async for kind, item in subscription.interleave(agent_stream):
+                    ...
+        """
+        self._loop = asyncio.get_running_loop()
+        subscription = SessionSubscription(thread_id, maxsize=self.queue_size)
+
+        for event in self._backlog.pop(thread_id, ()):
+            subscription.queue.put_nowait(event)
+
+        self._subscribers.setdefault(thread_id, set()).add(subscription)
+        logger.debug(
+            f"[EventBus] Subscribed to {thread_id} "
+            f"(subscribers: {len(self._subscribers[thread_id])})"
+        )
+
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscribers.get(thread_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[thread_id]
+            logger.debug(f"[EventBus] Unsubscribed from {thread_id}")
+
+    async def publish(self, thread_id: str, event: dict, websocket: bool = True) -> None:
+        """
+        Publish an event to every subscriber of a session.
+
+        Waits up to put_timeout per full subscriber queue (backpressure),
+        then drops the event for that subscriber. Sessions without a
+        subscriber keep the most recent backlog_size events for replay.
+
+        Args:
+            thread_id: Session the event belongs to
+            event: JSON-serializable event payload
+            websocket: Also send to the session's WebSocket clients (tagged with thread_id)
+        """
+        owner = self._loop
+        if owner is not None and not owner.is_closed():
+            try:
+                current = asyncio.get_running_loop()
+            except RuntimeError:
+                current = None
+            if current is not owner:
+                future = asyncio.run_coroutine_threadsafe(
+                    self._publish(thread_id, event, websocket), owner
+                )
+                await asyncio.wrap_future(future)
+                return
+
+        await self._publish(thread_id, event, websocket)
+
+    def publish_threadsafe(self, thread_id: str, event: dict, websocket: bool = True) -> None:
+        """
+        Publish from a thread with no running event loop (fire-and-forget).
+
+        Args:
+            thread_id: Session the event belongs to
+            event: JSON-serializable event payload
+            websocket: Also send to the session's WebSocket clients
+        """
+        owner = self._loop
+        if owner is None or owner.is_closed():
+            self._stats["published"] += 1
+            self._append_backlog(thread_id, event)
+            return
+        asyncio.run_coroutine_threadsafe(self._publish(thread_id, event, websocket), owner)
+
+    async def _publish(self, thread_id: str, event: dict, websocket: bool) -> None:
+        """Deliver on the owning loop."""
+        self._stats["published"] += 1
+
+        subscribers = list(self._subscribers.get(thread_id, ()))
+        if subscribers:
+            await asyncio.gather(*(self._deliver(sub, event) for sub in subscribers))
+        else:
+            self._append_backlog(thread_id, event)
+
+        if websocket and self._ws_manager is not None:
+            try:
+                await self._ws_manager.send_to_session(thread_id, {**event, "thread_id": thread_id})
+            except Exception as e:
+                logger.warning(f"[EventBus] WebSocket fan-out failed for {thread_id}: {e}")
+
+    async def _deliver(self, subscription: SessionSubscription, event: dict) -> None:
+        """Put event on one subscriber queue, dropping it after put_timeout."""
+        try:
+            await asyncio.wait_for(subscription.queue.put(event), timeout=self.put_timeout)
+            self._stats["delivered"] += 1
+        except asyncio.TimeoutError:
+            self._stats["dropped"] += 1
+            logger.warning(
+                f"[EventBus] Dropped {event.get('type')} for {subscription.thread_id}: "
+                f"subscriber queue full ({self.queue_size})"
+            )
+
+    def _append_backlog(self, thread_id: str, event: dict) -> None:
+        """Buffer an event for a session with no subscribers."""
+        backlog = self._backlog.get(thread_id)
+        if backlog is None:
+            backlog = self._backlog[thread_id] = deque(maxlen=self.backlog_size)
+            if len(self._backlog) > MAX_BACKLOG_SESSIONS:
+                _, evicted = self._backlog.popitem(last=False)
+                self._stats["dropped"] += len(evicted)
+        if len(backlog) == backlog.maxlen:
+            self._stats["dropped"] += 1
+        backlog.append(event)
+        self._stats["backlogged"] += 1
+
+    def get_stats(self) -> dict:
+        """Return counters and current session/subscriber totals."""
+        return {
+            **self._stats,
+            "active_sessions": len(self._subscribers),
+            "subscribers": sum(len(subs) for subs in self._subscribers.values()),
+            "backlogged_sessions": len(self._backlog),
+        }
+
+
+# Singleton instance
+event_bus = SessionEventBus()
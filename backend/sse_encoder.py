@@ -0,0 +1,256 @@
+"""
+SSE Encoder for Chat Streams.
+
+stream_agent_response used to json.dumps every event into its own "data:"
+frame and follow each yield with asyncio.sleep(0), so a tool-heavy run meant
+thousands of tiny socket writes and scheduler hops. This encoder:
+- Serializes with orjson when installed (compact stdlib json otherwise)
+- Coalesces frames produced within a short window into one write, flushing
+  early when the batch grows large and as soon as the window ends even if
+  the agent is idle (e.g. waiting on an approval)
+- Optionally (compact mode) sends large tool_result payloads by reference:
+  a preview plus a result_id fetched on demand from the tool result endpoint
+- Counts events, writes and bytes per stream for throughput reporting
+
+Usage:
+    encoder = SSEEncoder(thread_id, compact=True)
+    async for data in encoder.stream(agent_event_stream(...)):
+        yield data
+    logger.info(encoder.get_stats())
+"""
+
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Check if orjson is available (optional fast serializer)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Seconds a frame may wait for others to share its write
+DEFAULT_WINDOW = float(os.getenv("SSE_COALESCE_WINDOW", "0.015"))
+
+# Buffered bytes that trigger a write before the window ends
+DEFAULT_MAX_BATCH_BYTES = 64 * 1024
+
+# tool_result content longer than this is sent by reference in compact mode
+DEFAULT_INLINE_LIMIT = 2048
+
+# Characters of a referenced tool_result kept inline as a preview
+PREVIEW_CHARS = 280
+
+# Referenced tool results kept for on-demand fetches (least recently used evicted first)
+DEFAULT_MAX_RESULTS = 512
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON, preferring orjson."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # Types orjson rejects (e.g. int subclasses); let json decide
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def sse_frame(event: Dict[str, Any]) -> bytes:
+    """Encode one event as an SSE "data:" frame."""
+    return b"data: " + dumps(event) + b"\n\n"
+
+
+class ToolResultStore:
+    """
+    Bounded LRU store of full tool results sent by reference.
+
+    Results are scoped to the thread that produced them: a fetch must name
+    the same thread_id, so result ids are not readable across sessions.
+    """
+
+    def __init__(self, max_results: int = DEFAULT_MAX_RESULTS):
+        self.max_results = max_results
+        self._results: "OrderedDict[str, tuple]" = OrderedDict()  # result_id -> (thread_id, content)
+        self._lock = threading.Lock()
+
+    def put(self, thread_id: str, content: str) -> str:
+        """Store a result and return its id."""
+        result_id = uuid.uuid4().hex
+        with self._lock:
+            self._results[result_id] = (thread_id, content)
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+        return result_id
+
+    def get(self, thread_id: str, result_id: str) -> Optional[str]:
+        """Return a stored result, or None if unknown, evicted or another thread's."""
+        with self._lock:
+            entry = self._results.get(result_id)
+            if entry is None or entry[0] != thread_id:
+                return None
+            self._results.move_to_end(result_id)  # Fetched results are evicted last
+        return entry[1]
+
+
+# Process-wide store shared by all chat streams and the fetch endpoint
+tool_result_store = ToolResultStore()
+
+
+class SSEEncoder:
+    """
+    Encodes one chat stream's events into coalesced SSE writes.
+
+    Attributes:
+        thread_id: Thread the stream belongs to (scopes referenced results)
+        window: Seconds a frame may wait for others to share its write (0 = no coalescing)
+        max_batch_bytes: Buffered bytes that trigger an early write
+        compact: Send large tool_result payloads by reference
+        inline_limit: tool_result length above which compact mode references it
+    """
+
+    def __init__(
+        self,
+        thread_id: str,
+        window: float = DEFAULT_WINDOW,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        compact: bool = False,
+        inline_limit: int = DEFAULT_INLINE_LIMIT,
+        result_store: Optional[ToolResultStore] = None
+    ):
+        self.thread_id = thread_id
+        self.window = window
+        self.max_batch_bytes = max_batch_bytes
+        self.compact = compact
+        self.inline_limit = inline_limit
+        self.result_store = result_store or tool_result_store
+
+        self._stats = {"events": 0, "writes": 0, "bytes": 0, "referenced_results": 0, "referenced_bytes": 0}
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+
+    def encode(self, event: Dict[str, Any]) -> bytes:
+        """Encode one event, referencing its payload if compact mode applies."""
+        if self.compact and event.get("type") == "tool_result":
+            content = event.get("content")
+            if isinstance(content, str) and len(content) > self.inline_limit:
+                result_id = self.result_store.put(self.thread_id, content)
+                event = {
+                    **event,
+                    "content": content[:PREVIEW_CHARS],
+                    "truncated": True,
+                    "result_id": result_id,
+                    "size": len(content),
+                }
+                self._stats["referenced_results"] += 1
+                self._stats["referenced_bytes"] += len(content)
+
+        self._stats["events"] += 1
+        return sse_frame(event)
+
+    async def stream(self, events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+        """
+        Encode an event stream into coalesced writes.
+
+        A pump task iterates the source and encodes into a shared buffer; this
+        generator writes the buffer once per window (earlier if it fills up),
+        so a write goes out when the window ends even if the source is idle.
+        The source runs entirely inside the pump task, with a copy of the
+        caller's context: context variables it sets (such as the current
+        session) persist between its events.
+
+        Args:
+            events: Async iterator of JSON-serializable event dicts
+
+        Yields:
+            One or more concatenated SSE frames per write
+
+        Raises:
+            Whatever the source raised, after the frames it produced are written
+        """
+        loop = asyncio.get_running_loop()
+        buffer = bytearray()
+        has_data = asyncio.Event()     # Buffer non-empty (or source finished)
+        flush_now = asyncio.Event()    # Buffer full (or source finished)
+        has_space = asyncio.Event()    # Buffer below max_batch_bytes
+        has_space.set()
+        finished = False
+        failure: Optional[BaseException] = None
+
+        async def pump() -> None:
+            nonlocal finished, failure
+            try:
+                async for event in events:
+                    if len(buffer) >= self.max_batch_bytes:
+                        has_space.clear()
+                        flush_now.set()
+                        await has_space.wait()  # Backpressure: slow client
+                    buffer.extend(self.encode(event))
+                    has_data.set()
+            except Exception as e:
+                failure = e
+            finally:
+                finished = True
+                has_data.set()
+                flush_now.set()
+                if failure is None and hasattr(events, "aclose"):
+                    await events.aclose()  # No-op unless cancelled while the source sat at a yield
+
+        self._started = time.perf_counter()
+        pump_task = loop.create_task(pump(), context=contextvars.copy_context())
+        try:
+            while True:
+                await has_data.wait()
+                if not finished and self.window > 0 and len(buffer) < self.max_batch_bytes:
+                    try:
+                        await asyncio.wait_for(flush_now.wait(), self.window)
+                    except asyncio.TimeoutError:
+                        pass
+
+                # Take the batch and reset signals before yielding: the pump
+                # keeps filling the buffer while this write is being sent
+                data = self._take(buffer) if buffer else None
+                done = finished
+                has_data.clear()
+                flush_now.clear()
+                has_space.set()
+
+                if data:
+                    yield data
+                if done:
+                    break
+        finally:
+            self._finished = time.perf_counter()
+            if not pump_task.done():
+                pump_task.cancel()  # Unwinds the source inside the pump task
+
+        if failure is not None:
+            raise failure
+
+    def _take(self, buffer: bytearray) -> bytes:
+        """Empty the buffer into one write."""
+        data = bytes(buffer)
+        buffer.clear()
+        self._stats["writes"] += 1
+        self._stats["bytes"] += len(data)
+        return data
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-stream counters plus throughput (events/sec) and frames per write."""
+        elapsed = 0.0
+        if self._started is not None:
+            elapsed = (self._finished or time.perf_counter()) - self._started
+        stats = dict(self._stats)
+        stats["elapsed_s"] = round(elapsed, 3)
+        stats["events_per_sec"] = round(stats["events"] / elapsed, 1) if elapsed > 0 else 0.0
+        stats["events_per_write"] = round(stats["events"] / stats["writes"], 2) if stats["writes"] else 0.0
+        return stats
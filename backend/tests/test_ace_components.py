@@ -2,10 +2,11 @@
 Unit tests for ACE (Agentic Context Engineering) components.
 
 Tests all ACE components with Osmosis-Structure-0.6B integration:
-- OsmosisExtractor (two-pass workflow)
-- PlaybookStore (persistence and CRUD)
+- OsmosisExtractor (two-pass workflow, micro-batching)
+- PlaybookStore (persistence, CRUD, latest pointer and read-through cache)
 - Reflector (insight generation)
-- Curator (delta generation with semantic de-duplication)
+- Curator (delta generation with semantic de-duplication and cached entry embeddings)
+- ReflectionQueue (bounded worker pool, per-agent batching, shedding)
 - ACEMiddleware (node wrapping)
 
 Uses Ollama local deployment for zero-cost testing.
@@ -23,6 +24,7 @@ from ace.playbook_store import PlaybookStore
 from ace.reflector import Reflector
 from ace.curator import Curator
 from ace.middleware import ACEMiddleware
+from ace.reflection_queue import ReflectionJob, ReflectionQueue
 from ace.schemas import (
     PlaybookEntry,
     PlaybookState,
@@ -35,6 +37,7 @@ from ace.schemas import (
 )
 from ace.config import ACEConfig, ACE_CONFIGS
 
+from langchain_core.embeddings import Embeddings
 from langgraph.store.memory import InMemoryStore
 from pydantic import BaseModel, Field
 
@@ -230,6 +233,50 @@ class TestOsmosisExtractor:
 
         assert result.value == "test"
 
+    @pytest.mark.asyncio
+    async def test_concurrent_extractions_batched(self):
+        """Test that concurrent extractions of one schema share a request."""
+
+        class Finding(BaseModel):
+            summary: str
+
+        extractor = OsmosisExtractor(mode="ollama", batch_window=0.05, max_batch_size=3)
+        requests = []
+
+        async def fake_backend(text, extraction_prompt, schema):
+            requests.append(schema.__name__)
+            count = text.count("### TEXT")
+            return {"items": [{"summary": f"finding {i}"} for i in range(1, count + 1)]}
+
+        extractor._extract_ollama = fake_backend
+
+        results = await asyncio.gather(
+            extractor.extract("first", Finding),
+            extractor.extract("second", Finding),
+        )
+
+        assert requests == ["FindingBatch"]
+        assert [r.summary for r in results] == ["finding 1", "finding 2"]
+        await extractor.close()
+
+    @pytest.mark.asyncio
+    async def test_close_releases_http_clients(self):
+        """Test that close() closes the Osmosis and Ollama clients."""
+
+        class SpyClient:
+            closed = False
+
+            async def close(self):
+                self.closed = True
+
+        extractor = OsmosisExtractor(mode="ollama")
+        extractor._ollama_client = SpyClient()
+
+        await extractor.close()
+
+        assert extractor.client.is_closed
+        assert extractor._ollama_client.closed
+
 
 # ============================================================================
 # PlaybookStore Tests
@@ -344,6 +391,65 @@ class TestPlaybookStore:
         assert stats["harmful_entries"] == 1
         assert stats["avg_confidence"] > 0
 
+    @pytest.mark.asyncio
+    async def test_latest_pointer_and_separate_history(self, playbook_store, sample_playbook):
+        """Test that only the latest key lives in the playbook namespace."""
+
+        for _ in range(3):
+            await playbook_store.save_playbook(sample_playbook)
+
+        current = await playbook_store.store.asearch(("ace", "playbooks", "researcher"))
+        history = await playbook_store.store.asearch(("ace", "playbook_history", "researcher"))
+
+        assert [item.key for item in current] == ["latest"]
+        assert current[0].value["version"] == 3
+        assert sorted(item.key for item in history) == ["v1", "v2", "v3"]
+
+    @pytest.mark.asyncio
+    async def test_cached_reads_skip_store(self, playbook_store, sample_playbook, monkeypatch):
+        """Test read-through cache and write-through invalidation."""
+
+        await playbook_store.save_playbook(sample_playbook)
+        await playbook_store.get_playbook("researcher")
+
+        calls = []
+        original_aget = InMemoryStore.aget
+
+        async def counting_aget(self, *args, **kwargs):
+            calls.append(args)
+            return await original_aget(self, *args, **kwargs)
+
+        # InMemoryStore uses __slots__, so patch the class rather than the instance
+        monkeypatch.setattr(InMemoryStore, "aget", counting_aget)
+
+        first = await playbook_store.get_playbook("researcher")
+        first["entries"].clear()  # Callers get copies
+        second = await playbook_store.get_playbook("researcher")
+
+        assert calls == []
+        assert len(second["entries"]) == 2
+
+        await playbook_store.save_playbook(second)
+        assert (await playbook_store.get_playbook("researcher"))["version"] == 2
+        assert calls == []
+
+    @pytest.mark.asyncio
+    async def test_legacy_versions_migrated(self, playbook_store, sample_playbook):
+        """Test that v{n} keys from the old layout move to the history namespace."""
+
+        namespace = ("ace", "playbooks", "researcher")
+        for version in (1, 2):
+            await playbook_store.store.aput(
+                namespace, f"v{version}", {**sample_playbook, "version": version}
+            )
+
+        playbook = await playbook_store.get_playbook("researcher")
+        history = await playbook_store.get_playbook_history("researcher")
+
+        assert playbook["version"] == 2
+        assert [p["version"] for p in history] == [2, 1]
+        assert [item.key for item in await playbook_store.store.asearch(namespace)] == ["latest"]
+
 
 # ============================================================================
 # Reflector Tests
@@ -490,6 +596,110 @@ class TestCurator:
         # (Exact behavior depends on similarity threshold)
         assert isinstance(delta, PlaybookDelta)
 
+    @pytest.mark.asyncio
+    async def test_entry_embeddings_cached(self, sample_playbook):
+        """Test that only new insights are embedded once entries carry embeddings."""
+
+        class CountingEmbeddings(Embeddings):
+            def __init__(self):
+                self.embedded: List[str] = []
+
+            def embed_documents(self, texts):
+                self.embedded.extend(texts)
+                return [
+                    [1.0, 0.0, 0.0] if "cite" in t else
+                    [0.0, 1.0, 0.0] if "delegat" in t else
+                    [0.0, 0.0, 1.0]
+                    for t in texts
+                ]
+
+            def embed_query(self, text):
+                return self.embed_documents([text])[0]
+
+        embeddings = CountingEmbeddings()
+        curator = Curator(osmosis=OsmosisExtractor(mode="ollama"), embeddings=embeddings)
+
+        def insight(content):
+            return ReflectionInsight(
+                id=str(uuid.uuid4()),
+                content=content,
+                category="helpful",
+                confidence_score=0.8,
+                execution_id="test",
+                agent_type="researcher",
+                tags=[],
+                evidence="",
+                recommendation="",
+                created_at=datetime.now(),
+            )
+
+        kept, _ = await curator._deduplicate_insights(
+            [insight("Always cite the original paper")], sample_playbook
+        )
+        assert kept == []
+        assert len(embeddings.embedded) == 3  # 1 insight + 2 entries
+
+        embeddings.embedded.clear()
+        kept, vectors = await curator._deduplicate_insights(
+            [insight("Prefer primary datasets over blog summaries")], sample_playbook
+        )
+        assert len(kept) == 1
+        assert embeddings.embedded == ["Prefer primary datasets over blog summaries"]
+        assert all(e.embedding is not None for e in sample_playbook["entries"])
+        assert set(vectors) == {"Prefer primary datasets over blog summaries"}
+
+
+# ============================================================================
+# ReflectionQueue Tests
+# ============================================================================
+
+class TestReflectionQueue:
+    """Test bounded, per-agent serialized background reflection."""
+
+    @pytest.mark.asyncio
+    async def test_batches_serialized_per_agent(self):
+        """Test batching and that one agent never has two batches running."""
+
+        batches = []
+        running = set()
+
+        async def handler(agent_type, jobs):
+            assert agent_type not in running
+            running.add(agent_type)
+            await asyncio.sleep(0.01)
+            batches.append((agent_type, [job.execution_id for job in jobs]))
+            running.discard(agent_type)
+
+        queue = ReflectionQueue(handler, workers=2, max_batch=3, batch_window=0.01)
+        for i in range(5):
+            queue.submit(ReflectionJob("researcher", f"r{i}", {}, None))
+        queue.submit(ReflectionJob("writer", "w0", {}, None))
+
+        assert await queue.drain(timeout=2.0)
+        assert ("writer", ["w0"]) in batches
+        assert [ids for agent, ids in batches if agent == "researcher"] == [
+            ["r0", "r1", "r2"], ["r3", "r4"]
+        ]
+
+    @pytest.mark.asyncio
+    async def test_full_queue_sheds_and_drops(self):
+        """Test shedding the agent's oldest trace and dropping after shutdown."""
+
+        async def handler(agent_type, jobs):
+            pass
+
+        queue = ReflectionQueue(handler, workers=1, max_pending=2, batch_window=0.05)
+        for i in range(4):
+            queue.submit(ReflectionJob("researcher", f"r{i}", {}, None))
+
+        assert queue.get_stats()["shed"] == 2
+        assert await queue.drain(timeout=2.0)
+        assert not queue.submit(ReflectionJob("researcher", "late", {}, None))
+
+        stats = queue.get_stats()
+        assert stats["processed"] == 2
+        assert stats["dropped"] == 1
+
 
 # ============================================================================
 # ACEMiddleware Tests
@@ -546,6 +756,34 @@ class TestACEMiddleware:
         assert "ACE PLAYBOOK" in first_message.content
         assert "exact quotes" in first_message.content.lower()
 
+    @pytest.mark.asyncio
+    async def test_playbook_passed_to_node_built_prompt(self, ace_middleware, sample_playbook):
+        """Test playbook handoff when the node builds its own (cached) system prompt."""
+        from langchain_core.messages import HumanMessage, SystemMessage
+
+        state = {"messages": [HumanMessage(content="Research topic")]}
+
+        enhanced = await ace_middleware._inject_playbook(
+            state, sample_playbook, "researcher", ACE_CONFIGS["researcher"],
+        )
+
+        # Messages untouched, playbook available for the dynamic tail
+        assert enhanced["messages"] == state["messages"]
+        assert "ACE PLAYBOOK" in enhanced["ace_playbook"]
+        assert "ace_playbook" not in state
+
+        # Content-block system messages keep their cached prefix block intact
+        prefix_block = {"type": "text", "text": "static", "cache_control": {"type": "ephemeral"}}
+        state = {"messages": [SystemMessage(content=[prefix_block])]}
+
+        enhanced = await ace_middleware._inject_playbook(
+            state, sample_playbook, "researcher", ACE_CONFIGS["researcher"],
+        )
+
+        blocks = enhanced["messages"][0].content
+        assert blocks[0] == prefix_block
+        assert "ACE PLAYBOOK" in blocks[1]["text"]
+
     @pytest.mark.asyncio
     async def test_delta_application(self, ace_middleware, sample_playbook):
         """Test applying playbook delta."""
@@ -593,30 +831,28 @@ class TestACEIntegration:
 
         # Initialize playbook
         await ace_middleware.playbook_store.initialize_all_playbooks()
+        before = (await ace_middleware.playbook_store.get_playbook("researcher"))["total_executions"]
 
-        # Mock execution trace
-        execution_id = "integration_test_001"
-
-        # Trigger reflection and curation
-        await ace_middleware._reflect_and_update(
-            execution_trace=sample_execution_trace,
-            execution_id=execution_id,
-            agent_type="researcher",
-            config=ACEConfig(
-                enabled=True,
-                reflection_mode="automatic",
-                playbook_id="researcher_v1",
-            ),
+        config = ACEConfig(
+            enabled=True,
+            reflection_mode="automatic",
+            playbook_id="researcher_v1",
         )
 
-        # Wait for async processing
-        await asyncio.sleep(1)
+        # Two queued executions reflected as one batch
+        jobs = [
+            ReflectionJob("researcher", f"integration_test_00{i}", sample_execution_trace, config)
+            for i in (1, 2)
+        ]
+
+        # Trigger reflection and curation
+        await ace_middleware._reflect_and_update("researcher", jobs)
 
         # Verify playbook was updated
         playbook = await ace_middleware.playbook_store.get_playbook("researcher")
 
-        # Should have executed at least once
-        assert playbook["total_executions"] >= 1
+        # Every execution in the batch is counted
+        assert playbook["total_executions"] == before + len(jobs)
 
 
 # ============================================================================
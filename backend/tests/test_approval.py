@@ -14,9 +14,8 @@ sys.path.insert(0, str(Path(__file__).parent))
 from module_2_2_simple import (
     get_approval_for_tool,
     submit_approval_decision,
-    get_auto_approve,
-    set_auto_approve
 )
+from backend.approval_registry import get_auto_approve, set_auto_approve
 
 
 async def test_approval_flow():
@@ -0,0 +1,111 @@
+"""
+Unit tests for per-session approval state.
+
+Covers:
+- Auto-approve mode isolated between concurrent chat tasks
+- Decisions resolving only their own session's request
+- Waiters on a private loop in another thread (no blocked worker on the caller)
+- Timeout and TTL sweep cleanup
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from approval_registry import (
+    ApprovalRegistry,
+    get_auto_approve,
+    set_auto_approve,
+)
+
+
+class TestAutoApproveContext:
+    """Test contextvar scoping of auto-approve mode."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_chats_keep_their_own_mode(self):
+        seen = {}
+
+        async def chat(name, enabled):
+            set_auto_approve(enabled)
+            await asyncio.sleep(0.01)
+            seen[name] = get_auto_approve()
+
+        await asyncio.gather(chat("strict", False), chat("relaxed", True))
+
+        assert seen == {"strict": False, "relaxed": True}
+        assert get_auto_approve() is True
+
+
+class TestApprovalRegistry:
+    """Test registration, resolution and cleanup."""
+
+    @pytest.mark.asyncio
+    async def test_decision_resolves_waiter(self):
+        registry = ApprovalRegistry()
+        pending = registry.register("thread-a", "r1", "write_file", {"file_path": "a.md"})
+
+        waiter = asyncio.create_task(registry.wait(pending, timeout=1.0))
+        await asyncio.sleep(0)
+        assert registry.resolve("r1", approved=False, feedback="no")
+
+        assert await waiter == {"approved": False, "feedback": "no"}
+        assert registry.get_stats()["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_decision_for_other_session_rejected(self):
+        registry = ApprovalRegistry()
+        pending = registry.register("thread-a", "r1", "write_file", {})
+
+        assert not registry.resolve("r1", approved=True, thread_id="thread-b")
+        assert not registry.resolve("unknown", approved=True)
+        assert registry.resolve("r1", approved=True, thread_id="thread-a")
+        assert (await registry.wait(pending, timeout=1.0))["approved"] is True
+
+    @pytest.mark.asyncio
+    async def test_waiter_on_private_loop_in_other_thread(self):
+        registry = ApprovalRegistry()
+        registered = threading.Event()
+        result = {}
+
+        def tool_thread():
+            async def run():
+                pending = registry.register("thread-a", "r1", "edit_file", {})
+                registered.set()
+                result["decision"] = await registry.wait(pending, timeout=2.0)
+            asyncio.run(run())
+
+        thread = threading.Thread(target=tool_thread)
+        thread.start()
+        await asyncio.to_thread(registered.wait, 2.0)
+
+        assert registry.resolve("r1", approved=True)
+        await asyncio.to_thread(thread.join, 2.0)
+
+        assert result["decision"]["approved"] is True
+
+    @pytest.mark.asyncio
+    async def test_timeout_removes_entry(self):
+        registry = ApprovalRegistry()
+        pending = registry.register("thread-a", "r1", "write_file", {})
+
+        decision = await registry.wait(pending, timeout=0.01)
+
+        assert decision["approved"] is False
+        assert registry.get_stats()["pending"] == 0
+        assert registry.get_stats()["timed_out"] == 1
+
+    @pytest.mark.asyncio
+    async def test_sweep_expires_stale_entries(self):
+        registry = ApprovalRegistry(ttl=60.0)
+        stale = registry.register("thread-a", "old", "write_file", {})
+        fresh = registry.register("thread-b", "new", "write_file", {})
+        fresh.created_at = stale.created_at + 120.0
+
+        assert registry.sweep(now=stale.created_at + 90.0) == 1
+        await asyncio.sleep(0)
+
+        assert stale.future.result()["approved"] is False
+        assert not fresh.future.done()
+        assert registry.get_stats()["sessions"] == 1
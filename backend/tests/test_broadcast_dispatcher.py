@@ -0,0 +1,142 @@
+"""
+Unit tests for the main-loop broadcast dispatcher.
+
+Covers:
+- Delivery on the owning loop for submissions from worker threads
+- Coalescing of repeated file changes and plan updates
+- Dropping the oldest pending event when the backlog is full
+- Draining pending events on stop, including a batch being delivered
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from broadcast_dispatcher import BroadcastDispatcher
+
+
+class FakeManager:
+    """Records broadcasts and the thread they were delivered on."""
+
+    def __init__(self):
+        self.messages = []
+        self.file_changes = []
+        self.threads = set()
+
+    async def broadcast(self, message):
+        self.threads.add(threading.get_ident())
+        self.messages.append(message)
+
+    async def broadcast_file_change(self, **kwargs):
+        self.threads.add(threading.get_ident())
+        self.file_changes.append(kwargs)
+
+
+async def _wait_for(predicate, timeout: float = 1.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out waiting for delivery"
+        await asyncio.sleep(0.01)
+
+
+class TestBroadcastDispatcher:
+    """Test submission, batching and backpressure."""
+
+    @pytest.mark.asyncio
+    async def test_worker_thread_submissions_delivered_on_main_loop(self):
+        manager = FakeManager()
+        dispatcher = BroadcastDispatcher()
+        dispatcher.start(manager)
+
+        def worker():
+            for i in range(10):
+                dispatcher.submit({"type": "agent_event", "event_type": "step_completed", "n": i})
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+        await _wait_for(lambda: len(manager.messages) == 10)
+        await dispatcher.stop()
+
+        assert [m["n"] for m in manager.messages] == list(range(10))
+        assert manager.threads == {threading.get_ident()}
+
+    @pytest.mark.asyncio
+    async def test_file_changes_coalesce_keeping_first_old_content(self):
+        manager = FakeManager()
+        dispatcher = BroadcastDispatcher()
+        dispatcher.start(manager)
+
+        # Submitted in one loop iteration, so the second replaces the first
+        dispatcher.submit_file_change("a.md", "v0", "v1", "ai_agent")
+        dispatcher.submit_file_change("a.md", "v1", "v2", "ai_agent")
+
+        await _wait_for(lambda: manager.file_changes)
+        await dispatcher.stop()
+
+        assert len(manager.file_changes) == 1
+        assert manager.file_changes[0]["old_content"] == "v0"
+        assert manager.file_changes[0]["new_content"] == "v2"
+        assert dispatcher.get_stats()["coalesced"] == 1
+
+    @pytest.mark.asyncio
+    async def test_plan_updates_coalesce_per_plan(self):
+        manager = FakeManager()
+        dispatcher = BroadcastDispatcher()
+        dispatcher.start(manager)
+
+        for progress in (0.2, 0.4):
+            dispatcher.submit({"event_type": "plan_updated", "data": {"plan_id": "p1", "progress": progress}})
+        dispatcher.submit({"event_type": "plan_updated", "data": {"plan_id": "p2", "progress": 0.1}})
+
+        await _wait_for(lambda: len(manager.messages) == 2)
+        await dispatcher.stop()
+
+        assert [(m["data"]["plan_id"], m["data"]["progress"]) for m in manager.messages] == [
+            ("p1", 0.4),
+            ("p2", 0.1),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_full_backlog_drops_oldest(self):
+        manager = FakeManager()
+        dispatcher = BroadcastDispatcher(max_pending=2)
+        dispatcher.start(manager)
+
+        for i in range(3):
+            dispatcher.submit({"event_type": "step_completed", "n": i})
+
+        await dispatcher.stop()
+
+        assert [m["n"] for m in manager.messages] == [1, 2]
+        assert dispatcher.get_stats()["dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stop_finishes_batch_in_flight(self):
+        manager = FakeManager()
+        delivering = asyncio.Event()
+
+        async def slow_broadcast(message):
+            delivering.set()
+            await asyncio.sleep(0.05)
+            manager.messages.append(message)
+
+        manager.broadcast = slow_broadcast
+        dispatcher = BroadcastDispatcher()
+        dispatcher.start(manager)
+        for i in range(3):
+            dispatcher.submit({"type": "agent_event", "n": i})
+
+        await delivering.wait()  # First event of the batch is being delivered
+        await dispatcher.stop()
+
+        assert [m["n"] for m in manager.messages] == [0, 1, 2]
+        assert not dispatcher.running
+
+    def test_submit_without_running_loop_is_dropped(self):
+        dispatcher = BroadcastDispatcher()
+
+        assert dispatcher.submit({"event_type": "plan_created"}) is False
+        assert dispatcher.get_stats()["dropped"] == 1
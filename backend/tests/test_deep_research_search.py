@@ -0,0 +1,94 @@
+"""
+Unit tests for deep_research search fan-out.
+
+Covers:
+- Sub-query parsing and de-duplication against query history
+- Sub-query count derived from the effort level
+- Concurrency bounded by parallel_searches, failures isolated
+- URL de-duplication when merging results
+"""
+
+import asyncio
+
+import pytest
+
+from agents.deep_research.effort_config import get_effort_config
+from agents.deep_research.search_fanout import (
+    merge_results,
+    parse_subqueries,
+    run_searches,
+    select_subqueries,
+    subquery_count,
+)
+
+
+class TestSubqueries:
+    """Test expansion parsing and selection."""
+
+    def test_parse_strips_list_markers(self):
+        text = 'Queries:\n1. quantum error rates\n- "surface codes 2025"\n* IBM Heron\n\n'
+
+        assert parse_subqueries(text) == ["quantum error rates", "surface codes 2025", "IBM Heron"]
+
+    def test_select_skips_searched_and_duplicates(self):
+        selected = select_subqueries(
+            "Quantum computing",
+            ["quantum computing!", "surface codes", "Surface  codes", "IBM Heron", "qubits"],
+            history=["IBM heron"],
+            count=3,
+        )
+
+        assert selected == ["Quantum computing", "surface codes", "qubits"]
+
+    def test_select_falls_back_to_original(self):
+        assert select_subqueries("qc", ["qc"], history=["qc"], count=4) == ["qc"]
+
+    def test_count_scales_with_effort(self):
+        quick = get_effort_config("quick")
+        deep = get_effort_config("deep")
+
+        assert subquery_count(quick, search_count=0, iteration=1) == quick.parallel_searches
+        assert subquery_count(deep, search_count=0, iteration=1) == deep.parallel_searches
+        # Behind schedule on the last iteration: capped at 2x parallel_searches
+        assert subquery_count(deep, search_count=0, iteration=deep.max_iterations) == 2 * deep.parallel_searches
+
+
+class TestRunSearches:
+    """Test concurrent execution and merging."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_bounded_and_failures_isolated(self):
+        running = 0
+        peak = 0
+
+        async def search(query):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            if query == "bad":
+                raise RuntimeError("rate limited")
+            return [{"url": f"https://{query}.example"}]
+
+        outcomes = await run_searches(["a", "b", "bad", "c", "d"], search, concurrency=2)
+
+        assert peak == 2
+        assert [q for q, _ in outcomes] == ["a", "b", "bad", "c", "d"]
+        assert isinstance(outcomes[2][1], RuntimeError)
+
+    def test_merge_dedupes_by_url(self):
+        outcomes = [
+            ("q1", [{"url": "https://a"}, {"url": "https://b"}]),
+            ("q2", RuntimeError("failed")),
+            ("q3", [{"url": "https://b"}, {"url": "https://c"}, {"url": "https://old"}]),
+        ]
+        seen = {"https://old"}
+
+        merged, duplicates = merge_results(outcomes, seen)
+
+        assert [(q, r["url"]) for q, r in merged] == [
+            ("q1", "https://a"), ("q1", "https://b"), ("q3", "https://c"),
+        ]
+        assert duplicates == 2
+        assert seen == {"https://old", "https://a", "https://b", "https://c"}
@@ -0,0 +1,150 @@
+"""
+Unit tests and growth benchmark for deep_research state.
+
+Covers:
+- Search-result store reducer (deduplicated by URL hash)
+- Action history reducer (bounded)
+- Regression benchmark: nodes return deltas, so checkpoint bytes written per
+  research iteration stay flat and state grows linearly, not quadratically
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from agents.deep_research import base_agent
+from agents.deep_research.state import (
+    ACTION_HISTORY_LIMIT,
+    ActionRecord,
+    SearchResult,
+    create_initial_state,
+    keep_recent_actions,
+    merge_search_results,
+    search_result_key,
+)
+from agents.deep_research.vector_store import ResearchVectorStore
+
+
+def _result(url: str, query: str = "q") -> SearchResult:
+    return SearchResult(query=query, content="content", url=url, title="title")
+
+
+class TestReducers:
+    """Test the accumulator reducers."""
+
+    def test_search_store_keeps_first_copy(self):
+        first = _result("https://a", query="first")
+        store = merge_search_results({}, {search_result_key(first.url): first})
+
+        store = merge_search_results(store, {
+            search_result_key("https://a"): _result("https://a", query="second"),
+            search_result_key("https://b"): _result("https://b"),
+        })
+
+        assert list(store) == [search_result_key("https://a"), search_result_key("https://b")]
+        assert store[search_result_key("https://a")].query == "first"
+
+    def test_urlless_results_keyed_by_content(self):
+        assert search_result_key("", "one") != search_result_key("", "two")
+
+    def test_action_history_bounded(self):
+        actions = [
+            ActionRecord(action_type="search", agent_name="researcher", input=str(i), output="")
+            for i in range(ACTION_HISTORY_LIMIT + 3)
+        ]
+
+        history = []
+        for action in actions:
+            history = keep_recent_actions(history, [action])
+
+        assert [a.input for a in history] == [a.input for a in actions[-ACTION_HISTORY_LIMIT:]]
+
+
+class _FakeLLM:
+    """Deterministic stand-in for the research LLM."""
+
+    def __init__(self):
+        self.expansions = 0
+
+    def _respond(self, prompt: str) -> SimpleNamespace:
+        if prompt.startswith("Generate"):
+            self.expansions += 1
+            return SimpleNamespace(content="\n".join(
+                f"sub-query {self.expansions}-{i}" for i in range(10)
+            ))
+        if "research planning assistant" in prompt:
+            return SimpleNamespace(content="Clarified Query: growth benchmark")
+        if prompt.startswith("Analyze"):
+            return SimpleNamespace(content="Key findings:\n- steady growth")
+        return SimpleNamespace(content="report")
+
+    def invoke(self, prompt: str) -> SimpleNamespace:
+        return self._respond(prompt)
+
+    async def ainvoke(self, prompt: str) -> SimpleNamespace:
+        return self._respond(prompt)
+
+
+class _FakeSearch:
+    """Tavily stand-in returning five unique URLs per query."""
+
+    def __init__(self, **kwargs):
+        pass
+
+    async def ainvoke(self, payload: dict) -> list[dict]:
+        query = payload["query"]
+        return [
+            {"url": f"https://example.com/{query}/{i}", "title": query, "content": "x" * 200, "score": 0.5}
+            for i in range(5)
+        ]
+
+
+class _FakeEmbeddings:
+    """Constant-size embeddings (the benchmark measures state, not retrieval)."""
+
+    model = "fake"
+
+    async def aembed_documents(self, texts):
+        return [[float(len(text) % 7), 1.0, 0.5] for text in texts]
+
+    async def aembed_query(self, text):
+        return [float(len(text) % 7), 1.0, 0.5]
+
+
+@pytest.mark.performance
+class TestCheckpointGrowth:
+    """Benchmark checkpoint size across research iterations."""
+
+    @pytest.mark.asyncio
+    async def test_bytes_per_iteration_stay_flat(self, monkeypatch):
+        from langgraph.checkpoint.memory import MemorySaver
+
+        monkeypatch.setattr(base_agent, "llm", _FakeLLM())
+        monkeypatch.setattr(base_agent, "TavilySearchResults", _FakeSearch)
+        store = ResearchVectorStore(_FakeEmbeddings())
+        monkeypatch.setattr(base_agent, "get_vector_store", lambda session_id: store)
+
+        saver = MemorySaver()
+        app = base_agent.create_deep_research_agent(checkpointer=saver)
+        config = {"configurable": {"thread_id": "growth"}, "recursion_limit": 100}
+        state = create_initial_state("growth benchmark", "deep", session_id="growth")
+
+        update_bytes = []
+        async for chunk in app.astream(state, config, stream_mode="updates"):
+            if "research" in chunk:
+                update_bytes.append(len(saver.serde.dumps_typed(chunk["research"])[1]))
+
+        # Checkpoints taken right after each research step (oldest first)
+        history = [snap async for snap in app.aget_state_history(config)][::-1]
+        after_research = [snap for snap in history if snap.next == ("analysis",)]
+        state_bytes = [len(saver.serde.dumps_typed(snap.values)[1]) for snap in after_research]
+        growth = [b - a for a, b in zip(state_bytes, state_bytes[1:])]
+
+        final = history[-1].values
+        assert len(after_research) >= 5
+        assert final["search_count"] == len(final["search_results"]) == 25 * len(after_research)
+        assert len(final["action_history"]) <= 5
+
+        # Flat: the last iteration writes about as much as the second one
+        assert max(update_bytes[1:]) < 1.25 * min(update_bytes[1:])
+        assert max(growth) < 1.25 * min(growth)
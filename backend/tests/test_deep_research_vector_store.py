@@ -0,0 +1,162 @@
+"""
+Unit tests for the deep_research vector RAG store.
+
+Covers:
+- Chunking with overlap on word boundaries
+- Indexing each search result once
+- Multi-question retrieval merged by best score and capped
+- Sub-questions embedded as queries, not documents
+- Persistence round trip and model-change re-indexing
+- Resumed session rebuilds a dropped index from its search results
+- Session directories confined to the vector directory
+- Prompt formatting grouped by source
+"""
+
+from collections import OrderedDict
+
+import pytest
+
+from agents.deep_research import vector_store
+from agents.deep_research.state import SearchResult
+from agents.deep_research.vector_store import (
+    ResearchVectorStore,
+    RetrievedChunk,
+    chunk_text,
+    format_chunks,
+    get_vector_store,
+)
+
+VOCABULARY = ["qubit", "error", "surface", "code", "ion", "trap", "laser", "photon"]
+
+
+class _BagOfWordsEmbeddings:
+    """Deterministic embeddings: one dimension per vocabulary word."""
+
+    def __init__(self, model: str = "bag-of-words"):
+        self.model = model
+        self.calls = 0
+
+        self.queries = []
+
+    async def aembed_documents(self, texts):
+        self.calls += 1
+        return [[text.lower().count(word) for word in VOCABULARY] for text in texts]
+
+    async def aembed_query(self, text):
+        self.queries.append(text)
+        return [text.lower().count(word) for word in VOCABULARY]
+
+
+def _result(url: str, content: str) -> SearchResult:
+    return SearchResult(query="q", content=content, url=url, title=url.rsplit("/", 1)[-1])
+
+
+class TestChunkText:
+    """Test chunk boundaries."""
+
+    def test_short_text_single_chunk(self):
+        assert chunk_text("  a   short text ") == ["a short text"]
+        assert chunk_text("") == []
+
+    def test_long_text_overlaps_on_words(self):
+        text = " ".join(f"word{i}" for i in range(300))
+
+        chunks = chunk_text(text, chunk_size=200, overlap=40)
+
+        assert all(len(chunk) <= 200 for chunk in chunks)
+        assert chunks[0].startswith("word0 ")
+        assert chunks[-1].endswith("word299")
+        # Consecutive chunks share text and never split a word
+        for previous, current in zip(chunks, chunks[1:]):
+            assert current.split()[0] in previous.split()
+
+
+class TestResearchVectorStore:
+    """Test indexing, retrieval and persistence."""
+
+    @pytest.mark.asyncio
+    async def test_results_indexed_once(self):
+        embeddings = _BagOfWordsEmbeddings()
+        store = ResearchVectorStore(embeddings)
+        results = {"a": _result("https://a", "qubit error rates")}
+
+        assert await store.add_results(results) == 1
+        assert await store.add_results(results) == 0
+        assert store.size == 1
+        assert embeddings.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_retrieval_per_question_merged_and_capped(self):
+        embeddings = _BagOfWordsEmbeddings()
+        store = ResearchVectorStore(embeddings)
+        await store.add_results({
+            "a": _result("https://a/qubits", "qubit error error"),
+            "b": _result("https://b/surface", "surface code code"),
+            "c": _result("https://c/ions", "ion trap laser"),
+            "d": _result("https://d/photons", "photon photon"),
+        })
+
+        chunks = await store.search(["qubit error", "ion trap", "ion trap"], k_per_query=1, max_chunks=5)
+
+        assert [c.url for c in chunks] == ["https://a/qubits", "https://c/ions"]
+        assert chunks[0].score >= chunks[1].score > 0.5
+        assert embeddings.queries == ["qubit error", "ion trap"]  # Embedded as queries, deduplicated
+        assert embeddings.calls == 1
+
+        capped = await store.search(["qubit", "surface", "ion", "photon"], k_per_query=2, max_chunks=3)
+        assert len(capped) == 3
+
+    @pytest.mark.asyncio
+    async def test_persistence_round_trip(self, tmp_path):
+        store = ResearchVectorStore(_BagOfWordsEmbeddings(), path=tmp_path)
+        await store.add_results({"a": _result("https://a", "qubit error")})
+        store.save()
+
+        reopened = ResearchVectorStore(_BagOfWordsEmbeddings(), path=tmp_path)
+        assert reopened.size == 1
+        assert await reopened.add_results({"a": _result("https://a", "qubit error")}) == 0
+        assert (await reopened.search(["qubit"], 1, 1))[0].url == "https://a"
+
+        other_model = ResearchVectorStore(_BagOfWordsEmbeddings(model="other"), path=tmp_path)
+        assert other_model.size == 0
+
+    @pytest.mark.asyncio
+    async def test_resume_rebuilds_dropped_index(self, tmp_path, monkeypatch):
+        from agents.deep_research import base_agent
+
+        earlier = {"a": _result("https://a", "qubit error"), "b": _result("https://b", "ion trap")}
+        store = ResearchVectorStore(_BagOfWordsEmbeddings(), path=tmp_path)
+        await store.add_results(earlier)
+        store.save()
+
+        # Resumed with another embedding model: stored index is dropped
+        resumed = ResearchVectorStore(_BagOfWordsEmbeddings(model="other"), path=tmp_path)
+        monkeypatch.setattr(base_agent, "get_vector_store", lambda session_id: resumed)
+
+        count = await base_agent.index_results("s", {"c": _result("https://c", "photon laser")}, 2, earlier)
+
+        assert count == resumed.size == 3
+        assert (await resumed.search(["qubit"], 1, 1))[0].url == "https://a"
+        assert ResearchVectorStore(_BagOfWordsEmbeddings(model="other"), path=tmp_path).size == 3
+
+    def test_session_paths_stay_under_vector_dir(self, tmp_path, monkeypatch):
+        root = tmp_path / "vectors"
+        monkeypatch.setattr(vector_store, "VECTOR_DIR", root)
+        monkeypatch.setattr(vector_store, "_stores", OrderedDict())
+
+        paths = {
+            session_id: get_vector_store(session_id, _BagOfWordsEmbeddings()).path
+            for session_id in ["..", ".", "../escape", "/etc", "plan_20251115"]
+        }
+
+        assert all(path.parent == root.resolve() for path in paths.values())
+        assert len(set(paths.values())) == len(paths)
+
+    def test_format_groups_by_source(self):
+        text = format_chunks([
+            RetrievedChunk(url="https://a", title="A", text="first", score=0.9),
+            RetrievedChunk(url="https://b", title="B", text="second", score=0.8),
+            RetrievedChunk(url="https://a", title="A", text="third", score=0.7),
+        ])
+
+        assert text == "[1] A (https://a)\nfirst\n...\nthird\n\n[2] B (https://b)\nsecond"
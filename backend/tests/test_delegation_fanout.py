@@ -0,0 +1,278 @@
+"""
+Unit tests for parallel subagent fan-out.
+
+Covers:
+- Delegation tool output split into ToolMessages and per-call thread metadata
+- One Send per delegate_to_* call (failed delegations and other tools skipped)
+- Branches run concurrently with private message channels, bounded by the limit
+- The limit applies per run: concurrent runs do not wait on each other
+- Failing branch reported as an error result without cancelling the others
+- Results joined back to the supervisor in delegation order, then cleared
+- Chat event stream carries every branch's tool events, labelled by subagent
+"""
+
+import asyncio
+import time
+from typing import Annotated
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.graph import END, MessagesState, StateGraph
+from langgraph.types import Command
+
+from delegation_fanout import (
+    JOIN_NODE,
+    branch_node_name,
+    build_subagent_branch,
+    delegation_sends,
+    fanout_run_config,
+    join_subagent_results,
+    make_branch_runner,
+    merge_subagent_results,
+    split_delegation_output,
+    subagent_type_from_namespace,
+)
+
+
+def _delegations(*calls) -> AIMessage:
+    return AIMessage(content="", tool_calls=[
+        {"name": f"delegate_to_{subagent}", "args": {"task": task}, "id": call_id}
+        for subagent, task, call_id in calls
+    ])
+
+
+class _ParentState(MessagesState):
+    subagent_results: Annotated[dict[str, dict], merge_subagent_results]
+
+
+def _fanout_graph(branch_nodes: dict, limit: int, supervisor=None):
+    """Parent graph shaped like create_unified_graph: [agent →] dispatch → branches → join."""
+    def dispatch(state):
+        tool_messages = [
+            ToolMessage(content="routed", tool_call_id=tc["id"]) for tc in state["messages"][-1].tool_calls
+        ]
+        return Command(
+            update={"messages": tool_messages},
+            goto=delegation_sends(state["messages"][-1], tool_messages, {}),
+        )
+
+    workflow = StateGraph(_ParentState)
+    workflow.add_node("dispatch", dispatch, destinations=tuple(branch_node_name(t) for t in branch_nodes))
+    for subagent_type, (agent_node, tools_node) in branch_nodes.items():
+        runner = make_branch_runner(build_subagent_branch(agent_node, tools_node))
+        workflow.add_node(branch_node_name(subagent_type), runner)
+        workflow.add_edge(branch_node_name(subagent_type), JOIN_NODE)
+    workflow.add_node(JOIN_NODE, join_subagent_results)
+    if supervisor is not None:
+        workflow.add_node("agent", supervisor)
+        workflow.set_entry_point("agent")
+        workflow.add_edge("agent", "dispatch")
+    else:
+        workflow.set_entry_point("dispatch")
+    workflow.add_edge(JOIN_NODE, END)
+    return workflow.compile().with_config(fanout_run_config(limit))
+
+
+class TestDispatch:
+    """Test splitting delegation output and building Sends."""
+
+    def test_split_keeps_thread_metadata_per_call(self):
+        output = [
+            Command(goto="researcher_agent", update={
+                "messages": [ToolMessage(content="routed", tool_call_id="c1")],
+                "subagent_thread_id": "t/subagent-researcher-1",
+            }),
+            {"messages": [ToolMessage(content="bad", tool_call_id="c2", status="error")]},
+        ]
+
+        messages, metadata = split_delegation_output(output)
+
+        assert [m.tool_call_id for m in messages] == ["c1", "c2"]
+        assert metadata["c1"] == {"subagent_thread_id": "t/subagent-researcher-1"}
+
+    def test_one_send_per_successful_delegation(self):
+        message = _delegations(("researcher", "topic A", "c1"), ("data_scientist", "dataset B", "c2"),
+                               ("writer", "draft", "c3"))
+        message.tool_calls.append({"name": "write_file", "args": {}, "id": "c4"})
+        tool_messages = [
+            ToolMessage(content="ok", tool_call_id="c1"),
+            ToolMessage(content="ok", tool_call_id="c2"),
+            ToolMessage(content="failed", tool_call_id="c3", status="error"),
+        ]
+
+        sends = delegation_sends(message, tool_messages, {"c2": {"parent_thread_id": "t"}})
+
+        assert [s.node for s in sends] == ["researcher_agent", "data_scientist_agent"]
+        assert sends[0].arg["task"] == "topic A"
+        assert sends[0].arg["messages"] == []
+        assert sends[1].arg["parent_thread_id"] == "t"
+
+
+class TestParallelBranches:
+    """Test concurrent execution, isolation and the join."""
+
+    @pytest.mark.asyncio
+    async def test_branches_run_concurrently_in_isolation(self):
+        running = 0
+        peak = 0
+        seen_histories = []
+
+        def make_agent(delay):
+            async def agent(state):
+                nonlocal running, peak
+                seen_histories.append([m.content for m in state["messages"]])
+                if state["messages"]:
+                    return {"messages": [AIMessage(content=f"done: {state['task']}")]}
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(delay)
+                running -= 1
+                call = {"name": "search", "args": {}, "id": f"s-{state['delegation_id']}"}
+                return {"messages": [AIMessage(content="", tool_calls=[call])]}
+            return agent
+
+        async def tools(state):
+            call = state["messages"][-1].tool_calls[0]
+            return {"messages": [ToolMessage(content=state["task"], tool_call_id=call["id"])]}
+
+        graph = _fanout_graph({
+            "researcher": (make_agent(0.2), tools),
+            "data_scientist": (make_agent(0.2), tools),
+            "writer": (make_agent(0.2), tools),
+        }, limit=3)
+
+        start = time.perf_counter()
+        result = await graph.ainvoke({"messages": [
+            HumanMessage(content="multi-part request"),
+            _delegations(("researcher", "A", "c1"), ("data_scientist", "B", "c2"), ("writer", "C", "c3")),
+        ]})
+        elapsed = time.perf_counter() - start
+
+        # Slowest branch, not the sum of all branches
+        assert peak == 3
+        assert elapsed < 0.5
+        # Each branch saw only its own tool results
+        assert sorted(h for h in seen_histories if h) == [["", "A"], ["", "B"], ["", "C"]]
+        # Reported in the join message, then cleared from state
+        assert result["subagent_results"] == {}
+
+        joined = result["messages"][-1].content
+        assert joined.index("done: A") < joined.index("done: B") < joined.index("done: C")
+        assert len(result["messages"]) == 2 + 3 + 1  # request, delegations, tool results, join
+
+    @pytest.mark.asyncio
+    async def test_limit_and_failure_isolation(self):
+        running = 0
+        peak = 0
+
+        async def agent(state):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+            if state["task"] == "fail":
+                raise RuntimeError("model overloaded")
+            return {"messages": [AIMessage(content=f"done: {state['task']}")]}
+
+        async def tools(state):
+            return {"messages": []}
+
+        graph = _fanout_graph({t: (agent, tools) for t in ("researcher", "writer", "reviewer")}, limit=1)
+
+        result = await graph.ainvoke({"messages": [
+            _delegations(("researcher", "ok", "c1"), ("writer", "fail", "c2"), ("reviewer", "ok too", "c3")),
+        ]})
+
+        assert peak == 1
+        joined = result["messages"][-1].content
+        assert "## researcher (completed)" in joined
+        assert "## writer (error)" in joined
+        assert "## reviewer (completed)" in joined
+        assert "model overloaded" in joined
+
+    @pytest.mark.asyncio
+    async def test_limit_is_per_run(self):
+        running = 0
+        peak = 0
+
+        async def agent(state):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.1)
+            running -= 1
+            return {"messages": [AIMessage(content=f"done: {state['task']}")]}
+
+        async def tools(state):
+            return {"messages": []}
+
+        graph = _fanout_graph({t: (agent, tools) for t in ("researcher", "writer")}, limit=1)
+
+        def run(thread):
+            return graph.ainvoke({"messages": [
+                _delegations(("researcher", f"{thread} A", "c1"), ("writer", f"{thread} B", "c2")),
+            ]})
+
+        start = time.perf_counter()
+        results = await asyncio.gather(run("t1"), run("t2"))
+        elapsed = time.perf_counter() - start
+
+        # One branch at a time within each run, but the runs overlap
+        assert peak == 2
+        assert elapsed < 0.35
+        assert all("done: " in r["messages"][-1].content for r in results)
+
+
+class TestEventStream:
+    """Test that branch progress reaches the chat event stream."""
+
+    def test_namespace_names_the_branch(self):
+        assert subagent_type_from_namespace(()) is None
+        assert subagent_type_from_namespace(("data_scientist_agent:0f3a",)) == "data_scientist"
+        assert subagent_type_from_namespace(("researcher_agent:1c", "tools:2d")) == "researcher"
+        assert subagent_type_from_namespace(("planner:1c",)) is None
+
+    @pytest.mark.asyncio
+    async def test_agent_event_stream_reports_every_branch(self, monkeypatch):
+        import backend_main
+        import module_2_2_simple
+
+        async def supervisor(state):
+            return {"messages": [_delegations(("researcher", "topic A", "c1"), ("data_scientist", "dataset B", "c2"))]}
+
+        async def agent(state):
+            if state["messages"]:
+                return {"messages": [AIMessage(content=f"done: {state['task']}")]}
+            call = {"name": "tavily_search", "args": {"query": state["task"]}, "id": f"s-{state['delegation_id']}"}
+            return {"messages": [AIMessage(content="", tool_calls=[call])]}
+
+        async def tools(state):
+            call = state["messages"][-1].tool_calls[0]
+            return {"messages": [ToolMessage(content=f"results for {state['task']}", tool_call_id=call["id"])]}
+
+        graph = _fanout_graph({t: (agent, tools) for t in ("researcher", "data_scientist")}, limit=2,
+                              supervisor=supervisor)
+        monkeypatch.setattr(module_2_2_simple, "agent", graph)
+
+        events = [e async for e in backend_main.agent_event_stream("compare A and B", session_id="fanout-stream")]
+
+        for agent_name, task in (("Researcher", "topic A"), ("Data Scientist", "dataset B")):
+            assert {"type": "tool_call", "tool": "tavily_search", "args": {"query": task},
+                    "agent": agent_name} in events
+            assert {"type": "tool_result", "content": f"results for {task}", "agent": agent_name} in events
+            assert {"type": "llm_final_response", "content": f"done: {task}", "agent": agent_name} in events
+
+        joined = [e for e in events if e["type"] == "tool_result" and e["agent"] == "Supervisor"]
+        assert "done: topic A" in joined[-1]["content"] and "done: dataset B" in joined[-1]["content"]
+        assert events[-1] == {"type": "stream_complete", "thread_id": "fanout-stream"}
+
+
+class TestResultsChannel:
+    """Test the subagent_results reducer."""
+
+    def test_none_update_clears(self):
+        merged = merge_subagent_results({"c1": {"status": "completed"}}, {"c2": {"status": "error"}})
+
+        assert set(merged) == {"c1", "c2"}
+        assert merge_subagent_results(merged, None) == {}
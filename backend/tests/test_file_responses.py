@@ -0,0 +1,87 @@
+"""
+Unit tests for workspace file HTTP helpers.
+
+Covers:
+- Range header parsing (explicit, open-ended, suffix, unsatisfiable, empty file)
+- Conditional request evaluation (ETag and Last-Modified)
+- Chunked range reads from disk
+"""
+
+import os
+
+import pytest
+
+from file_responses import (
+    RangeNotSatisfiable,
+    file_etag,
+    is_not_modified,
+    iter_file_range,
+    last_modified,
+    parse_range,
+)
+
+
+class TestParseRange:
+    """Test single byte-range parsing."""
+
+    @pytest.mark.parametrize("header, expected", [
+        (None, None),
+        ("bytes=0-99", (0, 99)),
+        ("bytes=100-", (100, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=900-5000", (900, 999)),
+        ("bytes=0-1,5-9", None),
+        ("items=0-1", None),
+    ])
+    def test_ranges(self, header, expected):
+        assert parse_range(header, 1000) == expected
+
+    @pytest.mark.parametrize("header", ["bytes=1000-", "bytes=50-10", "bytes=-0"])
+    def test_unsatisfiable(self, header):
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range(header, 1000)
+
+    @pytest.mark.parametrize("header", ["bytes=-10", "bytes=0-", "bytes=0-0"])
+    def test_empty_file_unsatisfiable(self, header):
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range(header, 0)
+
+
+class TestConditional:
+    """Test 304 decisions."""
+
+    def test_etag_and_last_modified(self, tmp_path):
+        path = tmp_path / "report.md"
+        path.write_text("content", encoding="utf-8")
+        stat = os.stat(path)
+
+        assert is_not_modified(stat, file_etag(stat), None)
+        assert is_not_modified(stat, f'"other", W/{file_etag(stat)}', None)
+        assert not is_not_modified(stat, '"other"', None)
+        assert is_not_modified(stat, None, last_modified(stat))
+        assert not is_not_modified(stat, None, "Thu, 01 Jan 1970 00:00:00 GMT")
+        # If-None-Match wins over If-Modified-Since
+        assert not is_not_modified(stat, '"other"', last_modified(stat))
+
+    def test_etag_changes_with_size(self, tmp_path):
+        path = tmp_path / "report.md"
+        path.write_text("content", encoding="utf-8")
+        before = file_etag(os.stat(path))
+
+        path.write_text("content, extended", encoding="utf-8")
+
+        assert file_etag(os.stat(path)) != before
+
+
+class TestIterFileRange:
+    """Test chunked reads."""
+
+    @pytest.mark.asyncio
+    async def test_reads_requested_range_in_chunks(self, tmp_path):
+        path = tmp_path / "data.bin"
+        path.write_bytes(bytes(range(256)) * 4)
+
+        chunks = [chunk async for chunk in iter_file_range(path, 10, 309, chunk_size=100)]
+
+        assert [len(chunk) for chunk in chunks] == [100, 100, 100]
+        assert b"".join(chunks) == (bytes(range(256)) * 4)[10:310]
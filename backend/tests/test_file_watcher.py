@@ -0,0 +1,141 @@
+"""
+Unit tests for the workspace file watcher.
+
+Covers:
+- Trailing-edge debounce of bursts into a single content broadcast
+- Create/delete/move tree events (and create+delete cancelling out)
+- Skipping re-reads when mtime and size are unchanged
+- Bounded LRU stat state
+"""
+
+import asyncio
+
+import pytest
+
+from file_watcher import (
+    EVENT_CREATED,
+    EVENT_DELETED,
+    EVENT_MODIFIED,
+    EVENT_MOVED,
+    FileWatcher,
+    WorkspaceEvent,
+)
+
+
+class FakeManager:
+    """Records broadcasts; every file counts as open in the editor."""
+
+    def __init__(self, open_files=()):
+        self.active_connections = {path: {"viewer": object()} for path in open_files}
+        self.messages = []
+        self.file_changes = []
+
+    async def broadcast(self, message):
+        self.messages.append(message)
+
+    async def broadcast_file_change(self, **kwargs):
+        self.file_changes.append(kwargs)
+
+
+def _watcher(tmp_path, manager, **kwargs) -> FileWatcher:
+    """FileWatcher bound to the running loop without starting the observer."""
+    watcher = FileWatcher(tmp_path, manager, debounce_seconds=0.05, **kwargs)
+    watcher._loop = asyncio.get_running_loop()
+    return watcher
+
+
+async def _settle(watcher: FileWatcher, delay: float = 0.15):
+    await asyncio.sleep(delay)
+    if watcher._flush_tasks:
+        await asyncio.gather(*watcher._flush_tasks)
+
+
+class TestDebounce:
+    """Test trailing-edge coalescing of event bursts."""
+
+    @pytest.mark.asyncio
+    async def test_burst_yields_one_broadcast_with_final_content(self, tmp_path):
+        manager = FakeManager(open_files=["report.md"])
+        watcher = _watcher(tmp_path, manager)
+        path = tmp_path / "report.md"
+
+        for i in range(5):
+            path.write_text(f"version {i}", encoding="utf-8")
+            watcher._on_event(WorkspaceEvent(EVENT_MODIFIED, "report.md"))
+
+        await _settle(watcher)
+
+        assert [c["new_content"] for c in manager.file_changes] == ["version 4"]
+        assert watcher.get_stats()["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_create_then_delete_cancels_out(self, tmp_path):
+        manager = FakeManager()
+        watcher = _watcher(tmp_path, manager)
+
+        watcher._on_event(WorkspaceEvent(EVENT_CREATED, "scratch.md"))
+        watcher._on_event(WorkspaceEvent(EVENT_DELETED, "scratch.md"))
+        await _settle(watcher)
+
+        assert manager.messages == []
+
+    @pytest.mark.asyncio
+    async def test_tree_events_broadcast(self, tmp_path):
+        manager = FakeManager()
+        watcher = _watcher(tmp_path, manager)
+
+        watcher._on_event(WorkspaceEvent(EVENT_DELETED, "old.md"))
+        watcher._on_event(WorkspaceEvent(EVENT_MOVED, "a.md", dest_path="b.md"))
+        await _settle(watcher)
+
+        assert sorted((m["event"], m["path"], m["dest_path"]) for m in manager.messages) == [
+            ("deleted", "old.md", None),
+            ("moved", "a.md", "b.md"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_pending_paths_bounded(self, tmp_path):
+        manager = FakeManager()
+        watcher = _watcher(tmp_path, manager, max_pending=2)
+
+        for i in range(5):
+            watcher._on_event(WorkspaceEvent(EVENT_DELETED, f"f{i}.md"))
+
+        assert len(watcher._pending) == 2
+        await _settle(watcher)
+        assert len(manager.messages) == 5
+
+
+class TestStatCache:
+    """Test mtime/size skip and LRU bounds."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_file_not_reread(self, tmp_path):
+        manager = FakeManager(open_files=["report.md"])
+        watcher = _watcher(tmp_path, manager)
+        (tmp_path / "report.md").write_text("content", encoding="utf-8")
+
+        await watcher._broadcast_content("report.md")
+        await watcher._broadcast_content("report.md")
+
+        assert len(manager.file_changes) == 1
+        assert watcher.get_stats()["unchanged"] == 1
+
+    @pytest.mark.asyncio
+    async def test_closed_file_not_read(self, tmp_path):
+        manager = FakeManager()
+        watcher = _watcher(tmp_path, manager)
+        (tmp_path / "report.md").write_text("content", encoding="utf-8")
+
+        await watcher._broadcast_content("report.md")
+
+        assert manager.file_changes == []
+        assert watcher.get_stats()["tracked_files"] == 0
+
+    def test_stat_lru_is_bounded(self, tmp_path):
+        watcher = FileWatcher(tmp_path, FakeManager(), max_tracked=2)
+
+        for i in range(3):
+            watcher._remember_stat(f"f{i}.md", (i, i))
+
+        assert list(watcher._file_stats) == ["f1.md", "f2.md"]
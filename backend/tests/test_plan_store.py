@@ -0,0 +1,160 @@
+"""
+Unit tests for the per-thread research plan store.
+
+Covers:
+- Each thread gets its own current plan (no cross-session overwrites)
+- Concurrent edits to one plan serialize without lost updates
+- Edits bump the version; rejected or failed edits leave the plan untouched
+- Write-behind: edits batched into one atomic, compact write per plan
+- Plans and thread pointers reloaded from disk by a fresh store
+- Progress deltas carry the change and position, not the step list
+"""
+
+import json
+import threading
+
+import pytest
+
+from plan_store import PlanStore, plan_delta
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PlanStore(tmp_path / ".plans", flush_delay=0.05)
+
+
+class TestThreadIsolation:
+    """Test that plans are keyed by thread."""
+
+    def test_threads_keep_separate_current_plans(self, store):
+        a = store.create("thread-a", "query A", ["a1", "a2"])
+        b = store.create("thread-b", "query B", ["b1"])
+
+        with store.edit("thread-a") as plan:
+            plan["steps"].append("a3")
+
+        assert store.current("thread-a")["steps"] == ["a1", "a2", "a3"]
+        assert store.current("thread-b")["plan_id"] == b["plan_id"] != a["plan_id"]
+        assert store.current("thread-c") is None
+
+    def test_readers_get_copies(self, store):
+        store.create("t", "q", ["s1"])
+
+        store.current("t")["steps"].append("not stored")
+
+        assert store.current("t")["steps"] == ["s1"]
+
+
+class TestEdits:
+    """Test locking, versioning and rollback of edits."""
+
+    def test_concurrent_edits_are_not_lost(self, store):
+        store.create("t", "q", [])
+
+        def add_steps(worker):
+            for i in range(50):
+                with store.edit("t") as plan:
+                    plan["steps"].append(f"{worker}-{i}")
+
+        workers = [threading.Thread(target=add_steps, args=(w,)) for w in range(8)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        plan = store.current("t")
+        assert len(plan["steps"]) == 400
+        assert plan["version"] == 401
+
+    def test_unchanged_edit_does_not_bump_version(self, store):
+        store.create("t", "q", ["s1"])
+
+        with store.edit("t") as plan:
+            assert plan["version"] == 2  # Next version visible inside the block
+
+        assert store.current("t")["version"] == 1
+        assert store.get_stats()["dirty_plans"] == 0
+
+    def test_failed_edit_rolls_back(self, store):
+        store.create("t", "q", ["s1"])
+
+        with pytest.raises(ValueError):
+            with store.edit("t") as plan:
+                plan["steps"].append("half-done")
+                raise ValueError("boom")
+
+        plan = store.current("t")
+        assert plan["steps"] == ["s1"]
+        assert plan["version"] == 1
+
+    def test_edit_without_plan_yields_none(self, store):
+        with store.edit("t") as plan:
+            assert plan is None
+
+
+class TestPersistence:
+    """Test write-behind flushing and reload."""
+
+    def test_edits_batched_into_one_atomic_write(self, store, tmp_path):
+        created = store.create("t", "q", ["s1"])
+        plan_file = tmp_path / ".plans" / f"{created['plan_id']}.json"
+
+        for i in range(1, 11):
+            with store.edit("t") as plan:
+                plan["current_step"] = i
+
+        # Nothing written yet: the file still holds the plan as created
+        assert json.loads(plan_file.read_text())["version"] == 1
+
+        store.close()
+
+        stored = json.loads(plan_file.read_text())
+        assert stored["version"] == 11
+        assert stored["current_step"] == 10
+        assert "\n" not in plan_file.read_text()  # Compact JSON
+        assert store.get_stats()["plans_written"] == 1
+        assert not list(plan_file.parent.glob("*.tmp"))
+
+    def test_timer_flushes_without_close(self, store, tmp_path):
+        created = store.create("t", "q", ["s1"])
+        with store.edit("t") as plan:
+            plan["status"] = "completed"
+
+        timer = store._timer
+        timer.join(timeout=2)
+
+        stored = json.loads((tmp_path / ".plans" / f"{created['plan_id']}.json").read_text())
+        assert stored["status"] == "completed"
+
+    def test_fresh_store_reloads_from_disk(self, store, tmp_path):
+        created = store.create("thread/with:odd chars", "q", ["s1", "s2"])
+        with store.edit("thread/with:odd chars") as plan:
+            plan["current_step"] = 1
+        store.close()
+
+        reloaded = PlanStore(tmp_path / ".plans").current("thread/with:odd chars")
+
+        assert reloaded["plan_id"] == created["plan_id"]
+        assert reloaded["current_step"] == 1
+        assert reloaded["version"] == 2
+
+
+class TestPlanDelta:
+    """Test the broadcast payload."""
+
+    def test_delta_omits_step_list(self, store):
+        store.create("t", "q", ["s1", "s2"])
+        with store.edit("t") as plan:
+            plan["steps"].insert(1, "new")
+            delta = plan_delta(plan, "add_step", step_index=1, step_text="new")
+
+        assert delta == {
+            "plan_id": plan["plan_id"],
+            "version": 2,
+            "op": "add_step",
+            "step_index": 1,
+            "step_text": "new",
+            "current_step": 0,
+            "total_steps": 3,
+            "progress": 0.0,
+        }
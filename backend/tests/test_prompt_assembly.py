@@ -0,0 +1,77 @@
+"""
+Unit tests for prompt assembly with prefix caching.
+
+Covers:
+- Static prefix is date-free and byte-stable across days
+- Memoized render per (agent, prompt version); template edits re-render
+- System message layout: cache breakpoint on the prefix, date and playbook in the tail
+"""
+
+import pytest
+
+from prompts import assembly
+from prompts.assembly import (
+    DATE_PLACEHOLDER,
+    PROMPT_TEMPLATES,
+    build_system_message,
+    get_static_prefix,
+    prompt_version,
+)
+
+
+class TestStaticPrefix:
+    """Test prefix rendering and memoization."""
+
+    @pytest.mark.parametrize("agent", sorted(PROMPT_TEMPLATES))
+    def test_prefix_has_no_date(self, agent):
+        prefix = get_static_prefix(agent)
+
+        assert "Current date:" not in prefix
+        assert "{current_date}" not in prefix
+        assert "2026-" not in prefix
+
+    def test_researcher_dates_use_placeholder(self):
+        prefix = get_static_prefix("researcher")
+
+        assert f"Accessed: {DATE_PLACEHOLDER}" in prefix
+        # Literal braces in the template still render as in get_researcher_prompt
+        assert "session_id={{plan_id}}" in prefix
+
+    def test_render_memoized_per_version(self, monkeypatch):
+        assert get_static_prefix("writer") is get_static_prefix("writer")
+
+        version = prompt_version("writer")
+        monkeypatch.setitem(PROMPT_TEMPLATES, "writer", lambda: "Edited writer.\n\nCurrent date: {current_date}\n\nBody")
+
+        assert prompt_version("writer") != version
+        assert get_static_prefix("writer") == "Edited writer.\n\nBody"
+
+
+class TestSystemMessage:
+    """Test the cached/dynamic split of the system message."""
+
+    def test_prefix_identical_across_dates(self):
+        monday = build_system_message("supervisor", current_date="2026-01-05")
+        tuesday = build_system_message("supervisor", current_date="2026-01-06")
+
+        assert monday.content[0] == tuesday.content[0]
+        assert monday.content[0]["cache_control"] == {"type": "ephemeral"}
+        assert "2026-01-05" in monday.content[1]["text"]
+        assert "cache_control" not in monday.content[1]
+
+    def test_playbook_in_tail(self):
+        message = build_system_message("researcher", current_date="2026-01-05", playbook="ACE PLAYBOOK\n- cite")
+
+        assert len(message.content) == 2
+        assert message.content[1]["text"].endswith("ACE PLAYBOOK\n- cite")
+        assert "ACE PLAYBOOK" not in message.content[0]["text"]
+
+    def test_full_prompt_matches_legacy_content(self):
+        from prompts import get_supervisor_prompt
+
+        message = build_system_message("supervisor", current_date="2026-01-05")
+        legacy = get_supervisor_prompt("2026-01-05")
+
+        # Same instructions; only the date line moved to the tail
+        assert legacy.replace("Current date: 2026-01-05\n\n", "").strip() == message.content[0]["text"]
+        assert assembly.get_dynamic_tail("2026-01-05").startswith("Current date: 2026-01-05")
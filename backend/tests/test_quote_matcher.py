@@ -0,0 +1,134 @@
+"""
+Unit tests for the indexed quote verification engine.
+
+Covers:
+- Exact matches across punctuation, Unicode and case differences
+- Character offsets into the original source text
+- Fuzzy matches above / below the similarity threshold
+- Fuzzy matches that change a negation or number rejected
+- Source index caching
+- Dozens of quotes against a multi-megabyte source
+"""
+
+import random
+import time
+
+import pytest
+
+from tools.quote_matcher import SourceIndexCache, match_quote, tokenize
+
+
+SOURCE = (
+    "In 2025, IBM’s “Heron” processor achieved a logical error rate of 0.1% — "
+    "a café-grade breakthrough. The results were significant across all benchmarks."
+)
+
+
+class TestTokenize:
+    """Test normalization of source text."""
+
+    def test_tokens_and_spans(self):
+        tokens, spans = tokenize("Café  “Heron”")
+
+        assert tokens == ["cafe", "heron"]
+        assert spans == [(0, 4), (7, 12)]
+
+
+class TestMatchQuote:
+    """Test exact and fuzzy matching."""
+
+    def test_exact_despite_punctuation_and_unicode(self):
+        match = match_quote('IBM\'s "Heron" processor achieved', SOURCE)
+
+        assert match.found and match.exact
+        assert match.score == 1.0
+        assert SOURCE[match.start:match.end] == "IBM’s “Heron” processor achieved"
+
+    def test_accents_folded(self):
+        match = match_quote("a cafe grade breakthrough", SOURCE)
+
+        assert match.exact
+        assert SOURCE[match.start:match.end] == "a café-grade breakthrough"
+
+    def test_exact_requires_whole_words(self):
+        assert not match_quote("eron processor", SOURCE).exact
+
+    def test_fuzzy_small_wording_slip(self):
+        match = match_quote("The results were highly significant across all benchmarks", SOURCE)
+
+        assert match.found and not match.exact
+        assert 0.9 <= match.score < 1.0
+        assert SOURCE[match.start:match.end] == "The results were significant across all benchmarks"
+
+    def test_dropped_negation_rejected(self):
+        source = (
+            "Independent audits found that the new error correction scheme did not "
+            "reduce logical error rates on any of the tested superconducting devices."
+        )
+        quote = (
+            "the new error correction scheme did reduce logical error rates "
+            "on any of the tested superconducting devices"
+        )
+
+        match = match_quote(quote, source)
+
+        assert not match.found
+        assert match.score >= 0.9  # Would verify on similarity alone
+        assert "'not'" in match.reason
+
+    def test_changed_number_rejected(self):
+        match = match_quote("In 2024, IBM's Heron processor achieved a logical error rate", SOURCE)
+
+        assert not match.found
+        assert "'2024'" in match.reason and "'2025'" in match.reason
+
+    def test_paraphrase_rejected(self):
+        match = match_quote("IBM announced a processor with very low error rates", SOURCE)
+
+        assert not match.found
+        assert match.score < 0.9
+
+    def test_empty_inputs(self):
+        assert not match_quote("", SOURCE).found
+        assert not match_quote("quote", "").found
+
+
+class TestSourceIndexCache:
+    """Test per-source index reuse."""
+
+    def test_index_built_once_per_source(self):
+        cache = SourceIndexCache(max_entries=1)
+
+        first = cache.get(SOURCE)
+        assert cache.get(SOURCE) is first
+        cache.get("other source")
+        assert cache.get(SOURCE) is not first
+
+        assert cache.get_stats() == {"hits": 1, "misses": 3, "entries": 1}
+
+
+@pytest.mark.performance
+class TestLargeSources:
+    """Test verification cost against multi-megabyte content."""
+
+    def test_dozens_of_quotes_against_large_source(self):
+        rng = random.Random(0)
+        vocabulary = ["".join(rng.choice("abcdefghij") for _ in range(rng.randint(3, 9))) for _ in range(5000)]
+        words = [rng.choice(vocabulary) for _ in range(400000)]
+        source = " ".join(words)
+
+        quotes = []
+        for i in range(40):
+            start = rng.randrange(len(words) - 20)
+            quote = words[start:start + 15]
+            if i % 2:
+                quote[7] = "paraphrased"
+            quotes.append(" ".join(quote))
+
+        started = time.perf_counter()
+        matches = [match_quote(quote, source) for quote in quotes]
+        elapsed = time.perf_counter() - started
+
+        assert all(match.found for match in matches)
+        assert sum(match.exact for match in matches) == 20
+        assert elapsed < 5.0
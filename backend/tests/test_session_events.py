@@ -0,0 +1,140 @@
+"""
+Unit tests for the per-session event bus.
+
+Covers:
+- Isolation of events between thread_ids
+- Backlog replay for sessions without a subscriber
+- Interleaving of agent chunks with session events
+- Backpressure drops on full subscriber queues
+"""
+
+import asyncio
+
+import pytest
+
+from session_events import (
+    SessionEventBus,
+    get_current_session,
+    reset_current_session,
+    set_current_session,
+)
+
+
+async def _agent_stream(chunks, delay: float = 0.0):
+    """Fake agent.astream() yielding the given chunks."""
+    for chunk in chunks:
+        await asyncio.sleep(delay)
+        yield chunk
+
+
+class TestSessionEventBus:
+    """Test routing and delivery guarantees."""
+
+    @pytest.mark.asyncio
+    async def test_events_stay_in_their_session(self):
+        bus = SessionEventBus()
+
+        async with bus.subscribe("thread-a") as sub_a, bus.subscribe("thread-b") as sub_b:
+            await bus.publish("thread-a", {"type": "tool_approval_request", "request_id": "a1"})
+            await bus.publish("thread-b", {"type": "tool_approval_request", "request_id": "b1"})
+
+            assert [e["request_id"] for e in sub_a.drain()] == ["a1"]
+            assert [e["request_id"] for e in sub_b.drain()] == ["b1"]
+
+    @pytest.mark.asyncio
+    async def test_backlog_replayed_to_first_subscriber(self):
+        bus = SessionEventBus(backlog_size=2)
+
+        for i in range(3):
+            await bus.publish("thread-a", {"type": "event", "n": i})
+
+        async with bus.subscribe("thread-a") as sub:
+            assert [e["n"] for e in sub.drain()] == [1, 2]
+
+        assert bus.get_stats()["dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_after_timeout(self):
+        bus = SessionEventBus(queue_size=1, put_timeout=0.01)
+
+        async with bus.subscribe("thread-a") as sub:
+            await bus.publish("thread-a", {"type": "event", "n": 0})
+            await bus.publish("thread-a", {"type": "event", "n": 1})
+
+            assert [e["n"] for e in sub.drain()] == [0]
+            assert bus.get_stats()["dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_websocket_fan_out_tags_thread_id(self):
+        sent = []
+
+        class FakeManager:
+            async def send_to_session(self, thread_id, message):
+                sent.append((thread_id, message))
+
+            async def broadcast(self, message):
+                raise AssertionError("session events must not be broadcast to every client")
+
+        bus = SessionEventBus()
+        bus.attach_websocket_manager(FakeManager())
+
+        await bus.publish("thread-a", {"type": "tool_approval_request"})
+
+        assert sent == [("thread-a", {"type": "tool_approval_request", "thread_id": "thread-a"})]
+
+
+class TestInterleave:
+    """Test merging of agent output with session events."""
+
+    @pytest.mark.asyncio
+    async def test_event_delivered_while_agent_is_blocked(self):
+        bus = SessionEventBus()
+        approved = asyncio.Event()
+
+        async def blocked_agent():
+            yield "before"
+            await bus.publish("thread-a", {"type": "tool_approval_request"})
+            await asyncio.wait_for(approved.wait(), timeout=1.0)
+            yield "after"
+
+        received = []
+        async with bus.subscribe("thread-a") as sub:
+            async for source, item in sub.interleave(blocked_agent()):
+                received.append((source, item))
+                if source == "event":
+                    approved.set()
+
+        assert received == [
+            ("chunk", "before"),
+            ("event", {"type": "tool_approval_request"}),
+            ("chunk", "after"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_pending_events_flushed_after_stream_ends(self):
+        bus = SessionEventBus()
+
+        async with bus.subscribe("thread-a") as sub:
+            await bus.publish("thread-a", {"type": "late"})
+            received = [item async for _, item in sub.interleave(_agent_stream([]))]
+
+        assert received == [{"type": "late"}]
+
+
+class TestCurrentSession:
+    """Test contextvar-based session binding."""
+
+    @pytest.mark.asyncio
+    async def test_session_binding_is_per_task(self):
+        async def bound(thread_id):
+            token = set_current_session(thread_id)
+            try:
+                await asyncio.sleep(0.01)
+                return get_current_session()
+            finally:
+                reset_current_session(token)
+
+        results = await asyncio.gather(bound("thread-a"), bound("thread-b"))
+
+        assert results == ["thread-a", "thread-b"]
+        assert get_current_session() is None
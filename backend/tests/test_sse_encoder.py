@@ -0,0 +1,217 @@
+"""
+Unit tests and throughput benchmark for the chat stream SSE encoder.
+
+Covers:
+- Burst of events coalesced into few writes, frames intact and in order
+- Window ends while the source is idle (event delivered without waiting on it)
+- Context variables set inside the source persist between events
+- Frames buffered before a source failure are still delivered
+- Closing the stream (client disconnect) runs the source's cleanup
+- Compact mode: large tool results sent by reference, fetchable by their thread only
+- Result store evicts the least recently used result
+- Benchmark: events/sec, writes and bytes on the wire, per-event frames vs encoder
+"""
+
+import asyncio
+import contextvars
+import json
+import time
+
+import pytest
+
+from sse_encoder import SSEEncoder, ToolResultStore, sse_frame
+
+
+def _parse(writes):
+    """Decode concatenated SSE writes back into events."""
+    data = b"".join(writes).decode("utf-8")
+    return [json.loads(frame[len("data: "):]) for frame in data.split("\n\n") if frame]
+
+
+async def _collect(encoder, source):
+    return [data async for data in encoder.stream(source)]
+
+
+async def _burst(count):
+    for i in range(count):
+        yield {"type": "tool_call", "tool": "tavily_search", "args": {"query": f"q{i}"}, "agent": "Researcher"}
+
+
+class TestCoalescing:
+    """Test batching of frames into writes."""
+
+    @pytest.mark.asyncio
+    async def test_burst_coalesced_in_order(self):
+        encoder = SSEEncoder("t", window=0.05)
+
+        writes = await _collect(encoder, _burst(200))
+
+        assert [e["args"]["query"] for e in _parse(writes)] == [f"q{i}" for i in range(200)]
+        assert len(writes) < 10
+        assert encoder.get_stats()["events"] == 200
+
+    @pytest.mark.asyncio
+    async def test_batch_size_forces_early_write(self):
+        encoder = SSEEncoder("t", window=10, max_batch_bytes=1024)
+
+        writes = await _collect(encoder, _burst(200))
+
+        assert len(writes) > 10
+        assert all(len(w) < 1024 + 200 for w in writes)
+
+    @pytest.mark.asyncio
+    async def test_window_ends_while_source_idle(self):
+        received = []
+
+        async def source():
+            yield {"type": "approval_request", "tool": "write_file"}
+            await asyncio.sleep(0.3)  # Agent blocked waiting on the approval
+            yield {"type": "stream_complete"}
+
+        start = time.perf_counter()
+        async for data in SSEEncoder("t", window=0.01).stream(source()):
+            received.append((time.perf_counter() - start, _parse([data])))
+
+        first_at, first_events = received[0]
+        assert first_events == [{"type": "approval_request", "tool": "write_file"}]
+        assert first_at < 0.15
+
+    @pytest.mark.asyncio
+    async def test_source_context_persists(self):
+        session = contextvars.ContextVar("session", default=None)
+
+        async def source():
+            session.set("thread-1")
+            yield {"n": 1}
+            await asyncio.sleep(0.01)
+            yield {"session": session.get()}
+
+        events = _parse(await _collect(SSEEncoder("t", window=0), source()))
+
+        assert events[-1] == {"session": "thread-1"}
+
+    @pytest.mark.asyncio
+    async def test_frames_before_failure_delivered(self):
+        async def source():
+            yield {"n": 1}
+            yield {"n": 2}
+            raise RuntimeError("agent crashed")
+
+        writes = []
+        with pytest.raises(RuntimeError):
+            async for data in SSEEncoder("t", window=10).stream(source()):
+                writes.append(data)
+
+        assert _parse(writes) == [{"n": 1}, {"n": 2}]
+
+    @pytest.mark.asyncio
+    async def test_client_disconnect_closes_source(self):
+        closed = asyncio.Event()
+
+        async def source():
+            try:
+                for i in range(1000):
+                    yield {"n": i}
+                    await asyncio.sleep(0.001)
+            finally:
+                closed.set()  # e.g. leaving the session subscription
+
+        stream = SSEEncoder("t", window=0.005).stream(source())
+        await stream.__anext__()
+        await stream.aclose()
+
+        await asyncio.wait_for(closed.wait(), timeout=1)
+
+
+class TestCompactMode:
+    """Test tool results sent by reference."""
+
+    def test_large_tool_result_referenced(self):
+        store = ToolResultStore()
+        encoder = SSEEncoder("thread-a", compact=True, inline_limit=100, result_store=store)
+        content = "search result " * 1000
+
+        [event] = _parse([encoder.encode({"type": "tool_result", "content": content, "agent": "Researcher"})])
+        [small] = _parse([encoder.encode({"type": "tool_result", "content": "short", "agent": "Researcher"})])
+
+        assert event["truncated"] is True
+        assert event["size"] == len(content)
+        assert content.startswith(event["content"])
+        assert store.get("thread-a", event["result_id"]) == content
+        assert store.get("thread-b", event["result_id"]) is None
+        assert small["content"] == "short" and "result_id" not in small
+
+    def test_non_compact_sends_full_content(self):
+        content = "x" * 10_000
+        frame = SSEEncoder("t").encode({"type": "tool_result", "content": content})
+
+        assert _parse([frame])[0]["content"] == content
+
+    def test_store_evicts_oldest(self):
+        store = ToolResultStore(max_results=2)
+        first = store.put("t", "one")
+        store.put("t", "two")
+        store.put("t", "three")
+
+        assert store.get("t", first) is None
+
+    def test_store_keeps_recently_fetched(self):
+        store = ToolResultStore(max_results=2)
+        first = store.put("t", "one")
+        second = store.put("t", "two")
+
+        assert store.get("t", first) == "one"
+        store.put("t", "three")
+
+        assert store.get("t", first) == "one"
+        assert store.get("t", second) is None
+
+
+@pytest.mark.performance
+class TestStreamThroughput:
+    """Benchmark per-event frames (json.dumps + sleep(0)) against the encoder."""
+
+    @pytest.mark.asyncio
+    async def test_throughput_and_bytes(self):
+        def events():
+            for i in range(2000):
+                yield {"type": "tool_call", "tool": "tavily_search", "args": {"query": f"q{i}"}, "agent": "Researcher"}
+                yield {"type": "tool_result", "content": f"result {i} " * 600, "agent": "Researcher"}
+
+        async def source():
+            for event in events():
+                yield event
+
+        # Before: one json.dumps frame and one scheduler hop per event
+        start = time.perf_counter()
+        before_writes = 0
+        before_bytes = 0
+        for event in events():
+            frame = f"data: {json.dumps(event)}\n\n"
+            await asyncio.sleep(0)
+            before_writes += 1
+            before_bytes += len(frame.encode("utf-8"))
+        before = 4000 / (time.perf_counter() - start)
+
+        encoder = SSEEncoder("bench", compact=False)
+        writes = await _collect(encoder, source())
+        stats = encoder.get_stats()
+
+        compact = SSEEncoder("bench", compact=True, result_store=ToolResultStore(max_results=4000))
+        await _collect(compact, source())
+        compact_stats = compact.get_stats()
+
+        print(
+            f"\nper-event: {before:,.0f} events/s, {before_writes} writes, {before_bytes:,} bytes"
+            f"\nencoder:   {stats['events_per_sec']:,.0f} events/s, {stats['writes']} writes, {stats['bytes']:,} bytes"
+            f"\ncompact:   {compact_stats['events_per_sec']:,.0f} events/s, {compact_stats['writes']} writes, "
+            f"{compact_stats['bytes']:,} bytes"
+        )
+        assert len(writes) * 10 < before_writes
+        assert stats["events_per_sec"] > before
+        assert compact_stats["bytes"] * 5 < before_bytes
+
+    def test_frame_matches_stdlib_json(self):
+        event = {"type": "llm_thinking", "content": "Résumé — ✓", "agent": "Writer"}
+
+        assert json.loads(sse_frame(event)[len(b"data: "):]) == event
@@ -0,0 +1,102 @@
+"""
+Unit tests for the cross-session Tavily query cache.
+
+Covers:
+- Query normalization and cache keys
+- Fresh / stale / expired classification
+- LRU eviction and newer-entry-wins writes
+- Single background refresh per key
+"""
+
+import pytest
+
+from tools.tavily_cache import (
+    EXPIRED,
+    FRESH,
+    STALE,
+    CachedSearch,
+    TavilyQueryCache,
+    content_hash,
+    normalize_query,
+    query_cache_key,
+)
+
+
+class TestQueryKeys:
+    """Test normalization of near-identical queries."""
+
+    @pytest.mark.parametrize("query", [
+        "quantum error correction 2025",
+        "  Quantum   Error Correction 2025? ",
+        "QUANTUM ERROR CORRECTION, 2025!",
+        "ｑｕａｎｔｕｍ error correction ２０２５",
+    ])
+    def test_variants_share_key(self, query):
+        assert normalize_query(query) == "quantum error correction 2025"
+        assert query_cache_key(query, "advanced", 5) == query_cache_key(
+            "quantum error correction 2025", "advanced", 5
+        )
+
+    def test_depth_and_max_results_are_part_of_key(self):
+        base = query_cache_key("llm agents", "advanced", 5)
+
+        assert query_cache_key("llm agents", "basic", 5) != base
+        assert query_cache_key("llm agents", "advanced", 10) != base
+
+    def test_quotes_and_hyphens_kept(self):
+        assert normalize_query('"self-healing" code') == '"self-healing" code'
+
+    def test_content_hash_depends_on_url_and_body(self):
+        digest = content_hash("https://a.example", "body")
+
+        assert digest == content_hash("https://a.example", "body")
+        assert digest != content_hash("https://b.example", "body")
+        assert digest != content_hash("https://a.example", "other")
+
+
+class TestTavilyQueryCache:
+    """Test freshness, eviction and refresh bookkeeping."""
+
+    def test_freshness_windows(self):
+        cache = TavilyQueryCache(ttl=100.0, stale_ttl=50.0)
+        entry = CachedSearch(results=[], fetched_at=1000.0)
+
+        assert cache.freshness(None) == EXPIRED
+        assert cache.freshness(entry, now=1100.0) == FRESH
+        assert cache.freshness(entry, now=1120.0) == STALE
+        assert cache.freshness(entry, now=1151.0) == EXPIRED
+
+    def test_lru_eviction(self):
+        cache = TavilyQueryCache(max_entries=2)
+        cache.put("a", CachedSearch(results=[]))
+        cache.put("b", CachedSearch(results=[]))
+        cache.get("a")
+        cache.put("c", CachedSearch(results=[]))
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get_stats()["entries"] == 2
+
+    def test_older_entry_does_not_replace_newer(self):
+        cache = TavilyQueryCache()
+        newer = CachedSearch(results=[{"url": "new"}], fetched_at=2000.0)
+        cache.put("k", newer)
+        cache.put("k", CachedSearch(results=[{"url": "old"}], fetched_at=1000.0))
+
+        assert cache.get("k") is newer
+
+    def test_copy_results_isolated(self):
+        entry = CachedSearch(results=[{"url": "u", "score": 0.5}])
+
+        entry.copy_results()[0]["score"] = 1.0
+
+        assert entry.results[0]["score"] == 0.5
+
+    def test_single_refresh_per_key(self):
+        cache = TavilyQueryCache()
+
+        assert cache.begin_refresh("k")
+        assert not cache.begin_refresh("k")
+        cache.end_refresh("k")
+        assert cache.begin_refresh("k")
+        assert cache.get_stats()["refreshes"] == 2
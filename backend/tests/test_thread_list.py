@@ -0,0 +1,160 @@
+"""
+Unit tests for /api/threads/list keyset pagination.
+
+Covers:
+- Cursor round trip (updated_at, thread_id)
+- Malformed cursors rejected with 400
+- limit + 1 rows fetched; next_cursor points at the last returned thread
+- Cursor position passed to the keyset filter
+"""
+
+import base64
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+import backend_main
+from backend_main import _decode_thread_cursor, _encode_thread_cursor, list_threads
+
+
+class _FakeCursor:
+    def __init__(self, rows, executed):
+        self._rows = rows
+        self._executed = executed
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, query, params):
+        self._executed.append((query, list(params)))
+        limit = params[-1]
+        self._rows = self._rows[:limit]
+
+    async def fetchall(self):
+        return self._rows
+
+
+class _FakeConnection:
+    def __init__(self, rows, executed):
+        self._rows = rows
+        self._executed = executed
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def cursor(self, row_factory=None):
+        return _FakeCursor(self._rows, self._executed)
+
+
+class _FakePool:
+    """Serves user_threads rows (newest first) and records executed queries."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed = []
+
+    def connection(self):
+        return _FakeConnection(self.rows, self.executed)
+
+
+def _rows(count):
+    """user_threads rows ordered by (updated_at, thread_id) DESC."""
+    return [
+        (
+            f"thread-{i:02d}",
+            f"Thread {i}",
+            "user123",
+            datetime(2025, 11, 1, tzinfo=timezone.utc),
+            datetime(2025, 11, 18, 12, 0, 59 - i, tzinfo=timezone.utc),
+            False,
+            i,
+            None,
+        )
+        for i in range(count)
+    ]
+
+
+async def _list(cursor=None, limit=3):
+    return await list_threads(user_id="user123", include_archived=False, cursor=cursor, limit=limit)
+
+
+class TestThreadCursor:
+    """Test cursor encoding and validation."""
+
+    def test_round_trip(self):
+        updated_at = datetime(2025, 11, 18, 12, 30, 5, 123456, tzinfo=timezone.utc)
+
+        cursor = _encode_thread_cursor(updated_at, "thread/ä")
+
+        assert _decode_thread_cursor(cursor) == (updated_at, "thread/ä")
+        assert "/" not in cursor and "+" not in cursor  # Safe in a query string
+
+    @pytest.mark.parametrize("cursor", [
+        "not base64 at all!",
+        base64.urlsafe_b64encode(b"not json").decode(),
+        base64.urlsafe_b64encode(b'["2025-11-18T12:00:00"]').decode(),
+        base64.urlsafe_b64encode(b'["yesterday", "thread-1"]').decode(),
+        base64.urlsafe_b64encode(b"42").decode(),
+    ])
+    def test_malformed_cursor_rejected(self, cursor):
+        with pytest.raises(HTTPException) as excinfo:
+            _decode_thread_cursor(cursor)
+
+        assert excinfo.value.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_endpoint_returns_400_for_bad_cursor(self, monkeypatch):
+        pool = _FakePool(_rows(5))
+        monkeypatch.setattr(backend_main, "get_pool", lambda: pool)
+
+        with pytest.raises(HTTPException) as excinfo:
+            await _list(cursor="garbage")
+
+        assert excinfo.value.status_code == 400
+        assert pool.executed == []
+
+
+class TestKeysetPages:
+    """Test page size, has_more and next_cursor."""
+
+    @pytest.mark.asyncio
+    async def test_extra_row_sets_next_cursor(self, monkeypatch):
+        rows = _rows(5)
+        pool = _FakePool(rows)
+        monkeypatch.setattr(backend_main, "get_pool", lambda: pool)
+
+        page = await _list(limit=3)
+
+        assert pool.executed[0][1][-1] == 4  # limit + 1
+        assert [t.thread_id for t in page.threads] == ["thread-00", "thread-01", "thread-02"]
+        assert page.has_more is True
+        assert _decode_thread_cursor(page.next_cursor) == (rows[2][4], "thread-02")
+
+    @pytest.mark.asyncio
+    async def test_last_page_has_no_cursor(self, monkeypatch):
+        monkeypatch.setattr(backend_main, "get_pool", lambda: _FakePool(_rows(3)))
+
+        page = await _list(limit=3)
+
+        assert len(page.threads) == 3
+        assert page.has_more is False
+        assert page.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_cursor_feeds_keyset_filter(self, monkeypatch):
+        pool = _FakePool(_rows(2))
+        monkeypatch.setattr(backend_main, "get_pool", lambda: pool)
+        updated_at = datetime(2025, 11, 18, 12, 0, 57, tzinfo=timezone.utc)
+
+        await _list(cursor=_encode_thread_cursor(updated_at, "thread-02"), limit=3)
+
+        query, params = pool.executed[0]
+        assert "(t.updated_at, t.thread_id) < (%s, %s)" in query
+        assert params == ["user123", updated_at, "thread-02", 4]
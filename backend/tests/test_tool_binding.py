@@ -0,0 +1,118 @@
+"""
+Unit tests and per-turn overhead benchmark for the tool-bound model registry.
+
+Covers:
+- One bound runnable per (agent, tool set), reused on later turns
+- Tool schemas converted once and shared between agents
+- Bound schemas match what bind_tools(tools) sends
+- Benchmark: per-turn binding overhead before (bind_tools every turn) and after
+"""
+
+import time
+from typing import Annotated
+
+import pytest
+from langchain_anthropic import ChatAnthropic
+from langchain_core.tools import InjectedToolCallId, StructuredTool, tool
+from pydantic import BaseModel, Field
+
+from tool_binding import ToolBindingRegistry, tool_set_key
+
+
+class _WriteFileInput(BaseModel):
+    """Input for write_file (long field docs, like the production tool)."""
+
+    file_path: str = Field(description="Absolute path under /workspace. " * 20)
+    content: str = Field(description="Complete file content in Markdown. " * 40)
+
+
+def _write_file(file_path: str, content: str) -> str:
+    return "written"
+
+
+write_file = StructuredTool.from_function(
+    func=_write_file, name="write_file", args_schema=_WriteFileInput,
+    description="Write a file to the workspace, with approval. " * 30,
+)
+
+
+@tool("read_file")
+def read_file(file_path: str) -> str:
+    """Read a file from the workspace."""
+    return ""
+
+
+@tool("delegate_to_writer")
+def delegate_to_writer(task: str, tool_call_id: Annotated[str, InjectedToolCallId]) -> str:
+    """Delegate a writing task to the Writer subagent."""
+    return ""
+
+
+@pytest.fixture
+def model():
+    return ChatAnthropic(model="claude-haiku-4-5-20251001", api_key="test-key")
+
+
+class TestToolBindingRegistry:
+    """Test caching of bound runnables and schemas."""
+
+    def test_bound_once_per_agent_and_tool_set(self, model):
+        registry = ToolBindingRegistry(model)
+
+        first = registry.get("writer", [write_file, read_file])
+
+        assert registry.get("writer", [write_file, read_file]) is first
+        assert registry.get("reviewer", [write_file, read_file]) is not first
+        assert registry.get("writer", [write_file]) is not first
+        assert tool_set_key([write_file, read_file]) == ("write_file", "read_file")
+
+    def test_schemas_shared_between_agents(self, model, monkeypatch):
+        import tool_binding
+
+        conversions = []
+        original = tool_binding.convert_to_openai_tool
+        monkeypatch.setattr(
+            tool_binding, "convert_to_openai_tool",
+            lambda t: conversions.append(t.name) or original(t),
+        )
+        registry = ToolBindingRegistry(model)
+
+        registry.get("writer", [write_file, read_file])
+        registry.get("reviewer", [write_file, read_file])
+        registry.get("supervisor", [write_file, delegate_to_writer])
+
+        assert conversions == ["write_file", "read_file", "delegate_to_writer"]
+
+    def test_matches_direct_bind_tools(self, model):
+        registry = ToolBindingRegistry(model)
+
+        cached = registry.get("supervisor", [write_file, delegate_to_writer])
+        direct = model.bind_tools([write_file, delegate_to_writer])
+
+        assert cached.kwargs["tools"] == direct.kwargs["tools"]
+        # Injected arguments stay out of the schema sent to the model
+        schema = cached.kwargs["tools"][1]["input_schema"]
+        assert list(schema["properties"]) == ["task"]
+
+
+@pytest.mark.performance
+class TestBindingOverhead:
+    """Benchmark per-turn tool binding overhead."""
+
+    def test_per_turn_overhead(self, model):
+        tools = [write_file, read_file, delegate_to_writer]
+        turns = 200
+
+        start = time.perf_counter()
+        for _ in range(turns):
+            model.bind_tools(tools)
+        before = (time.perf_counter() - start) / turns
+
+        registry = ToolBindingRegistry(model)
+        start = time.perf_counter()
+        for _ in range(turns):
+            registry.get("supervisor", tools)
+        after = (time.perf_counter() - start) / turns
+
+        print(f"\nbind_tools per turn: {before * 1e6:.1f}µs, registry per turn: {after * 1e6:.1f}µs")
+        assert after * 20 < before
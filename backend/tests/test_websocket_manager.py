@@ -0,0 +1,224 @@
+"""
+Unit tests for ConnectionManager delta mode and chunked streaming.
+
+Covers:
+- compute_patch correctness, including non-BMP characters (UTF-16 offsets)
+- file_patch delivery to opted-in clients, full snapshots to others
+- Snapshot fallback when old_content does not match the room's version
+- Watcher echo of content the room already holds is not re-broadcast
+- UTF-8-safe chunking of broadcasts and of initial content read from disk
+- Session-private messages delivered only to that session's sockets
+"""
+
+import json
+
+import pytest
+
+from websocket_manager import (
+    ConnectionManager,
+    compute_patch,
+    content_hash,
+    iter_utf8_chunks,
+    stream_file_chunks,
+)
+
+
+class FakeWebSocket:
+    """Collects JSON messages and binary frames sent to a client."""
+
+    def __init__(self):
+        self.sent = []
+        self.frames = []
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+    async def send_bytes(self, data):
+        self.frames.append(data)
+
+
+def _unpack_frame(frame: bytes):
+    """Split a binary frame into (header, payload)."""
+    header_len = int.from_bytes(frame[:4], "big")
+    return json.loads(frame[4:4 + header_len]), frame[4 + header_len:]
+
+
+def _apply_js_patch(text: str, patch: dict) -> str:
+    """Apply a patch the way a JavaScript client would (UTF-16 indices)."""
+    units = text.encode("utf-16-le")
+    start = patch["offset"] * 2
+    end = start + patch["delete"] * 2
+    return (units[:start] + patch["insert"].encode("utf-16-le") + units[end:]).decode("utf-16-le")
+
+
+class TestComputePatch:
+    """Test single-splice patch computation."""
+
+    @pytest.mark.parametrize("old, new", [
+        ("hello world", "hello brave world"),
+        ("abcdef", "abXYef"),
+        ("same", "same"),
+        ("", "new file"),
+        ("aaaa", "aa"),
+        ("😀 emoji prefix, tail", "😀 emoji prefix 🎉, tail"),
+    ])
+    def test_patch_round_trips(self, old, new):
+        assert _apply_js_patch(old, compute_patch(old, new)) == new
+
+    def test_patch_is_edit_sized(self):
+        old = "x" * 500_000
+        new = old[:250_000] + "EDIT" + old[250_000:]
+
+        patch = compute_patch(old, new)
+
+        assert patch == {"offset": 250_000, "delete": 0, "insert": "EDIT"}
+
+
+class TestDeltaBroadcast:
+    """Test file_patch routing and snapshot fallback."""
+
+    @pytest.mark.asyncio
+    async def test_delta_clients_get_patch_full_clients_get_snapshot(self):
+        manager = ConnectionManager()
+        old, new = "a" * 1000, "a" * 500 + "b" + "a" * 500
+        delta_ws, full_ws = FakeWebSocket(), FakeWebSocket()
+
+        base = await manager.sync_file_version("doc.md", content_hash(old))
+        await manager.connect(delta_ws, "doc.md", "viewer-delta", delta=True)
+        await manager.connect(full_ws, "doc.md", "viewer-full")
+
+        await manager.broadcast_file_change("doc.md", old, new)
+
+        [patch_msg] = delta_ws.sent
+        assert patch_msg["type"] == "file_patch"
+        assert patch_msg["base_version"] == base.version
+        assert patch_msg["version"] == base.version + 1
+        assert patch_msg["content_hash"] == content_hash(new)
+        assert patch_msg["patch"] == {"offset": 500, "delete": 0, "insert": "b"}
+
+        [full_msg] = full_ws.sent
+        assert full_msg["type"] == "file_change"
+        assert full_msg["new_content"] == new
+        assert full_msg["metadata"]["version"] == base.version + 1
+
+    @pytest.mark.asyncio
+    async def test_version_mismatch_falls_back_to_snapshot(self):
+        manager = ConnectionManager()
+        ws = FakeWebSocket()
+
+        await manager.sync_file_version("doc.md", content_hash("x" * 1000))
+        await manager.connect(ws, "doc.md", "viewer", delta=True)
+
+        # old_content is not what the room was last sent
+        await manager.broadcast_file_change("doc.md", "y" * 1000, "y" * 999 + "z")
+
+        [msg] = ws.sent
+        assert msg["type"] == "file_change"
+        assert msg["metadata"]["content_hash"] == content_hash("y" * 999 + "z")
+
+    @pytest.mark.asyncio
+    async def test_watcher_echo_of_patched_edit_skipped(self):
+        manager = ConnectionManager()
+        old, new = "a" * 5000, "a" * 2500 + "b" + "a" * 2500
+        delta_ws, full_ws = FakeWebSocket(), FakeWebSocket()
+
+        await manager.sync_file_version("doc.md", content_hash(old))
+        await manager.connect(delta_ws, "doc.md", "viewer-delta", delta=True)
+        await manager.connect(full_ws, "doc.md", "viewer-full")
+
+        await manager.broadcast_file_change("doc.md", old, new)
+        # File watcher reports the same write without old_content
+        await manager.broadcast_file_change("doc.md", "", new, editor_user_id="file_watcher")
+
+        assert [m["type"] for m in delta_ws.sent] == ["file_patch"]
+        assert [m["type"] for m in full_ws.sent] == ["file_change"]
+        assert manager.file_versions["doc.md"].version == 2
+
+    @pytest.mark.asyncio
+    async def test_version_state_cleared_with_room(self):
+        manager = ConnectionManager()
+        ws = FakeWebSocket()
+
+        await manager.sync_file_version("doc.md", content_hash("content"))
+        await manager.connect(ws, "doc.md", "viewer", delta=True)
+        await manager.disconnect(ws, "doc.md", "viewer")
+
+        assert manager.file_versions == {}
+        assert manager.delta_clients == {}
+
+
+class TestUtf8Chunking:
+    """Test codepoint-aligned chunking."""
+
+    TEXT = ("ascii é 中文 😀 " * 5000)
+
+    def test_chunks_decode_independently(self):
+        data = self.TEXT.encode("utf-8")
+
+        chunks = list(iter_utf8_chunks(data, 1000))
+
+        assert all(len(chunk) <= 1000 for chunk in chunks)
+        assert "".join(str(chunk, "utf-8") for chunk in chunks) == self.TEXT
+
+    @pytest.mark.asyncio
+    async def test_stream_file_chunks_from_disk(self, tmp_path):
+        path = tmp_path / "report.md"
+        path.write_text(self.TEXT, encoding="utf-8")
+
+        parts = [str(chunk, "utf-8") async for chunk in stream_file_chunks(path, 1001)]
+
+        assert len(parts) > 1
+        assert "".join(parts) == self.TEXT
+
+    @pytest.mark.asyncio
+    async def test_broadcast_chunks_text_and_binary(self, monkeypatch):
+        monkeypatch.setattr("websocket_manager.CHUNK_SIZE_BYTES", 1000)
+        manager = ConnectionManager()
+        text_ws, binary_ws = FakeWebSocket(), FakeWebSocket()
+        await manager.connect(text_ws, "doc.md", "viewer-text")
+        await manager.connect(binary_ws, "doc.md", "viewer-binary", binary=True)
+
+        await manager.broadcast_file_change("doc.md", "", self.TEXT)
+
+        assert "".join(m["content_chunk"] for m in text_ws.sent) == self.TEXT
+        frames = [_unpack_frame(frame) for frame in binary_ws.frames]
+        assert frames[0][0]["total_chunks"] == len(frames)
+        assert b"".join(payload for _, payload in frames).decode("utf-8") == self.TEXT
+
+    @pytest.mark.asyncio
+    async def test_initial_content_streamed_with_version(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("websocket_manager.CHUNK_SIZE_BYTES", 1000)
+        path = tmp_path / "report.md"
+        path.write_text(self.TEXT, encoding="utf-8")
+        manager = ConnectionManager()
+        ws = FakeWebSocket()
+
+        version = await manager.send_initial_content(ws, "report.md", path)
+
+        *chunks, end = ws.sent
+        assert "".join(m["content_chunk"] for m in chunks) == self.TEXT
+        assert end["type"] == "initial_content_end"
+        assert end["total_chunks"] == len(chunks)
+        assert end["content_hash"] == content_hash(self.TEXT) == version.content_hash
+
+
+class TestSessionMessages:
+    """Test session-scoped delivery (approval requests)."""
+
+    @pytest.mark.asyncio
+    async def test_only_session_sockets_receive(self):
+        manager = ConnectionManager()
+        own, other, file_client = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+        await manager.connect_session(own, "thread-a")
+        await manager.connect_session(other, "thread-b")
+        await manager.connect(file_client, "doc.md", "user-1")
+
+        sent = await manager.send_to_session("thread-a", {"type": "tool_approval_request"})
+
+        assert sent == 1
+        assert own.sent == [{"type": "tool_approval_request"}]
+        assert other.sent == [] and file_client.sent == []
+
+        await manager.disconnect_session(own, "thread-a")
+        assert await manager.send_to_session("thread-a", {"type": "x"}) == 0
+        assert "thread-a" not in manager.session_connections
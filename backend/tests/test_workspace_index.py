@@ -0,0 +1,116 @@
+"""
+Unit tests for the in-memory workspace tree index.
+
+Covers:
+- Cold build shape (directories first, hidden and watcher-ignored entries skipped)
+- Lazy depth-limited rendering and subtree paths
+- Incremental updates from watcher events and ETag changes
+- Events arriving during the cold build replayed after it
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from file_watcher import EVENT_CREATED, EVENT_DELETED, EVENT_MOVED, WorkspaceEvent
+from workspace_index import TreePathError, WorkspaceTreeIndex
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    (tmp_path / "reports" / "2025").mkdir(parents=True)
+    (tmp_path / "reports" / "2025" / "q1.md").write_text("q1", encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("notes", encoding="utf-8")
+    (tmp_path / ".hidden").write_text("secret", encoding="utf-8")
+    (tmp_path / "notes.txt.bak").write_text("backup", encoding="utf-8")
+    (tmp_path / "reports" / "draft.tmp").write_text("partial", encoding="utf-8")
+    (tmp_path / "__pycache__").mkdir()
+    return tmp_path
+
+
+def _render(index, path="", depth=None):
+    return json.loads(index.render(path, depth)[1])
+
+
+class TestTreeIndex:
+    """Test build, render and incremental updates."""
+
+    @pytest.mark.asyncio
+    async def test_cold_build_matches_tree_shape(self, workspace):
+        index = WorkspaceTreeIndex(workspace)
+        await index.ensure_built()
+
+        tree = _render(index)
+
+        assert [(n["name"], n["type"]) for n in tree] == [("reports", "directory"), ("notes.txt", "file")]
+        assert [n["name"] for n in tree[0]["children"]] == ["2025"]
+        assert tree[0]["children"][0]["children"][0]["path"] == "reports/2025/q1.md"
+        assert tree[1]["extension"] == ".txt"
+        assert tree[1]["size"] == 5
+
+    @pytest.mark.asyncio
+    async def test_depth_and_subtree(self, workspace):
+        index = WorkspaceTreeIndex(workspace)
+        await index.ensure_built()
+
+        assert _render(index, depth=1)[0]["children"] is None
+        assert [n["name"] for n in _render(index, "reports/2025")] == ["q1.md"]
+        with pytest.raises(TreePathError):
+            index.render("notes.txt")
+
+    @pytest.mark.asyncio
+    async def test_watcher_events_update_index_and_etag(self, workspace):
+        index = WorkspaceTreeIndex(workspace)
+        await index.ensure_built()
+        etag_before = index.etag_for("", None)
+
+        (workspace / "drafts" / "deep").mkdir(parents=True)
+        (workspace / "drafts" / "deep" / "a.md").write_text("a", encoding="utf-8")
+        await index.apply_event(WorkspaceEvent(EVENT_CREATED, "drafts/deep/a.md"))
+
+        (workspace / "notes.txt").rename(workspace / "reports" / "notes.txt")
+        await index.apply_event(WorkspaceEvent(EVENT_MOVED, "notes.txt", dest_path="reports/notes.txt"))
+
+        (workspace / "reports" / "2025" / "q1.md").unlink()
+        await index.apply_event(WorkspaceEvent(EVENT_DELETED, "reports/2025/q1.md"))
+
+        assert index.etag_for("", None) != etag_before
+        assert [n["name"] for n in _render(index)] == ["drafts", "reports"]
+        assert [n["name"] for n in _render(index, "drafts/deep")] == ["a.md"]
+        assert [n["name"] for n in _render(index, "reports")] == ["2025", "notes.txt"]
+        assert _render(index, "reports/2025") == []
+
+    @pytest.mark.asyncio
+    async def test_events_during_build_replayed(self, workspace):
+        index = WorkspaceTreeIndex(workspace)
+        loop = asyncio.get_running_loop()
+        scan = index._scan_into
+
+        def scan_then_change(directory, relative_dir, nodes, children):
+            scan(directory, relative_dir, nodes, children)
+            # Changes land after the scan passed their directories
+            (workspace / "late.md").write_text("late", encoding="utf-8")
+            (workspace / "reports" / "2025" / "q1.md").unlink()
+            for event in (WorkspaceEvent(EVENT_CREATED, "late.md"),
+                          WorkspaceEvent(EVENT_DELETED, "reports/2025/q1.md")):
+                asyncio.run_coroutine_threadsafe(index.apply_event(event), loop).result()
+
+        index._scan_into = scan_then_change
+        await index.ensure_built()
+
+        assert [n["name"] for n in _render(index)] == ["reports", "late.md", "notes.txt"]
+        assert _render(index, "reports/2025") == []
+
+    @pytest.mark.asyncio
+    async def test_render_cached_until_change(self, workspace):
+        index = WorkspaceTreeIndex(workspace)
+        await index.ensure_built()
+
+        first = index.render()
+        assert index.render()[1] is first[1]
+
+        (workspace / "new.md").write_text("new", encoding="utf-8")
+        await index.refresh_path("new.md")
+
+        assert index.render()[0] != first[0]
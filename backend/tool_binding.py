@@ -0,0 +1,93 @@
+"""
+Tool-Bound Model Registry.
+
+Agent nodes used to call model.bind_tools(tools) on every LLM turn, which
+regenerates the JSON schema of every tool (pydantic model + docstring parsing)
+each time. This registry:
+- Converts each tool to its schema once and shares it across agents
+- Builds each agent's tool-bound runnable once, keyed by agent type and tool set
+- Returns the same runnable on every later turn
+
+Usage:
+    bound_models = ToolBindingRegistry(model)
+    model_with_tools = bound_models.get("researcher", researcher_tools_list)
+    response = await model_with_tools.ainvoke(messages)
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Sequence, Tuple
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable
+from langchain_core.tools import BaseTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+logger = logging.getLogger(__name__)
+
+
+def tool_set_key(tools: Sequence[BaseTool]) -> Tuple[str, ...]:
+    """Identify a tool set by its tool names, in binding order."""
+    return tuple(tool.name for tool in tools)
+
+
+class ToolBindingRegistry:
+    """
+    Cache of tool schemas and tool-bound runnables for one chat model.
+
+    Attributes:
+        model: Chat model the tools are bound to
+    """
+
+    def __init__(self, model: BaseChatModel):
+        """Create an empty registry for model."""
+        self.model = model
+        self._schemas: Dict[str, Dict[str, Any]] = {}  # Tool name -> OpenAI-format schema
+        self._bound: Dict[Tuple[str, Tuple[str, ...]], Runnable] = {}
+        self._lock = threading.Lock()
+
+    def schema(self, tool: BaseTool) -> Dict[str, Any]:
+        """
+        Get a tool's schema, converting it on first use.
+
+        Args:
+            tool: LangChain tool
+
+        Returns:
+            OpenAI-format tool schema (accepted by every chat model's bind_tools)
+        """
+        schema = self._schemas.get(tool.name)
+        if schema is None:
+            schema = convert_to_openai_tool(tool)
+            self._schemas[tool.name] = schema
+        return schema
+
+    def get(self, agent_type: str, tools: Sequence[BaseTool]) -> Runnable:
+        """
+        Get the model bound to an agent's tools, building it on first use.
+
+        Args:
+            agent_type: Agent name (supervisor, researcher, ...)
+            tools: Tools the agent's tools node can execute
+
+        Returns:
+            Tool-bound runnable, shared by every turn of that agent
+        """
+        key = (agent_type, tool_set_key(tools))
+        bound = self._bound.get(key)
+        if bound is not None:
+            return bound
+
+        with self._lock:
+            bound = self._bound.get(key)
+            if bound is None:
+                bound = self.model.bind_tools([self.schema(tool) for tool in tools])
+                self._bound[key] = bound
+                logger.debug(f"Bound {len(tools)} tools for {agent_type}: {list(key[1])}")
+        return bound
+
+    def clear(self) -> None:
+        """Drop cached schemas and runnables (e.g. after tools are redefined)."""
+        with self._lock:
+            self._schemas.clear()
+            self._bound.clear()
@@ -6,27 +6,109 @@ This eliminates the need for additional API calls during verification.
 
 Key Features:
 - Automatic caching of Tavily results to PostgreSQL
-- Fast quote verification using database lookups
+- Cross-session query cache with TTL and stale-while-revalidate (tavily_cache.py)
+- Page bodies stored once and shared by every session that saw them
+- Fast quote verification using database lookups (one query per response)
+- Indexed exact/fuzzy quote matching with similarity and offsets (quote_matcher.py)
+- Pooled connections and batched upserts (no connect per tool call)
 - Session-based tracking for research workflows
 - Full-text search support for finding quotes
 """
 
+import atexit
+import logging
 import os
 import re
-from typing import Dict, List, Optional
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import Json, RealDictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from langchain_core.tools import tool
 from langchain_tavily import TavilySearch
 
+from .quote_matcher import FUZZY_THRESHOLD, match_quote
+from .tavily_cache import (
+    EXPIRED,
+    STALE,
+    CachedSearch,
+    content_hash,
+    normalize_query,
+    query_cache,
+    query_cache_key,
+)
+
+logger = logging.getLogger(__name__)
+
+# Results requested per Tavily search (part of the query cache key)
+TAVILY_MAX_RESULTS = 5
+
+# Connection pool sizing (the tools run in executor threads)
+POOL_MIN_SIZE = int(os.getenv("CITATION_DB_POOL_MIN_SIZE", "1"))
+POOL_MAX_SIZE = int(os.getenv("CITATION_DB_POOL_MAX_SIZE", "8"))
+
+# Process-wide pool (created on first use)
+_pool: Optional[ThreadedConnectionPool] = None
+_pool_slots: Optional[threading.BoundedSemaphore] = None
+_pool_lock = threading.Lock()
+
+
+def get_connection_pool() -> ThreadedConnectionPool:
+    """Return the Tavily cache connection pool, creating it on first use."""
+    global _pool, _pool_slots
+
+    if _pool is not None:
+        return _pool
+    with _pool_lock:
+        if _pool is None:
+            postgres_uri = os.getenv("POSTGRES_URI")
+            if not postgres_uri:
+                raise ValueError("POSTGRES_URI environment variable not set")
+            _pool = ThreadedConnectionPool(POOL_MIN_SIZE, POOL_MAX_SIZE, postgres_uri)
+            # ThreadedConnectionPool raises when exhausted; callers wait instead
+            _pool_slots = threading.BoundedSemaphore(POOL_MAX_SIZE)
+            logger.info(f"Citation cache pool opened (max {POOL_MAX_SIZE} connections)")
+    return _pool
+
+
+@contextmanager
+def pooled_connection() -> Iterator["psycopg2.extensions.connection"]:
+    """
+    Borrow a pooled connection for one transaction.
+
+    Commits when the block succeeds and rolls back when it raises.
+    Connections found closed (server restart, network error) are discarded
+    instead of being returned to the pool.
+    """
+    pool = get_connection_pool()
+    _pool_slots.acquire()
+    try:
+        conn = pool.getconn()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            if not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            pool.putconn(conn, close=bool(conn.closed))
+    finally:
+        _pool_slots.release()
+
 
-def get_postgres_connection():
-    """Get PostgreSQL connection for Tavily cache."""
-    postgres_uri = os.getenv("POSTGRES_URI")
-    if not postgres_uri:
-        raise ValueError("POSTGRES_URI environment variable not set")
-    return psycopg2.connect(postgres_uri)
+def close_connection_pool() -> None:
+    """Close every pooled connection (registered with atexit)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+
+atexit.register(close_connection_pool)
 
 
 def normalize_text(text: str) -> str:
@@ -46,6 +128,238 @@ def normalize_text(text: str) -> str:
     return ' '.join(text.split()).lower()
 
 
+def _search_tavily(query: str, search_depth: str, api_key: str) -> List[dict]:
+    """Run one Tavily search and return its result dicts."""
+    # Initialize TavilySearch with max_results parameter
+    tavily_tool = TavilySearch(
+        max_results=TAVILY_MAX_RESULTS,
+        search_depth=search_depth,
+        include_raw_content=True,  # Important for verification
+        api_key=api_key
+    )
+
+    # Execute search - returns the Tavily response (or a bare list of result dicts)
+    search_results = tavily_tool.invoke(query)
+    if isinstance(search_results, dict):
+        search_results = search_results.get("results", [])
+    return search_results if isinstance(search_results, list) else []
+
+
+def _load_cached_search(cursor, key: str) -> Optional[CachedSearch]:
+    """Read a query-cache entry and its shared page content from PostgreSQL."""
+    cursor.execute("""
+        SELECT results, EXTRACT(EPOCH FROM fetched_at) AS fetched_at
+        FROM tavily_query_cache
+        WHERE query_key = %s
+    """, (key,))
+    row = cursor.fetchone()
+    if not row:
+        return None
+
+    refs = row["results"] or []
+    cursor.execute("""
+        SELECT content_hash, url, title, raw_content, published_date
+        FROM tavily_content
+        WHERE content_hash = ANY(%s)
+    """, ([ref["content_hash"] for ref in refs],))
+    pages = {page["content_hash"]: page for page in cursor.fetchall()}
+
+    results = []
+    for ref in refs:
+        page = pages.get(ref["content_hash"])
+        if page is None:
+            # Shared content was pruned: treat the whole entry as a miss
+            return None
+        results.append({
+            "url": page["url"],
+            "title": page["title"],
+            "content": ref.get("content", ""),
+            "raw_content": page["raw_content"],
+            "score": ref.get("score", 0.0),
+            "published_date": page["published_date"]
+        })
+    return CachedSearch(results=results, fetched_at=float(row["fetched_at"]))
+
+
+def _store_pages(cursor, results: List[dict]) -> List[str]:
+    """
+    Upsert the results' page bodies into tavily_content.
+
+    Bodies are keyed by content hash, so rewriting an existing page is a
+    no-op; callers run this in the same transaction as the rows that
+    reference the pages.
+
+    Returns:
+        Content hash of each result, in order
+    """
+    digests = []
+    pages = {}
+    for result in results:
+        digest = content_hash(result.get("url", ""), result.get("raw_content"))
+        digests.append(digest)
+        pages[digest] = (
+            digest,
+            result.get("url", ""),
+            result.get("title", ""),
+            result.get("raw_content", ""),
+            result.get("published_date", "")
+        )
+    if not pages:
+        return digests
+
+    execute_values(cursor, """
+        INSERT INTO tavily_content
+            (content_hash, url, title, raw_content, published_date)
+        VALUES %s
+        ON CONFLICT (content_hash) DO NOTHING
+    """, list(pages.values()))
+    return digests
+
+
+def _store_cached_search(
+    cursor,
+    key: str,
+    query: str,
+    search_depth: str,
+    entry: CachedSearch
+) -> None:
+    """Write a query-cache entry; page bodies are stored once per content hash."""
+    digests = _store_pages(cursor, entry.results)
+    refs = [
+        {
+            "content_hash": digest,
+            "content": result.get("content", ""),
+            "score": result.get("score", 0.0)
+        }
+        for digest, result in zip(digests, entry.results)
+    ]
+
+    # Keep whichever copy is newer when two workers refresh the same query
+    cursor.execute("""
+        INSERT INTO tavily_query_cache
+            (query_key, normalized_query, search_depth, max_results, results, fetched_at)
+        VALUES (%s, %s, %s, %s, %s, to_timestamp(%s))
+        ON CONFLICT (query_key)
+        DO UPDATE SET
+            results = EXCLUDED.results,
+            fetched_at = EXCLUDED.fetched_at
+        WHERE tavily_query_cache.fetched_at < EXCLUDED.fetched_at
+    """, (
+        key,
+        normalize_query(query),
+        search_depth,
+        TAVILY_MAX_RESULTS,
+        Json(refs),
+        entry.fetched_at
+    ))
+
+
+def _store_session_results(
+    cursor,
+    session_id: str,
+    query: str,
+    search_depth: str,
+    results: List[dict]
+) -> None:
+    """
+    Upsert a session's rows for one search, with the page bodies they reference.
+
+    Session rows keep raw_content NULL and read the body from tavily_content,
+    so the bodies are written here in the same transaction: a committed
+    session row always has its page (whether the results came from Tavily,
+    the database or the in-memory cache tier).
+    """
+    digests = _store_pages(cursor, results)
+
+    # One row per URL: ON CONFLICT cannot touch the same row twice per statement
+    rows = {}
+    for digest, result in zip(digests, results):
+        url = result.get("url", "")
+        rows[url] = (
+            session_id,
+            query,
+            search_depth,
+            url,
+            result.get("title", ""),
+            result.get("content", ""),
+            result.get("score", 0.0),
+            result.get("published_date", ""),
+            digest
+        )
+    if not rows:
+        return
+
+    execute_values(cursor, """
+        INSERT INTO tavily_search_cache
+            (session_id, query, search_depth, url, title, content, raw_content,
+             score, published_date, content_hash)
+        VALUES %s
+        ON CONFLICT (session_id, url)
+        DO UPDATE SET
+            content = EXCLUDED.content,
+            raw_content = NULL,
+            content_hash = EXCLUDED.content_hash,
+            score = EXCLUDED.score,
+            search_timestamp = NOW()
+    """, list(rows.values()), template="(%s, %s, %s, %s, %s, %s, NULL, %s, %s, %s)")
+
+
+def _lookup_cached_search(key: str) -> Optional[CachedSearch]:
+    """Find a servable entry in memory, then in PostgreSQL."""
+    entry = query_cache.get(key)
+    if query_cache.freshness(entry) != EXPIRED:
+        query_cache.record("memory_hits")
+        return entry
+
+    # Not in memory (or expired there): another worker may have refreshed it
+    try:
+        with pooled_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                entry = _load_cached_search(cursor, key)
+    except Exception as e:
+        logger.warning(f"Tavily query cache lookup failed: {e}")
+        return None
+
+    if query_cache.freshness(entry) == EXPIRED:
+        return None
+    query_cache.put(key, entry)
+    query_cache.record("db_hits")
+    return entry
+
+
+def _fetch_and_store(key: str, query: str, search_depth: str, api_key: str) -> CachedSearch:
+    """Search Tavily and publish the response to both cache tiers."""
+    entry = CachedSearch(results=_search_tavily(query, search_depth, api_key))
+    if not entry.results:
+        # Never cache an empty response (transient upstream issue)
+        return entry
+
+    query_cache.put(key, entry)
+    try:
+        with pooled_connection() as conn:
+            with conn.cursor() as cursor:
+                _store_cached_search(cursor, key, query, search_depth, entry)
+    except Exception as e:
+        logger.warning(f"Tavily query cache write failed: {e}")
+    return entry
+
+
+def _refresh_in_background(key: str, query: str, search_depth: str, api_key: str) -> None:
+    """Replace a stale entry without delaying the caller (one refresh per key)."""
+    if not query_cache.begin_refresh(key):
+        return
+
+    def run():
+        try:
+            _fetch_and_store(key, query, search_depth, api_key)
+        except Exception as e:
+            logger.warning(f"Tavily background refresh failed for {query!r}: {e}")
+        finally:
+            query_cache.end_refresh(key)
+
+    threading.Thread(target=run, name="tavily-refresh", daemon=True).start()
+
+
 @tool
 def tavily_search_cached(query: str, session_id: str, search_depth: str = "advanced") -> dict:
     """
@@ -54,6 +368,9 @@ def tavily_search_cached(query: str, session_id: str, search_depth: str = "advan
     All results are automatically saved to PostgreSQL database with the session_id.
     This enables later verification of quotes without additional API calls.
 
+    Identical (normalized) queries from any session are answered from a shared
+    query cache; stale entries are served while they refresh in the background.
+
     Args:
         query: Search query string
         session_id: Research session identifier (typically the plan_id)
@@ -68,69 +385,46 @@ def tavily_search_cached(query: str, session_id: str, search_depth: str = "advan
             session_id="plan_20251115_213543"
         )
     """
-    # Get Tavily API key
+    # Get Tavily API key (only required when the query cache cannot answer)
     tavily_api_key = os.getenv("TAVILY_API_KEY")
-    if not tavily_api_key:
-        return {
-            "error": "TAVILY_API_KEY not found in environment variables",
-            "results": []
-        }
 
-    # Perform Tavily search using LangChain v1.0+ integration
-    try:
-        # Initialize TavilySearch with max_results parameter
-        tavily_tool = TavilySearch(
-            max_results=5,
-            search_depth=search_depth,
-            include_raw_content=True,  # Important for verification
-            api_key=tavily_api_key
-        )
+    key = query_cache_key(query, search_depth, TAVILY_MAX_RESULTS)
+    entry = _lookup_cached_search(key)
+    freshness = query_cache.freshness(entry)
 
-        # Execute search - returns a list of result dicts
-        search_results = tavily_tool.invoke(query)
+    if freshness == EXPIRED:
+        if not tavily_api_key:
+            return {
+                "error": "TAVILY_API_KEY not found in environment variables",
+                "results": []
+            }
+        query_cache.record("misses")
+        # Perform Tavily search using LangChain v1.0+ integration
+        try:
+            entry = _fetch_and_store(key, query, search_depth, tavily_api_key)
+        except Exception as e:
+            return {
+                "error": f"Tavily search failed: {str(e)}",
+                "results": []
+            }
+    elif freshness == STALE:
+        query_cache.record("stale_served")
+        if tavily_api_key:
+            _refresh_in_background(key, query, search_depth, tavily_api_key)
 
-        # Convert to expected format
-        results = {
-            "results": search_results if isinstance(search_results, list) else [],
-            "query": query
-        }
-    except Exception as e:
-        return {
-            "error": f"Tavily search failed: {str(e)}",
-            "results": []
-        }
+    # Cache status goes to query_cache.get_stats() and the log, not the tool result
+    logger.debug(f"Tavily query cache {freshness} for {query!r}")
 
-    # Cache results in database
-    try:
-        conn = get_postgres_connection()
-        cursor = conn.cursor()
+    results = {
+        "results": entry.copy_results(),
+        "query": query,
+    }
 
-        for result in results.get("results", []):
-            cursor.execute("""
-                INSERT INTO tavily_search_cache
-                    (session_id, query, search_depth, url, title, content, raw_content, score, published_date)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (session_id, url)
-                DO UPDATE SET
-                    content = EXCLUDED.content,
-                    raw_content = EXCLUDED.raw_content,
-                    score = EXCLUDED.score,
-                    search_timestamp = NOW()
-            """, (
-                session_id,
-                query,
-                search_depth,
-                result.get("url", ""),
-                result.get("title", ""),
-                result.get("content", ""),
-                result.get("raw_content", ""),
-                result.get("score", 0.0),
-                result.get("published_date", "")
-            ))
-
-        conn.commit()
-        cursor.close()
-        conn.close()
+    # Record the results for this session together with their page bodies
+    try:
+        with pooled_connection() as conn:
+            with conn.cursor() as cursor:
+                _store_session_results(cursor, session_id, query, search_depth, results["results"])
 
         # Add cache confirmation to results
         results["_cached"] = True
@@ -145,6 +439,21 @@ def tavily_search_cached(query: str, session_id: str, search_depth: str = "advan
     return results
 
 
+def _fetch_session_sources(session_id: str, urls: List[str]) -> Dict[str, dict]:
+    """Load cached content for the given URLs of a session, keyed by URL."""
+    with pooled_connection() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute("""
+                SELECT s.url, s.content,
+                       COALESCE(c.raw_content, s.raw_content) AS raw_content,
+                       s.title, s.score
+                FROM tavily_search_cache s
+                LEFT JOIN tavily_content c ON c.content_hash = s.content_hash
+                WHERE s.session_id = %s AND s.url = ANY(%s)
+            """, (session_id, list(set(urls))))
+            return {row["url"]: row for row in cursor.fetchall()}
+
+
 @tool
 def verify_citations(response_text: str, session_id: str) -> Dict:
     """
@@ -153,6 +462,10 @@ def verify_citations(response_text: str, session_id: str) -> Dict:
     Checks that every quote in the response can be found in the Tavily search
     results cached during research. NO external API calls are made.
 
+    Quotes are matched ignoring case, punctuation, accents and whitespace;
+    near-verbatim quotes (similarity >= FUZZY_THRESHOLD) verify as "fuzzy"
+    unless they add, drop or change a negation or number.
+
     Citation Format Expected:
         Inline: "exact quote" [Source, URL, Date] [#]
         Source List: [#] "exact quote" - Source - URL - Date
@@ -178,7 +491,10 @@ def verify_citations(response_text: str, session_id: str) -> Dict:
                 {
                     "ref_num": int,
                     "status": "verified" | "failed",
-                    "found_in": "content" | "raw_content" | None
+                    "found_in": "content" | "raw_content" | None,
+                    "match_type": "exact" | "fuzzy",  # verified only
+                    "similarity": float,               # verified only
+                    "offsets": [start, end]            # verified only, in found_in
                 }
             ]
         }
@@ -215,75 +531,9 @@ def verify_citations(response_text: str, session_id: str) -> Dict:
         })
         return results
 
-    # Connect to database
+    # Fetch every cited source in one round trip
     try:
-        conn = get_postgres_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        for ref_num, quote, source, url in citations:
-            # Normalize quote for comparison (collapse whitespace, lowercase)
-            quote_normalized = normalize_text(quote)
-
-            # Query cached Tavily results for this URL
-            cursor.execute("""
-                SELECT content, raw_content, title, score
-                FROM tavily_search_cache
-                WHERE session_id = %s AND url = %s
-                LIMIT 1
-            """, (session_id, url))
-
-            result = cursor.fetchone()
-
-            if not result:
-                # URL not in cache - wasn't from Tavily search
-                results["all_verified"] = False
-                results["failed_citations"].append({
-                    "ref_num": int(ref_num),
-                    "quote": quote[:100] + "..." if len(quote) > 100 else quote,
-                    "url": url,
-                    "reason": "URL not found in Tavily search results for this session. Only cite sources from your tavily_search results."
-                })
-                results["verification_details"].append({
-                    "ref_num": int(ref_num),
-                    "status": "failed",
-                    "found_in": None
-                })
-                continue
-
-            # Search in content (try both content and raw_content)
-            content_normalized = normalize_text(result["content"] or "")
-            raw_normalized = normalize_text(result["raw_content"] or "")
-
-            found_in_content = quote_normalized in content_normalized
-            found_in_raw = quote_normalized in raw_normalized
-
-            if found_in_content or found_in_raw:
-                results["verified_count"] += 1
-                results["verification_details"].append({
-                    "ref_num": int(ref_num),
-                    "status": "verified",
-                    "found_in": "content" if found_in_content else "raw_content",
-                    "relevance_score": float(result["score"]) if result["score"] else 0.0
-                })
-            else:
-                results["all_verified"] = False
-                results["failed_citations"].append({
-                    "ref_num": int(ref_num),
-                    "quote": quote[:100] + "..." if len(quote) > 100 else quote,
-                    "url": url,
-                    "source_title": result["title"],
-                    "reason": "Quote not found in Tavily search result content. The quote must be an EXACT excerpt from the source.",
-                    "suggestion": "Re-read the Tavily result and extract the exact text. Do not paraphrase or modify quotes."
-                })
-                results["verification_details"].append({
-                    "ref_num": int(ref_num),
-                    "status": "failed",
-                    "found_in": None
-                })
-
-        cursor.close()
-        conn.close()
-
+        sources = _fetch_session_sources(session_id, [url for _, _, _, url in citations])
     except Exception as e:
         results["all_verified"] = False
         results["failed_citations"].append({
@@ -292,6 +542,65 @@ def verify_citations(response_text: str, session_id: str) -> Dict:
             "url": "",
             "reason": f"Database error during verification: {str(e)}"
         })
+        return results
+
+    for ref_num, quote, source, url in citations:
+        result = sources.get(url)
+
+        if not result:
+            # URL not in cache - wasn't from Tavily search
+            results["all_verified"] = False
+            results["failed_citations"].append({
+                "ref_num": int(ref_num),
+                "quote": quote[:100] + "..." if len(quote) > 100 else quote,
+                "url": url,
+                "reason": "URL not found in Tavily search results for this session. Only cite sources from your tavily_search results."
+            })
+            results["verification_details"].append({
+                "ref_num": int(ref_num),
+                "status": "failed",
+                "found_in": None
+            })
+            continue
+
+        # Search in content, then raw_content (sources are indexed once and cached)
+        found_in, match = "content", match_quote(quote, result["content"] or "")
+        if not match.exact:
+            raw_match = match_quote(quote, result["raw_content"] or "")
+            if raw_match.exact or raw_match.score > match.score:
+                found_in, match = "raw_content", raw_match
+
+        if match.found:
+            results["verified_count"] += 1
+            results["verification_details"].append({
+                "ref_num": int(ref_num),
+                "status": "verified",
+                "found_in": found_in,
+                "match_type": "exact" if match.exact else "fuzzy",
+                "similarity": round(match.score, 3),
+                "offsets": [match.start, match.end],
+                "relevance_score": float(result["score"]) if result["score"] else 0.0
+            })
+        else:
+            results["all_verified"] = False
+            results["failed_citations"].append({
+                "ref_num": int(ref_num),
+                "quote": quote[:100] + "..." if len(quote) > 100 else quote,
+                "url": url,
+                "source_title": result["title"],
+                "similarity": round(match.score, 3),
+                "reason": (
+                    f"Quote {match.reason} (negations and numbers must match exactly). "
+                    if match.reason else
+                    f"Quote not found in Tavily search result content (best similarity {match.score:.2f}, required {FUZZY_THRESHOLD}). "
+                ) + "The quote must be an EXACT excerpt from the source.",
+                "suggestion": "Re-read the Tavily result and extract the exact text. Do not paraphrase or modify quotes."
+            })
+            results["verification_details"].append({
+                "ref_num": int(ref_num),
+                "status": "failed",
+                "found_in": None
+            })
 
     return results
 
@@ -317,20 +626,19 @@ def get_cached_source_content(url: str, session_id: str) -> Dict:
         }
     """
     try:
-        conn = get_postgres_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        cursor.execute("""
-            SELECT url, title, content, raw_content, score, published_date
-            FROM tavily_search_cache
-            WHERE session_id = %s AND url = %s
-            LIMIT 1
-        """, (session_id, url))
-
-        result = cursor.fetchone()
-
-        cursor.close()
-        conn.close()
+        with pooled_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute("""
+                    SELECT s.url, s.title, s.content,
+                           COALESCE(c.raw_content, s.raw_content) AS raw_content,
+                           s.score, s.published_date
+                    FROM tavily_search_cache s
+                    LEFT JOIN tavily_content c ON c.content_hash = s.content_hash
+                    WHERE s.session_id = %s AND s.url = %s
+                    LIMIT 1
+                """, (session_id, url))
+
+                result = cursor.fetchone()
 
         if result:
             return {
@@ -0,0 +1,320 @@
+"""
+Indexed Quote Verification Engine
+
+Matches cited quotes against cached source text for verify_citations:
+- Each source is tokenized and normalized once (NFKD, accents stripped,
+  case-folded, punctuation ignored) and cached by content hash, so dozens of
+  citations against the same multi-megabyte page share one pass
+- Exact matches are a single str.find over the normalized token stream
+- Otherwise a 3-token shingle index (built lazily with numpy, also cached)
+  proposes alignments, and the best one is scored with a token-level alignment
+- Every match reports a similarity score and character offsets into the
+  original (un-normalized) source text
+
+Quotes that differ only by punctuation, curly quotes, dashes, accents or
+whitespace therefore verify exactly; small wording slips verify as fuzzy
+matches above the threshold, unless a differing token is a negation or a
+number (one such word can flip the meaning of a near-verbatim quote).
+"""
+
+import hashlib
+import re
+import threading
+import unicodedata
+from bisect import bisect_right
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, replace
+from difflib import SequenceMatcher
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Matching configuration
+FUZZY_THRESHOLD = 0.9       # Minimum similarity for a fuzzy match
+SHINGLE_SIZE = 3            # Tokens per shingle in the candidate index
+MAX_CANDIDATES = 3          # Alignments scored per quote
+MAX_POSTINGS = 1000         # Shingles more frequent than this do not vote
+INDEX_CACHE_SIZE = 128      # Source indexes kept in memory
+
+_TOKEN = re.compile(r"\w+")
+
+# Tokens a fuzzy match may not add, drop or change ("t" is the n't of don't, isn't, ...)
+NEGATIONS = frozenset({
+    "not", "no", "never", "none", "nor", "neither", "nobody", "nothing",
+    "nowhere", "without", "cannot", "t",
+})
+
+
+def _fold(token: str) -> str:
+    """Normalize one token (compatibility forms, accents, case)."""
+    if token.isascii():
+        return token.lower()
+    decomposed = unicodedata.normalize("NFKD", token)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def tokenize(text: str) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """
+    Split text into normalized word tokens.
+
+    Returns:
+        (tokens, spans) where spans[i] is the (start, end) character range of
+        tokens[i] in the original text
+    """
+    spans = [match.span() for match in _TOKEN.finditer(text)]
+    if text.isascii():
+        # lower() keeps ASCII offsets, so one C-level pass yields the tokens
+        return _TOKEN.findall(text.lower()), spans
+    return [_fold(text[start:end]) for start, end in spans], spans
+
+
+@dataclass
+class QuoteMatch:
+    """
+    Result of matching one quote against one source.
+
+    Attributes:
+        found: True for an exact match or a fuzzy match above the threshold
+        exact: True if the normalized quote occurs verbatim
+        score: Similarity in [0, 1] (1.0 for exact matches)
+        start: Character offset of the match in the original source text
+        end: End offset (exclusive) of the match in the original source text
+        reason: Why an alignment above the threshold was rejected, if it was
+    """
+
+    found: bool
+    exact: bool = False
+    score: float = 0.0
+    start: Optional[int] = None
+    end: Optional[int] = None
+    reason: Optional[str] = None
+
+
+NO_MATCH = QuoteMatch(found=False)
+
+
+class SourceIndex:
+    """
+    Normalized, searchable view of one source text.
+
+    Attributes:
+        tokens: Normalized tokens
+        spans: Original character range of each token
+    """
+
+    def __init__(self, text: str):
+        """Tokenize text; the shingle index is built on first fuzzy lookup."""
+        self.tokens, self.spans = tokenize(text)
+        # Space-padded so that exact matches start and end on token boundaries
+        self._joined = " " + " ".join(self.tokens) + " "
+
+        # Offset of the space before each token in _joined (exact-match mapping)
+        self._starts = list(accumulate((len(token) + 1 for token in self.tokens), initial=0))
+
+        # Shingle index: token ids, shingle keys sorted once, positions in key order
+        self._vocab: Optional[Dict[str, int]] = None
+        self._sorted_keys: Optional[np.ndarray] = None
+        self._positions: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    def match(self, quote: str, threshold: float = FUZZY_THRESHOLD) -> QuoteMatch:
+        """
+        Find quote in this source.
+
+        Args:
+            quote: Quote as cited (any punctuation, case or Unicode form)
+            threshold: Minimum similarity accepted as a fuzzy match
+
+        Returns:
+            QuoteMatch (found=False if nothing reaches threshold)
+        """
+        quote_tokens, _ = tokenize(quote)
+        if not quote_tokens or not self.tokens:
+            return NO_MATCH
+
+        position = self._joined.find(" " + " ".join(quote_tokens) + " ")
+        if position >= 0:
+            first = bisect_right(self._starts, position) - 1
+            last = first + len(quote_tokens) - 1
+            return QuoteMatch(
+                found=True,
+                exact=True,
+                score=1.0,
+                start=self.spans[first][0],
+                end=self.spans[last][1],
+            )
+
+        # Too short to align reliably: exact matches only
+        if len(quote_tokens) < SHINGLE_SIZE:
+            return NO_MATCH
+        return self._fuzzy_match(quote_tokens, threshold)
+
+    def _fuzzy_match(self, quote_tokens: List[str], threshold: float) -> QuoteMatch:
+        """Score the best shingle-proposed alignments of quote_tokens."""
+        self._build_shingle_index()
+
+        # Each shared shingle votes for the source position the quote would start at
+        votes = Counter()
+        quote_ids = [self._vocab.get(token, -1) for token in quote_tokens]
+        for offset in range(len(quote_ids) - SHINGLE_SIZE + 1):
+            window = quote_ids[offset:offset + SHINGLE_SIZE]
+            if -1 in window:
+                continue
+            key = _shingle_keys(np.array(window, dtype=np.int64))[0]
+            low = np.searchsorted(self._sorted_keys, key, side="left")
+            high = np.searchsorted(self._sorted_keys, key, side="right")
+            if high - low > MAX_POSTINGS:
+                continue
+            for position in self._positions[low:high].tolist():
+                votes[position - offset] += 1
+
+        best = NO_MATCH
+        rejected = NO_MATCH  # Best alignment that changes a negation or number
+        slack = max(2, len(quote_tokens) // 5)
+        tried = []
+        for start, _ in votes.most_common():
+            if len(tried) >= MAX_CANDIDATES:
+                break
+            if any(abs(start - other) <= slack for other in tried):
+                continue
+            tried.append(start)
+
+            candidate = self._score_alignment(quote_tokens, start, slack)
+            if candidate.reason is not None:
+                if candidate.score > rejected.score:
+                    rejected = candidate
+            elif candidate.score > best.score:
+                best = candidate
+
+        if best.start is not None and best.score >= threshold:
+            return replace(best, found=True)
+        if rejected.score >= threshold:
+            return rejected
+        return QuoteMatch(found=False, score=best.score)
+
+    def _score_alignment(self, quote_tokens: List[str], start: int, slack: int) -> QuoteMatch:
+        """Align quote_tokens against the source window around start."""
+        window_start = max(0, start - slack)
+        window = self.tokens[window_start:start + len(quote_tokens) + slack]
+
+        matcher = SequenceMatcher(None, quote_tokens, window, autojunk=False)
+        blocks = [block for block in matcher.get_matching_blocks() if block.size]
+        if not blocks:
+            return NO_MATCH
+
+        matched = sum(block.size for block in blocks)
+        first = blocks[0].b
+        last = blocks[-1].b + blocks[-1].size  # exclusive
+        score = 2.0 * matched / (len(quote_tokens) + (last - first))
+
+        critical = _critical_changes(quote_tokens, window, blocks, first, last)
+        if critical:
+            return QuoteMatch(
+                found=False,
+                score=score,
+                reason=f"differs from the source in {', '.join(repr(t) for t in critical)}",
+            )
+
+        return QuoteMatch(
+            found=False,
+            score=score,
+            start=self.spans[window_start + first][0],
+            end=self.spans[window_start + last - 1][1],
+        )
+
+    def _build_shingle_index(self) -> None:
+        """Build the sorted shingle-key index once (first fuzzy lookup)."""
+        with self._lock:
+            if self._vocab is not None:
+                return
+            vocab: Dict[str, int] = {}
+            ids = np.fromiter(
+                (vocab.setdefault(token, len(vocab)) for token in self.tokens),
+                dtype=np.int64,
+                count=len(self.tokens),
+            )
+            keys = _shingle_keys(ids)
+            order = np.argsort(keys, kind="stable")
+            self._sorted_keys = keys[order]
+            self._positions = order
+            self._vocab = vocab
+
+
+def _critical_changes(quote_tokens, window, blocks, first: int, last: int) -> List[str]:
+    """Negations and numbers present on only one side of an alignment."""
+    matched_quote = set()
+    matched_source = set()
+    for block in blocks:
+        matched_quote.update(range(block.a, block.a + block.size))
+        matched_source.update(range(block.b, block.b + block.size))
+
+    changed = [t for i, t in enumerate(quote_tokens) if i not in matched_quote]
+    changed += [window[i] for i in range(first, last) if i not in matched_source]
+    return sorted({t for t in changed if t in NEGATIONS or any(c.isdigit() for c in t)})
+
+
+def _shingle_keys(ids: np.ndarray) -> np.ndarray:
+    """
+    Hash each run of SHINGLE_SIZE token ids into one int64 key.
+
+    Keys may collide (wrapping arithmetic); a collision only adds a candidate
+    alignment, which scoring then rejects.
+    """
+    if len(ids) < SHINGLE_SIZE:
+        return np.zeros(0, dtype=np.int64)
+    keys = ids[:len(ids) - SHINGLE_SIZE + 1].copy()
+    with np.errstate(over="ignore"):
+        for i in range(1, SHINGLE_SIZE):
+            keys = keys * np.int64(1_000_003) + ids[i:len(ids) - SHINGLE_SIZE + 1 + i]
+    return keys
+
+
+class SourceIndexCache:
+    """
+    LRU of SourceIndex objects keyed by content hash.
+
+    Attributes:
+        max_entries: LRU capacity
+    """
+
+    def __init__(self, max_entries: int = INDEX_CACHE_SIZE):
+        """Initialize an empty cache."""
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, SourceIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def get(self, text: str) -> SourceIndex:
+        """Return the index for text, building it on first use."""
+        key = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return index
+            self._stats["misses"] += 1
+
+        index = SourceIndex(text)
+        with self._lock:
+            self._entries[key] = index
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return index
+
+    def get_stats(self) -> dict:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
+
+
+# Singleton instance (shared by all verification calls in this process)
+source_index_cache = SourceIndexCache()
+
+
+def match_quote(quote: str, text: str, threshold: float = FUZZY_THRESHOLD) -> QuoteMatch:
+    """Match quote against text using the shared index cache."""
+    if not text:
+        return NO_MATCH
+    return source_index_cache.get(text).match(quote, threshold)
@@ -0,0 +1,194 @@
+"""
+Cross-Session Tavily Query Cache
+
+Query-level cache in front of the Tavily API, shared by every research session:
+- Keyed on (normalized query, search depth, max results), so "Quantum  Error
+  Correction 2025?" and "quantum error correction 2025" hit the same entry
+- Fresh entries (younger than the TTL) are served without an API call
+- Stale entries (TTL < age <= TTL + stale window) are served immediately while
+  one background refresh replaces them (stale-while-revalidate)
+- An in-process LRU sits in front of the PostgreSQL copy, so repeated queries
+  in the same worker return without a database round trip
+
+Persistence lives in citation_verification.py (tavily_query_cache and
+tavily_content tables, see migrations/005_tavily_query_cache.sql).
+
+Configuration (environment variables):
+    TAVILY_CACHE_TTL            Seconds an entry is fresh (default: 86400)
+    TAVILY_CACHE_STALE_TTL      Extra seconds a stale entry may be served
+                                while it is refreshed (default: 604800)
+    TAVILY_CACHE_MEMORY_SIZE    Entries kept in the in-process LRU (default: 512)
+"""
+
+import copy
+import hashlib
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Cache configuration
+CACHE_TTL = float(os.getenv("TAVILY_CACHE_TTL", "86400"))
+CACHE_STALE_TTL = float(os.getenv("TAVILY_CACHE_STALE_TTL", "604800"))
+CACHE_MEMORY_SIZE = int(os.getenv("TAVILY_CACHE_MEMORY_SIZE", "512"))
+
+# Freshness states returned by TavilyQueryCache.freshness()
+FRESH = "fresh"
+STALE = "stale"
+EXPIRED = "expired"
+
+_PUNCTUATION = re.compile(r"[^\w\s\"'-]+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a search query for cache lookups.
+
+    - Unicode NFKC (full-width and compatibility characters folded)
+    - Case-folded
+    - Punctuation other than quotes and hyphens removed
+    - Whitespace collapsed
+
+    Args:
+        query: Raw query string
+
+    Returns:
+        Normalized query
+    """
+    text = unicodedata.normalize("NFKC", query).casefold()
+    text = _PUNCTUATION.sub(" ", text)
+    return " ".join(text.split())
+
+
+def query_cache_key(query: str, search_depth: str, max_results: int) -> str:
+    """Cache key for a (query, depth, max_results) search."""
+    raw = f"{normalize_query(query)}\0{search_depth}\0{max_results}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def content_hash(url: str, raw_content: Optional[str]) -> str:
+    """Identify a page body shared between sessions and queries."""
+    raw = f"{url}\0{raw_content or ''}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedSearch:
+    """
+    One cached Tavily response.
+
+    Attributes:
+        results: Tavily result dicts (url, title, content, raw_content, score,
+            published_date)
+        fetched_at: time.time() when Tavily returned the results
+    """
+
+    results: List[Dict[str, Any]]
+    fetched_at: float = field(default_factory=time.time)
+
+    def copy_results(self) -> List[Dict[str, Any]]:
+        """Results safe for the caller to mutate."""
+        return copy.deepcopy(self.results)
+
+
+class TavilyQueryCache:
+    """
+    In-process LRU of cached searches plus freshness and refresh bookkeeping.
+
+    Thread-safe: the search tool runs in executor threads and background
+    refreshes run in their own threads.
+
+    Attributes:
+        ttl: Seconds an entry is fresh
+        stale_ttl: Extra seconds a stale entry may be served
+        max_entries: LRU capacity
+    """
+
+    def __init__(
+        self,
+        ttl: float = CACHE_TTL,
+        stale_ttl: float = CACHE_STALE_TTL,
+        max_entries: int = CACHE_MEMORY_SIZE,
+    ):
+        """Initialize an empty cache."""
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[str, CachedSearch]" = OrderedDict()
+        self._refreshing: set = set()
+        self._lock = threading.Lock()
+
+        self._stats = {
+            "memory_hits": 0,
+            "db_hits": 0,
+            "misses": 0,
+            "stale_served": 0,
+            "refreshes": 0,
+        }
+
+    def get(self, key: str) -> Optional[CachedSearch]:
+        """Return the in-memory entry for key (marking it recently used)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: CachedSearch) -> None:
+        """Store an entry unless a newer one is already cached."""
+        with self._lock:
+            current = self._entries.get(key)
+            if current is not None and current.fetched_at > entry.fetched_at:
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def freshness(self, entry: Optional[CachedSearch], now: Optional[float] = None) -> str:
+        """Classify an entry as FRESH, STALE or EXPIRED (None is EXPIRED)."""
+        if entry is None:
+            return EXPIRED
+        age = (time.time() if now is None else now) - entry.fetched_at
+        if age <= self.ttl:
+            return FRESH
+        if age <= self.ttl + self.stale_ttl:
+            return STALE
+        return EXPIRED
+
+    def begin_refresh(self, key: str) -> bool:
+        """Claim the background refresh for key (False if one is running)."""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            self._stats["refreshes"] += 1
+            return True
+
+    def end_refresh(self, key: str) -> None:
+        """Release the refresh claim for key."""
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def record(self, stat: str) -> None:
+        """Increment a counter (memory_hits, db_hits, misses, stale_served)."""
+        with self._lock:
+            self._stats[stat] += 1
+
+    def get_stats(self) -> dict:
+        """Return counters and current sizes."""
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "refreshing": len(self._refreshing),
+            }
+
+
+# Singleton instance (shared by all sessions in this process)
+query_cache = TavilyQueryCache()
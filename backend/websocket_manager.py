@@ -3,18 +3,26 @@ WebSocket Connection Manager for Real-Time Collaborative Editing.
 
 This module implements file-based WebSocket rooms with:
 - Multi-user connection management per file
-- Large file chunking (>100KB)
+- Large file chunking (>100KB) on UTF-8 codepoint boundaries, as JSON text
+  frames or (opt-in) binary frames
+- Initial file content streamed from disk in chunks
 - Thread-safe operations with async locks
 - Automatic room cleanup
 - Editor exclusion from broadcasts (no echo-back)
+- Optional delta mode: opted-in clients receive compact patches tagged with
+  a per-file version and content hash instead of full snapshots
 
 Reference: INTEGRATION_CONTRACT.md for type definitions and interfaces.
 """
 
 import asyncio
+import hashlib
+import json
 import logging
 import time
-from typing import Dict, Optional
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterator, Optional, Set, Union
 
 from fastapi import WebSocket
 
@@ -25,6 +33,175 @@ logger = logging.getLogger(__name__)
 # Constants (must match INTEGRATION_CONTRACT.md)
 CHUNK_SIZE_BYTES = 102400  # 100KB
 
+# Delta mode: send a full snapshot instead when the patch is at least this
+# fraction of the new content (patching would save little bandwidth)
+DELTA_MAX_RATIO = 0.5
+
+
+@dataclass
+class FileVersion:
+    """Server-side version of a file as last sent to its room."""
+    version: int
+    content_hash: str
+
+
+def utf8_boundary(data: memoryview, end: int) -> int:
+    """
+    Move end back to the nearest UTF-8 codepoint boundary.
+
+    Continuation bytes have the bit pattern 10xxxxxx; a codepoint is at
+    most 4 bytes, so at most 3 steps are taken (invalid input is cut as-is).
+    """
+    if end >= len(data):
+        return len(data)
+    cut = end
+    while cut > end - 3 and cut > 0 and (data[cut] & 0xC0) == 0x80:
+        cut -= 1
+    return cut if (data[cut] & 0xC0) != 0x80 else end
+
+
+def utf8_complete_len(data: memoryview) -> int:
+    """
+    Length of data without a trailing incomplete UTF-8 sequence.
+
+    Used when the next bytes are not known yet (e.g. mid-file reads).
+    """
+    n = len(data)
+    for back in range(1, min(4, n) + 1):
+        lead = data[n - back]
+        if (lead & 0xC0) == 0x80:
+            continue
+        # Expected sequence length from the lead byte
+        if lead < 0x80:
+            expected = 1
+        elif lead >= 0xF0:
+            expected = 4
+        elif lead >= 0xE0:
+            expected = 3
+        else:
+            expected = 2
+        return n if back >= expected else n - back
+    return n
+
+
+def iter_utf8_chunks(data: Union[bytes, memoryview], chunk_size: int = CHUNK_SIZE_BYTES) -> Iterator[memoryview]:
+    """
+    Split UTF-8 data into chunks of at most chunk_size bytes.
+
+    Chunks are memoryview slices (no copies) that never split a codepoint,
+    so each one decodes on its own.
+    """
+    view = memoryview(data)
+    start = 0
+    while start < len(view):
+        end = utf8_boundary(view, start + chunk_size)
+        if end <= start:
+            end = min(start + chunk_size, len(view))
+        yield view[start:end]
+        start = end
+
+
+async def stream_file_chunks(path: Path, chunk_size: int = CHUNK_SIZE_BYTES) -> AsyncIterator[memoryview]:
+    """
+    Stream a UTF-8 file from disk in codepoint-aligned chunks.
+
+    Reads happen in a worker thread into one reusable buffer; the bytes of a
+    codepoint cut by the read are carried over to the next chunk. Each
+    yielded memoryview is only valid until the next iteration.
+    """
+    view = memoryview(bytearray(chunk_size))
+    carried = 0
+
+    with open(path, 'rb') as f:
+        while True:
+            read = await asyncio.to_thread(f.readinto, view[carried:])
+            filled = carried + read
+            if read == 0:
+                # EOF: flush a (truncated) remainder so decoding reports it
+                if filled:
+                    yield view[:filled]
+                return
+
+            end = utf8_complete_len(view[:filled])
+            if end == 0:
+                end = filled
+            yield view[:end]
+
+            carried = filled - end
+            view[:carried] = view[end:filled]
+
+
+def binary_frame(header: dict, payload: Union[bytes, memoryview]) -> bytes:
+    """
+    Pack a binary WebSocket frame: 4-byte big-endian header length,
+    JSON header (UTF-8), then the raw payload bytes.
+    """
+    header_bytes = json.dumps(header).encode('utf-8')
+    return b"".join((len(header_bytes).to_bytes(4, 'big'), header_bytes, payload))
+
+
+def content_hash(content: str) -> str:
+    """SHA-256 of the UTF-8 content (hex), verifiable in browsers via SubtleCrypto."""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def _common_prefix_len(a: str, b: str) -> int:
+    """Length of the common prefix, via binary search over C-level slice compares."""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix_len(a: str, b: str, limit: int) -> int:
+    """Length of the common suffix, at most limit characters."""
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:] == b[len(b) - mid:]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _utf16_len(text: str) -> int:
+    """Length in UTF-16 code units (JavaScript string indices)."""
+    return len(text.encode('utf-16-le')) // 2
+
+
+def compute_patch(old_content: str, new_content: str) -> dict:
+    """
+    Compute a single-splice patch turning old_content into new_content.
+
+    The common prefix and suffix are trimmed, leaving one replaced region.
+    This is exact and minimal for the single-region edits made by edit_file,
+    and degrades to a full replacement for unrelated rewrites.
+
+    Offsets are UTF-16 code units so clients can apply the patch with
+    JavaScript string slicing:
+        text.slice(0, offset) + insert + text.slice(offset + delete)
+
+    Returns:
+        {"offset": int, "delete": int, "insert": str}
+    """
+    prefix = _common_prefix_len(old_content, new_content)
+    suffix_limit = min(len(old_content), len(new_content)) - prefix
+    suffix = _common_suffix_len(old_content, new_content, suffix_limit)
+
+    deleted = old_content[prefix:len(old_content) - suffix]
+    inserted = new_content[prefix:len(new_content) - suffix]
+
+    return {
+        "offset": _utf16_len(old_content[:prefix]),
+        "delete": _utf16_len(deleted),
+        "insert": inserted,
+    }
+
 
 class ConnectionManager:
     """
@@ -33,18 +210,32 @@ class ConnectionManager:
     Attributes:
         active_connections: Dict mapping file paths to user connections
                            {file_path: {user_id: websocket}}
+        delta_clients: Dict mapping file paths to user IDs that opted into
+                       delta mode {file_path: {user_id}}
+        binary_clients: Dict mapping file paths to user IDs that receive
+                        chunks as binary frames {file_path: {user_id}}
+        file_versions: Current version/hash per file with an active room
+        session_connections: Dict mapping thread_id to the sockets that
+                             subscribed to that session's events
+                             {thread_id: {connection_id: websocket}}
     """
 
     def __init__(self):
         """Initialize connection manager with empty rooms and async lock."""
         self.active_connections: Dict[str, Dict[str, WebSocket]] = {}
+        self.session_connections: Dict[str, Dict[str, WebSocket]] = {}
+        self.delta_clients: Dict[str, Set[str]] = {}
+        self.binary_clients: Dict[str, Set[str]] = {}
+        self.file_versions: Dict[str, FileVersion] = {}
         self._lock: asyncio.Lock = asyncio.Lock()
 
     async def connect(
         self,
         websocket: WebSocket,
         file_path: str,
-        user_id: str
+        user_id: str,
+        delta: bool = False,
+        binary: bool = False
     ) -> None:
         """
         Add authenticated client to file-specific room.
@@ -53,6 +244,8 @@ class ConnectionManager:
             websocket: FastAPI WebSocket connection
             file_path: Relative file path from workspace root
             user_id: Authenticated user identifier
+            delta: Client opted into file_patch messages (default: False)
+            binary: Client receives large-file chunks as binary frames (default: False)
         """
         async with self._lock:
             # Create room if it doesn't exist
@@ -62,6 +255,11 @@ class ConnectionManager:
 
             # Add user to room
             self.active_connections[file_path][user_id] = websocket
+            for opted_in, clients in ((delta, self.delta_clients), (binary, self.binary_clients)):
+                if opted_in:
+                    clients.setdefault(file_path, set()).add(user_id)
+                else:
+                    clients.get(file_path, set()).discard(user_id)
             room_size = len(self.active_connections[file_path])
             logger.info(
                 f"User {user_id} connected to {file_path} "
@@ -88,10 +286,15 @@ class ConnectionManager:
                 if user_id in self.active_connections[file_path]:
                     del self.active_connections[file_path][user_id]
                     logger.info(f"User {user_id} disconnected from {file_path}")
+                self.delta_clients.get(file_path, set()).discard(user_id)
+                self.binary_clients.get(file_path, set()).discard(user_id)
 
-                # Cleanup empty rooms
+                # Cleanup empty rooms (and their version state)
                 if not self.active_connections[file_path]:
                     del self.active_connections[file_path]
+                    self.delta_clients.pop(file_path, None)
+                    self.binary_clients.pop(file_path, None)
+                    self.file_versions.pop(file_path, None)
                     logger.info(f"Removed empty room for file: {file_path}")
                 else:
                     room_size = len(self.active_connections[file_path])
@@ -99,6 +302,104 @@ class ConnectionManager:
                         f"Room {file_path} still active "
                         f"(remaining users: {room_size})"
                     )
+            else:
+                # Client never joined (initial send failed) - drop state from sync
+                self.file_versions.pop(file_path, None)
+
+    async def sync_file_version(self, file_path: str, digest: str) -> FileVersion:
+        """
+        Return the version for content just read from disk for a new client.
+
+        If the content differs from what the room was last sent (e.g. an
+        edit made outside the agent tools), the version is bumped so that
+        delta clients holding older content detect the mismatch.
+
+        Args:
+            file_path: Relative file path from workspace root
+            digest: content_hash() of the current file content
+
+        Returns:
+            FileVersion to include in the initial_content message
+        """
+        async with self._lock:
+            current = self.file_versions.get(file_path)
+            if current is None or current.content_hash != digest:
+                current = FileVersion(
+                    version=(current.version + 1) if current else 1,
+                    content_hash=digest
+                )
+                self.file_versions[file_path] = current
+            return current
+
+    async def send_initial_content(
+        self,
+        websocket: WebSocket,
+        file_path: str,
+        full_path: Path,
+        binary: bool = False
+    ) -> FileVersion:
+        """
+        Stream a file from disk to one client as its initial content.
+
+        Files up to CHUNK_SIZE_BYTES are sent as a single initial_content
+        message. Larger files are read in codepoint-aligned chunks and sent
+        as initial_content_chunk messages (or binary frames) as they are
+        read, followed by initial_content_end with the version and
+        content_hash, so the file is never held in memory as a whole.
+
+        Args:
+            websocket: Client connection (not yet registered in a room)
+            file_path: Relative file path from workspace root
+            full_path: Validated absolute path on disk
+            binary: Send chunks as binary frames (default: False)
+
+        Returns:
+            FileVersion of the content that was sent
+        """
+        file_size = (await asyncio.to_thread(full_path.stat)).st_size
+
+        if file_size <= CHUNK_SIZE_BYTES:
+            data = await asyncio.to_thread(full_path.read_bytes)
+            version = await self.sync_file_version(file_path, hashlib.sha256(data).hexdigest())
+            await websocket.send_json({
+                "type": "initial_content",
+                "new_content": data.decode('utf-8'),
+                "version": version.version,
+                "content_hash": version.content_hash
+            })
+            logger.info(f"📤 Sent initial_content for {file_path} ({len(data)} bytes, v{version.version})")
+            return version
+
+        hasher = hashlib.sha256()
+        chunk_index = 0
+        async for chunk in stream_file_chunks(full_path, CHUNK_SIZE_BYTES):
+            hasher.update(chunk)
+            header = {
+                "type": "initial_content_chunk",
+                "file_path": file_path,
+                "chunk_index": chunk_index
+            }
+            if binary:
+                await websocket.send_bytes(binary_frame(header, chunk))
+            else:
+                header["content_chunk"] = str(chunk, 'utf-8')
+                await websocket.send_json(header)
+            chunk_index += 1
+
+        version = await self.sync_file_version(file_path, hasher.hexdigest())
+        await websocket.send_json({
+            "type": "initial_content_end",
+            "file_path": file_path,
+            "total_chunks": chunk_index,
+            "version": version.version,
+            "content_hash": version.content_hash
+        })
+
+        logger.info(
+            f"📤 Streamed initial content for {file_path} "
+            f"({file_size} bytes, {chunk_index} chunks, v{version.version})"
+        )
+        return version
 
     async def broadcast_file_change(
         self,
@@ -111,7 +412,13 @@ class ConnectionManager:
         """
         Broadcast file changes to all connected clients (except editor).
 
-        For large files (>100KB), automatically chunks the message.
+        Full-mode clients receive file_change (chunked for files >100KB).
+        Delta-mode clients receive a file_patch against base_version when
+        old_content matches the room's current version; otherwise (or when
+        the patch would not be smaller) they get the full snapshot, whose
+        metadata carries the new version and content_hash. Content the room
+        already holds (same content_hash as its current version) is not
+        re-broadcast.
 
         Args:
             file_path: Relative file path from workspace root
@@ -140,7 +447,13 @@ class ConnectionManager:
         content_size = len(new_content.encode('utf-8'))
         needs_chunking = content_size > CHUNK_SIZE_BYTES
 
+        old_hash = content_hash(old_content)
+        new_hash = content_hash(new_content)
+
         async with self._lock:
+            if file_path not in self.active_connections:
+                return
+
             # Get all connections except the editor
             recipients = {
                 uid: ws
@@ -148,6 +461,22 @@ class ConnectionManager:
                 if uid != editor_user_id
             }
 
+            # Room already holds this content (e.g. the watcher re-reporting
+            # an agent edit that was just patched): nothing new to send
+            current = self.file_versions.get(file_path)
+            if current is not None and current.content_hash == new_hash:
+                logger.info(f"✅ {file_path} already at v{current.version}, skipping duplicate broadcast")
+                return
+
+            # Advance the room's version; a patch is only valid against the
+            # version whose content matches old_content
+            base = current if current and current.content_hash == old_hash else None
+            version = FileVersion(
+                version=(current.version + 1) if current else 1,
+                content_hash=new_hash
+            )
+            self.file_versions[file_path] = version
+
             if not recipients:
                 logger.info(
                     f"⚠️  No recipients for broadcast to {file_path} "
@@ -155,15 +484,41 @@ class ConnectionManager:
                 )
                 return
 
-            logger.info(
-                f"✅ Broadcasting change to {file_path} "
-                f"(recipients: {len(recipients)}, chunked: {needs_chunking}, editor: {editor_user_id})"
-            )
+            delta_ids = self.delta_clients.get(file_path, set())
+            delta_recipients = {uid: ws for uid, ws in recipients.items() if uid in delta_ids}
+            full_recipients = {uid: ws for uid, ws in recipients.items() if uid not in delta_ids}
+
+        metadata["version"] = version.version
+        metadata["content_hash"] = version.content_hash
+
+        # Build the patch for delta clients; fall back to a snapshot on a
+        # version mismatch or when the patch would not save bandwidth
+        patch = None
+        if delta_recipients and base is not None:
+            patch = compute_patch(old_content, new_content)
+            patch_size = len(patch["insert"].encode('utf-8'))
+            if patch_size > CHUNK_SIZE_BYTES or patch_size >= content_size * DELTA_MAX_RATIO:
+                patch = None
+
+        if patch is not None:
+            await self._broadcast_patch(delta_recipients, file_path, base, version, patch, metadata)
+        else:
+            full_recipients.update(delta_recipients)
 
-        # Broadcast to all recipients
+        if not full_recipients:
+            logger.info(f"✅ Broadcast patch v{version.version} to {file_path} (recipients: {len(delta_recipients)})")
+            return
+
+        logger.info(
+            f"✅ Broadcasting change to {file_path} "
+            f"(recipients: {len(full_recipients)}, chunked: {needs_chunking}, editor: {editor_user_id}, "
+            f"patched: {len(delta_recipients) if patch is not None else 0})"
+        )
+
+        # Broadcast full snapshot to remaining recipients
         if needs_chunking:
             await self._broadcast_chunked(
-                recipients,
+                full_recipients,
                 file_path,
                 old_content,
                 new_content,
@@ -171,13 +526,50 @@ class ConnectionManager:
             )
         else:
             await self._broadcast_single(
-                recipients,
+                full_recipients,
                 file_path,
                 old_content,
                 new_content,
                 metadata
             )
 
+    async def _broadcast_patch(
+        self,
+        recipients: Dict[str, WebSocket],
+        file_path: str,
+        base: FileVersion,
+        version: FileVersion,
+        patch: dict,
+        metadata: dict
+    ) -> None:
+        """
+        Broadcast a compact patch to delta-mode recipients.
+
+        Clients apply the patch only if their local version equals
+        base_version, then verify content_hash; on mismatch they send
+        {"type": "resync_request"} to receive a full snapshot.
+
+        Args:
+            recipients: Dict of {user_id: websocket}
+            file_path: Relative file path
+            base: Version the patch applies to
+            version: Version after applying the patch
+            patch: {"offset", "delete", "insert"} from compute_patch()
+            metadata: Change metadata
+        """
+        message = {
+            "type": "file_patch",
+            "file_path": file_path,
+            "base_version": base.version,
+            "base_hash": base.content_hash,
+            "version": version.version,
+            "content_hash": version.content_hash,
+            "patch": patch,
+            "metadata": metadata
+        }
+
+        await self._send_to_all(recipients, message)
+
     async def _broadcast_single(
         self,
         recipients: Dict[str, WebSocket],
@@ -218,6 +610,10 @@ class ConnectionManager:
         """
         Broadcast large file in chunks to all recipients.
 
+        Chunks are cut on UTF-8 codepoint boundaries from a single encoded
+        buffer via memoryview slices. Binary-mode recipients get each chunk
+        as a binary frame (see binary_frame), others as JSON text.
+
         Args:
             recipients: Dict of {user_id: websocket}
             file_path: Relative file path
@@ -225,51 +621,58 @@ class ConnectionManager:
             new_content: Content after change
             metadata: Change metadata
         """
-        # Calculate chunks
+        # Calculate chunks (slices share the encoded buffer)
         content_bytes = new_content.encode('utf-8')
-        total_chunks = (len(content_bytes) + CHUNK_SIZE_BYTES - 1) // CHUNK_SIZE_BYTES
+        chunks = list(iter_utf8_chunks(content_bytes, CHUNK_SIZE_BYTES))
+        total_chunks = len(chunks)
+
+        binary_ids = self.binary_clients.get(file_path, set())
+        binary_recipients = {uid: ws for uid, ws in recipients.items() if uid in binary_ids}
+        text_recipients = {uid: ws for uid, ws in recipients.items() if uid not in binary_ids}
 
         logger.info(
             f"Chunking {file_path}: {len(content_bytes)} bytes "
-            f"into {total_chunks} chunks"
+            f"into {total_chunks} chunks (binary recipients: {len(binary_recipients)})"
         )
 
         # Send chunks sequentially
-        for chunk_index in range(total_chunks):
-            start_byte = chunk_index * CHUNK_SIZE_BYTES
-            end_byte = min(start_byte + CHUNK_SIZE_BYTES, len(content_bytes))
-            chunk_bytes = content_bytes[start_byte:end_byte]
-            chunk_text = chunk_bytes.decode('utf-8')
-
-            message = {
+        for chunk_index, chunk in enumerate(chunks):
+            header = {
                 "type": "file_change_chunk",
                 "file_path": file_path,
                 "old_content": old_content if chunk_index == 0 else None,
-                "content_chunk": chunk_text,
                 "chunk_index": chunk_index,
                 "total_chunks": total_chunks,
                 "metadata": metadata if chunk_index == 0 else None
             }
 
             # Send chunk to all recipients
-            await self._send_to_all(recipients, message)
+            sends = []
+            if text_recipients:
+                sends.append(self._send_to_all(
+                    text_recipients,
+                    {**header, "content_chunk": str(chunk, 'utf-8')}
+                ))
+            if binary_recipients:
+                sends.append(self._send_to_all(binary_recipients, binary_frame(header, chunk)))
+            await asyncio.gather(*sends)
 
             logger.debug(
                 f"Sent chunk {chunk_index + 1}/{total_chunks} "
-                f"of {file_path} ({len(chunk_bytes)} bytes)"
+                f"of {file_path} ({len(chunk)} bytes)"
             )
 
     async def _send_to_all(
         self,
         recipients: Dict[str, WebSocket],
-        message: dict
+        message: Union[dict, bytes]
     ) -> None:
         """
         Send message to all recipients, handling disconnections.
 
         Args:
             recipients: Dict of {user_id: websocket}
-            message: Message dictionary to send as JSON
+            message: Message dictionary to send as JSON, or bytes for a binary frame
         """
         # Create tasks for concurrent sending
         send_tasks = [
@@ -284,7 +687,7 @@ class ConnectionManager:
         self,
         user_id: str,
         websocket: WebSocket,
-        message: dict
+        message: Union[dict, bytes]
     ) -> None:
         """
         Safely send message to a single websocket with error handling.
@@ -292,10 +695,13 @@ class ConnectionManager:
         Args:
             user_id: User identifier (for logging)
             websocket: WebSocket connection
-            message: Message dictionary to send as JSON
+            message: Message dictionary to send as JSON, or bytes for a binary frame
         """
         try:
-            await websocket.send_json(message)
+            if isinstance(message, bytes):
+                await websocket.send_bytes(message)
+            else:
+                await websocket.send_json(message)
         except Exception as e:
             logger.error(
                 f"Failed to send to user {user_id}: {type(e).__name__}: {e}"
@@ -303,11 +709,61 @@ class ConnectionManager:
             # Note: Connection cleanup will happen in disconnect()
             # when the WebSocket endpoint detects the broken connection
 
+    async def connect_session(self, websocket: WebSocket, thread_id: str) -> None:
+        """
+        Subscribe a socket to one session's events (see send_to_session).
+
+        Args:
+            websocket: FastAPI WebSocket connection
+            thread_id: Session whose events the socket may receive
+        """
+        async with self._lock:
+            self.session_connections.setdefault(thread_id, {})[str(id(websocket))] = websocket
+            logger.info(f"Socket subscribed to session {thread_id}")
+
+    async def disconnect_session(self, websocket: WebSocket, thread_id: str) -> None:
+        """
+        Remove a socket's session subscription.
+
+        Args:
+            websocket: FastAPI WebSocket connection
+            thread_id: Session the socket subscribed to
+        """
+        async with self._lock:
+            sockets = self.session_connections.get(thread_id)
+            if sockets is not None:
+                sockets.pop(str(id(websocket)), None)
+                if not sockets:
+                    del self.session_connections[thread_id]
+
+    async def send_to_session(self, thread_id: str, message: dict) -> int:
+        """
+        Send a message only to sockets subscribed to one session.
+
+        Used for session-private events (e.g. tool approval requests, whose
+        arguments include file paths and content); never falls back to
+        broadcast when the session has no subscribed socket.
+
+        Args:
+            thread_id: Session the message belongs to
+            message: Message dictionary to send as JSON
+
+        Returns:
+            Number of sockets the message was sent to
+        """
+        async with self._lock:
+            recipients = dict(self.session_connections.get(thread_id, {}))
+
+        if recipients:
+            await self._send_to_all(recipients, message)
+        return len(recipients)
+
     async def broadcast(self, message: dict) -> None:
         """
         Broadcast a message to ALL connected clients across all rooms.
 
-        This is used for system-wide events like tool approval requests.
+        Only for events that are safe for every client to see; use
+        send_to_session for anything belonging to one chat session.
 
         Args:
             message: Message dictionary to send as JSON
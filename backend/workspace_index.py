@@ -0,0 +1,339 @@
+"""
+In-Memory Workspace Tree Index.
+
+Backs GET /api/workspace/tree so file-browser refreshes do not walk the
+workspace on the event loop:
+- Cold build in a worker thread with os.scandir (one stat per entry)
+- Kept current by FileWatcher events (refresh only the touched paths);
+  events that arrive during the cold build are replayed once it finishes
+- Generation counter -> ETag for If-None-Match short-circuits
+- Lazy subtree rendering by (path, depth); rendered JSON cached per generation
+
+Nodes are plain dicts shaped like backend_main.FileNode so responses can be
+serialized without building Pydantic models per request.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from pathlib import Path
+from stat import S_ISDIR
+from typing import Dict, List, Optional, Tuple
+
+from file_watcher import is_ignored_name
+
+logger = logging.getLogger(__name__)
+
+# Rendered (path, depth) responses kept per generation
+MAX_RENDER_CACHE = 64
+
+
+class TreePathError(Exception):
+    """Requested subtree path is missing or not a directory."""
+
+
+def _node_id(relative_path: str) -> str:
+    return relative_path.replace('/', '_').replace('\\', '_')
+
+
+class WorkspaceTreeIndex:
+    """
+    Thread-safe index of the workspace tree.
+
+    _nodes maps relative paths ("" is the root) to node dicts; directory
+    nodes keep a set of child names. All mutations bump the generation.
+    """
+
+    def __init__(self, workspace_root: Path):
+        self.workspace_root = workspace_root
+        self._nodes: Dict[str, dict] = {}
+        self._children: Dict[str, set] = {}
+        self._lock = threading.Lock()
+        self._build_lock = asyncio.Lock()
+        self._built = False
+        # Paths touched while the cold build scans, replayed after it (None: no build running)
+        self._pending: Optional[List[Tuple[str, Optional[str]]]] = None
+        self._generation = 0
+        # Salt so ETags from a previous process never match this one
+        self._instance = uuid.uuid4().hex
+        self._render_cache: Dict[Tuple[str, Optional[int]], Tuple[int, str, bytes]] = {}
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    # ------------------------------------------------------------------
+    # Building (worker thread)
+    # ------------------------------------------------------------------
+
+    async def ensure_built(self) -> None:
+        """Build the index off the event loop on first use."""
+        if self._built:
+            return
+        async with self._build_lock:
+            if not self._built:
+                await asyncio.to_thread(self.rebuild)
+
+    def rebuild(self) -> None:
+        """Walk the whole workspace (blocking) and replace the index."""
+        with self._lock:
+            if not self._built:
+                self._pending = []
+
+        nodes: Dict[str, dict] = {}
+        children: Dict[str, set] = {}
+
+        root_stat = self.workspace_root.stat()
+        nodes[""] = self._dir_node("", self.workspace_root.name, root_stat.st_mtime)
+        children[""] = set()
+        self._scan_into(self.workspace_root, "", nodes, children)
+
+        with self._lock:
+            self._nodes = nodes
+            self._children = children
+            self._built = True
+            self._bump()
+            pending, self._pending = self._pending or [], None
+
+        logger.info(f"🌳 [TreeIndex] Built index for {self.workspace_root} ({len(nodes) - 1} entries)")
+
+        # The scan may have passed these paths before they changed
+        for path, dest_path in pending:
+            self._apply_sync(path, dest_path)
+
+    def _scan_into(self, directory: Path, relative_dir: str, nodes: Dict[str, dict], children: Dict[str, set]) -> None:
+        """Recursively add directory contents (iterative to avoid deep recursion)."""
+        stack = [(directory, relative_dir)]
+        while stack:
+            current, current_rel = stack.pop()
+            try:
+                entries = list(os.scandir(current))
+            except (PermissionError, FileNotFoundError, NotADirectoryError):
+                continue
+
+            for entry in entries:
+                # Same names the watcher filters: it never reports their removal
+                if is_ignored_name(entry.name):
+                    continue
+                relative_path = f"{current_rel}/{entry.name}" if current_rel else entry.name
+                try:
+                    is_dir = entry.is_dir()
+                    stat = entry.stat()
+                except (FileNotFoundError, PermissionError):
+                    continue
+
+                if is_dir:
+                    nodes[relative_path] = self._dir_node(relative_path, entry.name, stat.st_mtime)
+                    children[relative_path] = set()
+                    stack.append((Path(entry.path), relative_path))
+                else:
+                    nodes[relative_path] = self._file_node(relative_path, entry.name, stat.st_size, stat.st_mtime)
+                children[current_rel].add(entry.name)
+
+    @staticmethod
+    def _dir_node(relative_path: str, name: str, mtime: float) -> dict:
+        return {
+            "id": _node_id(relative_path),
+            "name": name,
+            "path": relative_path,
+            "type": "directory",
+            "children": None,
+            "size": None,
+            "extension": None,
+            "lastModified": mtime,
+        }
+
+    @staticmethod
+    def _file_node(relative_path: str, name: str, size: int, mtime: float) -> dict:
+        return {
+            "id": _node_id(relative_path),
+            "name": name,
+            "path": relative_path,
+            "type": "file",
+            "children": None,
+            "size": size,
+            "extension": os.path.splitext(name)[1],
+            "lastModified": mtime,
+        }
+
+    # ------------------------------------------------------------------
+    # Incremental updates (from FileWatcher)
+    # ------------------------------------------------------------------
+
+    async def apply_event(self, event) -> None:
+        """
+        Update the index for one watcher event (WorkspaceEvent).
+
+        Paths are re-stat'ed rather than trusted, so replayed or coalesced
+        events converge on the on-disk state. Runs in a worker thread since
+        a created or moved directory is scanned.
+        """
+        if self._defer(event.path, event.dest_path):
+            return
+        await asyncio.to_thread(self._apply_sync, event.path, event.dest_path)
+
+    async def refresh_path(self, relative_path: str) -> None:
+        """Update the index right after an API endpoint changed relative_path."""
+        if self._defer(relative_path):
+            return
+        await asyncio.to_thread(self._apply_sync, relative_path)
+
+    def _defer(self, path: str, dest_path: Optional[str] = None) -> bool:
+        """
+        Hold back an update until the index is built.
+
+        Returns:
+            True if the update must not be applied now: recorded for replay
+            while the cold build scans, dropped before it starts (the build
+            will see the current state)
+        """
+        with self._lock:
+            if self._built:
+                return False
+            if self._pending is not None:
+                self._pending.append((path, dest_path))
+            return True
+
+    def _apply_sync(self, path: str, dest_path: Optional[str] = None) -> None:
+        if dest_path is not None:
+            with self._lock:
+                self._remove(path)
+                self._bump()
+            self._refresh_topmost(dest_path)
+        else:
+            self._refresh_topmost(path)
+
+    def _refresh_topmost(self, relative_path: str) -> None:
+        """Refresh the highest ancestor not yet indexed (covers mkdir -p)."""
+        parts = relative_path.split('/')
+        for i in range(1, len(parts)):
+            prefix = '/'.join(parts[:i])
+            if prefix not in self._nodes:
+                self._refresh(prefix)
+                return
+        self._refresh(relative_path)
+
+    def _refresh(self, relative_path: str) -> None:
+        """Bring one path (and its parent's mtime) in line with the disk."""
+        full_path = self.workspace_root / relative_path
+        name = full_path.name
+
+        # Scan a directory's subtree before taking the lock
+        sub_nodes: Dict[str, dict] = {}
+        sub_children: Dict[str, set] = {}
+        try:
+            stat = full_path.stat()
+            is_dir = S_ISDIR(stat.st_mode)
+        except FileNotFoundError:
+            stat = None
+            is_dir = False
+
+        if stat is not None and is_dir:
+            sub_nodes[relative_path] = self._dir_node(relative_path, name, stat.st_mtime)
+            sub_children[relative_path] = set()
+            self._scan_into(full_path, relative_path, sub_nodes, sub_children)
+
+        parent = os.path.dirname(relative_path)
+        try:
+            parent_mtime = (self.workspace_root / parent).stat().st_mtime
+        except FileNotFoundError:
+            parent_mtime = None
+
+        with self._lock:
+            if stat is None or is_ignored_name(name):
+                self._remove(relative_path)
+            elif parent not in self._children:
+                # Parent not indexed (e.g. hidden ancestor) - ignore
+                return
+            elif is_dir:
+                self._remove(relative_path)
+                self._nodes.update(sub_nodes)
+                self._children.update(sub_children)
+                self._children[parent].add(name)
+            else:
+                self._remove(relative_path)
+                self._nodes[relative_path] = self._file_node(relative_path, name, stat.st_size, stat.st_mtime)
+                self._children[parent].add(name)
+
+            if parent_mtime is not None and parent in self._nodes:
+                self._nodes[parent]["lastModified"] = parent_mtime
+            self._bump()
+
+    def _remove(self, relative_path: str) -> None:
+        """Remove a node and its subtree (caller holds the lock)."""
+        if relative_path not in self._nodes:
+            return
+        stack = [relative_path]
+        while stack:
+            current = stack.pop()
+            self._nodes.pop(current, None)
+            for child in self._children.pop(current, ()):
+                stack.append(f"{current}/{child}" if current else child)
+
+        parent = os.path.dirname(relative_path)
+        if parent in self._children:
+            self._children[parent].discard(os.path.basename(relative_path))
+
+    def _bump(self) -> None:
+        self._generation += 1
+        self._render_cache.clear()
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+
+    def etag_for(self, path: str, depth: Optional[int]) -> str:
+        """Strong ETag for a (path, depth) view at the current generation."""
+        key = f"{self._instance}:{self._generation}:{path}:{depth}"
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+        return f'"{digest}"'
+
+    def render(self, path: str = "", depth: Optional[int] = None) -> Tuple[str, bytes]:
+        """
+        Return (etag, JSON bytes) for the children of path.
+
+        Args:
+            path: Relative directory path ("" for the workspace root)
+            depth: Directory levels to include; None for the full subtree.
+                   Directories beyond depth have children = null (not loaded).
+
+        Raises:
+            TreePathError: If path is not an indexed directory
+        """
+        key = (path, depth)
+        with self._lock:
+            cached = self._render_cache.get(key)
+            if cached and cached[0] == self._generation:
+                return cached[1], cached[2]
+
+            if path not in self._children:
+                raise TreePathError(path)
+
+            nodes = self._render_children(path, depth)
+            etag = self.etag_for(path, depth)
+            body = json.dumps(nodes, separators=(',', ':')).encode('utf-8')
+
+            if len(self._render_cache) >= MAX_RENDER_CACHE:
+                self._render_cache.clear()
+            self._render_cache[key] = (self._generation, etag, body)
+            return etag, body
+
+    def _render_children(self, path: str, depth: Optional[int]) -> List[dict]:
+        result = []
+        for name in self._children.get(path, ()):
+            child_path = f"{path}/{name}" if path else name
+            node = dict(self._nodes[child_path])
+            if node["type"] == "directory":
+                if depth is None or depth > 1:
+                    node["children"] = self._render_children(child_path, None if depth is None else depth - 1)
+                else:
+                    node["children"] = None
+            result.append(node)
+
+        # Directories first, then by name (same order as before)
+        result.sort(key=lambda n: (n["type"] != "directory", n["name"]))
+        return result